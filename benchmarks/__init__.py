@@ -0,0 +1,11 @@
+"""Benchmarks for the hot paths of the game: cards, hands, tricks, scoring and whole hands.
+
+Run every benchmark, or the ones named, and compare against a saved baseline:
+
+    python -m benchmarks
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json --threshold 0.1
+    python -m benchmarks deal_cards filter_cards
+
+The cases module defines what is timed and the runner module how.
+"""
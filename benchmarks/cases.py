@@ -0,0 +1,197 @@
+"""The cases module defines the benchmarks. Each case builds its inputs once and
+returns the operation to time, a function taking no arguments.
+
+The runner sends game events to a NullSink while timing, so the cases time the
+game logic without any display.
+
+CASES: -- the registered benchmarks by name, in the order they were defined.
+benchmark(): -- decorator registering a case under a name.
+"""
+from __future__ import annotations
+from typing import Callable
+from random import Random
+
+from euchre.bots import Bot, BotAgent, ISMCTSAgent
+from euchre.cards import Card, get_highest_rank_card
+from euchre.dealers import Dealer
+from euchre.dealing import Deck
+from euchre.engine import PLAY, GameEngine, HandState
+from euchre.masks import card_suit, from_card, hand_from_cards
+from euchre.multitable import BatchBotAgent, TableBatch
+from euchre.players import Player
+from euchre.scores import score_round
+from euchre.solver import solve
+from euchre.state import GameState
+from euchre.teams import Team, assign_player_teams
+from euchre.trumps import Trump
+
+CASES: dict[str, Callable[[], Callable[[], object]]] = {}
+# Hands played by one op of the whole hand benchmarks
+BATCH_HANDS = 64
+# Deals solved by one op of solve_deal
+SOLVER_DEALS = 16
+
+
+def benchmark(name: str):
+    """Register the decorated case under the name. Raises ValueError if the name is taken."""
+    def register(case: Callable[[], Callable[[], object]]):
+        if name in CASES:
+            raise ValueError(f'Benchmark {name!r} is already registered.')
+        CASES[name] = case
+        return case
+    return register
+
+
+def _table() -> tuple[list[Player], list[Team]]:
+    """Return four players seated in two teams."""
+    players = [Player(f'Player_{seat + 1}') for seat in range(4)]
+    teams = [Team(players[0], players[2], 'Team_1'), Team(players[1], players[3], 'Team_2')]
+    assign_player_teams(teams)
+    return players, teams
+
+
+def _hand(player: Player, cards: list[Card]) -> Player:
+    """Give the cards to the player and return the player."""
+    for card in cards:
+        player.receive_card(card)
+    return player
+
+
+@benchmark('card_construction')
+def card_construction():
+    return lambda: Card(14, 'Spades')
+
+
+@benchmark('deal_cards')
+def deal_cards():
+    players, _ = _table()
+    dealer = Dealer(players)
+
+    def deal():
+        for player in players:
+            player.reset()
+        return dealer.deal_cards()
+    return deal
+
+
+@benchmark('filter_cards')
+def filter_cards():
+    player = _hand(Player('Player_1'), [
+        Card(11, 'Clubs'), Card(14, 'Spades'), Card(10, 'Hearts'), Card(9, 'Spades'), Card(13, 'Diamonds'),
+    ])
+    led = Card(12, 'Spades')
+    trump = Trump('Spades')
+    return lambda: player.filter_cards(led, trump)
+
+
+@benchmark('sorted_cards_in_hand')
+def sorted_cards_in_hand():
+    player = _hand(Player('Player_1'), [
+        Card(9, 'Hearts'), Card(14, 'Diamonds'), Card(11, 'Clubs'), Card(12, 'Spades'), Card(10, 'Diamonds'),
+    ])
+    return player.sorted_cards_in_hand
+
+
+@benchmark('highest_rank_card')
+def highest_rank_card():
+    players, _ = _table()
+    trick = list(zip(players, [Card(10, 'Hearts'), Card(14, 'Hearts'), Card(11, 'Diamonds'), Card(9, 'Spades')]))
+    trump = Trump('Hearts')
+    return lambda: get_highest_rank_card(trick, trump)
+
+
+@benchmark('hand_strength')
+def hand_strength():
+    # Bot._calculate_hand_strength became the strength table lookup of the
+    # bot's order decision
+    bot = Bot('Bot_1')
+    hand = hand_from_cards([
+        Card(11, 'Spades'), Card(11, 'Clubs'), Card(14, 'Spades'), Card(13, 'Hearts'), Card(9, 'Diamonds'),
+    ])
+    state = HandState(3, [hand, 0, 0, 0], [from_card(Card(10, 'Spades'))])
+    return lambda: bot.choose_order(state, 0)
+
+
+@benchmark('score_round')
+def score_round_case():
+    players, teams = _table()
+    for player, tricks in zip(players, (2, 1, 1, 1)):
+        for _ in range(tricks):
+            player.set_tricks()
+    trump = Trump('Spades', teams[0])
+    return lambda: score_round(teams, trump)
+
+
+@benchmark('headless_hand')
+def headless_hand():
+    # The hands of seeds 0 to 63, the same deals every op, timing pass and
+    # baseline, and the same deals as table_batch_hands
+    agents = [BotAgent() for _ in range(4)]
+
+    def play():
+        for seed in range(BATCH_HANDS):
+            GameEngine(agents, Random(seed)).play_hand()
+    return play
+
+
+@benchmark('table_batch_hands')
+def table_batch_hands():
+    # One hand at each of 64 tables dealt from seeds 0 to 63, compare with headless_hand
+    agents = [BatchBotAgent()] * 4
+
+    def play():
+        return TableBatch(agents, [Random(seed) for seed in range(BATCH_HANDS)]).play_hands()
+    return play
+
+
+@benchmark('game_state_playout')
+def game_state_playout():
+    # Seed 1 deals a hand the bots bid on
+    engine = GameEngine([BotAgent() for _ in range(4)], Random(1))
+    steps = engine.hand_steps()
+    decision = next(steps)
+    agent = BotAgent()
+    while decision.kind != PLAY:
+        decision = steps.send(getattr(agent, decision.kind)(decision.state, decision.seat))
+    start = GameState.from_hand_state(decision.state)
+
+    def playout():
+        state = start
+        while not state.is_over():
+            state = state.apply(state.legal_moves()[0])
+        return state.result()
+    return playout
+
+
+@benchmark('ismcts_decision')
+def ismcts_decision():
+    # The opening lead of seed 1, searched with 100 iterations: ops/s * 100 is
+    # the search throughput in iterations per second
+    engine = GameEngine([BotAgent() for _ in range(4)], Random(1))
+    steps = engine.hand_steps()
+    decision = next(steps)
+    agent = BotAgent()
+    while decision.kind != PLAY:
+        decision = steps.send(getattr(agent, decision.kind)(decision.state, decision.seat))
+    searcher = ISMCTSAgent(iterations=100, time_budget=None, rng=Random(0))
+    legal = decision.options
+
+    def decide():
+        searcher.get_search().reset()
+        return searcher.play(decision.state, decision.seat, legal)
+    return decide
+
+
+@benchmark('solve_deal')
+def solve_deal():
+    # The deals of seeds 0 to 15 with the turned suit as trump, each solved from
+    # the opening lead with a fresh Solver: ops/s * 16 is deals solved per second
+    deals = []
+    for seed in range(SOLVER_DEALS):
+        deck = Deck(Random(seed))
+        deck.shuffle()
+        deals.append((deck.deal_masks(0), card_suit(deck.turned())))
+
+    def solve_all():
+        return [solve(hands, trump, 1, 0) for hands, trump in deals]
+    return solve_all
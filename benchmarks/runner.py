@@ -0,0 +1,196 @@
+"""The runner module times the benchmark cases, saves baselines and finds regressions.
+
+Speed is the best ops/sec of several timing runs, each long enough to smooth
+out the timer. Memory is the median peak of the bytes tracemalloc sees held
+during one op, above what was held before it, measured in a separate pass so
+tracing does not slow the timing runs. It is the high-water mark of one op,
+not a count of the allocations it makes.
+
+Result(): -- the measurements of one benchmark.
+measure(): -- time one operation and measure its peak memory.
+run(): -- measure the named cases.
+save_baseline(): -- write results to a JSON baseline.
+load_baseline(): -- read results from a JSON baseline.
+compare(): -- return the regressions of results against a baseline.
+main(): -- command line entry point.
+"""
+from __future__ import annotations
+from typing import Callable, Iterable, NamedTuple
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.cases import CASES
+from euchre.events import NullSink, use_sink
+
+BASELINE_VERSION = 2
+DEFAULT_THRESHOLD = 0.10
+# Growth in peak bytes per op that is never reported, to ignore interpreter noise
+PEAK_SLACK = 64
+PEAK_SAMPLES = 50
+
+
+class Result(NamedTuple):
+    """The measurements of one benchmark."""
+    name: str
+    ops_per_sec: float
+    peak_bytes: int
+
+
+def measure(name: str, operation: Callable[[], object], min_time: float=0.2, repeat: int=5) -> Result:
+    """Time the operation and measure the peak bytes it holds. Returns the Result.
+
+    Keyword arguments:
+    name: -- name to report the measurements under.
+    operation: -- function taking no arguments to measure.
+    min_time: -- seconds each timing run lasts at least.
+    repeat: -- timing runs to take the best of.
+    """
+    # Double the loop count until a run takes long enough to time
+    loops = 1
+    while True:
+        elapsed = _time_loops(operation, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, _time_loops(operation, loops))
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(PEAK_SAMPLES):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            operation()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return Result(name, loops / best, int(statistics.median(peaks)))
+
+
+def run(names: Iterable[str]=None, min_time: float=0.2, repeat: int=5) -> list[Result]:
+    """Measure the named cases, or every case. Raises ValueError for an unknown name.
+
+    Keyword arguments:
+    names: -- names of the cases to measure, None for all of them.
+    min_time: -- seconds each timing run lasts at least.
+    repeat: -- timing runs to take the best of.
+    """
+    names = list(CASES) if names is None else list(names)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f'Unknown benchmarks: {", ".join(unknown)}.')
+
+    results = []
+    with use_sink(NullSink()):
+        for name in names:
+            results.append(measure(name, CASES[name](), min_time, repeat))
+    return results
+
+
+def save_baseline(results: list[Result], path: str):
+    """Write the results to a JSON baseline file."""
+    data = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {result.name: result._asdict() for result in results},
+    }
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2)
+        file.write('\n')
+
+
+def load_baseline(path: str) -> dict[str, Result]:
+    """Read the results of a JSON baseline file by name. Raises ValueError for an
+    unknown baseline version.
+    """
+    with open(path) as file:
+        data = json.load(file)
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f'Unsupported baseline version {data.get("version")!r} in {path}.')
+    return {name: Result(**result) for name, result in data['results'].items()}
+
+
+def compare(results: list[Result], baseline: dict[str, Result], threshold: float=DEFAULT_THRESHOLD) -> list[str]:
+    """Return a message for every result slower, or peaking higher in memory, than its
+    baseline by more than the threshold. Results missing from the baseline are skipped.
+
+    Keyword arguments:
+    results: -- the new measurements.
+    baseline: -- the saved measurements by name.
+    threshold: -- fraction a measurement may get worse by, 0.1 for 10%.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if result.ops_per_sec < base.ops_per_sec * (1 - threshold):
+            regressions.append(
+                f'{result.name}: {result.ops_per_sec:,.0f} ops/sec, '
+                f'{_change(result.ops_per_sec, base.ops_per_sec)} from {base.ops_per_sec:,.0f}'
+            )
+        if result.peak_bytes > base.peak_bytes * (1 + threshold) + PEAK_SLACK:
+            regressions.append(
+                f'{result.name}: {result.peak_bytes:,} peak bytes/op, up from {base.peak_bytes:,}'
+            )
+    return regressions
+
+
+def main(argv: list[str]=None) -> int:
+    """Run the benchmarks from the command line. Returns 1 if any regressed, 0 otherwise."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the hot paths of the game.')
+    parser.add_argument('names', nargs='*', help=f'benchmarks to run, all by default: {", ".join(CASES)}')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds each timing run lasts at least')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs to take the best of')
+    parser.add_argument('--save', metavar='PATH', help='write the results to a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results to a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='fraction a benchmark may get worse by before it fails')
+    args = parser.parse_args(argv)
+
+    try:
+        results = run(args.names or None, args.min_time, args.repeat)
+    except ValueError as e:
+        parser.error(str(e))
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    print(f'{"BENCHMARK":<24}{"OPS/SEC":>16}{"PEAK BYTES":>12}{"CHANGE":>10}')
+    for result in results:
+        base = baseline.get(result.name)
+        change = _change(result.ops_per_sec, base.ops_per_sec) if base else ''
+        print(f'{result.name:<24}{result.ops_per_sec:>16,.0f}{result.peak_bytes:>12,}{change:>10}')
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f'Saved baseline to {args.save}.')
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f'Regressions over {args.threshold:.0%}:')
+        for regression in regressions:
+            print(f'\t{regression}')
+        return 1
+    return 0
+
+
+def _time_loops(operation: Callable[[], object], loops: int) -> float:
+    """Return the seconds it takes to call the operation loops times."""
+    start = time.perf_counter()
+    for _ in range(loops):
+        operation()
+    return time.perf_counter() - start
+
+
+def _change(value: float, base: float) -> str:
+    """Return the change from base to value as a signed percentage."""
+    return f'{(value - base) / base:+.1%}'
@@ -0,0 +1,238 @@
+"""The agents module defines who makes the decisions in a game of Euchre.
+
+An agent answers the five decisions of a hand. Each method receives the
+HandState and the seat deciding, and answers with plain values in the
+encoding of the masks module:
+
+    order(state, seat) -> bool: order up the turned card in the first round of bidding.
+    call(state, seat) -> int|None: name a trump suit index in the second round, None to pass.
+    alone(state, seat) -> bool: go alone after making trump.
+    discard(state, seat) -> int: card the dealer discards after picking up.
+    play(state, seat, legal) -> int: card to play from the legal card mask.
+
+Agents come in a synchronous and an asynchronous variant with the same
+methods. GameEngine drives synchronous agents, the tables of the server module
+await asynchronous ones, and decide_async() answers a decision with either.
+Bots (bots.BotAgent), people at the terminal (TerminalAgent), scripted
+answers for tests (ScriptedAgent) and people over a connection
+(server.RemoteAgent) all answer through the same methods, so Player objects
+and the engine never prompt for input themselves.
+
+Agent: -- the synchronous agent protocol.
+AsyncAgent: -- the asynchronous agent protocol.
+TerminalAgent(): -- a person answering prompts at the terminal.
+ScriptedAgent(): -- answers given ahead of time, for tests.
+AsyncAdapter(): -- makes a synchronous agent awaitable.
+decide_async(): -- ask a synchronous or asynchronous agent to make a decision.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Iterable, Protocol, runtime_checkable
+if TYPE_CHECKING:
+    from euchre.engine import Decision, HandState
+
+from collections.abc import Awaitable
+
+from euchre.constants import SUITS
+from euchre.engine import ALONE, CALL, DISCARD, ORDER, PLAY
+from euchre.events import MESSAGE, emit
+from euchre.masks import card_suit, sort_hand, to_card
+
+
+@runtime_checkable
+class Agent(Protocol):
+    """Makes the decisions for a seat, answering right away."""
+
+    def order(self, state: HandState, seat: int) -> bool: ...
+
+    def call(self, state: HandState, seat: int) -> int|None: ...
+
+    def alone(self, state: HandState, seat: int) -> bool: ...
+
+    def discard(self, state: HandState, seat: int) -> int: ...
+
+    def play(self, state: HandState, seat: int, legal: int) -> int: ...
+
+
+@runtime_checkable
+class AsyncAgent(Protocol):
+    """Makes the decisions for a seat, answering when it is ready."""
+
+    async def order(self, state: HandState, seat: int) -> bool: ...
+
+    async def call(self, state: HandState, seat: int) -> int|None: ...
+
+    async def alone(self, state: HandState, seat: int) -> bool: ...
+
+    async def discard(self, state: HandState, seat: int) -> int: ...
+
+    async def play(self, state: HandState, seat: int, legal: int) -> int: ...
+
+
+class TerminalAgent():
+    """A person answering prompts at the terminal. Cards are chosen by their
+    number in the list Player.get_player_status prints.
+
+    order(): -- ask to order the turned card or pass.
+    call(): -- ask for a trump suit or pass.
+    alone(): -- ask if going alone.
+    discard(): -- ask for a card to discard.
+    play(): -- ask for a card to play.
+    """
+
+    def __init__(self, read: Callable[[str], str]=None):
+        """Initialize the agent.
+
+        Keyword arguments:
+        read: -- function that shows a prompt and returns the line typed, input() if None.
+        """
+        self._read = read if read is not None else input
+
+    def __repr__(self):
+        """Return the TerminalAgent object."""
+        return 'TerminalAgent()'
+
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        """Ask to order the turned card. Only 'order', 'yes' or 'pass' are accepted."""
+        revealed = to_card(state.turned)
+        while True:
+            order = self._read(f'Order {revealed} or pass?: -> ')
+            emit(MESSAGE, text='\n')
+            if order.lower() == 'order' or order.lower() == 'yes':
+                return True
+            if order.lower() == 'pass':
+                return False
+
+    def call(self, state: HandState, seat: int) -> int|None:
+        """Ask for a trump suit other than the turned card's suit, or 'pass'."""
+        turned_suit = card_suit(state.turned)
+        while True:
+            call = self._read("Enter suit ({}) for trump or pass: -> ".format(', '.join(suit for suit in SUITS)))
+            if call.lower() == 'pass':
+                return None
+            if call.capitalize() in SUITS and SUITS.index(call.capitalize()) != turned_suit:
+                return SUITS.index(call.capitalize())
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        """Ask if going alone. Only 'yes' or 'no' are accepted."""
+        while True:
+            is_alone = self._read("Are you going alone?: -> ")
+            match is_alone.lower():
+                case 'yes':
+                    return True
+                case 'no':
+                    return False
+
+    def discard(self, state: HandState, seat: int) -> int:
+        """Ask for the number of the card to discard from the hand."""
+        return self._choose(sort_hand(state.hands[seat]))
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        """Ask for the number of the legal card to play."""
+        return self._choose(sort_hand(legal))
+
+    # Private methods
+    def _choose(self, cards: list[int]) -> int:
+        """Ask for a card by its number in the list, starting at 1."""
+        while True:
+            card = self._read("Enter the number of a card you'd like to choose: -> ")
+            if card.isdigit() and 0 < int(card) <= len(cards):
+                return cards[int(card) - 1]
+
+
+class ScriptedAgent():
+    """Answers given ahead of time, one list per kind of decision, used in order.
+    Lets tests run games that would otherwise wait for a person.
+
+    remaining(): -- return the number of answers left for a kind of decision.
+    """
+
+    def __init__(self, order: Iterable[bool]=(), call: Iterable[int|None]=(), alone: Iterable[bool]=(),
+                 discard: Iterable[int]=(), play: Iterable[int]=()):
+        """Initialize the agent with the answers to give for each kind of decision.
+        Cards are card numbers of the masks module.
+        """
+        self._answers = {
+            ORDER: list(order),
+            CALL: list(call),
+            ALONE: list(alone),
+            DISCARD: list(discard),
+            PLAY: list(play),
+        }
+
+    def __repr__(self):
+        """Return the ScriptedAgent object."""
+        return f'ScriptedAgent(remaining={sum(len(answers) for answers in self._answers.values())})'
+
+    # Public methods
+    def remaining(self, kind: str) -> int:
+        """Return the number of answers left for the kind of decision."""
+        return len(self._answers[kind])
+
+    def order(self, state: HandState, seat: int) -> bool:
+        return self._next(ORDER)
+
+    def call(self, state: HandState, seat: int) -> int|None:
+        return self._next(CALL)
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        return self._next(ALONE)
+
+    def discard(self, state: HandState, seat: int) -> int:
+        return self._next(DISCARD)
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        return self._next(PLAY)
+
+    # Private methods
+    def _next(self, kind: str):
+        """Return the next answer for the kind of decision. Raises LookupError if
+        the script has run out.
+        """
+        answers = self._answers[kind]
+        if not answers:
+            raise LookupError(f'No scripted answer left for {kind}.')
+        return answers.pop(0)
+
+
+class AsyncAdapter():
+    """Makes a synchronous agent awaitable, for code that only takes AsyncAgents."""
+
+    def __init__(self, agent: Agent):
+        self._agent = agent
+
+    def __repr__(self):
+        """Return the AsyncAdapter object."""
+        return f'AsyncAdapter({self._agent!r})'
+
+    # Public methods
+    async def order(self, state: HandState, seat: int) -> bool:
+        return self._agent.order(state, seat)
+
+    async def call(self, state: HandState, seat: int) -> int|None:
+        return self._agent.call(state, seat)
+
+    async def alone(self, state: HandState, seat: int) -> bool:
+        return self._agent.alone(state, seat)
+
+    async def discard(self, state: HandState, seat: int) -> int:
+        return self._agent.discard(state, seat)
+
+    async def play(self, state: HandState, seat: int, legal: int) -> int:
+        return self._agent.play(state, seat, legal)
+
+
+async def decide_async(agent: Agent|AsyncAgent, decision: Decision):
+    """Ask a synchronous or asynchronous agent to make the decision. Returns the answer.
+
+    Keyword arguments:
+    agent: -- the agent sitting at the deciding seat.
+    decision: -- the Decision to make.
+    """
+    if decision.kind == PLAY:
+        answer = agent.play(decision.state, decision.seat, decision.options)
+    else:
+        answer = getattr(agent, decision.kind)(decision.state, decision.seat)
+    if isinstance(answer, Awaitable):
+        answer = await answer
+    return answer
@@ -0,0 +1,186 @@
+"""The batch module works out legal moves and trick winners for many hands at once.
+
+A batch of tricks is an (N, 4) integer array with the card number each seat
+played to each trick, -1 for a seat sitting out, together with the trump suit
+and the leading seat of every trick. The effective suit and rank of every card
+under every trump are looked up from the tables of the masks module with fancy
+indexing, so a batch of millions of tricks is a handful of array operations.
+The rules are the same as masks.trick_winner and cards.get_highest_rank_card.
+
+Legal moves for a batch of hands are worked out the same way from arrays of
+hand masks, led cards (-1 when leading) and trump suits, including the left
+bower following trump, and so are the highest and lowest card of a batch of
+masks. Without NumPy they are worked out with plain integer masks instead;
+the trick winners need NumPy.
+
+FOLLOW_MASKS: -- cards that follow each led card for each trump, as int masks.
+SUIT_TABLE: -- effective suit of each card for each trump, shape (4, 24).
+RANK_TABLE: -- effective rank of each card for each trump, shape (4, 24).
+FOLLOW_TABLE: -- FOLLOW_MASKS as an array, shape (4, 24).
+ORDER_TABLE: -- position of each card in masks.RANK_ORDER for each trump, shape (4, 24).
+legal_masks(): -- return the legal move mask of every hand in a batch.
+highest_cards(): -- return the highest card of every mask in a batch.
+lowest_cards(): -- return the lowest card of every mask in a batch.
+trick_winners(): -- return the winning seat of every trick in a batch.
+tricks_from_records(): -- return the batch arrays of the tricks in game records.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+if TYPE_CHECKING:
+    from euchre.records import HandRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from euchre.constants import PLAYER_COUNT, SUITS
+from euchre.masks import (
+    CARD_COUNT,
+    EFFECTIVE_RANK,
+    EFFECTIVE_SUIT,
+    RANK_ORDER,
+    TRUMP_SUIT_MASK,
+    highest_card,
+    lowest_card,
+)
+
+# Card number of a seat sitting out the trick, or of the led card when leading
+NO_CARD = -1
+
+# FOLLOW_MASKS[trump][card]: the cards that follow suit when the card is led
+FOLLOW_MASKS = tuple(
+    tuple(TRUMP_SUIT_MASK[trump][EFFECTIVE_SUIT[trump][card]] for card in range(CARD_COUNT))
+    for trump in range(len(SUITS))
+)
+
+if np is not None:
+    SUIT_TABLE = np.array(EFFECTIVE_SUIT, dtype=np.int8)
+    RANK_TABLE = np.array(EFFECTIVE_RANK, dtype=np.int8)
+    FOLLOW_TABLE = np.array(FOLLOW_MASKS, dtype=np.int32)
+    # ORDER_TABLE[trump][card]: 0 for the right bower up to 23 for the lowest card
+    ORDER_TABLE = np.array(
+        [[RANK_ORDER[trump].index(card) for card in range(CARD_COUNT)] for trump in range(len(SUITS))],
+        dtype=np.int8,
+    )
+    CARD_BITS = np.arange(CARD_COUNT, dtype=np.int32)
+
+
+def legal_masks(hands, leds, trumps, use_numpy: bool=True):
+    """Return the mask of legal cards for every hand in the batch, like
+    masks.legal_mask. Returns an array with NumPy and a list of ints without.
+
+    Keyword arguments:
+    hands: -- card mask of each hand.
+    leds: -- card number led to each trick, NO_CARD if the hand is leading.
+    trumps: -- suit index of trump for each hand.
+    use_numpy: -- False to use the integer masks even if NumPy is installed.
+    """
+    if np is None or not use_numpy:
+        return [
+            hand if led < 0 else hand & FOLLOW_MASKS[trump][led] or hand
+            for hand, led, trump in zip(hands, leds, trumps)
+        ]
+
+    hands = np.asarray(hands, dtype=np.int32)
+    leds = np.asarray(leds)
+    trumps = np.asarray(trumps)
+    follow = hands & FOLLOW_TABLE[trumps, np.where(leds >= 0, leds, 0)]
+    return np.where((leds < 0) | (follow == 0), hands, follow)
+
+
+def highest_cards(masks, trumps, use_numpy: bool=True):
+    """Return the highest ranking card of every non-empty mask in the batch, like
+    masks.highest_card. Returns an array with NumPy and a list of ints without.
+
+    Keyword arguments:
+    masks: -- card mask of each row, such as the legal cards.
+    trumps: -- suit index of trump for each row.
+    use_numpy: -- False to use the integer masks even if NumPy is installed.
+    """
+    if np is None or not use_numpy:
+        return [highest_card(mask, trump) for mask, trump in zip(masks, trumps)]
+    return _order_positions(masks, trumps, CARD_COUNT).argmin(axis=1)
+
+
+def lowest_cards(masks, trumps, use_numpy: bool=True):
+    """Return the lowest ranking card of every non-empty mask in the batch, like
+    masks.lowest_card. Returns an array with NumPy and a list of ints without.
+
+    Keyword arguments:
+    masks: -- card mask of each row, such as a hand to discard from.
+    trumps: -- suit index of trump for each row.
+    use_numpy: -- False to use the integer masks even if NumPy is installed.
+    """
+    if np is None or not use_numpy:
+        return [lowest_card(mask, trump) for mask, trump in zip(masks, trumps)]
+    return _order_positions(masks, trumps, -1).argmax(axis=1)
+
+
+def trick_winners(cards, trumps, leaders):
+    """Return the seat that won each trick as an (N,) array.
+
+    Keyword arguments:
+    cards: -- (N, 4) card numbers played by each seat, NO_CARD for a seat sitting out.
+    trumps: -- (N,) suit index of trump for each trick.
+    leaders: -- (N,) seat that led each trick.
+    """
+    _require_numpy('trick_winners')
+    cards = np.asarray(cards)
+    trumps = np.asarray(trumps)
+    leaders = np.asarray(leaders)
+    if cards.ndim != 2 or cards.shape[1] != PLAYER_COUNT:
+        raise ValueError(f'Expected an (N, {PLAYER_COUNT}) array of cards, got shape {cards.shape}.')
+    if trumps.shape != cards.shape[:1] or leaders.shape != cards.shape[:1]:
+        raise ValueError('Expected one trump and one leader for every trick.')
+
+    played = cards >= 0
+    indexes = np.where(played, cards, 0)
+    trump_rows = trumps[:, None]
+    suits = SUIT_TABLE[trump_rows, indexes]
+    ranks = RANK_TABLE[trump_rows, indexes]
+
+    led_suits = suits[np.arange(len(cards)), leaders]
+    # Cards that neither follow the led suit nor are trump cannot win
+    counts = played & ((suits == led_suits[:, None]) | (suits == trump_rows))
+    scores = np.where(counts, ranks, -1)
+    return scores.argmax(axis=1)
+
+
+def tricks_from_records(records: Iterable[HandRecord]) -> tuple:
+    """Return (cards, trumps, leaders) arrays of every trick in the records, in
+    order, for trick_winners. Hands every seat passed on have no tricks.
+    """
+    _require_numpy('tricks_from_records')
+    cards = []
+    trumps = []
+    leaders = []
+    for record in records:
+        for _, trick, _ in record.tricks():
+            row = [NO_CARD] * PLAYER_COUNT
+            for seat, card in trick:
+                row[seat] = card
+            cards.append(row)
+            trumps.append(record.trump)
+            leaders.append(trick[0][0])
+    return (
+        np.array(cards, dtype=np.int8).reshape(-1, PLAYER_COUNT),
+        np.array(trumps, dtype=np.int8),
+        np.array(leaders, dtype=np.int8),
+    )
+
+
+def _order_positions(masks, trumps, missing: int):
+    """Return the (N, 24) position in the rank order of every card in each mask,
+    and missing for the cards that are not in it.
+    """
+    masks = np.asarray(masks, dtype=np.int32)
+    trumps = np.asarray(trumps)
+    held = (masks[:, None] >> CARD_BITS) & 1
+    return np.where(held == 1, ORDER_TABLE[trumps], missing)
+
+
+def _require_numpy(name: str):
+    """Raise ImportError if NumPy is not installed."""
+    if np is None:
+        raise ImportError(f'{name} needs NumPy.')
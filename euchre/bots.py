@@ -1,16 +1,38 @@
 """Module for holding the logic for the computer bot players.
 
+The bots are Players deciding through their agent. Every bot also has a
+headless agent with the same rules, for the game engine without any Players.
 
+Bot(): -- the base Bot class, deciding with BotAgent's rules of thumb.
+BotAgent(): -- headless agent bidding and playing by rules of thumb.
+BotAdapter(): -- agent making the decisions of a Bot player.
+EVBot(): -- bot bidding like EVAgent.
+EVAgent(): -- headless agent making its first round bids from the EV table.
+PIMCBot(): -- bot playing cards like PIMCAgent.
+PIMCAgent(): -- headless agent playing cards by perfect-information Monte Carlo search.
+ISMCTSBot(): -- bot bidding and playing like ISMCTSAgent.
+ISMCTSAgent(): -- headless agent bidding and playing by information set Monte Carlo tree search.
+build_bots(): -- build a Bot for each player.
+find_bots(): -- return the players that are named as bots.
+replace_players_with_bots(): -- replace players with the bots of the same name.
 """
-# from __future__ import annotations
-# from typing import TYPE_CHECKING
-# if TYPE_CHECKING:
-#     from euchre.trumps import Trump
+from random import Random
 
-from euchre.trumps import Trump
-from euchre.cards import Card
 from euchre.players import Player
-from euchre.constants import BOTS
+from euchre.constants import BOTS, PLAYER_COUNT, SUITS
+from euchre.engine import ORDER, HandState
+from euchre.events import MESSAGE, emit
+from euchre.evtable import ALONE_BID, MIN_SAMPLES, PASS_BID, get_table as get_ev_table
+from euchre.masks import (
+    FULL_DECK,
+    card_suit,
+    highest_card,
+    lowest_card,
+)
+from euchre.ismcts import BidView, ISMCTSSearch
+from euchre.pimc import PIMCSearch, PlayView
+from euchre.profiling import timed
+from euchre.strength import get_table
 
 # The base Bot class
 class Bot(Player):
@@ -30,17 +52,36 @@ class Bot(Player):
     - when playing a card, the bot must play the best card, if he can catch the trick he will play the best card to do so
     - if bot is leading the hand, he will play the highest card in hand
 
+    Bots are Players whose agent is a BotAdapter, so they sit at the engine
+    through get_agent() like every other Player. The adapter asks the choose
+    methods below, which decide with the bot's rules: a BotAgent for the base
+    Bot and a stronger agent for the other bots.
+
     is_bot(): -- returns status if player is a bot.
-    get_player_card(): -- bot evaluates and plays a card from hand.
-    going_alone(): -- bot decideds if it will go alone in a hand.
+    choose_order(): -- order up the turned card if the hand is strong enough.
+    choose_call(): -- call the strongest suit in the second round of bidding.
+    choose_alone(): -- go alone if the hand is strong enough.
+    choose_discard(): -- discard the lowest card in hand.
+    choose_card(): -- play the highest legal card.
     """
-    def __init__(self, name: str):
+    # Estimated tricks from the strength table needed to make trump or go alone
+    ORDER_TRICKS = 2.5
+    CALL_TRICKS = 2.5
+    ALONE_TRICKS = 4.0
+
+    def __init__(self, name: str, rules: 'BotAgent'=None):
         """Initialize bot player object. Anything player related should be 
         inherited by the player object that this object is taking place of as they
         should be created first.
+
+        Keyword arguments:
+        name: -- name of the bot.
+        rules: -- agent making the bot's decisions, a BotAgent if None.
         """
         super().__init__(name)
+        self.set_agent(BotAdapter(self))
         self._is_bot = True
+        self._rules = rules if rules is not None else BotAgent()
 
     def __repr__(self):
         """Return the bot object."""
@@ -50,156 +91,358 @@ class Bot(Player):
     def is_bot(self):
         """Returns if is a bot."""
         return self._is_bot
-    
-    def get_player_status(self, *args, **kwargs):
-        print('\n')
-        print('-' * 40)
-        print(f'\tPLAYER: {self._name} \tTEAM: {self._team.get_name()}')
-        print('-' * 40)
-        print(f'{self._name} is thinking...')
-        
-    def get_player_card(self, legal_card_list: list[Card]) -> int:
-        """Bot evaluates and plays a card from hand. Returns card number to play.
-        
+
+    @timed('bot.choose_order')
+    def choose_order(self, state: HandState, seat: int) -> bool:
+        """Order up the turned card if the hand is estimated to take enough tricks."""
+        return self._rules.order(state, seat)
+
+    @timed('bot.choose_call')
+    def choose_call(self, state: HandState, seat: int) -> int|None:
+        """Call the suit the hand is estimated to take the most tricks with, None to pass."""
+        return self._rules.call(state, seat)
+
+    @timed('bot.choose_alone')
+    def choose_alone(self, state: HandState, seat: int) -> bool:
+        """Go alone if the hand is estimated to take enough tricks."""
+        return self._rules.alone(state, seat)
+
+    @timed('bot.choose_discard')
+    def choose_discard(self, state: HandState, seat: int) -> int:
+        """Discard the lowest ranking card in hand."""
+        return self._rules.discard(state, seat)
+
+    @timed('bot.choose_card')
+    def choose_card(self, state: HandState, seat: int, legal: int) -> int:
+        """Play the highest ranking legal card."""
+        return self._rules.play(state, seat, legal)
+
+
+# Headless bot for the game engine
+class BotAgent():
+    """Agent for the headless game engine using the same rules of thumb as Bot,
+    without any console output.
+
+    order(): -- order the turned card if the hand is strong enough.
+    call(): -- call the strongest suit in the second round of bidding.
+    alone(): -- go alone if the hand is strong enough.
+    discard(): -- discard the lowest card in hand.
+    play(): -- play the highest legal card.
+    """
+    def __repr__(self):
+        """Return the bot agent object."""
+        return 'BotAgent()'
+
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        """Order the turned card if the hand is estimated to take enough tricks."""
+        return get_table().tricks(state.hands[seat], card_suit(state.turned)) >= Bot.ORDER_TRICKS
+
+    def call(self, state: HandState, seat: int) -> int|None:
+        """Call the suit the hand is estimated to take the most tricks with, if enough."""
+        return _best_call(state.hands[seat], card_suit(state.turned))
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        """Go alone if the hand is estimated to take enough tricks."""
+        return get_table().tricks(state.hands[seat], state.trump) >= Bot.ALONE_TRICKS
+
+    def discard(self, state: HandState, seat: int) -> int:
+        """Discard the lowest ranking card in hand."""
+        return lowest_card(state.hands[seat], state.trump)
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        """Play the highest ranking legal card."""
+        return highest_card(legal, state.trump)
+
+
+# Agent of the Bot players
+class BotAdapter():
+    """Agent making the decisions of a Bot player with the bot's choose methods."""
+    def __init__(self, bot: Bot):
+        """Initialize the adapter for the bot it decides for."""
+        self._bot = bot
+
+    def __repr__(self):
+        """Return the bot adapter object."""
+        return f'BotAdapter({self._bot!r})'
+
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        return self._bot.choose_order(state, seat)
+
+    def call(self, state: HandState, seat: int) -> int|None:
+        return self._bot.choose_call(state, seat)
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        return self._bot.choose_alone(state, seat)
+
+    def discard(self, state: HandState, seat: int) -> int:
+        return self._bot.choose_discard(state, seat)
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        return self._bot.choose_card(state, seat, legal)
+
+
+def _best_call(hand: int, turned_suit: int) -> int|None:
+    """Return the suit other than the turned suit the hand is estimated to take the
+    most tricks with, or None if no suit reaches Bot.CALL_TRICKS.
+    """
+    table = get_table()
+    best = None
+    best_tricks = Bot.CALL_TRICKS
+    for suit in range(len(SUITS)):
+        if suit == turned_suit:
+            continue
+        tricks = table.tricks(hand, suit)
+        if tricks >= best_tricks:
+            if best is None or tricks > best_tricks:
+                best = suit
+                best_tricks = tricks
+    return best
+
+
+
+def _table_bid(hand: int, turned: int, seat: int, dealer: int) -> int|None:
+    """Return the first round choice, an index in evtable.BIDS, with the most
+    points in the EV table. None if there is no table or too few samples for the hand.
+    """
+    table = get_ev_table()
+    if table is None:
+        return None
+    values = table.lookup(hand, turned, seat, dealer)
+    if values is None or values.samples < MIN_SAMPLES:
+        return None
+    return values.best()
+
+
+# Bot that bids from the EV table
+class EVBot(Bot):
+    """Bot that decides like EVAgent: first round bids, ordering up and going
+    alone, by the choice with the most points in the EV table.
+    """
+    def __init__(self, name: str):
+        """Initialize the bot."""
+        super().__init__(name, EVAgent())
+
+    def __repr__(self):
+        """Return the bot object."""
+        return f'EV Bot player(\'{self._name}\')'
+
+
+# Headless EV table bot for the game engine
+class EVAgent(BotAgent):
+    """Agent for the headless game engine that makes its first round bids by the
+    choice with the most points in the EV table, and every other decision like BotAgent.
+
+    order(): -- order up the turned card if the table says it scores best.
+    alone(): -- go alone after ordering up if the table says it scores best.
+    """
+    def __repr__(self):
+        """Return the agent object."""
+        return 'EVAgent()'
+
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        """Order up the turned card if ordering or going alone scores the most in the table."""
+        bid = _table_bid(state.dealt[seat], state.turned, seat, state.dealer)
+        if bid is None:
+            return super().order(state, seat)
+        return bid != PASS_BID
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        """Go alone after ordering up if the table chose it, otherwise like BotAgent."""
+        if state.bids and state.bids[-1] == (seat, ORDER):
+            bid = _table_bid(state.dealt[seat], state.turned, seat, state.dealer)
+            if bid is not None:
+                return bid == ALONE_BID
+        return super().alone(state, seat)
+
+
+# Bot that searches sampled deals
+class PIMCBot(Bot):
+    """Bot that plays cards like PIMCAgent, by perfect-information Monte Carlo
+    search over deals of the cards it cannot see. Bidding is the same as Bot.
+    """
+    def __init__(self, name: str, samples: int=32, time_budget: float=0.1, rng: Random=None):
+        """Initialize the bot.
+
         Keyword arguments:
-        legal_card_list: -- List of cards able to be played this round.
+        name: -- name of the bot.
+        samples: -- most layouts to solve for one card.
+        time_budget: -- wall-clock seconds to spend choosing one card.
+        rng: -- random number generator for sampling layouts.
         """
-        if not legal_card_list:
-            return
-        
-        card = self._choose_high_card(legal_card_list)
-        return card
-    
-    def get_call(self, previous_revealed: Card) -> str:
-        """Bot decides if it wants to call a trump on second round of bidding.
+        super().__init__(name, PIMCAgent(samples, time_budget, rng))
+
+    def __repr__(self):
+        """Return the bot object."""
+        return f'PIMC Bot player(\'{self._name}\')'
+
+
+# Headless search bot for the game engine
+class PIMCAgent(BotAgent):
+    """Agent for the headless game engine that plays cards by perfect-information
+    Monte Carlo search. From what its own seat can see of the HandState, and the
+    cards played and the suits each seat has shown out of in its CardTracker, it
+    deals the cards it cannot see at random, solves each layout double-dummy and
+    plays the card that takes the most tricks overall. Bidding is the same as BotAgent.
+
+    play(): -- play the card with the most tricks over sampled layouts.
+    """
+    def __init__(self, samples: int=32, time_budget: float=0.1, rng: Random=None):
+        """Initialize the agent.
+
         Keyword arguments:
-        previous_revealed: -- card turned down for trump bidding in last round.
-        """
-        if not previous_revealed:
-            return
-        
-        trumps = ['Spades', 'Diamonds', 'Clubs', 'Hearts']
-        trump_count = {}
-        highest = 0
-
-        for card in self._cards:
-            if card.get_suit() in trump_count.keys():
-                trump_count[card.get_suit()] += 1
-            else:
-                trump_count[card.get_suit()] = 1
-
-        suit = previous_revealed.get_suit()
-        suit_to_call = None
-        
-        for trump in trumps:
-            if trump == suit or trump not in trump_count.keys():
-                continue
-            if trump_count[trump] > highest:
-                highest = trump_count[trump]
-                suit_to_call = trump
-        
-        # If we have 3 or more trumps, we will call that suit, else pass
-        # TODO adding more refined decisions if this is working, such as
-        #   strength of the trumps in hand, etc.
-        if highest >= 3:
-            print(f'{self._name} has called {suit_to_call} for trump.')
-            return suit_to_call
-        print(f'{self._name} has passed in second round.')
-        return 'pass'
-    
-    def get_order(self, revealed: Card) -> str:
-        """Evaluates and decides if to order revealed card as trump or not.
+        samples: -- most layouts to solve for one card.
+        time_budget: -- wall-clock seconds to spend choosing one card, None for no limit.
+        rng: -- random number generator for sampling layouts.
         """
-        hand_strength = self._calculate_hand_strength(revealed)
-        order_value = 75
+        self._search = PIMCSearch(samples, time_budget, rng)
+
+    def __repr__(self):
+        """Return the agent object."""
+        return f'PIMCAgent({self._search!r})'
 
-        if hand_strength >= order_value:
-            print(f'{self._name} has ordered {revealed}.')
-            return  'order'
-        print(f'{self._name} has passed.')
-        return 'pass'
+    # Public methods
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        """Play the card with the most tricks over the sampled layouts."""
+        return self._search.choose(self._view(state, seat, legal))
 
-    def going_alone(self, trump: Trump) -> bool:
-        """Check if bot wants to go alone this round.
-        """
-        # Calculate hand strength based on card values.
-        # alone value is based on 3A + both Bowers
-        hand_strength = self._calculate_hand_strength(trump)
-        alone_value = 83
-
-        if hand_strength >= alone_value:
-            self.set_alone(True)
-            partner = self._get_partner()
-            self._set_partner_skipped(partner)
-            print(f'{self._name} is going alone.')
-            return True
-        self.set_alone(False)
-        print(f'{self._name} is not going alone.')
-        return False
-
-    # private methods
-    def _choose_high_card(self, card_list: list[tuple [int, Card]]) -> int:
-        """Evaluates all the cards, and chooses the highest value card in the list. 
-        Returns integer of that card.
+    # Private methods
+    def _view(self, state: HandState, seat: int, legal: int) -> PlayView:
+        """Return what the seat can know about the hand from the HandState."""
+        if not all(state.dealt):
+            raise ValueError(f'{self!r} needs the HandState of the engine, with a hand dealt to every seat.')
+        trump = state.trump
+        tracker = state.tracker
+        played = tracker.get_played()
+        voids = tuple(tracker.get_voids(other) for other in range(PLAYER_COUNT))
+
+        hand = state.hands[seat]
+        sizes = tuple(state.hands[other].bit_count() for other in range(PLAYER_COUNT))
+        known = [0] * PLAYER_COUNT
+        unseen = FULL_DECK & ~hand & ~played
+        turned = 1 << state.turned
+        picked_up = any(action == ORDER for _, action in state.bids)
+        if not picked_up or state.dealer == state.skipped:
+            unseen &= ~turned
+        elif state.dealer == seat:
+            unseen &= ~(1 << state.kitty[0])
+        elif not played & turned:
+            known[state.dealer] = turned
+            unseen &= ~turned
+
+        leader = state.trick[0][0] if state.trick else seat
+        return PlayView(
+            seat, hand, legal, trump, leader,
+            tuple(card for _, card in state.trick), state.skipped, unseen,
+            sizes, voids, tuple(known), state.maker, tuple(state.won),
+        )
+
+
+
+# Bot that searches a tree of information sets
+class ISMCTSBot(Bot):
+    """Bot that bids and plays like ISMCTSAgent, by information set Monte Carlo
+    tree search. The search tree is kept between the tricks of a hand and
+    dropped when the round is reset.
+
+    get_search(): -- return the ISMCTSSearch, for its iteration counts and rates.
+    reset(): -- reset the round and forget the search tree.
+    """
+    def __init__(self, name: str, iterations: int=1000, time_budget: float=0.1, exploration: float=0.7,
+                 policy: str='rule', rng: Random=None):
+        """Initialize the bot.
 
         Keyword arguments:
-        card_list: -- List of cards able to be played this round.
+        name: -- name of the bot.
+        iterations: -- most search iterations for one decision.
+        time_budget: -- wall-clock seconds to spend on one decision.
+        exploration: -- UCB exploration constant.
+        policy: -- rollout policy, a name from ismcts.ROLLOUT_POLICIES.
+        rng: -- random number generator for the search.
         """
-        highest_card = card_list[0][1]
-        highest_card_index = card_list[0][0]
-        for card in card_list:
-            if card[1].get_value() > highest_card.get_value():
-                highest_card_index = card[0]
+        super().__init__(name, ISMCTSAgent(iterations, time_budget, exploration, policy, rng))
+
+    def __repr__(self):
+        """Return the bot object."""
+        return f'ISMCTS Bot player(\'{self._name}\')'
+
+    # public methods
+    def get_search(self) -> ISMCTSSearch:
+        """Return the ISMCTSSearch, for its iteration counts and rates."""
+        return self._rules.get_search()
+
+    def reset(self):
+        """Reset player attribute status and forget the search tree."""
+        super().reset()
+        self._rules.get_search().reset()
+
+
+# Headless tree search agent for the game engine
+class ISMCTSAgent(PIMCAgent):
+    """Agent for the headless game engine that bids and plays by information set
+    Monte Carlo tree search, from what its own seat can see of the HandState.
+    Discards are the same as BotAgent.
+
+    order(): -- order up the turned card if it scores best in the search.
+    call(): -- call the suit that scores best in the search, None to pass.
+    alone(): -- go alone if it scores best in the search.
+    play(): -- play the card the search visits most.
+    get_search(): -- return the ISMCTSSearch, for its iteration counts and rates.
+    """
+    def __init__(self, iterations: int=1000, time_budget: float=0.1, exploration: float=0.7,
+                 policy: str='rule', rng: Random=None):
+        """Initialize the agent.
 
-        return highest_card_index
-    
-    def _choose_low_card(self, card_list: list[tuple [int, Card]]) -> int:
-        """Evaluates and chooses the first low card in the list of cards.
-        
         Keyword arguments:
-        card_list: -- List of cards able to be chosen to discard.
+        iterations: -- most search iterations for one decision.
+        time_budget: -- wall-clock seconds to spend on one decision, None for no limit.
+        exploration: -- UCB exploration constant.
+        policy: -- rollout policy, a name from ismcts.ROLLOUT_POLICIES.
+        rng: -- random number generator for the search.
         """
-        print(f'BOT PLAYER {self._name} CHOOSING CARD TO DISCARD...')
-        lowest_card = card_list[0][1]
-        lowest_card_index = card_list[0][0]
-        for card in card_list:
-            if card[1].get_value() < lowest_card.get_value():
-                lowest_card_index = card[0]
-
-        return lowest_card_index
-    
-    def _calculate_hand_strength(self, trump):
-        """Calculates the strength on hand by adding up the values of each card in hand.
+        self._search = ISMCTSSearch(iterations, time_budget, exploration, policy, BotAgent(), rng)
 
-        The values for the cards are temporarily set to be inflated for the purposes of calculation.
-        """
-        tmp_trump = Trump(trump.get_suit())
-        # record the hand values
-        tmp_cards = {}
-        hand_strength = 0
+    def __repr__(self):
+        """Return the agent object."""
+        return f'ISMCTSAgent({self._search!r})'
 
-        for card in self._cards:
-            tmp_cards[card.get_id()] = card.get_value() 
-            card.is_trump(tmp_trump)
-            hand_strength += card.get_value()
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        """Order up the turned card if ordering scores best in the search."""
+        return self._search.order(self._bid_view(state, seat, True))
 
-        self._reset_card_values(tmp_cards)
+    def call(self, state: HandState, seat: int) -> int|None:
+        """Call the suit that scores best in the search, None to pass."""
+        turned_suit = card_suit(state.turned)
+        options = tuple(suit for suit in range(len(SUITS)) if suit != turned_suit)
+        return self._search.call(self._bid_view(state, seat, False), options)
 
-        return hand_strength
-    
-    def _reset_card_values(self, card_values):
-        """Reset the cards values."""
-        for card in self._cards:
-            id = card.get_id()
-            value = card_values[id]
-            card.reset(value)
+    def alone(self, state: HandState, seat: int) -> bool:
+        """Go alone if it scores better than playing with the partner in the search."""
+        first_round = any(action == ORDER for _, action in state.bids)
+        return self._search.alone(self._bid_view(state, seat, first_round, state.trump))
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        """Play the card the search visits most."""
+        return self._search.choose(self._view(state, seat, legal), tuple(state.tracker.get_history()))
+
+    def get_search(self) -> ISMCTSSearch:
+        """Return the ISMCTSSearch, for its iteration counts and rates."""
+        return self._search
+
+    # Private methods
+    def _bid_view(self, state: HandState, seat: int, first_round: bool, trump: int=None) -> BidView:
+        """Return what the seat can know in bidding from the HandState."""
+        return BidView(seat, state.hands[seat], state.dealer, state.turned, first_round, trump)
 
     
 # Bot player builder
 def build_bots(players: list[Player]) -> list[Bot]:
     """Create Bot player objects based on list of Player objects."""
     if not players:
-        print("WARNING: NO NAMES OF PLAYER OBJECTS TO CREATE BOTS. EXITING BUILDER.")
+        emit(MESSAGE, text="WARNING: NO NAMES OF PLAYER OBJECTS TO CREATE BOTS. EXITING BUILDER.")
         return
     
     bots = [Bot(player.get_name()) for player in players]
@@ -0,0 +1,150 @@
+"""The canonical module maps hands and deals to one representative of the deals
+that only differ by renaming suits.
+
+Renaming suits changes nothing about how a hand plays out as long as the colour
+pairs stay together, since the left bower is the Jack of the other suit of the
+same colour (Trump._find_left): Spades with Clubs and Diamonds with Hearts. The
+renamings that keep the pairs are swapping the suits within either pair and
+swapping the two pairs, eight permutations in all. Caches and tables keyed on
+the canonical form of a hand or deal need up to eight times fewer entries.
+
+A permutation is a tuple giving the new suit index of every suit in
+constants.SUITS order.
+
+PERMUTATIONS: -- the eight suit permutations that keep the colour pairs.
+permute_card(): -- rename the suit of a card number.
+permute_hand(): -- rename the suits of a hand mask.
+invert(): -- return the permutation that undoes a permutation.
+trump_permutation(): -- return the permutation that makes a trump suit Spades.
+canonical_hand(): -- return the canonical form of a hand and the permutation to it.
+canonical_deal(): -- return the canonical form of a deal with trump and the permutation to it.
+"""
+from __future__ import annotations
+
+from euchre.constants import SUITS
+from euchre.masks import LEFT_SUIT, SUIT_MASK, SUIT_SIZE
+
+IDENTITY = tuple(range(len(SUITS)))
+
+
+def _compose(first: tuple[int, ...], second: tuple[int, ...]) -> tuple[int, ...]:
+    """Return the permutation that applies first, then second."""
+    return tuple(second[first[suit]] for suit in range(len(SUITS)))
+
+
+def _build_permutations() -> tuple[tuple[int, ...], ...]:
+    """Return the permutations made from swapping within the colour pairs and
+    swapping the pairs, identity first.
+    """
+    black_swap = tuple(LEFT_SUIT[suit] if suit in (0, LEFT_SUIT[0]) else suit for suit in IDENTITY)
+    red_swap = tuple(LEFT_SUIT[suit] if suit in (1, LEFT_SUIT[1]) else suit for suit in IDENTITY)
+    # Spades <-> Diamonds and Clubs <-> Hearts
+    pair_swap = (1, 0, 3, 2)
+
+    permutations = []
+    for swap_pairs in (False, True):
+        for swap_black in (False, True):
+            for swap_red in (False, True):
+                permutation = IDENTITY
+                if swap_black:
+                    permutation = _compose(permutation, black_swap)
+                if swap_red:
+                    permutation = _compose(permutation, red_swap)
+                if swap_pairs:
+                    permutation = _compose(permutation, pair_swap)
+                permutations.append(permutation)
+    return tuple(permutations)
+
+PERMUTATIONS = _build_permutations()
+
+
+def permute_card(card: int, permutation: tuple[int, ...]) -> int:
+    """Return the card number with its suit renamed by the permutation."""
+    suit, offset = divmod(card, SUIT_SIZE)
+    return permutation[suit] * SUIT_SIZE + offset
+
+
+def permute_hand(hand: int, permutation: tuple[int, ...]) -> int:
+    """Return the hand mask with its suits renamed by the permutation."""
+    permuted = 0
+    for suit in range(len(SUITS)):
+        cards = hand & SUIT_MASK[suit]
+        if cards:
+            permuted |= cards >> (suit * SUIT_SIZE) << (permutation[suit] * SUIT_SIZE)
+    return permuted
+
+
+def invert(permutation: tuple[int, ...]) -> tuple[int, ...]:
+    """Return the permutation that renames the suits back."""
+    inverse = [0] * len(permutation)
+    for suit, new_suit in enumerate(permutation):
+        inverse[new_suit] = suit
+    return tuple(inverse)
+
+
+def _trump_permutation(trump: int) -> tuple[int, ...]:
+    """Return the permutation that renames the trump Spades, the left bower suit
+    Clubs and the other two suits Diamonds and Hearts in their SUITS order.
+    """
+    others = iter((1, LEFT_SUIT[1]))
+    permutation = []
+    for suit in range(len(SUITS)):
+        if suit == trump:
+            permutation.append(0)
+        elif suit == LEFT_SUIT[trump]:
+            permutation.append(LEFT_SUIT[0])
+        else:
+            permutation.append(next(others))
+    return tuple(permutation)
+
+# TRUMP_PERMUTATIONS[trump]: the permutation that makes the trump Spades
+TRUMP_PERMUTATIONS = tuple(_trump_permutation(trump) for trump in range(len(SUITS)))
+
+
+def trump_permutation(trump: int) -> tuple[int, ...]:
+    """Return the permutation that renames the trump suit Spades and its left
+    bower suit Clubs.
+    """
+    return TRUMP_PERMUTATIONS[trump]
+
+
+def canonical_hand(hand: int) -> tuple[int, tuple[int, ...]]:
+    """Return (canonical hand, permutation) where the canonical hand is the smallest
+    mask among the renamings of the hand and the permutation renames the hand to it.
+    Hands that are renamings of each other have the same canonical hand.
+    """
+    best = hand
+    best_permutation = IDENTITY
+    for permutation in PERMUTATIONS:
+        permuted = permute_hand(hand, permutation)
+        if permuted < best:
+            best = permuted
+            best_permutation = permutation
+    return best, best_permutation
+
+
+def canonical_deal(hands: list[int], trump: int|None=None) -> tuple[tuple[int, ...], int|None, tuple[int, ...]]:
+    """Return (canonical hands, canonical trump, permutation) for a deal.
+
+    With a trump, the trump is always renamed Spades and only the renamings that
+    keep it there are compared. The canonical deal is the one whose hands are the
+    smallest in seat order, and the permutation renames the deal to it.
+
+    Keyword arguments:
+    hands: -- card mask of each seat, the kitty can be passed as one more mask.
+    trump: -- suit index of trump, None to compare every renaming.
+    """
+    if trump is None:
+        candidates = PERMUTATIONS
+    else:
+        candidates = [permutation for permutation in PERMUTATIONS if permutation[trump] == 0]
+
+    best = None
+    best_permutation = IDENTITY
+    for permutation in candidates:
+        permuted = tuple(permute_hand(hand, permutation) for hand in hands)
+        if best is None or permuted < best:
+            best = permuted
+            best_permutation = permutation
+    canonical_trump = None if trump is None else best_permutation[trump]
+    return best, canonical_trump, best_permutation
@@ -7,8 +7,8 @@ if TYPE_CHECKING:
     from euchre.trumps import Trump
     from euchre.players import Player
 
-from colorama import just_fix_windows_console, Fore, Style
-just_fix_windows_console()
+from euchre.colors import BLUE, RED, RESET_ALL
+from euchre.profiling import timed
 
 # The base Card class
 class Card():
@@ -54,10 +54,10 @@ class Card():
     def __str__(self):
         """Return human friendly version of card."""
         if type(self._rank) == str:
-            # assign color with colorama, print text of card, reset colors
-            return f'{self._color}{self._rank[0]}{self._symbol}{Style.RESET_ALL}'
+            # assign color, print text of card, reset colors
+            return f'{self._color}{self._rank[0]}{self._symbol}{RESET_ALL}'
         else:
-            return f'{self._color}{self._rank}{self._symbol}{Style.RESET_ALL}'
+            return f'{self._color}{self._rank}{self._symbol}{RESET_ALL}'
     
     def __repr__(self):
         """Return card object."""
@@ -142,9 +142,9 @@ class Card():
         
         try:
             if suit == "Diamonds" or suit == "Hearts":
-                return Fore.RED
+                return RED
             elif suit == "Spades" or suit == "Clubs":
-                return Fore.BLUE
+                return BLUE
             else:
                 raise ValueError("Not Valid Suit Value")
         except ValueError as e:
@@ -155,6 +155,7 @@ class Card():
         return Card.SYMBOLS[suit]
     
 
+@timed('get_highest_rank_card')
 def get_highest_rank_card(cards: list[tuple[Player, Card]], trump: Trump) -> tuple[Player, Card]:
     """Return the highest ranking Card object in the card list by value. Returns as tuple (player, card).
     
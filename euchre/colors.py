@@ -0,0 +1,26 @@
+"""The colors module holds the terminal colour codes cards and players are shown with.
+
+The codes are plain ANSI escape sequences, the same strings as colorama's Fore
+and Style, so building cards and players imports nothing. Only a Windows
+console needs setting up to understand them, which setup_console() does with
+colorama the first time the TerminalSink writes.
+
+setup_console(): -- set up the console for ANSI colours, once.
+"""
+
+RED = '\x1b[31m'
+BLUE = '\x1b[34m'
+YELLOW = '\x1b[33m'
+RESET_ALL = '\x1b[0m'
+
+_console_ready = False
+
+
+def setup_console():
+    """Set up the console to show ANSI colours. Only the first call does anything."""
+    global _console_ready
+    if _console_ready:
+        return
+    _console_ready = True
+    from colorama import just_fix_windows_console
+    just_fix_windows_console()
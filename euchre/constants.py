@@ -1,14 +1,10 @@
 """
 Constants module: holds constants for the game of Euchre.
 """
-from euchre.cards import Card
 
 # Card creation constants
 VALUES = (9, 10, 11, 12, 13, 14)
 SUITS = ("Spades", "Diamonds", "Clubs", "Hearts")
-DECK = [
-    Card(value, suit) for value in VALUES for suit in SUITS
-]
 
 # General gameplay constants
 PLAYER_COUNT = 4
@@ -30,3 +26,4 @@ BOT_MAX = 3
 
 # Quality of life
 DELAY = True
+DELAY_SECONDS = 2
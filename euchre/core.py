@@ -1,135 +1,203 @@
-"""Core.py holds the core functions that run the main game loop."""
+"""Core.py holds the core functions that run the main game loop.
+
+The rules are the GameEngine's; these functions show a hand of the engine to
+the players through events and keep the Player and Team objects up to date.
+"""
 from __future__ import annotations
-import time
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from euchre.cards import Card
-    from euchre.dealers import Dealer
+    from euchre.engine import GameEngine, HandResult
     from euchre.players import Player
+    from euchre.teams import Team
     from euchre.trumps import Trump
 
+import euchre.scores as _scores
 import euchre.trumps as _trumps
-from euchre.constants import DELAY
-
-
-def bidding_round(players: list[Player], dealer: Dealer, revealed: Card=None, first_round=True) -> Trump|None:
-    """Start bidding round for trump card for this round. If revealed is None,
-    Players can choose trump from their hand. Returns Trump object.
+from euchre.constants import PLAYER_COUNT, SUITS
+from euchre.engine import ALONE, CALL, DISCARD, ORDER, PLAY, HandState, decide, play_trick
+from euchre.events import (
+    ALONE as ALONE_EVENT,
+    BID,
+    CARD_PLAYED,
+    DEAL,
+    DISCARDED,
+    DISCARDING,
+    MESSAGE,
+    NEXT_DEALER,
+    PASSED_OUT,
+    PAUSE,
+    PICKUP,
+    TURNED_DOWN,
+    emit,
+)
+from euchre.masks import from_card, hand_from_cards, sort_hand, to_card
+from euchre.profiling import timed
+
+
+@timed('play_hand')
+def play_hand(engine: GameEngine, players: list[Player], teams: list[Team],
+              deal: tuple[list[int], list[int]]=None) -> HandResult:
+    """Deal and play one hand of the engine, showing every step. The players'
+    agents answer the engine's decisions, the players keep the tricks they won
+    and the winning team is given the points. Returns the HandResult.
 
     Keyword arguments:
-    players: -- list of players in this round of bidding.
-    revealed: -- the revealed card to start the Trump bidding.
-    previous: -- the same as revealed, except cannot be chosen as Trump this round.
+    engine: -- the game engine, playing the agents of the players.
+    players: -- list of players in seating order, the same order as the engine's agents.
+    teams: -- the teams to show and score.
+    deal: -- (hands, kitty) to play instead of shuffling, as for GameEngine.hand_steps().
     """
-    if first_round:
-        for player in players:
+    agents = engine.get_agents()
+    steps = engine.hand_steps(deal)
+    decision = next(steps)
+    state = decision.state
+    revealed = to_card(state.turned)
+    emit(DEAL, dealer=players[state.dealer], revealed=revealed)
+    delay()
+
+    trump = None
+    turned_down = False
+    result = None
+    while result is None:
+        kind = decision.kind
+        player = players[decision.seat]
+
+        if kind == ORDER or kind == CALL:
+            if kind == CALL and not turned_down:
+                delay()
+                emit(TURNED_DOWN, dealer=players[state.dealer], revealed=revealed)
+                turned_down = True
+            delay()
+            player.get_player_status(_numbered(state.hands[decision.seat]), bidding=True)
+        elif kind == DISCARD:
             delay()
-            if not player.is_bot():
-                player.get_player_status()
-            order = player.get_order(revealed)
-            if order == 'order' or order == 'yes':
-                trump = _trumps.Trump(revealed.get_suit(), player.get_team())
-                if player.is_bot():
-                    player.going_alone(trump)
-                else:
-                    player.going_alone()
+            emit(PICKUP, dealer=player, card=revealed)
+            emit(DISCARDING, dealer=player)
+            player.get_player_status(_numbered(decision.options))
+        elif kind == PLAY:
+            if trump is None:
+                trump = _trumps.Trump(SUITS[state.trump], players[state.maker].get_team())
+                trump.print_trump()
                 delay()
-                dealer.pickup_and_discard(revealed)
-                return trump
-            elif order == 'pass':
-                continue
-            else:
-                print('ERROR - NOT VALID OPTION.')
+                trump.print_makers()
+                space_break()
+            delay()
+            player.get_player_status(_numbered(decision.options), trump)
+
+        answer = decide(agents[decision.seat], decision)
+        asked = decision
+        trick = state.trick
+        tricks = len(state.tricks)
+        try:
+            decision = steps.send(answer)
+        except StopIteration as stop:
+            result = stop.value
+
+        if kind == ORDER:
+            emit(BID, player=player, revealed=revealed, call='order' if answer else 'pass', first_round=True)
+        elif kind == CALL:
+            call = SUITS[answer] if answer in asked.options else 'pass'
+            emit(BID, player=player, revealed=revealed, call=call, first_round=False)
+        elif kind == ALONE:
+            emit(ALONE_EVENT, player=player, alone=bool(answer))
+        elif kind == DISCARD:
+            emit(DISCARDED, dealer=player)
+        elif kind == PLAY:
+            cards_played = tuple((players[seat], to_card(card)) for seat, card in trick)
+            emit(CARD_PLAYED, player=player, card=cards_played[-1][1], trick=cards_played)
+            if len(state.tricks) > tricks:
+                _score_trick(state.tricks[-1], players, teams)
+
+    if result.trump is None:
+        delay()
+        emit(PASSED_OUT)
     else:
-        if not first_round:
-            print('\n')
-            print(f'The dealer {dealer} turned the {revealed} face-down. Starting second round of bidding...')
-            print('\n')
-
-            for player in players:
-                delay()
-                if not player.is_bot():
-                    player.get_player_status()
-                call = player.get_call(revealed)
-                if call == 'pass':
-                    continue
-                if call:
-                    trump = _trumps.Trump(call, player.get_team())
-                    if player.is_bot():
-                        player.going_alone(trump)
-                    else:
-                        player.going_alone()
-                    return trump
-        else:
-            print("ERROR - NO PREVIOUS CARD REFERENCED.")
-    return None
+        # seat % 2 is the team of the seat, the same as the seating of the teams
+        players[result.winner].get_team().set_score(result.points)
+        _scores.print_scores(teams)
+    return result
 
 
 def play_cards(players: list[Player], trump: Trump) -> list[tuple[Player, Card]]:
-    """Each player plays a card from their hand. Returns tuple list of (player, card played).
-    
+    """Each player plays a card from their hand to one trick, by the rules of the
+    engine's play_trick. The players' agents choose the cards and the cards are
+    removed from the players' hands. Returns tuple list of (player, card played).
+
     Keyword arguments:
-    players: -- list of players.
+    players: -- list of players in playing order, the first one leads.
     trump: -- trump for current round.
     """
-    cards_played = []
-    card_to_match = None
-    for player in players:
-        # check if player gets skipped because partner alone this round
+    hands = [hand_from_cards(player.get_cards()) for player in players]
+    # The last player deals, so the first one leads
+    state = HandState(len(players) - 1, hands, [None])
+    state.trump = SUITS.index(trump.get_suit())
+    state.tracker.reset(state.trump)
+    for seat, player in enumerate(players):
         if player.get_skipped():
-            continue
+            state.skipped = seat
+
+    cards_played = []
+    steps = play_trick(state, state.leader)
+    decision = next(steps)
+    while decision is not None:
+        player = players[decision.seat]
         delay()
-        # If a card has been played, we need to filter cards that are legal and
-        # is matching the first card's suit in the list
-        if len(cards_played) >= 1:
-            card_to_match = cards_played[0][1]
-            # Filter list of cards in player hand that is legal to play
-            # If filtered list returns empty, any card in hand is legal to play
-            legal_cards = player.list_cards(player.filter_cards(card_to_match, trump))
-            if len(legal_cards) == 0:
-                legal_cards = player.list_cards()
-        else:
-            legal_cards = player.list_cards()
-        player.get_player_status(legal_cards, trump)            
-
-        # Subtract 1 from player choice to index properly
-        card = (player.get_player_card(legal_cards) - 1)
-
-        # Get the card from the tuple of the enumerated list
-        card_to_play = legal_cards[card][1]
-        player.remove_card(card_to_play)
-        cards_played.append((player, card_to_play))
-
-        print(f'{player.get_name()} played {card_to_play}.')
-        space_break()
-        space_break()
-        print('All cards played:')
-        for card in cards_played:
-            print(f'\t{card[0]} played {card[1]}')
-        
+        player.get_player_status(_numbered(decision.options), trump)
+        answer = decide(player.get_agent(), decision)
+        try:
+            decision = steps.send(answer)
+        except StopIteration:
+            decision = None
+
+        card = next(card for card in player.get_cards() if from_card(card) == answer)
+        player.remove_card(card)
+        cards_played.append((player, card))
+        emit(CARD_PLAYED, player=player, card=card, trick=tuple(cards_played))
     return cards_played
 
 
-def reset_round(players: list[Player], dealer: Dealer):
-    """Reset Player counters for next round of play.
-    
+def reset_round(players: list[Player], engine: GameEngine):
+    """Reset Player counters for next round of play and pass the deal on.
+
     Keyword arguments:
-    players: -- list of players to reset.
+    players: -- list of players to reset, in seating order.
+    engine: -- the game engine, which has already moved the deal to the next dealer.
     """
     for player in players:
         player.reset()
 
-    dealer.next_dealer() 
+    emit(NEXT_DEALER, dealer=players[engine.get_dealer()])
 
 
 def delay():
-    """Delay the time between display updates."""
-    # Check if we should use time delay on display updates
-    if DELAY:
-        time.sleep(2)
-    else:
-        pass
+    """Delay the time between display updates, if the event sink paces its output."""
+    emit(PAUSE)
 
 def space_break():
-    print('\n')
+    emit(MESSAGE, text='\n')
+
 
+def _numbered(hand: int) -> list[tuple[int, Card]]:
+    """Return the cards of a hand mask numbered from 1 in display order, the
+    numbers TerminalAgent asks for.
+    """
+    return list(enumerate((to_card(card) for card in sort_hand(hand)), 1))
+
+
+def _score_trick(trick: tuple[int, list[tuple[int, int]], int], players: list[Player], teams: list[Team]):
+    """Give the finished trick to the player who won it and show the trick scores.
+
+    Keyword arguments:
+    trick: -- (leader, [(seat, card), ...], winner) of the trick, as in HandState.tricks.
+    players: -- list of players in seating order.
+    teams: -- the teams to show the trick scores for.
+    """
+    leader, cards, winner = trick
+    delay()
+    card = next(card for seat, card in cards if seat == winner)
+    won = (players[winner], to_card(card))
+    _scores.score_trick(won)
+    _scores.print_trick_winner(won)
+    _scores.print_tricks([players[(leader + offset) % PLAYER_COUNT] for offset in range(PLAYER_COUNT)], teams)
+    delay()
@@ -7,23 +7,39 @@ if TYPE_CHECKING:
     from euchre.players import Player
 
 from collections import deque
-from random import sample
+import random
 
 from euchre.cards import Card
-from euchre.constants import SUITS, VALUES
+from euchre.dealing import THREE_TWO, Deck
+from euchre.events import DEAL, DISCARDED, DISCARDING, NEXT_DEALER, PICKUP, emit
+from euchre.masks import CARD_COUNT, card_value, to_card
+from euchre.trumps import Trump
 
 class Dealer():
     """
     Keeps track of player positions for dealing cards and playing cards each round.
 
     get_player_order(): Returns player order.
+    get_dealer(): Returns the dealer Player for the round.
     deal_cards(): Deal 5 Cards to each player in player order.
     next_dealer(): Get the next Player object in player order and assign as dealer.
     pickup_and_discard(card): Pick up the Card and choose a card to discard.
     set_leader(player): set the leader player for the round.
     """
 
-    def __init__(self, player_list: list[Player]):
+    def __init__(self, player_list: list[Player], rng: random.Random=None,
+                 pattern: tuple[tuple[int, ...], ...]=THREE_TWO):
+        """Initialize the dealer with the players in seating order.
+
+        Keyword arguments:
+        player_list: -- the players in seating order, the first one deals first.
+        rng: -- random number generator for shuffling, the random module if None.
+        pattern: -- cards each player gets in each round of the deal.
+        """
+        # One Card object per card number, dealt again every hand
+        self._deck = Deck(rng if rng is not None else random, pattern)
+        self._cards = [to_card(card) for card in range(CARD_COUNT)]
+        self._values = [card_value(card) for card in range(CARD_COUNT)]
         self._dealer_list = deque(player_list)
         self._player_order = deque(self._dealer_list)
         self._dealer_player = self._player_order[0]
@@ -45,41 +61,32 @@ class Dealer():
         """Return player order."""
         return self._player_order
 
+    def get_dealer(self) -> Player:
+        """Return the dealer Player for the round."""
+        return self._dealer_player
+
     def deal_cards(self) -> Card:
         """Shuffle the deck and deal cards to players in two rounds. Returns the top 
         card left in the remaining deck of cards.
-
-        Keyword arguments:
-        players: -- list of players for whom the cards are dealt.
-        deck: -- list of cards to deal.
         """
-        deck = self._deck()
-
-        print('\n')
-        print(f'{self._dealer_player} is dealing cards...')
-        shuffled = sample(deck, len(deck))
-        rounds = 0
-        cards_to_deal = 3
-        
-        while rounds < 2:
-            for player in self._player_order:
-                cards_dealt = shuffled[0:cards_to_deal]
-                
-                for card in cards_dealt:
-                    shuffled.remove(card)
-                    player.receive_card(card)
-                        
-            rounds += 1
-            cards_to_deal -= 1
-
-        revealed = shuffled[0]
-        print(f'Revealed card to bid for trump: {revealed}')
-        print('\n')
+        cards = self._cards
+        # Trump rankings from the last hand are taken off the cards
+        for card, value in zip(cards, self._values):
+            card.reset(value)
+
+        deck = self._deck
+        deck.shuffle()
+        players = self._player_order
+        for position, card in zip(deck.get_positions(), deck.get_cards()):
+            players[position].receive_card(cards[card])
+
+        revealed = cards[deck.turned()]
+        emit(DEAL, dealer=self._dealer_player, revealed=revealed)
         return revealed
          
     def next_dealer(self):
         """Pass to the next dealer in player order."""
-        print(f'Passing dealer...')
+        emit(NEXT_DEALER, dealer=self._next_dealer)
         # Get this dealer and find the next dealer then set the round of players.
         self._dealer_player = self._next_dealer
         this_dealer = self._dealer_list.popleft()
@@ -95,7 +102,7 @@ class Dealer():
         card: -- Card object the Dealer is to pick up.
         """
         self._pickup_card(card)
-        self._discard_card()
+        self._discard_card(Trump(card.get_suit()))
 
     def set_leader(self, leader: Player):
         """Get the leader player and make sure they are first in the order of play.
@@ -110,24 +117,27 @@ class Dealer():
     def _pickup_card(self, card: Card):
         """Dealer player picks up top card if player has ordered Trump."""
         self._dealer_player.receive_card(card)
-        print('\n')
-        print(f'{self._dealer_player} picked up {card}.')
+        emit(PICKUP, dealer=self._dealer_player, card=card)
+
+    def _discard_card(self, trump: Trump):
+        """Dealer discards Card they do not want.
 
-    def _discard_card(self):
-        """Dealer discards Card they do not want."""
+        Keyword arguments:
+        trump: -- the trump made by picking up the card.
+        """
         dealer = self._dealer_player
 
-        print(f'{dealer}, please discard a card:')
+        emit(DISCARDING, dealer=dealer)
 
         player_cards = dealer.list_cards()
         dealer.get_player_status(player_cards)            
 
         # Subtract 1 from player choice to index properly
-        discard = (dealer.get_player_card(player_cards) - 1)
+        discard = (dealer.get_player_card(player_cards, trump) - 1)
         # Get the card from the tuple of the enumerated list
         card_to_discard = player_cards[discard][1]
 
-        print(f'{dealer.get_name()} has discarded a card from hand.')
+        emit(DISCARDED, dealer=dealer)
         dealer.remove_card(card_to_discard)
 
     def _get_next_dealer(self) -> Player:
@@ -144,10 +154,3 @@ class Dealer():
         while self._player_order[-1] != self._dealer_player:
             self._get_new_order()
 
-    def _deck(self):
-        """Create a new deck to have clean setup of cards."""
-        deck = [
-            Card(value, suit) for value in VALUES for suit in SUITS
-        ]
-
-        return deck
@@ -0,0 +1,111 @@
+"""The dealing module shuffles and deals one reusable deck of card numbers.
+
+The deck is a single list of the card numbers of the masks module, shuffled in
+place with Fisher-Yates (Random.shuffle) from an injectable random number
+generator, so dealing allocates nothing per card and seeded games repeat
+exactly. Where each card of the shuffled deck goes is worked out once per
+dealing pattern, so a deal is one pass over the deck with no list removals.
+Hands can be dealt straight into card masks, or to the Card objects of the
+Dealer class.
+
+A pattern gives the cards each player gets in each round of the deal, players
+in order starting left of the dealer.
+
+THREE_TWO: -- 3 cards to every player, then 2 to every player.
+ALTERNATING: -- 3-2-3-2 in the first round and 2-3-2-3 in the second.
+deal_positions(): -- return the player each card of the deck is dealt to.
+Deck(): -- one deck of card numbers, shuffled in place and dealt by pattern.
+"""
+from __future__ import annotations
+from functools import cache
+from random import Random
+
+from euchre.constants import MAX_CARD_HAND_LIMIT, PLAYER_COUNT
+from euchre.masks import CARD_COUNT
+
+THREE_TWO = ((3, 3, 3, 3), (2, 2, 2, 2))
+ALTERNATING = ((3, 2, 3, 2), (2, 3, 2, 3))
+
+# Cards dealt to the players, the rest is the kitty with the turned card on top
+DEALT = PLAYER_COUNT * MAX_CARD_HAND_LIMIT
+
+
+@cache
+def deal_positions(pattern: tuple[tuple[int, ...], ...]=THREE_TWO) -> tuple[int, ...]:
+    """Return the player each card of the shuffled deck is dealt to, as the
+    position in playing order starting left of the dealer. Raises ValueError if
+    the pattern does not deal a full hand to every player.
+    """
+    positions = []
+    for cards_per_player in pattern:
+        for player, cards in enumerate(cards_per_player):
+            positions.extend([player] * cards)
+    for player in range(PLAYER_COUNT):
+        if positions.count(player) != MAX_CARD_HAND_LIMIT:
+            raise ValueError(f'Pattern {pattern} does not deal {MAX_CARD_HAND_LIMIT} cards to every player.')
+    return tuple(positions)
+
+
+class Deck():
+    """One deck of card numbers, shuffled in place and dealt by a pattern.
+    The order of the deck carries over from one shuffle to the next, like a
+    real deck, so a seeded generator deals the same games every time.
+
+    shuffle(): -- shuffle the deck in place.
+    get_cards(): -- return the deck in its current order.
+    get_positions(): -- return the player each card of the deck is dealt to.
+    deal_masks(): -- deal the shuffled deck into card masks.
+    turned(): -- return the card turned up for bidding.
+    kitty(): -- return the cards left after the deal.
+    """
+
+    def __init__(self, rng: Random=None, pattern: tuple[tuple[int, ...], ...]=THREE_TWO):
+        """Initialize the deck in card number order.
+
+        Keyword arguments:
+        rng: -- random number generator for shuffling. Seed it for reproducible deals.
+        pattern: -- cards each player gets in each round of the deal.
+        """
+        self._rng = rng if rng is not None else Random()
+        self._cards = list(range(CARD_COUNT))
+        self._positions = deal_positions(pattern)
+
+    def __repr__(self):
+        """Return the Deck object."""
+        return f'Deck(turned={self.turned()})'
+
+    # Public methods
+    def shuffle(self):
+        """Shuffle the deck in place."""
+        self._rng.shuffle(self._cards)
+
+    def get_cards(self) -> list[int]:
+        """Return the deck in its current order. The list is the deck itself and
+        changes with every shuffle.
+        """
+        return self._cards
+
+    def get_positions(self) -> tuple[int, ...]:
+        """Return the player each card of the deck is dealt to, in playing order
+        starting left of the dealer.
+        """
+        return self._positions
+
+    def deal_masks(self, dealer: int) -> list[int]:
+        """Deal the deck as it is into a card mask for each seat.
+
+        Keyword arguments:
+        dealer: -- seat of the dealer, the seat to their left gets the first cards.
+        """
+        hands = [0] * PLAYER_COUNT
+        for position, card in zip(self._positions, self._cards):
+            hands[(dealer + 1 + position) % PLAYER_COUNT] |= 1 << card
+        return hands
+
+    def turned(self) -> int:
+        """Return the card turned up for bidding, the top card after the deal."""
+        return self._cards[DEALT]
+
+    def kitty(self) -> list[int]:
+        """Return a new list of the cards left after the deal, turned card first."""
+        return self._cards[DEALT:]
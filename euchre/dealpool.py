@@ -0,0 +1,363 @@
+"""The dealpool module deals once into shared memory for worker processes and
+compares two agents on duplicate deals.
+
+A DealPool is a ring buffer of packed deals in a multiprocessing.shared_memory
+block: the dealer seat, the card mask of every hand and the kitty, turned card
+first. The parent process fills a window of deals, the workers attach to the
+block by name and read the deals they were given in place, without shuffling
+or pickling any cards, and the next window overwrites the slots once every
+worker is done with them. Deal number n always comes from the same seeded
+shuffle, so the results for a seed do not depend on the pool's capacity or the
+number of workers.
+
+Every deal is played twice as a single hand, the second time with the agents
+swapping seats, so each agent holds the cards the other held. The luck of the
+deal largely cancels in the sum of the two margins, which narrows the interval
+on the difference between two agents compared with the same number of
+independent hands; variance_reduction() reports by how much.
+
+    python -m euchre.dealpool --deals 20000 --workers 4 --seed 1 ev bot
+
+DEAL: -- the packed layout of one deal.
+DealPool(): -- ring buffer of deals in shared memory.
+PairedStats(): -- mergeable margins of duplicate deals.
+pool_deal(): -- return the deal of a deal number.
+play_pairs(): -- play a range of duplicate deals from a pool in this process.
+run_paired(): -- play duplicate deals across worker processes and merge the results.
+main(): -- command line entry point.
+"""
+from __future__ import annotations
+
+import math
+import struct
+from multiprocessing import shared_memory
+
+from euchre.constants import PLAYER_COUNT, TEAM_COUNT
+from euchre.dealing import Deck
+from euchre.engine import GameEngine, HandResult
+from euchre.stats import RunningStats
+from euchre.tournament import AGENTS, Z_95, game_rng, run_shards, split_range, worker_pool
+
+# One deal: the dealer, the card mask of every seat, then the kitty, turned card first
+DEAL = struct.Struct('<B4I4B')
+# Pool header: the capacity in deals and the number of the first deal in the window
+HEADER = struct.Struct('<II')
+
+DEFAULT_CAPACITY = 4096
+
+
+class DealPool():
+    """A ring buffer of deals in shared memory. Deal number n is kept in slot
+    n % capacity, for the window of deals from the last fill.
+
+    fill(): -- deal a window of deals into the pool.
+    get_deal(): -- return the dealer, hands and kitty of a deal in the window.
+    get_window(): -- return the range of deal numbers in the pool.
+    get_name(): -- return the name of the shared memory block.
+    get_capacity(): -- return the number of deals the pool holds.
+    close(): -- detach from the shared memory.
+    unlink(): -- free the shared memory, once every process has closed it.
+    """
+
+    def __init__(self, capacity: int=DEFAULT_CAPACITY, name: str=None):
+        """Create a pool, or attach to the pool of another process.
+
+        Keyword arguments:
+        capacity: -- number of deals the pool holds, for a new pool.
+        name: -- name of an existing pool to attach to, None to create one.
+        """
+        if name is None:
+            if capacity < 1:
+                raise ValueError(f'A deal pool needs room for at least one deal, not {capacity}.')
+            self._memory = shared_memory.SharedMemory(create=True, size=HEADER.size + capacity * DEAL.size)
+            HEADER.pack_into(self._memory.buf, 0, capacity, 0)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self._capacity = HEADER.unpack_from(self._memory.buf, 0)[0]
+
+    def __repr__(self):
+        """Return the DealPool object."""
+        return f'DealPool(capacity={self._capacity}, window={self.get_window()})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Public methods
+    def fill(self, seed: int, start: int, stop: int=None):
+        """Deal deals start to stop into the pool, overwriting the last window.
+        No process may be reading the pool while it is filled.
+
+        Keyword arguments:
+        seed: -- the seed of the deals.
+        start: -- number of the first deal.
+        stop: -- number of the deal to stop before, at most a capacity after start.
+        """
+        if stop is None:
+            stop = start + self._capacity
+        if not 0 <= stop - start <= self._capacity:
+            raise ValueError(f'Cannot fill deals {start} to {stop} into a pool of {self._capacity}.')
+        buffer = self._memory.buf
+        capacity = self._capacity
+        for number in range(start, stop):
+            dealer, hands, kitty = pool_deal(seed, number)
+            DEAL.pack_into(buffer, HEADER.size + number % capacity * DEAL.size, dealer, *hands, *kitty)
+        HEADER.pack_into(buffer, 0, capacity, start)
+
+    def get_deal(self, number: int) -> tuple[int, list[int], list[int]]:
+        """Return (dealer, hands, kitty) of a deal in the window. Raises ValueError
+        if the deal is not in the pool.
+        """
+        start = HEADER.unpack_from(self._memory.buf, 0)[1]
+        if not start <= number < start + self._capacity:
+            raise ValueError(f'Deal {number} is not in the pool, it holds deals from {start}.')
+        values = DEAL.unpack_from(self._memory.buf, HEADER.size + number % self._capacity * DEAL.size)
+        return values[0], list(values[1:5]), list(values[5:])
+
+    def get_window(self) -> tuple[int, int]:
+        """Return the numbers of the first deal in the pool and the deal a capacity after it."""
+        start = HEADER.unpack_from(self._memory.buf, 0)[1]
+        return (start, start + self._capacity)
+
+    def get_name(self) -> str:
+        """Return the name of the shared memory block, for workers to attach to."""
+        return self._memory.name
+
+    def get_capacity(self) -> int:
+        """Return the number of deals the pool holds."""
+        return self._capacity
+
+    def close(self):
+        """Detach this process from the shared memory."""
+        self._memory.close()
+
+    def unlink(self):
+        """Free the shared memory. Only the process that created the pool should."""
+        self._memory.unlink()
+
+
+class PairedStats():
+    """Margins of the first agent over the second on duplicate deals, in points
+    per hand. The counters are integer sums, so merging the results of workers
+    is exact and independent of the order they arrive in.
+
+    add_pair(): -- add the two hands played on one deal.
+    merge(): -- add the counters of another PairedStats.
+    mean(): -- return the average margin per hand.
+    interval(): -- return the 95% interval of the average margin per hand.
+    unpaired_interval(): -- return the interval if the hands had been independent.
+    variance_reduction(): -- return how many times fewer deals pairing needs.
+    summary(): -- return a dictionary of the results.
+    """
+
+    def __init__(self):
+        # margin of every hand, and the sum of the two margins of every deal
+        self.hands = RunningStats()
+        self.pairs = RunningStats()
+        # hands each agent made trump on
+        self.made = [0] * TEAM_COUNT
+
+    def __repr__(self):
+        """Return the PairedStats object."""
+        return f'PairedStats(deals={self.pairs.get_count()})'
+
+    def __eq__(self, other):
+        return (self.hands, self.pairs, self.made) == (other.hands, other.pairs, other.made)
+
+    # Public methods
+    def add_pair(self, first: HandResult, second: HandResult):
+        """Add the hands played on one deal: the first with the first agent on
+        team 0, the second with the agents swapped.
+        """
+        margins = (_margin(first, 0), _margin(second, 1))
+        for margin in margins:
+            self.hands.add(margin)
+        self.pairs.add(margins[0] + margins[1])
+        for result, team in ((first, 0), (second, 1)):
+            if result.maker is not None:
+                self.made[(result.maker + team) % TEAM_COUNT] += 1
+
+    def merge(self, other: PairedStats):
+        """Add the counters of another PairedStats to this one."""
+        self.hands.merge(other.hands)
+        self.pairs.merge(other.pairs)
+        for agent, count in enumerate(other.made):
+            self.made[agent] += count
+
+    def mean(self) -> float:
+        """Return the average margin per hand of the first agent over the second."""
+        return self.hands.mean()
+
+    def interval(self) -> tuple[float, float]:
+        """Return the 95% interval of the average margin per hand, from the spread
+        of the deal sums.
+        """
+        deals = self.pairs.get_count()
+        if deals < 2:
+            return (0.0, 0.0)
+        mean = self.pairs.mean() / 2
+        spread = Z_95 * math.sqrt(self.pairs.variance() / 4 / deals)
+        return (mean - spread, mean + spread)
+
+    def unpaired_interval(self) -> tuple[float, float]:
+        """Return the 95% interval of the average margin per hand as if the hands
+        had been dealt independently.
+        """
+        count = self.hands.get_count()
+        if count < 2:
+            return (0.0, 0.0)
+        mean = self.hands.mean()
+        spread = Z_95 * math.sqrt(self.hands.variance() / count)
+        return (mean - spread, mean + spread)
+
+    def variance_reduction(self) -> float:
+        """Return the variance of the mean margin from independent hands over its
+        variance from the same number of hands on duplicate deals.
+        """
+        if self.pairs.get_count() < 2:
+            return 1.0
+        paired = self.pairs.variance() / 2
+        if not paired:
+            return math.inf
+        return self.hands.variance() / paired
+
+    def summary(self, agents: list[str]=None) -> dict:
+        """Return a dictionary of the results.
+
+        Keyword arguments:
+        agents: -- names of the first and second agent.
+        """
+        return {
+            'agents': agents,
+            'deals': self.pairs.get_count(),
+            'hands': self.hands.get_count(),
+            'made': list(self.made),
+            'margin_per_hand': self.mean(),
+            'margin_interval': self.interval(),
+            'unpaired_interval': self.unpaired_interval(),
+            'variance_reduction': self.variance_reduction(),
+        }
+
+
+def pool_deal(seed: int, number: int) -> tuple[int, list[int], list[int]]:
+    """Return (dealer, hands, kitty) of a deal: the dealer seat, the card mask of
+    every seat and the kitty, turned card first. The dealer turns with the deal number.
+
+    Keyword arguments:
+    seed: -- the seed of the deals.
+    number: -- the number of the deal.
+    """
+    deck = Deck(game_rng(seed, number, 'pool'))
+    deck.shuffle()
+    dealer = number % PLAYER_COUNT
+    return dealer, deck.deal_masks(dealer), deck.kitty()
+
+
+def play_pairs(agents: list[str], seed: int, name: str, start: int, stop: int) -> PairedStats:
+    """Play deals start to stop from a pool twice each, the second time with the
+    agents swapping seats. Returns the PairedStats.
+
+    Keyword arguments:
+    agents: -- the first and second agent name.
+    seed: -- the seed of the deals and the agents' random streams.
+    name: -- the name of the DealPool holding the deals.
+    start: -- number of the first deal to play.
+    stop: -- number of the deal to stop before.
+    """
+    stats = PairedStats()
+    with DealPool(name=name) as pool:
+        for number in range(start, stop):
+            dealer, hands, kitty = pool.get_deal(number)
+            results = []
+            for swap in (0, 1):
+                seats = [
+                    AGENTS[agents[(seat + swap) % TEAM_COUNT]](game_rng(seed, number, f'seat{seat}:{swap}'))
+                    for seat in range(PLAYER_COUNT)
+                ]
+                engine = GameEngine(seats, dealer=dealer)
+                results.append(engine.play_hand((hands, kitty)))
+            stats.add_pair(*results)
+    return stats
+
+
+def run_paired(agents: list[str], deals: int, seed: int=0, workers: int=1,
+               capacity: int=DEFAULT_CAPACITY) -> PairedStats:
+    """Deal the deals into a pool a window at a time and play every window
+    across worker processes. Returns the merged PairedStats.
+
+    Keyword arguments:
+    agents: -- the first and second agent name.
+    deals: -- number of deals to play, each twice.
+    seed: -- the seed of the deals and the agents' random streams.
+    workers: -- number of worker processes, 1 plays in this process.
+    capacity: -- number of deals in the pool at once.
+    """
+    if len(agents) != TEAM_COUNT:
+        raise ValueError(f'Expected {TEAM_COUNT} agents, got {len(agents)}.')
+    for agent in agents:
+        if agent not in AGENTS:
+            raise ValueError(f'Unknown agent {agent!r}. Choose from {", ".join(AGENTS)}.')
+
+    stats = PairedStats()
+    deal_pool = DealPool(min(capacity, deals) or 1)
+    name = deal_pool.get_name()
+    try:
+        with worker_pool(workers) as pool:
+            for start in range(0, deals, deal_pool.get_capacity()):
+                stop = min(start + deal_pool.get_capacity(), deals)
+                deal_pool.fill(seed, start, stop)
+                # Every worker finishes with the window before the next fill overwrites it
+                shards = [(agents, seed, name, low, high) for low, high in split_range(start, stop, workers)]
+                for result in run_shards(play_pairs, shards, pool):
+                    stats.merge(result)
+    finally:
+        deal_pool.close()
+        deal_pool.unlink()
+    return stats
+
+
+def main(argv: list[str]=None):
+    """Compare two agents on duplicate deals from the command line and print the results."""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog='python -m euchre.dealpool', description=__doc__.splitlines()[0])
+    parser.add_argument('agents', nargs='*', default=['bot', 'bot'],
+                        help=f'the two agents to compare, from {", ".join(AGENTS)} (default: bot bot)')
+    parser.add_argument('--deals', type=int, default=1000, help='number of deals, each played twice')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the deals')
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY, help='deals in the pool at once')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        stats = run_paired(args.agents, args.deals, args.seed, args.workers, args.capacity)
+    except ValueError as e:
+        parser.error(str(e))
+    summary = stats.summary(args.agents)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    first, second = args.agents
+    low, high = summary['margin_interval']
+    unpaired_low, unpaired_high = summary['unpaired_interval']
+    print(f'Deals: {summary["deals"]}  Hands: {summary["hands"]}  '
+          f'Made: {first} {summary["made"][0]}, {second} {summary["made"][1]}')
+    print(f'Points margin per hand ({first} - {second}): {summary["margin_per_hand"]:.3f} [{low:.3f}, {high:.3f}]')
+    print(f'Unpaired interval: [{unpaired_low:.3f}, {unpaired_high:.3f}], '
+          f'variance reduction {summary["variance_reduction"]:.1f}x')
+
+
+def _margin(result: HandResult, team: int) -> int:
+    """Return the points the team scored on the hand, less the points of the other team."""
+    if result.winner is None:
+        return 0
+    return result.points if result.winner == team else -result.points
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""The engine module runs games of Euchre without any console input, output or delays.
+
+The engine is a set of state transitions (deal, bid, play a trick, score) driven
+by pluggable agents. Every choice is handed out as a Decision; the engine never
+prompts or prints, so the interactive CLI is just one front end over the same rules.
+Cards, hands and suits use the integer encoding of the masks module.
+
+Decision(): -- a choice the engine needs an agent to make.
+HandState(): -- the state of the hand currently being played.
+HandResult(): -- the outcome of a single hand.
+GameResult(): -- the outcome of a full game.
+GameEngine(): -- headless game loop driven by pluggable agents.
+play_trick(): -- play one trick of a hand, yielding a Decision for every card.
+decide(): -- ask an agent to make a decision.
+"""
+from __future__ import annotations
+from typing import Generator, NamedTuple
+from random import Random
+
+from euchre.constants import (
+    MAX_CARD_HAND_LIMIT,
+    PLAYER_COUNT,
+    POINTS_TO_WIN,
+    SUITS,
+)
+from euchre.dealing import Deck
+from euchre.masks import card_suit, legal_mask, trick_winner
+from euchre.profiling import timed, timed_steps
+from euchre.scores import round_points
+from euchre.tracker import CardTracker
+
+# Decision kinds, named after the agent method that answers them
+ORDER = 'order'
+CALL = 'call'
+ALONE = 'alone'
+DISCARD = 'discard'
+PLAY = 'play'
+
+
+class Decision(NamedTuple):
+    """A choice the engine needs an agent to make.
+
+    kind: -- one of 'order', 'call', 'alone', 'discard' or 'play'.
+    seat: -- the seat (0-3) that has to decide.
+    state: -- the HandState the decision is made in.
+    options: -- the legal answers: a card mask for 'discard' and 'play',
+        a tuple of suit indexes for 'call'.
+    """
+    kind: str
+    seat: int
+    state: HandState
+    options: tuple = ()
+
+
+class HandResult(NamedTuple):
+    """The outcome of a single hand. trump is None if every seat passed."""
+    dealer: int
+    trump: int|None
+    maker: int|None
+    alone: bool
+    tricks: tuple[int, int]
+    winner: int|None
+    points: int
+
+
+class GameResult(NamedTuple):
+    """The outcome of a full game."""
+    winner: int
+    scores: tuple[int, int]
+    hands: list[HandResult]
+
+
+class HandState():
+    """The state of the hand currently being played. Seats are numbered 0-3 in
+    playing order and seat % 2 is the team of the seat. Hands are card masks,
+    cards are card numbers and trump is a suit index. The CardTracker in tracker
+    answers what has been played so far without going back over the tricks.
+
+    Agents receive the whole state, so they are trusted to only look at their own hand.
+    """
+    __slots__ = (
+        'dealer', 'hands', 'dealt', 'turned', 'kitty', 'discard', 'trump', 'maker',
+        'alone', 'skipped', 'bids', 'leader', 'trick', 'tricks', 'won', 'tracker',
+    )
+
+    def __init__(self, dealer: int, hands: list[int], kitty: list[int]):
+        self.dealer = dealer
+        self.hands = hands
+        # the hands as they were dealt, before any pickup or play
+        self.dealt = tuple(hands)
+        self.kitty = kitty
+        self.turned = kitty[0]
+        # card the dealer discarded after picking up, None if nobody picked up
+        self.discard = None
+        self.trump = None
+        self.maker = None
+        self.alone = False
+        self.skipped = None
+        # (seat, action) for every bid, where action is 'order', 'pass' or the suit index called
+        self.bids = []
+        self.leader = (dealer + 1) % PLAYER_COUNT
+        # (seat, card) for each card of the trick being played
+        self.trick = []
+        # (leader, [(seat, card), ...], winner) for each finished trick
+        self.tricks = []
+        self.won = [0, 0]
+        # cards played, voids shown and cards left in each suit, updated card by card
+        self.tracker = CardTracker()
+
+    def __repr__(self):
+        """Return the HandState object."""
+        return f'HandState(dealer={self.dealer}, trump={self.trump!r}, maker={self.maker})'
+
+    # Public methods
+    def seats_to_play(self, leader: int) -> list[int]:
+        """Return the seats in playing order starting from the leader, without the skipped seat."""
+        seats = []
+        for offset in range(PLAYER_COUNT):
+            seat = (leader + offset) % PLAYER_COUNT
+            if seat != self.skipped:
+                seats.append(seat)
+        return seats
+
+    def legal_cards(self, seat: int) -> int:
+        """Return the mask of cards the seat is allowed to play to the current trick."""
+        led = self.trick[0][1] if self.trick else None
+        return legal_mask(self.hands[seat], led, self.trump)
+
+
+class GameEngine():
+    """Headless game loop driven by pluggable agents.
+
+    An agent is any object with the methods below. Each receives the HandState
+    and the seat deciding:
+        order(state, seat) -> bool: order up the turned card in the first round of bidding.
+        call(state, seat) -> int|None: name a trump suit index in the second round, None to pass.
+        alone(state, seat) -> bool: go alone after making trump.
+        discard(state, seat) -> int: card the dealer discards after picking up.
+        play(state, seat, legal) -> int: card to play from the legal card mask.
+    The agents module has the Agent protocol and the agents for people and scripts.
+
+    play_game(): -- play a full game and return the GameResult.
+    play_hand(): -- deal and play one hand and return the HandResult.
+    hand_steps(): -- generator over the Decisions of one hand, returns the HandResult.
+    game_steps(): -- generator over the Decisions of a full game, returns the GameResult.
+    get_scores(): -- return the score of each team.
+    get_dealer(): -- return the seat of the current dealer.
+    get_agents(): -- return the agent of every seat.
+    """
+
+    def __init__(self, agents: list, rng: Random=None, dealer: int=0, points_to_win: int=POINTS_TO_WIN,
+                 recorder=None, scores: tuple[int, int]=(0, 0)):
+        """Initialize the engine with one agent per seat.
+
+        Keyword arguments:
+        agents: -- the agent playing each seat, in seating order.
+        rng: -- random number generator for shuffling. Seed it for reproducible games.
+        dealer: -- seat of the first dealer.
+        points_to_win: -- points a team needs to win the game.
+        recorder: -- object with a record(state, result) method called after every
+            hand, like records.RecordWriter. None to keep no record.
+        scores: -- score of each team to start from, to pick a game up part way.
+        """
+        if len(agents) != PLAYER_COUNT:
+            raise ValueError(f'Expected {PLAYER_COUNT} agents, got {len(agents)}.')
+        self._agents = list(agents)
+        self._rng = rng if rng is not None else Random()
+        self._dealer = dealer
+        self._points_to_win = points_to_win
+        self._recorder = recorder
+        self._scores = list(scores)
+        self._deck = Deck(self._rng)
+
+    def __repr__(self):
+        """Return the GameEngine object."""
+        return f'GameEngine(dealer={self._dealer}, scores={tuple(self._scores)})'
+
+    # Public methods
+    def get_scores(self) -> tuple[int, int]:
+        """Return the score of each team."""
+        return tuple(self._scores)
+
+    def get_dealer(self) -> int:
+        """Return the seat of the current dealer."""
+        return self._dealer
+
+    def get_agents(self) -> list:
+        """Return the agent playing each seat."""
+        return self._agents
+
+    def play_game(self) -> GameResult:
+        """Play hands until a team reaches the winning score. Returns the GameResult."""
+        hands = []
+        while max(self._scores) < self._points_to_win:
+            hands.append(self.play_hand())
+
+        winner = 0 if self._scores[0] >= self._points_to_win else 1
+        return GameResult(winner, tuple(self._scores), hands)
+
+    def play_hand(self, deal: tuple[list[int], list[int]]=None) -> HandResult:
+        """Deal and play one hand, asking the agents for every decision. Returns the HandResult.
+
+        Keyword arguments:
+        deal: -- (hands, kitty) to play instead of shuffling, as for hand_steps().
+        """
+        agents = self._agents
+        steps = self.hand_steps(deal)
+        try:
+            decision = next(steps)
+            while True:
+                decision = steps.send(decide(agents[decision.seat], decision))
+        except StopIteration as stop:
+            return stop.value
+
+    def hand_steps(self, deal: tuple[list[int], list[int]]=None) -> Generator[Decision, object, HandResult]:
+        """Deal and play one hand, yielding a Decision whenever an agent has to choose.
+        The answer is sent back into the generator. Returns the HandResult.
+
+        The dealer passes to the next seat once the hand is over, even if every seat passed.
+
+        Keyword arguments:
+        deal: -- (hands, kitty) to play instead of shuffling: the card mask of every
+            seat and the four kitty cards, the turned card first. Used to replay deals.
+        """
+        state = self._deal() if deal is None else HandState(self._dealer, list(deal[0]), list(deal[1]))
+        dealer = self._dealer
+        self._dealer = (dealer + 1) % PLAYER_COUNT
+
+        made = yield from self._bid(state)
+        if made:
+            leader = state.leader
+            for _ in range(MAX_CARD_HAND_LIMIT):
+                leader = yield from play_trick(state, leader)
+            result = self._score(state)
+        else:
+            result = HandResult(dealer, None, None, False, (0, 0), None, 0)
+
+        if self._recorder is not None:
+            self._recorder.record(state, result)
+        return result
+
+    def game_steps(self) -> Generator[Decision, object, GameResult]:
+        """Play hands until a team reaches the winning score, yielding a Decision
+        whenever an agent has to choose like hand_steps. Returns the GameResult.
+        """
+        hands = []
+        while max(self._scores) < self._points_to_win:
+            hands.append((yield from self.hand_steps()))
+
+        winner = 0 if self._scores[0] >= self._points_to_win else 1
+        return GameResult(winner, tuple(self._scores), hands)
+
+    # Private methods
+    def _deal(self) -> HandState:
+        """Shuffle the deck and deal 3 then 2 cards to each seat starting left of the dealer."""
+        deck = self._deck
+        deck.shuffle()
+        return HandState(self._dealer, deck.deal_masks(self._dealer), deck.kitty())
+
+    @timed_steps('bidding_round')
+    def _bid(self, state: HandState):
+        """Run both rounds of bidding. Returns True if a trump was made."""
+        turned_suit = card_suit(state.turned)
+        seats = state.seats_to_play(state.leader)
+
+        for seat in seats:
+            order = yield Decision(ORDER, seat, state)
+            state.bids.append((seat, ORDER if order else 'pass'))
+            if order:
+                self._make_trump(state, turned_suit, seat)
+                yield from self._going_alone(state, seat)
+                yield from self._pickup(state)
+                return True
+
+        options = tuple(suit for suit in range(len(SUITS)) if suit != turned_suit)
+        for seat in seats:
+            call = yield Decision(CALL, seat, state, options)
+            if call not in options:
+                state.bids.append((seat, 'pass'))
+                continue
+            state.bids.append((seat, call))
+            self._make_trump(state, call, seat)
+            yield from self._going_alone(state, seat)
+            return True
+
+        return False
+
+    def _make_trump(self, state: HandState, suit: int, seat: int):
+        """Record the trump suit and the seat that made it."""
+        state.trump = suit
+        state.maker = seat
+        state.tracker.reset(suit)
+
+    def _going_alone(self, state: HandState, seat: int):
+        """Ask the maker if they are going alone. Their partner sits out the hand."""
+        alone = yield Decision(ALONE, seat, state)
+        if alone:
+            partner = (seat + 2) % PLAYER_COUNT
+            state.alone = True
+            state.skipped = partner
+            state.hands[partner] = 0
+
+    def _pickup(self, state: HandState):
+        """The dealer picks up the turned card and discards a card of their choice."""
+        dealer = state.dealer
+        if dealer == state.skipped:
+            return
+
+        hand = state.hands[dealer] | 1 << state.turned
+        state.hands[dealer] = hand
+        discard = yield Decision(DISCARD, dealer, state, hand)
+        if not _in_mask(hand, discard):
+            raise ValueError(f'Seat {dealer} cannot discard card {discard!r}.')
+        state.hands[dealer] = hand ^ 1 << discard
+        state.kitty[0] = discard
+        state.discard = discard
+
+    @timed('score_round')
+    def _score(self, state: HandState) -> HandResult:
+        """Score the hand with the same rules as scores.score_round."""
+        makers = state.maker % 2
+        alone = makers if state.alone else None
+        result = round_points(state.won, makers, alone)
+
+        winner = None
+        points = 0
+        if result:
+            winner, points = result
+            self._scores[winner] += points
+
+        return HandResult(
+            state.dealer, state.trump, state.maker, state.alone,
+            tuple(state.won), winner, points,
+        )
+
+
+@timed_steps('play_cards')
+def play_trick(state: HandState, leader: int) -> Generator[Decision, int, int]:
+    """Play one trick of the hand starting with the leader, yielding a PLAY Decision
+    for every card like GameEngine.hand_steps. Returns the seat that won the trick.
+
+    Keyword arguments:
+    state: -- the HandState with trump made, updated card by card.
+    leader: -- the seat leading the trick.
+    """
+    trick = state.trick = []
+    hands = state.hands
+    trump = state.trump
+    tracker = state.tracker
+    tracker.start_trick()
+    cards = []
+
+    for seat in state.seats_to_play(leader):
+        legal = legal_mask(hands[seat], cards[0] if cards else None, trump)
+        card = yield Decision(PLAY, seat, state, legal)
+        if not _in_mask(legal, card):
+            raise ValueError(f'Seat {seat} cannot play card {card!r}.')
+        hands[seat] ^= 1 << card
+        tracker.play(seat, card)
+        trick.append((seat, card))
+        cards.append(card)
+
+    winner = _winner(trick, cards, trump)
+    state.won[winner % 2] += 1
+    state.tricks.append((leader, state.trick, winner))
+    return winner
+
+
+def decide(agent, decision: Decision):
+    """Ask the agent to make the decision. Returns the agent's answer.
+
+    Keyword arguments:
+    agent: -- the agent sitting at the deciding seat.
+    decision: -- the Decision to make.
+    """
+    if decision.kind == PLAY:
+        return agent.play(decision.state, decision.seat, decision.options)
+    return getattr(agent, decision.kind)(decision.state, decision.seat)
+
+
+@timed('get_highest_rank_card')
+def _winner(trick: list[tuple[int, int]], cards: list[int], trump: int) -> int:
+    """Return the seat that played the winning card of the finished trick."""
+    return trick[trick_winner(cards, trump)][0]
+
+
+def _in_mask(mask: int, card: object) -> bool:
+    """Return True if the answer is a card number in the mask. Answers that are
+    not card numbers, such as None from a scripted or remote agent, are not.
+    """
+    return isinstance(card, int) and 0 <= card and mask >> card & 1 == 1
@@ -0,0 +1,413 @@
+"""The events module carries everything the game displays as structured events.
+
+Display code emits an Event describing what happened, such as a deal, a bid or
+a trick won, instead of printing it. The current sink decides what becomes of
+the events: the TerminalSink renders them to the terminal as they come,
+pausing where the game pauses; the BufferedSink renders them into a buffer
+written out in large batches; the NullSink drops them before they are even
+built, so simulations pay nothing for display. Events hold the game objects
+themselves, so a sink keeping them should render or copy what it needs right away.
+
+Event(): -- something that happened in the game, with the objects involved.
+render(): -- return the lines the terminal shows for an event.
+EventSink(): -- the base class for sinks.
+NullSink(): -- drops every event.
+TerminalSink(): -- renders events to the terminal, with optional pacing.
+BufferedSink(): -- renders events into a buffer written out in batches.
+ProfilingSink(): -- passes events on to another sink, timing its output.
+get_sink(): -- return the current sink.
+set_sink(): -- set the current sink.
+use_sink(): -- context manager using a sink for a block of code.
+emit(): -- send an event to the current sink.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, NamedTuple, TextIO
+if TYPE_CHECKING:
+    from euchre.profiling import Profiler
+
+import contextlib
+import sys
+import time
+from abc import ABC, abstractmethod
+
+from euchre.colors import setup_console
+from euchre.constants import DELAY, DELAY_SECONDS
+
+# Event kinds
+TITLE = 'title'
+TEAMS = 'teams'
+DEAL = 'deal'
+STATUS = 'status'
+BID = 'bid'
+TURNED_DOWN = 'turned_down'
+ALONE = 'alone'
+PICKUP = 'pickup'
+DISCARDING = 'discarding'
+DISCARDED = 'discarded'
+PASSED_OUT = 'passed_out'
+TRUMP = 'trump'
+MAKERS = 'makers'
+CARD_PLAYED = 'card_played'
+TRICK_WON = 'trick_won'
+TRICKS = 'tricks'
+SCORE = 'score'
+NEXT_DEALER = 'next_dealer'
+GAME_WON = 'game_won'
+MESSAGE = 'message'
+PAUSE = 'pause'
+
+RULE = '-' * 40
+
+
+class Event(NamedTuple):
+    """Something that happened in the game.
+
+    kind: -- one of the event kinds of this module.
+    data: -- the objects involved, by name.
+    """
+    kind: str
+    data: dict
+
+
+def _title(data: dict) -> list[str]:
+    return [RULE, '\t\tEUCHRE', RULE, 'Welcome to the classic card game of Euchre!', '\n']
+
+
+def _teams(data: dict) -> list[str]:
+    return ['\n', 'Assigning teams...', *(str(team) for team in data['teams'])]
+
+
+def _deal(data: dict) -> list[str]:
+    return [
+        '\n', f'{data["dealer"]} is dealing cards...',
+        f'Revealed card to bid for trump: {data["revealed"]}', '\n',
+    ]
+
+
+def _status(data: dict) -> list[str]:
+    player = data['player']
+    lines = ['\n', RULE, f'\tPLAYER: {player.get_name()} \tTEAM: {player.get_team().get_name()}', RULE]
+    if player.is_bot():
+        # A bot only shows it is thinking over its cards, its bids are announced instead
+        if data['bidding']:
+            return []
+        lines.append(f'{player.get_name()} is thinking...')
+        return lines
+    if data['trump']:
+        lines.append(f'CARDS IN HAND: \t\tTRUMP: {data["trump"].get_suit()}')
+    else:
+        lines.append('CARDS IN HAND: ')
+    lines.extend(f'\t{number}. {card}' for number, card in data['cards'])
+    lines.append(RULE)
+    return lines
+
+
+def _bid(data: dict) -> list[str]:
+    player = data['player']
+    # People see what they typed, only the bots' bids are announced
+    if not player.is_bot():
+        return []
+    name = player.get_name()
+    if data['first_round']:
+        if data['call'] == 'pass':
+            return [f'{name} has passed.']
+        return [f'{name} has ordered {data["revealed"]}.']
+    if data['call'] == 'pass':
+        return [f'{name} has passed in second round.']
+    return [f'{name} has called {data["call"]} for trump.']
+
+
+def _turned_down(data: dict) -> list[str]:
+    return [
+        '\n',
+        f'The dealer {data["dealer"]} turned the {data["revealed"]} face-down. Starting second round of bidding...',
+        '\n',
+    ]
+
+
+def _alone(data: dict) -> list[str]:
+    if data['alone']:
+        return [f'{data["player"].get_name()} is going alone.']
+    return [f'{data["player"].get_name()} is not going alone.']
+
+
+def _pickup(data: dict) -> list[str]:
+    return ['\n', f'{data["dealer"]} picked up {data["card"]}.']
+
+
+def _discarding(data: dict) -> list[str]:
+    return [f'{data["dealer"]}, please discard a card:']
+
+
+def _discarded(data: dict) -> list[str]:
+    return [f'{data["dealer"].get_name()} has discarded a card from hand.']
+
+
+def _passed_out(data: dict) -> list[str]:
+    return ['\n', 'Second round of dealing passed.', '\n']
+
+
+def _trump(data: dict) -> list[str]:
+    return ['\n', RULE, f'\tCURRENT TRUMP IS: {data["trump"].get_suit()}', RULE]
+
+
+def _makers(data: dict) -> list[str]:
+    return [f'Ordered by {data["makers"]}.']
+
+
+def _card_played(data: dict) -> list[str]:
+    lines = [f'{data["player"].get_name()} played {data["card"]}.', '\n', '\n', 'All cards played:']
+    lines.extend(f'\t{player} played {card}' for player, card in data['trick'])
+    return lines
+
+
+def _trick_won(data: dict) -> list[str]:
+    return ['\n', f'{data["player"]} won a trick for Team {data["team"].get_name()} with the {data["card"]}!']
+
+
+def _tricks(data: dict) -> list[str]:
+    lines = ['\n', RULE, '\t\tTRICK SCORES: ', RULE]
+    lines.extend(f'{name}: {tricks}' for name, tricks in data['players'])
+    lines.append('\n')
+    lines.extend(f'Team {name}: {tricks}' for name, tricks in data['teams'])
+    return lines
+
+
+def _score(data: dict) -> list[str]:
+    lines = ['\n', RULE, '\t\tROUND SCORES: ', RULE]
+    lines.extend(f'{team}: {score}' for team, score in data['scores'])
+    lines.append('\n')
+    return lines
+
+
+def _next_dealer(data: dict) -> list[str]:
+    return ['Passing dealer...']
+
+
+def _game_won(data: dict) -> list[str]:
+    team = data['team']
+    players = team.get_players()
+    return [f'Team {team.get_name()} HAS WON THE GAME! CONGRATULATIONS {players[0]} and {players[1]}!']
+
+
+def _message(data: dict) -> list[str]:
+    return [data['text']]
+
+
+def _pause(data: dict) -> list[str]:
+    return []
+
+RENDERERS: dict[str, Callable[[dict], list[str]]] = {
+    TITLE: _title,
+    TEAMS: _teams,
+    DEAL: _deal,
+    STATUS: _status,
+    BID: _bid,
+    TURNED_DOWN: _turned_down,
+    ALONE: _alone,
+    PICKUP: _pickup,
+    DISCARDING: _discarding,
+    DISCARDED: _discarded,
+    PASSED_OUT: _passed_out,
+    TRUMP: _trump,
+    MAKERS: _makers,
+    CARD_PLAYED: _card_played,
+    TRICK_WON: _trick_won,
+    TRICKS: _tricks,
+    SCORE: _score,
+    NEXT_DEALER: _next_dealer,
+    GAME_WON: _game_won,
+    MESSAGE: _message,
+    PAUSE: _pause,
+}
+
+
+def render(event: Event) -> list[str]:
+    """Return the lines the terminal shows for the event, each printed on its own."""
+    return RENDERERS[event.kind](event.data)
+
+
+class EventSink(ABC):
+    """The base class for sinks. A sink that is not active is never sent events.
+    A sink without an emit() method cannot be created.
+
+    emit(): -- handle an event.
+    flush(): -- write out anything held back.
+    close(): -- flush and stop taking events.
+    """
+    active = True
+
+    @abstractmethod
+    def emit(self, event: Event):
+        """Handle the event."""
+
+    def flush(self):
+        """Write out anything held back."""
+        pass
+
+    def close(self):
+        """Flush and stop taking events."""
+        self.flush()
+
+
+class NullSink(EventSink):
+    """Drops every event, for games nobody is watching."""
+    active = False
+
+    def __repr__(self):
+        """Return the NullSink object."""
+        return 'NullSink()'
+
+    def emit(self, event: Event):
+        """Drop the event."""
+        pass
+
+
+class TerminalSink(EventSink):
+    """Renders every event to the terminal as it happens, the way the game has always looked."""
+
+    def __init__(self, pacing: float=0, stream: TextIO=None):
+        """Initialize the sink.
+
+        Keyword arguments:
+        pacing: -- seconds to wait at each pause, 0 to never wait.
+        stream: -- where to write, sys.stdout at the time of writing if None.
+        """
+        self._pacing = pacing
+        self._stream = stream
+
+    def __repr__(self):
+        """Return the TerminalSink object."""
+        return f'TerminalSink(pacing={self._pacing})'
+
+    def emit(self, event: Event):
+        """Write the lines of the event, or wait if it is a pause."""
+        setup_console()
+        stream = self._stream or sys.stdout
+        if event.kind == PAUSE:
+            if self._pacing:
+                stream.flush()
+                time.sleep(self._pacing)
+            return
+        lines = render(event)
+        if lines:
+            stream.write('\n'.join(lines) + '\n')
+
+    def flush(self):
+        """Flush the stream."""
+        (self._stream or sys.stdout).flush()
+
+
+class BufferedSink(EventSink):
+    """Renders events into a buffer and writes it out in batches, without pauses."""
+
+    def __init__(self, stream: TextIO=None, buffer_size: int=1 << 16):
+        """Initialize the sink.
+
+        Keyword arguments:
+        stream: -- where to write, sys.stdout at the time of writing if None.
+        buffer_size: -- characters to hold before writing them out.
+        """
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._size = 0
+
+    def __repr__(self):
+        """Return the BufferedSink object."""
+        return f'BufferedSink(buffered={self._size})'
+
+    def emit(self, event: Event):
+        """Add the lines of the event to the buffer, writing it out once it is full."""
+        lines = render(event)
+        if not lines:
+            return
+        text = '\n'.join(lines) + '\n'
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write out the buffer."""
+        if self._buffer:
+            stream = self._stream or sys.stdout
+            stream.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._size = 0
+
+
+class ProfilingSink(EventSink):
+    """Passes events on to another sink and records how long it takes in a
+    profiling.Profiler, as the 'output' phase. Pauses between display updates
+    are the 'pause' phase, so the pacing of the game is not counted as output.
+    """
+    OUTPUT = 'output'
+    PAUSE = 'pause'
+
+    def __init__(self, sink: EventSink, profiler: Profiler):
+        """Initialize the sink.
+
+        Keyword arguments:
+        sink: -- the sink that shows the events.
+        profiler: -- the Profiler to record the time in.
+        """
+        self._sink = sink
+        self._profiler = profiler
+        self.active = sink.active
+
+    def __repr__(self):
+        """Return the ProfilingSink object."""
+        return f'ProfilingSink({self._sink!r})'
+
+    def emit(self, event: Event):
+        """Pass the event on to the wrapped sink, timing it."""
+        start = time.perf_counter_ns()
+        self._sink.emit(event)
+        phase = self.PAUSE if event.kind == PAUSE else self.OUTPUT
+        self._profiler.record(phase, time.perf_counter_ns() - start)
+
+    def flush(self):
+        """Flush the wrapped sink."""
+        self._sink.flush()
+
+
+_sink = TerminalSink(DELAY_SECONDS if DELAY else 0)
+
+
+def get_sink() -> EventSink:
+    """Return the current sink."""
+    return _sink
+
+
+def set_sink(sink: EventSink) -> EventSink:
+    """Set the current sink. Returns the sink it replaces."""
+    global _sink
+    previous = _sink
+    _sink = sink
+    return previous
+
+
+@contextlib.contextmanager
+def use_sink(sink: EventSink):
+    """Send events to the sink for the block of code, then flush it and put the
+    previous sink back.
+    """
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        set_sink(previous)
+
+
+def emit(kind: str, **data):
+    """Send an event to the current sink.
+
+    Keyword arguments:
+    kind: -- one of the event kinds of this module.
+    data: -- the objects involved, by name.
+    """
+    sink = _sink
+    if sink.active:
+        sink.emit(Event(kind, data))
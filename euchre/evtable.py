@@ -0,0 +1,410 @@
+"""The evtable module estimates the points of the first round bids by simulation
+and keeps them in a compressed table the bots look up.
+
+A seat bidding in the first round can pass, order the turned card up, or
+order it up and go alone. For every choice the table holds the average
+points the seat's team scores, from simulated hands where every seat before
+it passed and every later decision is made by BotAgent. Hands are keyed by
+what the choice depends on: the seat relative to the dealer, the rank of the
+turned card and the strength.StrengthTable record of the hand with the turned
+suit as trump. The strength record is already relative to trump, so every
+hand with the same metrics shares one entry: 4 seats x 6 turned cards x 476
+records. The file is zlib compressed and is read on first use.
+
+    python -m euchre.evtable --deals 200000
+
+rebuilds the table file, and
+
+    python -m euchre.evtable --check 2000
+
+compares the table's bids on new deals with the strength thresholds of Bot and
+with the best choice for every single deal.
+
+BidValues(): -- average points of each first round choice for one key.
+bid_key(): -- return the table key of a hand about to bid.
+simulate_bid(): -- return the points a choice scores on one deal.
+EVCounts(): -- the point totals of every choice for every key.
+simulate_deals(): -- return the EVCounts of a range of simulated deals.
+EVTable(): -- the average points of every key, read from a table file.
+build_table(): -- return the bytes of the table file.
+write_table(): -- simulate deals and write the table file.
+load_table(): -- read a table file.
+get_table(): -- return the shared table, loading it on first use.
+check_table(): -- compare the table's bids with Bot's thresholds on new deals.
+"""
+from __future__ import annotations
+from typing import NamedTuple
+
+import os
+import struct
+import zlib
+from random import Random
+
+from euchre.constants import PLAYER_COUNT
+from euchre.engine import ALONE, ORDER, Decision, GameEngine, decide
+from euchre.masks import SUIT_SIZE, card_suit
+from euchre.strength import get_table as get_strength_table
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ev.bin')
+TABLE_MAGIC = b'EUEV'
+TABLE_VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+# Average points of pass, order and alone in hundredths, and the sample count
+RECORD = struct.Struct('<hhhH')
+STRENGTH = struct.Struct('<H')
+
+# The first round choices, by index in the table
+PASS_BID = 0
+ORDER_BID = 1
+ALONE_BID = 2
+BIDS = ('pass', 'order', 'alone')
+
+# Points are kept in hundredths of a point
+POINT_UNITS = 100
+MAX_SAMPLES = (1 << 16) - 1
+# Entries with fewer samples than this are left to the bots' own rules
+MIN_SAMPLES = 30
+
+
+class BidValues(NamedTuple):
+    """Average points for the bidder's team of each first round choice.
+
+    passing: -- points when the seat passes.
+    order: -- points when the seat orders the turned card up.
+    alone: -- points when the seat orders it up and goes alone.
+    samples: -- number of simulated deals the averages are over.
+    """
+    passing: float
+    order: float
+    alone: float
+    samples: int
+
+    def best(self) -> int:
+        """Return the index in BIDS of the choice with the most points, passing on ties."""
+        values = (self.passing, self.order, self.alone)
+        return max(range(len(BIDS)), key=lambda bid: (values[bid], -bid))
+
+
+def bid_key(hand: int, turned: int, seat: int, dealer: int) -> tuple[int, int, int]:
+    """Return the table key of a hand about to bid in the first round:
+    (seat relative to the dealer, turned card rank, strength record).
+
+    Keyword arguments:
+    hand: -- card mask of the seat's hand.
+    turned: -- card turned up for bidding.
+    seat: -- the bidding seat.
+    dealer: -- seat of the dealer.
+    """
+    record = get_strength_table().get_record(hand, card_suit(turned))
+    return ((seat - dealer) % PLAYER_COUNT, turned % SUIT_SIZE, record)
+
+
+def simulate_bid(seed: str|int, dealer: int, seat: int, bid: int, agents: list=None) -> int:
+    """Play one deal where every seat before the seat passes and the seat makes
+    the bid. Returns the points of the seat's team, negative when the other team
+    scored.
+
+    Keyword arguments:
+    seed: -- seed of the deal.
+    dealer: -- seat of the dealer.
+    seat: -- the bidding seat.
+    bid: -- index in BIDS of the seat's choice.
+    agents: -- the agents making every other decision, BotAgents if None.
+    """
+    if agents is None:
+        # Imported here, the bots module reads this module's table
+        from euchre.bots import BotAgent
+        agents = [BotAgent()] * PLAYER_COUNT
+    engine = GameEngine(agents, Random(seed), dealer=dealer)
+    steps = engine.hand_steps()
+    try:
+        decision = next(steps)
+        while True:
+            if decision.kind == ORDER:
+                answer = _first_round(decision, seat, bid, agents)
+            elif decision.kind == ALONE and decision.state.bids[-1] == (seat, ORDER):
+                answer = bid == ALONE_BID
+            else:
+                answer = decide(agents[decision.seat], decision)
+            decision = steps.send(answer)
+    except StopIteration as stop:
+        result = stop.value
+    if result.winner is None:
+        return 0
+    return result.points if result.winner == seat % 2 else -result.points
+
+
+class EVCounts():
+    """Point totals of every first round choice for every table key. The totals
+    are integers, so counts from worker processes merge exactly.
+
+    add(): -- add the points of every choice on one deal.
+    merge(): -- add the totals of another EVCounts.
+    get_values(): -- return the BidValues of a key.
+    get_keys(): -- return every key with samples.
+    """
+
+    def __init__(self):
+        """Initialize the counts with no deals."""
+        # key: [samples, points when passing, ordering, going alone]
+        self._totals = {}
+
+    def __repr__(self):
+        """Return the EVCounts object."""
+        return f'EVCounts(keys={len(self._totals)})'
+
+    def __len__(self):
+        """Return the number of keys with samples."""
+        return len(self._totals)
+
+    def __eq__(self, other):
+        return isinstance(other, EVCounts) and self._totals == other._totals
+
+    # Public methods
+    def add(self, key: tuple[int, int, int], points: tuple[int, int, int]):
+        """Add the points of every choice, in BIDS order, on one deal."""
+        totals = self._totals.get(key)
+        if totals is None:
+            totals = self._totals[key] = [0] * (len(BIDS) + 1)
+        totals[0] += 1
+        for bid, value in enumerate(points, 1):
+            totals[bid] += value
+
+    def merge(self, other: EVCounts):
+        """Add the totals of another EVCounts to this one."""
+        for key, counts in other._totals.items():
+            totals = self._totals.get(key)
+            if totals is None:
+                self._totals[key] = list(counts)
+                continue
+            for index, count in enumerate(counts):
+                totals[index] += count
+
+    def get_values(self, key: tuple[int, int, int]) -> BidValues|None:
+        """Return the average points of each choice for the key, None without samples."""
+        totals = self._totals.get(key)
+        if totals is None:
+            return None
+        samples = totals[0]
+        return BidValues(*(total / samples for total in totals[1:]), samples)
+
+    def get_keys(self) -> list[tuple[int, int, int]]:
+        """Return every key with samples, in order."""
+        return sorted(self._totals)
+
+
+def simulate_deals(seed: int, start: int, stop: int) -> EVCounts:
+    """Simulate every choice of every seat on deals start to stop and return the
+    EVCounts. The dealer moves around the table from deal to deal.
+
+    Keyword arguments:
+    seed: -- seed of the run.
+    start: -- number of the first deal.
+    stop: -- number of the deal to stop before.
+    """
+    from euchre.bots import BotAgent
+    agents = [BotAgent()] * PLAYER_COUNT
+    counts = EVCounts()
+    for deal in range(start, stop):
+        deal_seed = f'{seed}:{deal}'
+        dealer = deal % PLAYER_COUNT
+        state = next(GameEngine(agents, Random(deal_seed), dealer=dealer).hand_steps()).state
+        for seat in range(PLAYER_COUNT):
+            key = bid_key(state.dealt[seat], state.turned, seat, dealer)
+            points = tuple(simulate_bid(deal_seed, dealer, seat, bid, agents) for bid in range(len(BIDS)))
+            counts.add(key, points)
+    return counts
+
+
+class EVTable():
+    """The average points of every first round choice for every key, read from
+    the contents of a table file.
+
+    lookup(): -- return the BidValues of a hand about to bid.
+    get_values(): -- return the BidValues of a key.
+    """
+    # (seat relative to dealer, turned rank, strength record) and the RECORD fields
+    ENTRY = struct.Struct('<BBH' + RECORD.format[1:])
+
+    def __init__(self, data: bytes):
+        """Initialize the table from the contents of a table file. Raises ValueError
+        if the contents are not a table of this version.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('EV table is too short.')
+        magic, version, record_size, count = HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or record_size != self.ENTRY.size:
+            raise ValueError('Not an EV table of this version.')
+        try:
+            body = zlib.decompress(data[HEADER.size:])
+        except zlib.error as e:
+            raise ValueError(f'EV table is corrupt: {e}') from None
+        if len(body) != count * record_size:
+            raise ValueError('EV table has the wrong number of entries.')
+        self._values = {}
+        for relation, rank, record, passing, order, alone, samples in self.ENTRY.iter_unpack(body):
+            self._values[(relation, rank, record)] = BidValues(
+                passing / POINT_UNITS, order / POINT_UNITS, alone / POINT_UNITS, samples,
+            )
+
+    def __repr__(self):
+        """Return the EVTable object."""
+        return f'EVTable(entries={len(self._values)})'
+
+    def __len__(self):
+        """Return the number of keys in the table."""
+        return len(self._values)
+
+    # Public methods
+    def lookup(self, hand: int, turned: int, seat: int, dealer: int) -> BidValues|None:
+        """Return the average points of each choice for a hand about to bid in the
+        first round, None if the table has no entry for it.
+
+        Keyword arguments:
+        hand: -- card mask of the seat's hand.
+        turned: -- card turned up for bidding.
+        seat: -- the bidding seat.
+        dealer: -- seat of the dealer.
+        """
+        return self._values.get(bid_key(hand, turned, seat, dealer))
+
+    def get_values(self, key: tuple[int, int, int]) -> BidValues|None:
+        """Return the average points of each choice for a key, None if it has no entry."""
+        return self._values.get(key)
+
+
+def build_table(counts: EVCounts) -> bytes:
+    """Return the contents of a table file with the averages of the counts."""
+    entries = bytearray()
+    for key in counts.get_keys():
+        values = counts.get_values(key)
+        entries += EVTable.ENTRY.pack(
+            *key, *(round(value * POINT_UNITS) for value in values[:len(BIDS)]),
+            min(values.samples, MAX_SAMPLES),
+        )
+    header = HEADER.pack(TABLE_MAGIC, TABLE_VERSION, EVTable.ENTRY.size, len(counts))
+    return header + zlib.compress(bytes(entries), 9)
+
+
+def write_table(deals: int, seed: int=0, workers: int=1, path: str=TABLE_PATH) -> EVCounts:
+    """Simulate the deals across worker processes and write the table file.
+    Returns the EVCounts, the same for any number of workers.
+
+    Keyword arguments:
+    deals: -- number of deals to simulate.
+    seed: -- seed of the run.
+    workers: -- number of worker processes, 1 simulates in this process.
+    path: -- file to write.
+    """
+    # Imported here as the tournament module imports the bots, which use this module
+    from euchre.tournament import run_shards, split_range, worker_pool
+    shards = [(seed, start, stop) for start, stop in split_range(0, deals, workers * 4)]
+    counts = EVCounts()
+    with worker_pool(workers) as pool:
+        for result in run_shards(simulate_deals, shards, pool):
+            counts.merge(result)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(build_table(counts))
+    return counts
+
+
+def load_table(path: str=TABLE_PATH) -> EVTable:
+    """Read the table file at the path and return the EVTable."""
+    with open(path, 'rb') as f:
+        return EVTable(f.read())
+
+
+_table = None
+_loaded = False
+
+def get_table() -> EVTable|None:
+    """Return the table shared by the bots, reading the shipped file on first use.
+    None if the file is missing or out of date; it is too slow to build on the fly.
+    """
+    global _table, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            _table = load_table()
+        except (OSError, ValueError):
+            _table = None
+    return _table
+
+
+def check_table(table: EVTable, deals: int, seed: int=1) -> dict:
+    """Play every choice of every seat on new deals and return the average points
+    per decision of the table's bids, of the strength thresholds of Bot and of
+    the best choice for each deal, which no bidder can know beforehand.
+
+    Keyword arguments:
+    table: -- the EVTable to check.
+    deals: -- number of deals to simulate.
+    seed: -- seed of the deals, different from the seed the table was built with.
+    """
+    from euchre.bots import Bot, BotAgent
+    agents = [BotAgent()] * PLAYER_COUNT
+    strength = get_strength_table()
+    totals = {'table': 0, 'threshold': 0, 'best': 0}
+    decisions = 0
+    agree = 0
+    for deal in range(deals):
+        deal_seed = f'check:{seed}:{deal}'
+        dealer = deal % PLAYER_COUNT
+        state = next(GameEngine(agents, Random(deal_seed), dealer=dealer).hand_steps()).state
+        for seat in range(PLAYER_COUNT):
+            hand = state.dealt[seat]
+            points = [simulate_bid(deal_seed, dealer, seat, bid, agents) for bid in range(len(BIDS))]
+            tricks = strength.tricks(hand, card_suit(state.turned))
+            threshold = (PASS_BID if tricks < Bot.ORDER_TRICKS
+                         else ALONE_BID if tricks >= Bot.ALONE_TRICKS else ORDER_BID)
+            values = table.lookup(hand, state.turned, seat, dealer)
+            chosen = values.best() if values and values.samples >= MIN_SAMPLES else threshold
+            decisions += 1
+            agree += chosen == threshold
+            totals['table'] += points[chosen]
+            totals['threshold'] += points[threshold]
+            totals['best'] += max(points)
+    report = {name: total / decisions if decisions else 0.0 for name, total in totals.items()}
+    report['decisions'] = decisions
+    report['agreement'] = agree / decisions if decisions else 0.0
+    return report
+
+
+def main(argv: list[str]=None):
+    """Rebuild or check the table file from the command line."""
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m euchre.evtable', description=__doc__.splitlines()[0])
+    parser.add_argument('--deals', type=int, default=200000, help='number of deals to simulate for the table')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the simulated deals')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--path', default=TABLE_PATH, help='table file to write or check')
+    parser.add_argument('--check', type=int, metavar='DEALS',
+                        help='compare the table with the strength thresholds on this many new deals')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        report = check_table(load_table(args.path), args.check, args.seed + 1)
+        print(f'Decisions: {report["decisions"]}  agreement with thresholds: {report["agreement"]:.3f}')
+        for name in ('table', 'threshold', 'best'):
+            print(f'{name:<10} {report[name]:+.4f} points per decision')
+        return
+    counts = write_table(args.deals, args.seed, args.workers, args.path)
+    print(f'Wrote {len(counts)} entries from {args.deals} deals to {args.path}')
+
+
+def _first_round(decision: Decision, seat: int, bid: int, agents: list) -> bool:
+    """Answer a first round bid: pass before the seat, the bid at the seat, the agents after it."""
+    state = decision.state
+    position = (decision.seat - state.leader) % PLAYER_COUNT
+    target = (seat - state.leader) % PLAYER_COUNT
+    if position < target:
+        return False
+    if position == target:
+        return bid != PASS_BID
+    return decide(agents[decision.seat], decision)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,549 @@
+"""The ismcts module makes bidding and playing decisions by information set Monte Carlo tree search.
+
+Single-observer ISMCTS searches one tree over the moves of every seat as the
+deciding seat sees them. Each iteration deals the cards the seat cannot see
+at random, consistent with what it knows, walks down the tree choosing among
+the moves legal in that layout by UCB with availability counts, adds one new
+move, plays the rest of the hand out with a rollout policy and backs the
+points up the path. A move's value is kept for the team that made it.
+
+The tree is a set of parallel lists indexed by node number rather than an
+object per node. It is kept between the card decisions of a hand: the next
+decision starts from the node reached by the cards played since, so the
+iterations spent on earlier tricks are not lost.
+
+Bidding decisions are a bandit over the possible bids at the root: each
+iteration deals the unseen cards, makes the bid, lets the other seats bid
+and play like the rule bots and scores the hand.
+
+BidView(): -- what the deciding seat knows when it has to bid.
+random_policy(): -- rollout policy playing a random legal card.
+high_card_policy(): -- rollout policy playing the highest legal card, like Bot.
+rule_policy(): -- rollout policy that wins tricks cheaply and saves high cards.
+ROLLOUT_POLICIES: -- the rollout policies by name.
+SearchTree(): -- the nodes of a search tree as parallel lists.
+ISMCTSSearch(): -- chooses bids and cards within an iteration or time budget.
+"""
+from __future__ import annotations
+from typing import Callable, NamedTuple
+
+import math
+import time
+from random import Random
+
+from euchre.constants import MAX_CARD_HAND_LIMIT, PLAYER_COUNT, SUITS
+from euchre.engine import HandState
+from euchre.masks import (
+    EFFECTIVE_RANK,
+    FULL_DECK,
+    card_list,
+    card_suit,
+    highest_card,
+    lowest_card,
+    trick_winner,
+)
+from euchre.pimc import DealSampler, PlayView
+from euchre.state import ORDERS, GameState
+
+# Largest number of points a hand can be worth, to scale rewards to 0-1
+MAX_POINTS = 4
+
+
+class BidView(NamedTuple):
+    """What the deciding seat knows about the hand when it has to bid.
+    Seats only need to be consistent within the view, with seat % 2 the team.
+
+    seat: -- the deciding seat.
+    hand: -- card mask of the seat's own hand.
+    dealer: -- seat of the dealer.
+    turned: -- card turned up for bidding.
+    first_round: -- True while the turned card can be ordered up.
+    trump: -- suit index of trump once the seat has made it, None while bidding.
+    """
+    seat: int
+    hand: int
+    dealer: int
+    turned: int
+    first_round: bool = True
+    trump: int|None = None
+
+
+def random_policy(state: GameState, legal: int, rng: Random) -> int:
+    """Rollout policy playing a random legal card."""
+    cards = card_list(legal)
+    return cards[rng.randrange(len(cards))]
+
+
+def high_card_policy(state: GameState, legal: int, rng: Random) -> int:
+    """Rollout policy playing the highest ranking legal card, like Bot."""
+    return highest_card(legal, state.trump)
+
+
+def rule_policy(state: GameState, legal: int, rng: Random) -> int:
+    """Rollout policy for a fast rule bot: lead the highest card, let a partner's
+    winning card stand, otherwise win with the cheapest card that can, or throw
+    the lowest card.
+    """
+    trump = state.trump
+    trick = state.trick
+    if not trick:
+        return highest_card(legal, trump)
+
+    order = ORDERS[PLAYER_COUNT if state.skipped is None else state.skipped][state.leader]
+    winning = trick_winner(trick, trump)
+    if order[winning] % 2 == order[len(trick)] % 2:
+        return lowest_card(legal, trump)
+
+    ranks = EFFECTIVE_RANK[trump]
+    best = None
+    for card in card_list(legal):
+        if trick_winner(trick + (card,), trump) == len(trick):
+            if best is None or ranks[card] < ranks[best]:
+                best = card
+    return best if best is not None else lowest_card(legal, trump)
+
+
+ROLLOUT_POLICIES = {
+    'random': random_policy,
+    'high': high_card_policy,
+    'rule': rule_policy,
+}
+
+
+class SearchTree():
+    """The nodes of a search tree as parallel lists indexed by node number.
+    Children are a linked list of first child and next sibling. Node 0 is the
+    root once the tree is cleared.
+
+    clear(): -- remove every node and add a new root.
+    add(): -- add a child node for a move.
+    find(): -- return the child node for a move.
+    best_move(): -- return the most visited move of a node among some cards.
+    """
+    __slots__ = ('move', 'parent', 'child', 'sibling', 'ours', 'visits', 'available', 'reward')
+
+    def __init__(self):
+        """Initialize the tree with a root node."""
+        # card played to reach the node, -1 for the root
+        self.move = []
+        self.parent = []
+        self.child = []
+        self.sibling = []
+        # 1 if the seat that played the move is on the deciding seat's team
+        self.ours = []
+        self.visits = []
+        # iterations in which the move was legal
+        self.available = []
+        # total reward for the team that played the move
+        self.reward = []
+        self.clear()
+
+    def __len__(self):
+        """Return the number of nodes."""
+        return len(self.move)
+
+    def __repr__(self):
+        """Return the SearchTree object."""
+        return f'SearchTree(nodes={len(self)})'
+
+    # Public methods
+    def clear(self):
+        """Remove every node and add a new root."""
+        for values in (self.move, self.parent, self.child, self.sibling,
+                       self.ours, self.visits, self.available, self.reward):
+            values.clear()
+        self.add(-1, -1, 0)
+
+    def add(self, parent: int, move: int, ours: int) -> int:
+        """Add a child for the move to the parent node. Returns the new node number.
+
+        Keyword arguments:
+        parent: -- the parent node, -1 for the root.
+        move: -- card played to reach the node.
+        ours: -- 1 if the deciding seat's team plays the move.
+        """
+        node = len(self.move)
+        self.move.append(move)
+        self.parent.append(parent)
+        self.child.append(-1)
+        self.sibling.append(-1)
+        self.ours.append(ours)
+        self.visits.append(0)
+        self.available.append(1)
+        self.reward.append(0.0)
+        if parent >= 0:
+            self.sibling[node] = self.child[parent]
+            self.child[parent] = node
+        return node
+
+    def find(self, node: int, move: int) -> int:
+        """Return the child of the node for the move, -1 if there is none."""
+        child = self.child[node]
+        while child >= 0 and self.move[child] != move:
+            child = self.sibling[child]
+        return child
+
+    def best_move(self, node: int, cards: int, trump: int) -> int|None:
+        """Return the most visited move of the node among the card mask, the lower
+        card on ties. None if none of the cards has been tried.
+        """
+        ranks = EFFECTIVE_RANK[trump]
+        best = None
+        child = self.child[node]
+        while child >= 0:
+            move = self.move[child]
+            if cards >> move & 1:
+                key = (self.visits[child], -ranks[move])
+                if best is None or key > best[0]:
+                    best = (key, move)
+            child = self.sibling[child]
+        return best[1] if best else None
+
+
+class ISMCTSSearch():
+    """Chooses bids and cards by information set Monte Carlo tree search.
+
+    choose(): -- return the card to play for a PlayView.
+    order(): -- return True to order up the turned card.
+    call(): -- return the suit to call in the second round, None to pass.
+    alone(): -- return True to go alone after making trump.
+    reset(): -- forget the tree of the hand.
+    get_iterations(): -- return the iterations run for the last decision.
+    get_rate(): -- return the iterations per second of the last decision.
+    get_throughput(): -- return the iterations per second over every decision.
+    get_tree(): -- return the search tree.
+    """
+
+    def __init__(self, iterations: int=1000, time_budget: float|None=0.1, exploration: float=0.7,
+                 policy: str|Callable='rule', bidder=None, rng: Random=None):
+        """Initialize the search.
+
+        Keyword arguments:
+        iterations: -- most iterations for one decision.
+        time_budget: -- wall-clock seconds one decision may take, None for no limit.
+            At least one iteration is run.
+        exploration: -- UCB exploration constant.
+        policy: -- rollout policy, a name from ROLLOUT_POLICIES or a function
+            (state, legal, rng) -> card.
+        bidder: -- engine agent the other seats bid like in bidding playouts,
+            a BotAgent if None.
+        rng: -- random number generator for layouts and rollouts.
+        """
+        if isinstance(policy, str):
+            if policy not in ROLLOUT_POLICIES:
+                raise ValueError(f'Unknown rollout policy {policy!r}. Choose from {", ".join(ROLLOUT_POLICIES)}.')
+            policy = ROLLOUT_POLICIES[policy]
+        if bidder is None:
+            # Imported here, the bots module builds its search bots from this one
+            from euchre.bots import BotAgent
+            bidder = BotAgent()
+        self._iterations = iterations
+        self._time_budget = time_budget
+        self._exploration = exploration
+        self._policy = policy
+        self._bidder = bidder
+        self._rng = rng if rng is not None else Random()
+        self._sampler = DealSampler(self._rng)
+        self._tree = SearchTree()
+        self._root = 0
+        # cards played before the root, and the trump, maker and skipped seat of the tree
+        self._history = ()
+        self._key = None
+        self._pool = []
+        self._last_iterations = 0
+        self._last_seconds = 0.0
+        self._total_iterations = 0
+        self._total_seconds = 0.0
+
+    def __repr__(self):
+        """Return the ISMCTSSearch object."""
+        return (f'ISMCTSSearch(iterations={self._iterations}, time_budget={self._time_budget}, '
+                f'exploration={self._exploration})')
+
+    # Public methods
+    def get_iterations(self) -> int:
+        """Return the iterations run for the last decision."""
+        return self._last_iterations
+
+    def get_rate(self) -> float:
+        """Return the iterations per second of the last decision."""
+        if not self._last_seconds:
+            return 0.0
+        return self._last_iterations / self._last_seconds
+
+    def get_throughput(self) -> float:
+        """Return the iterations per second over every decision searched so far."""
+        if not self._total_seconds:
+            return 0.0
+        return self._total_iterations / self._total_seconds
+
+    def get_tree(self) -> SearchTree:
+        """Return the search tree."""
+        return self._tree
+
+    def reset(self):
+        """Forget the tree, for a new hand."""
+        self._tree.clear()
+        self._root = 0
+        self._history = ()
+        self._key = None
+
+    def choose(self, view: PlayView, history: tuple[int, ...]=()) -> int:
+        """Return the legal card to play.
+
+        Keyword arguments:
+        view: -- what the deciding seat knows about the hand.
+        history: -- every card played this hand, in order. The tree of the last
+            decision is reused when its cards are the start of the history.
+        """
+        legal = view.legal
+        self._last_iterations = 0
+        self._last_seconds = 0.0
+        if not legal & (legal - 1):
+            return legal.bit_length() - 1
+
+        root = self._find_root(view, history)
+        tree = self._tree
+        sampler = self._sampler
+        sampler.prepare(view)
+        team = view.seat % 2
+        # Hands dealt short of five cards count the missing tricks as already played
+        tricks = view.won[0] + view.won[1] + view.hand.bit_count()
+        won = (view.won[0] + MAX_CARD_HAND_LIMIT - tricks, view.won[1])
+        scored = view.maker is not None and tricks == MAX_CARD_HAND_LIMIT
+        maker = view.maker if view.maker is not None else view.seat
+        alone = view.skipped is not None
+
+        start = time.perf_counter()
+        deadline = None if self._time_budget is None else start + self._time_budget
+        while self._last_iterations < self._iterations:
+            hands = sampler.sample()
+            if hands is None:
+                break
+            state = GameState(tuple(hands), view.trump, view.leader, view.trick,
+                              view.skipped, maker, alone, won)
+            node, state = self._select(root, state, team)
+            state = self._rollout(state)
+            if scored:
+                winner, points = state.result()
+                value = points if winner == team else -points
+                reward = (value + MAX_POINTS) / (2 * MAX_POINTS)
+            else:
+                reward = (state.won[team] - won[team]) / max(sum(state.won) - sum(won), 1)
+            self._backup(node, root, reward)
+            self._last_iterations += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self._last_seconds = time.perf_counter() - start
+        self._total_iterations += self._last_iterations
+        self._total_seconds += self._last_seconds
+
+        card = tree.best_move(root, legal, view.trump)
+        return card if card is not None else lowest_card(legal, view.trump)
+
+    def order(self, view: BidView) -> bool:
+        """Return True to order up the turned card in the first round of bidding."""
+        return self._bid(view, 'order', (False, True))
+
+    def call(self, view: BidView, options: tuple[int, ...]) -> int|None:
+        """Return the suit index to call in the second round of bidding, None to pass.
+
+        Keyword arguments:
+        view: -- what the deciding seat knows.
+        options: -- suit indexes that may be called.
+        """
+        return self._bid(view, 'call', (None,) + tuple(options))
+
+    def alone(self, view: BidView) -> bool:
+        """Return True to go alone with the trump in the view."""
+        return self._bid(view, 'alone', (False, True))
+
+    # Private methods
+    def _find_root(self, view: PlayView, history: tuple[int, ...]) -> int:
+        """Return the node for the position of the view, reusing the tree when the
+        history carries on from the last decision and starting a new one otherwise.
+        """
+        tree = self._tree
+        key = (view.trump, view.skipped, view.maker)
+        known = len(self._history)
+        node = self._root
+        if key == self._key and tuple(history[:known]) == self._history:
+            for move in history[known:]:
+                node = tree.find(node, move)
+                if node < 0:
+                    break
+        else:
+            node = -1
+
+        if node < 0:
+            tree.clear()
+            node = 0
+        self._root = node
+        self._history = tuple(history)
+        self._key = key
+        return node
+
+    def _select(self, root: int, state: GameState, team: int) -> tuple[int, GameState]:
+        """Walk down the tree from the root with the moves legal in the layout,
+        adding the first move that is not in the tree yet. Returns the node
+        reached and the state after its move.
+        """
+        tree = self._tree
+        move = tree.move
+        sibling = tree.sibling
+        visits = tree.visits
+        available = tree.available
+        reward = tree.reward
+        exploration = self._exploration
+        node = root
+        while not state.is_over():
+            legal = state.legal_mask()
+            untried = legal
+            best = -1
+            best_score = -1.0
+            child = tree.child[node]
+            while child >= 0:
+                card = move[child]
+                if legal >> card & 1:
+                    untried &= ~(1 << card)
+                    available[child] += 1
+                    count = visits[child]
+                    score = reward[child] / count + exploration * math.sqrt(math.log(available[child]) / count)
+                    if score > best_score:
+                        best = child
+                        best_score = score
+                child = sibling[child]
+
+            if untried:
+                cards = card_list(untried)
+                card = cards[self._rng.randrange(len(cards))]
+                ours = int(state.to_play() % 2 == team)
+                return tree.add(node, card, ours), state.apply(card)
+            state = state.apply(move[best])
+            node = best
+        return node, state
+
+    def _rollout(self, state: GameState) -> GameState:
+        """Play the hand out with the rollout policy. Returns the finished state."""
+        policy = self._policy
+        rng = self._rng
+        while not state.is_over():
+            state = state.apply(policy(state, state.legal_mask(), rng))
+        return state
+
+    def _backup(self, node: int, root: int, reward: float):
+        """Add the reward, for the deciding seat's team, to every node from the node up to the root."""
+        tree = self._tree
+        while True:
+            tree.visits[node] += 1
+            tree.reward[node] += reward if tree.ours[node] else 1.0 - reward
+            if node == root:
+                return
+            node = tree.parent[node]
+
+    def _bid(self, view: BidView, kind: str, actions: tuple) -> object:
+        """Return the bid with the best average reward, choosing the bid to try in
+        each iteration by UCB1.
+        """
+        self._last_iterations = 0
+        visits = [0] * len(actions)
+        totals = [0.0] * len(actions)
+        exploration = self._exploration
+
+        start = time.perf_counter()
+        deadline = None if self._time_budget is None else start + self._time_budget
+        while self._last_iterations < max(self._iterations, len(actions)):
+            tried = self._last_iterations
+            if tried < len(actions):
+                index = tried
+            else:
+                log_tried = math.log(tried)
+                index = max(range(len(actions)), key=lambda index: (
+                    totals[index] / visits[index] + exploration * math.sqrt(log_tried / visits[index])
+                ))
+            hands, kitty = self._deal_unseen(view)
+            value = self._play_bid(view, kind, actions[index], hands, kitty)
+            visits[index] += 1
+            totals[index] += (value + MAX_POINTS) / (2 * MAX_POINTS)
+            self._last_iterations += 1
+            if deadline is not None and time.perf_counter() >= deadline and self._last_iterations >= len(actions):
+                break
+        self._last_seconds = time.perf_counter() - start
+        self._total_iterations += self._last_iterations
+        self._total_seconds += self._last_seconds
+
+        best = max(range(len(actions)), key=lambda index: (totals[index] / visits[index], -index))
+        return actions[best]
+
+    def _deal_unseen(self, view: BidView) -> tuple[list[int], list[int]]:
+        """Deal the cards the seat cannot see to the other seats and the kitty.
+        Returns (hand masks, kitty with the turned card first).
+        """
+        pool = self._pool
+        pool[:] = card_list(FULL_DECK & ~view.hand & ~(1 << view.turned))
+        self._rng.shuffle(pool)
+        hands = [0] * PLAYER_COUNT
+        position = 0
+        for seat in range(PLAYER_COUNT):
+            if seat == view.seat:
+                hands[seat] = view.hand
+                continue
+            for card in pool[position:position + 5]:
+                hands[seat] |= 1 << card
+            position += 5
+        return hands, [view.turned] + pool[position:]
+
+    def _play_bid(self, view: BidView, kind: str, action, hands: list[int], kitty: list[int]) -> int:
+        """Make the bid in the layout, let the other seats bid like the bidder and
+        play the hand out. Returns the points for the deciding seat's team,
+        negative if the other team scores.
+        """
+        bidder = self._bidder
+        state = HandState(view.dealer, hands, kitty)
+        turned_suit = card_suit(view.turned)
+        seats = state.seats_to_play(state.leader)
+        after = seats[seats.index(view.seat) + 1:]
+        trump = maker = None
+        first_round = view.first_round
+
+        if kind == 'alone':
+            trump, maker = view.trump, view.seat
+        elif kind == 'order' and action:
+            trump, maker = turned_suit, view.seat
+        elif kind == 'call' and action is not None:
+            trump, maker = action, view.seat
+        elif kind == 'order':
+            for seat in after:
+                if bidder.order(state, seat):
+                    trump, maker = turned_suit, seat
+                    break
+            if trump is None:
+                first_round = False
+                after = seats
+        if trump is None:
+            options = tuple(suit for suit in range(len(SUITS)) if suit != turned_suit)
+            for seat in after:
+                call = bidder.call(state, seat)
+                if call in options:
+                    trump, maker = call, seat
+                    break
+        if trump is None:
+            return 0
+
+        state.trump = trump
+        state.maker = maker
+        if kind == 'alone':
+            alone = action
+        else:
+            alone = bool(bidder.alone(state, maker))
+        skipped = (maker + 2) % PLAYER_COUNT if alone else None
+        if skipped is not None:
+            hands[skipped] = 0
+        if first_round and view.dealer != skipped:
+            hands[view.dealer] |= 1 << view.turned
+            state.skipped = skipped
+            hands[view.dealer] ^= 1 << bidder.discard(state, view.dealer)
+
+        game = self._rollout(GameState(tuple(hands), trump, state.leader, (), skipped, maker, alone))
+        winner, points = game.result()
+        return points if winner == view.seat % 2 else -points
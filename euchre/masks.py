@@ -0,0 +1,221 @@
+"""The masks module is the compact card core used by the engine and the search bots.
+
+A card is an integer 0-23 and a hand is a 24-bit integer with one bit per card.
+Cards are numbered suit by suit in constants.SUITS order, six values per suit:
+card = suit * 6 + (value - 9). For each of the four trump suits the effective
+suit and rank of every card is precomputed, including the left bower, so legal
+moves, trick winners and hand sorting are table lookups and mask operations.
+Card objects are only built when a card has to be shown to a person.
+
+card_index(): -- return the card number for a value and suit.
+card_value(): -- return the face value (9-14) of a card number.
+card_suit(): -- return the suit index of a card number.
+from_card(): -- return the card number of a Card object.
+to_card(): -- return a new Card object for a card number.
+hand_from_cards(): -- return the hand mask of a list of Card objects.
+cards_from_hand(): -- return Card objects for a hand mask.
+card_list(): -- return the card numbers in a mask, lowest first.
+legal_mask(): -- return the mask of cards that are legal to play.
+trick_winner(): -- return the position of the winning card in a trick.
+highest_card(): -- return the highest ranking card in a mask.
+lowest_card(): -- return the lowest ranking card in a mask.
+sort_hand(): -- return the cards of a hand in display order.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from euchre.cards import Card
+
+from euchre.constants import SUITS, VALUES
+
+CARD_COUNT = 24
+SUIT_SIZE = len(VALUES)
+FULL_DECK = (1 << CARD_COUNT) - 1
+JACK = 11
+
+# Suit index of the left bower for each trump, same pairing as Trump._find_left
+LEFT_SUIT = (2, 3, 0, 1)
+
+# Ranks of trump cards, same values as Trump.RANK
+RIGHT_BOWER_RANK = 21
+LEFT_BOWER_RANK = 20
+TRUMP_RANK = {9: 15, 10: 16, 12: 17, 13: 18, 14: 19, JACK: RIGHT_BOWER_RANK}
+
+# Face value of each Card rank
+RANK_VALUES = {9: 9, 10: 10, "Jack": 11, "Queen": 12, "King": 13, "Ace": 14}
+
+# Plain suit masks, ignoring trump
+SUIT_MASK = tuple(((1 << SUIT_SIZE) - 1) << (suit * SUIT_SIZE) for suit in range(len(SUITS)))
+
+
+def card_index(value: int, suit: int) -> int:
+    """Return the card number for the value (9-14) and suit index.
+
+    Keyword arguments:
+    value: -- face value of the card.
+    suit: -- index of the suit in constants.SUITS.
+    """
+    return suit * SUIT_SIZE + (value - VALUES[0])
+
+
+def card_value(card: int) -> int:
+    """Return the face value (9-14) of the card number."""
+    return card % SUIT_SIZE + VALUES[0]
+
+
+def card_suit(card: int) -> int:
+    """Return the suit index of the card number."""
+    return card // SUIT_SIZE
+
+
+def _build_tables():
+    """Build the effective suit, rank and suit mask tables for every trump suit."""
+    suits = []
+    ranks = []
+    masks = []
+    for trump in range(len(SUITS)):
+        left = card_index(JACK, LEFT_SUIT[trump])
+        trump_suits = []
+        trump_ranks = []
+        trump_masks = [0] * len(SUITS)
+        for card in range(CARD_COUNT):
+            value = card_value(card)
+            suit = card_suit(card)
+            if card == left:
+                suit = trump
+                rank = LEFT_BOWER_RANK
+            elif suit == trump:
+                rank = TRUMP_RANK[value]
+            else:
+                rank = value
+            trump_suits.append(suit)
+            trump_ranks.append(rank)
+            trump_masks[suit] |= 1 << card
+        suits.append(tuple(trump_suits))
+        ranks.append(tuple(trump_ranks))
+        masks.append(tuple(trump_masks))
+    return tuple(suits), tuple(ranks), tuple(masks)
+
+# EFFECTIVE_SUIT[trump][card]: the suit the card follows, the trump suit for the left bower
+# EFFECTIVE_RANK[trump][card]: the ranking value, trumps 15-21 above every plain card
+# TRUMP_SUIT_MASK[trump][suit]: every card that follows the suit under trump
+EFFECTIVE_SUIT, EFFECTIVE_RANK, TRUMP_SUIT_MASK = _build_tables()
+
+# Cards from strongest to weakest for each trump, used to find high and low cards in a mask
+RANK_ORDER = tuple(
+    tuple(sorted(range(CARD_COUNT), key=lambda card: (-ranks[card], card)))
+    for ranks in EFFECTIVE_RANK
+)
+
+
+# Card object conversions
+def from_card(card: Card) -> int:
+    """Return the card number of a Card object. Uses the rank, since the value of a
+    played card may have been changed by Card.update_to_trump.
+    """
+    return card_index(RANK_VALUES[card.get_rank()], SUITS.index(card.get_suit()))
+
+
+def to_card(card: int) -> Card:
+    """Return a new Card object for the card number, for display."""
+    from euchre.cards import Card
+    return Card(card_value(card), SUITS[card_suit(card)])
+
+
+def hand_from_cards(cards: list[Card]) -> int:
+    """Return the hand mask of a list of Card objects."""
+    hand = 0
+    for card in cards:
+        hand |= 1 << from_card(card)
+    return hand
+
+
+def cards_from_hand(hand: int) -> list[Card]:
+    """Return new Card objects for the cards in the hand mask, in display order."""
+    return [to_card(card) for card in sort_hand(hand)]
+
+
+# Mask operations
+def card_list(mask: int) -> list[int]:
+    """Return the card numbers in the mask, lowest first."""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(low.bit_length() - 1)
+        mask ^= low
+    return cards
+
+
+def legal_mask(hand: int, led: int|None, trump: int) -> int:
+    """Return the mask of cards in the hand that are legal to play.
+
+    Keyword arguments:
+    hand: -- mask of the cards in hand.
+    led: -- card number that was led this trick, None if leading.
+    trump: -- suit index of trump.
+    """
+    if led is None:
+        return hand
+    follow = hand & TRUMP_SUIT_MASK[trump][EFFECTIVE_SUIT[trump][led]]
+    return follow or hand
+
+
+def trick_winner(cards: list[int], trump: int) -> int:
+    """Return the position in the trick of the winning card.
+
+    Keyword arguments:
+    cards: -- card numbers in the order they were played.
+    trump: -- suit index of trump.
+    """
+    suits = EFFECTIVE_SUIT[trump]
+    ranks = EFFECTIVE_RANK[trump]
+    led_suit = suits[cards[0]]
+    winner = 0
+    highest = ranks[cards[0]]
+
+    for position in range(1, len(cards)):
+        card = cards[position]
+        suit = suits[card]
+        if suit != led_suit and suit != trump:
+            continue
+        if ranks[card] > highest:
+            winner = position
+            highest = ranks[card]
+
+    return winner
+
+
+def highest_card(mask: int, trump: int) -> int:
+    """Return the highest ranking card in the non-empty mask."""
+    for card in RANK_ORDER[trump]:
+        if mask >> card & 1:
+            return card
+
+
+def lowest_card(mask: int, trump: int) -> int:
+    """Return the lowest ranking card in the non-empty mask."""
+    for card in reversed(RANK_ORDER[trump]):
+        if mask >> card & 1:
+            return card
+
+
+def sort_hand(hand: int, trump: int|None=None) -> list[int]:
+    """Return the cards of the hand grouped by suit and highest first, like
+    Player.sorted_cards_in_hand. With a trump, the trumps come first.
+
+    Keyword arguments:
+    hand: -- mask of the cards in hand.
+    trump: -- suit index of trump, None to sort by plain suits.
+    """
+    if trump is None:
+        cards = []
+        for suit in range(len(SUITS)):
+            cards.extend(reversed(card_list(hand & SUIT_MASK[suit])))
+        return cards
+
+    suit_order = [trump] + [suit for suit in range(len(SUITS)) if suit != trump]
+    cards = []
+    for suit in suit_order:
+        in_suit = card_list(hand & TRUMP_SUIT_MASK[trump][suit])
+        cards.extend(sorted(in_suit, key=lambda card: -EFFECTIVE_RANK[trump][card]))
+    return cards
@@ -0,0 +1,190 @@
+"""The multitable module plays games at many tables at once and hands the
+decisions pending at every table to the agents in one call.
+
+Every table is a GameEngine stepped through its hand_steps() or game_steps()
+generator. Each round collects the Decision every table is waiting on, groups
+them by the agent of the deciding seat and asks each agent for all of its
+answers with one decide_batch() call. A batch agent can then answer with
+array operations over the hand masks, legal masks and trumps of every table
+instead of one Python call per table, which amortizes the interpreter
+overhead and leaves room for heavier evaluators.
+
+BatchAgent: -- protocol of agents answering many decisions in one call.
+BatchBotAgent(): -- answers a batch like BotAgent, with the card choices vectorized.
+AgentBatch(): -- answers a batch with an ordinary agent, one decision at a time.
+TableBatch(): -- plays hands or games at many tables, batching their decisions.
+"""
+from __future__ import annotations
+from typing import Generator, Iterable, Protocol, runtime_checkable
+from random import Random
+
+from euchre.batch import highest_cards, lowest_cards
+from euchre.bots import BotAgent
+from euchre.constants import PLAYER_COUNT, POINTS_TO_WIN
+from euchre.engine import DISCARD, PLAY, Decision, GameEngine, GameResult, HandResult, decide
+
+
+@runtime_checkable
+class BatchAgent(Protocol):
+    """Answers the decisions of many tables in one call.
+
+    decide_batch(decisions) -> list: the answer to every Decision, in order,
+    in the same encoding as the agent methods of the engine.
+    """
+    def decide_batch(self, decisions: list[Decision]) -> list: ...
+
+
+class BatchBotAgent():
+    """Answers a batch of decisions the same way BotAgent answers them one at a
+    time. The cards to play and discard are chosen for the whole batch at once
+    with batch.highest_cards and batch.lowest_cards; bids are strength table
+    lookups and are answered one by one.
+
+    decide_batch(): -- return the answer to every decision.
+    """
+
+    def __init__(self, use_numpy: bool=True):
+        """Initialize the agent.
+
+        Keyword arguments:
+        use_numpy: -- False to choose cards with integer masks even if NumPy is installed.
+        """
+        self._use_numpy = use_numpy
+        self._bidder = BotAgent()
+
+    def __repr__(self):
+        """Return the BatchBotAgent object."""
+        return f'BatchBotAgent(use_numpy={self._use_numpy})'
+
+    # Public methods
+    def decide_batch(self, decisions: list[Decision]) -> list:
+        """Return the answer to every decision, in order."""
+        answers = [None] * len(decisions)
+        plays = []
+        discards = []
+        for index, decision in enumerate(decisions):
+            if decision.kind == PLAY:
+                plays.append(index)
+            elif decision.kind == DISCARD:
+                discards.append(index)
+            else:
+                answers[index] = decide(self._bidder, decision)
+
+        for indexes, choose in ((plays, highest_cards), (discards, lowest_cards)):
+            if not indexes:
+                continue
+            masks = [decisions[index].options for index in indexes]
+            trumps = [decisions[index].state.trump for index in indexes]
+            for index, card in zip(indexes, choose(masks, trumps, self._use_numpy)):
+                answers[index] = int(card)
+        return answers
+
+
+class AgentBatch():
+    """Answers a batch of decisions by asking an ordinary agent, such as
+    bots.PIMCAgent, one decision at a time. Lets any agent sit at a TableBatch.
+
+    decide_batch(): -- return the answer to every decision.
+    """
+
+    def __init__(self, agent):
+        """Initialize the batch with the agent that answers every decision."""
+        self._agent = agent
+
+    def __repr__(self):
+        """Return the AgentBatch object."""
+        return f'AgentBatch({self._agent!r})'
+
+    # Public methods
+    def decide_batch(self, decisions: list[Decision]) -> list:
+        """Return the answer to every decision, in order."""
+        agent = self._agent
+        return [decide(agent, decision) for decision in decisions]
+
+
+class TableBatch():
+    """Plays hands or games at many tables at once. The same batch agents sit at
+    every table, one per seat, and answer the decisions of all the tables
+    waiting on them in one call.
+
+    play_hands(): -- play one hand at every table and return the HandResults.
+    play_games(): -- play a game at every table and return the GameResults.
+    get_engines(): -- return the GameEngine of every table.
+    get_calls(): -- return the number of decide_batch calls made so far.
+    """
+
+    def __init__(self, agents: list[BatchAgent], rngs: Iterable[Random], dealer: int=0,
+                 points_to_win: int=POINTS_TO_WIN, recorder=None):
+        """Initialize a table for every random number generator.
+
+        Keyword arguments:
+        agents: -- the batch agent playing each seat, in seating order.
+        rngs: -- random number generator of each table. Seed them for reproducible games.
+        dealer: -- seat of the first dealer at every table.
+        points_to_win: -- points a team needs to win a game.
+        recorder: -- object with a record(state, result) method, shared by every table.
+        """
+        if len(agents) != PLAYER_COUNT:
+            raise ValueError(f'Expected {PLAYER_COUNT} agents, got {len(agents)}.')
+        self._agents = list(agents)
+        self._engines = [
+            GameEngine(self._agents, rng, dealer, points_to_win, recorder)
+            for rng in rngs
+        ]
+        self._calls = 0
+
+    def __repr__(self):
+        """Return the TableBatch object."""
+        return f'TableBatch(tables={len(self._engines)})'
+
+    # Public methods
+    def play_hands(self) -> list[HandResult]:
+        """Deal and play one hand at every table. Returns the HandResult of each table."""
+        return self._run([engine.hand_steps() for engine in self._engines])
+
+    def play_games(self) -> list[GameResult]:
+        """Play a full game at every table. Returns the GameResult of each table."""
+        return self._run([engine.game_steps() for engine in self._engines])
+
+    def get_engines(self) -> list[GameEngine]:
+        """Return the GameEngine of every table."""
+        return self._engines
+
+    def get_calls(self) -> int:
+        """Return the number of decide_batch calls made so far."""
+        return self._calls
+
+    # Private methods
+    def _run(self, tables: list[Generator]) -> list:
+        """Step every table until it finishes, answering the decisions of all the
+        tables in a batch per agent each round. Returns the result of every table.
+        """
+        agents = self._agents
+        results = [None] * len(tables)
+        pending = {}
+        for table, steps in enumerate(tables):
+            try:
+                pending[table] = next(steps)
+            except StopIteration as stop:
+                results[table] = stop.value
+
+        while pending:
+            # tables waiting on each agent, keyed by the agent's identity
+            groups = {}
+            for table, decision in pending.items():
+                agent = agents[decision.seat]
+                group = groups.get(id(agent))
+                if group is None:
+                    group = groups[id(agent)] = (agent, [])
+                group[1].append(table)
+
+            for agent, waiting in groups.values():
+                answers = agent.decide_batch([pending[table] for table in waiting])
+                self._calls += 1
+                for table, answer in zip(waiting, answers):
+                    try:
+                        pending[table] = tables[table].send(answer)
+                    except StopIteration as stop:
+                        results[table] = stop.value
+                        del pending[table]
+        return results
@@ -0,0 +1,207 @@
+"""The pimc module chooses cards by perfect-information Monte Carlo search.
+
+The cards the deciding seat cannot see are dealt out at random many times,
+consistent with everything the seat knows: the cards already played, the
+suits each seat has shown out of, and where the revealed card went in bidding.
+Each layout is solved double-dummy and the legal card with the most tricks over
+all layouts is played.
+
+PlayView(): -- what the deciding seat knows about the hand.
+DealSampler(): -- deals the unseen cards to the other seats with reusable buffers.
+PIMCSearch(): -- samples layouts within a budget and picks the best card.
+"""
+from __future__ import annotations
+from typing import NamedTuple
+
+import time
+from random import Random
+
+from euchre.constants import PLAYER_COUNT, SUITS
+from euchre.masks import (
+    EFFECTIVE_RANK,
+    TRUMP_SUIT_MASK,
+    card_list,
+    lowest_card,
+)
+from euchre.solver import Solver
+
+
+class PlayView(NamedTuple):
+    """What the deciding seat knows about the hand when it has to play a card.
+    Seats only need to be consistent within the view, with seat % 2 the team.
+
+    seat: -- the deciding seat.
+    hand: -- card mask of the seat's own hand.
+    legal: -- card mask of the cards the seat may play.
+    trump: -- suit index of trump.
+    leader: -- seat that led the trick in progress, the deciding seat if leading.
+    trick: -- cards already played to the trick in progress, in order.
+    skipped: -- seat sitting out this hand, None if nobody went alone.
+    unseen: -- card mask of the cards whose place is unknown to the seat.
+    sizes: -- number of cards each seat holds.
+    voids: -- for each seat, a bit per effective suit the seat is known to be out of.
+    known: -- for each seat, card mask of cards known to be in its hand, like a picked up card.
+    maker: -- a seat of the team that made trump, the maker if they are alone.
+        None if not known; searches that score whole hands need it.
+    won: -- tricks won so far by each team.
+    """
+    seat: int
+    hand: int
+    legal: int
+    trump: int
+    leader: int
+    trick: tuple
+    skipped: int|None
+    unseen: int
+    sizes: tuple
+    voids: tuple
+    known: tuple
+    maker: int|None = None
+    won: tuple = (0, 0)
+
+
+class DealSampler():
+    """Deals the unseen cards to the other seats at random, respecting known voids
+    and known cards. The card pool and the hands are allocated once and reused
+    for every sample.
+
+    prepare(): -- set up the sampler for a view.
+    sample(): -- return a consistent layout of every hand, or None if none was found.
+    """
+    # Attempts at a consistent layout before giving up on a sample
+    MAX_ATTEMPTS = 50
+
+    def __init__(self, rng: Random=None):
+        """Initialize the sampler with an optional seeded random number generator."""
+        self._rng = rng if rng is not None else Random()
+        self._pool = []
+        self._hands = [0] * PLAYER_COUNT
+        self._seats = []
+        self._needed = [0] * PLAYER_COUNT
+        self._allowed = [0] * PLAYER_COUNT
+        self._view = None
+
+    def __repr__(self):
+        """Return the DealSampler object."""
+        return f'DealSampler(pool={len(self._pool)})'
+
+    # Public methods
+    def prepare(self, view: PlayView):
+        """Set up the pool of unseen cards and what each other seat can hold."""
+        self._view = view
+        self._pool[:] = card_list(view.unseen)
+        suit_masks = TRUMP_SUIT_MASK[view.trump]
+
+        self._seats.clear()
+        for seat in range(PLAYER_COUNT):
+            if seat == view.seat or seat == view.skipped:
+                self._needed[seat] = 0
+                continue
+            self._needed[seat] = view.sizes[seat] - view.known[seat].bit_count()
+            allowed = view.unseen
+            for suit in range(len(SUITS)):
+                if view.voids[seat] >> suit & 1:
+                    allowed &= ~suit_masks[suit]
+            self._allowed[seat] = allowed
+            if self._needed[seat] > 0:
+                self._seats.append(seat)
+
+        # Deal to the most constrained seats first
+        self._seats.sort(key=lambda seat: self._allowed[seat].bit_count() - self._needed[seat])
+
+    def sample(self) -> list[int]|None:
+        """Return the hand mask of every seat for one random layout. The returned list
+        is reused by the next call.
+        """
+        view = self._view
+        pool = self._pool
+        hands = self._hands
+        for _ in range(self.MAX_ATTEMPTS):
+            self._rng.shuffle(pool)
+            for seat in range(PLAYER_COUNT):
+                hands[seat] = view.known[seat]
+            hands[view.seat] = view.hand
+
+            taken = 0
+            complete = True
+            for seat in self._seats:
+                allowed = self._allowed[seat] & ~taken
+                needed = self._needed[seat]
+                for card in pool:
+                    if not needed:
+                        break
+                    bit = 1 << card
+                    if allowed & bit:
+                        hands[seat] |= bit
+                        taken |= bit
+                        needed -= 1
+                if needed:
+                    complete = False
+                    break
+            if complete:
+                return hands
+        return None
+
+
+class PIMCSearch():
+    """Chooses the card to play by solving sampled layouts of the unseen cards.
+
+    choose(): -- return the card to play for a view.
+    get_samples(): -- return the number of layouts solved for the last choice.
+    """
+
+    def __init__(self, samples: int=32, time_budget: float|None=0.1, rng: Random=None):
+        """Initialize the search.
+
+        Keyword arguments:
+        samples: -- most layouts to solve for one decision.
+        time_budget: -- wall-clock seconds one decision may take, None for no limit.
+            At least one layout is solved.
+        rng: -- random number generator for the sampler.
+        """
+        self._samples = samples
+        self._time_budget = time_budget
+        self._sampler = DealSampler(rng)
+        self._last_samples = 0
+
+    def __repr__(self):
+        """Return the PIMCSearch object."""
+        return f'PIMCSearch(samples={self._samples}, time_budget={self._time_budget})'
+
+    # Public methods
+    def get_samples(self) -> int:
+        """Return the number of layouts solved for the last choice."""
+        return self._last_samples
+
+    def choose(self, view: PlayView) -> int:
+        """Return the legal card with the most tricks over the sampled layouts."""
+        legal = view.legal
+        self._last_samples = 0
+        if not legal & (legal - 1):
+            return legal.bit_length() - 1
+
+        deadline = None
+        if self._time_budget is not None:
+            deadline = time.perf_counter() + self._time_budget
+        sampler = self._sampler
+        sampler.prepare(view)
+        solver = Solver(view.trump, view.skipped)
+        totals = dict.fromkeys(card_list(legal), 0)
+
+        while self._last_samples < self._samples:
+            hands = sampler.sample()
+            if hands is None:
+                break
+            values = solver.move_values(hands, view.leader, view.trick)
+            for card, value in values.items():
+                totals[card] += value
+            self._last_samples += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        if not self._last_samples:
+            return lowest_card(legal, view.trump)
+
+        # Prefer the lower card when two cards do equally well
+        ranks = EFFECTIVE_RANK[view.trump]
+        return max(totals, key=lambda card: (totals[card], -ranks[card]))
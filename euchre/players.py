@@ -6,21 +6,28 @@ build_players(): -- build each player object.
 from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
+    from euchre.agents import Agent
     from euchre.cards import Card
     from euchre.teams import Team
     from euchre.trumps import Trump
 
-from colorama import just_fix_windows_console, Fore, Style
-just_fix_windows_console()
+from euchre.colors import RESET_ALL, YELLOW
 
-from euchre.constants import SUITS
+from euchre.agents import TerminalAgent
+from euchre.constants import MAX_CARD_HAND_LIMIT, PLAYER_COUNT, SUITS
+from euchre.engine import HandState
+from euchre.events import MESSAGE, STATUS, emit
+from euchre.masks import from_card, hand_from_cards
 
 
 # The base Player class
 class Player():
-    """The base class for Player objects.
+    """The base class for Player objects. Decisions are made by the Player's agent,
+    a TerminalAgent asking at the terminal unless another agent is given.
 
     get_name(): -- returns the name of the Player.
+    get_agent(): -- returns the agent making the Player's decisions.
+    set_agent(): -- set the agent making the Player's decisions.
     get_team(): -- returns the team object this Player is assigned.
     set_team(): -- assign the Player to the Team object.
     receive_card(): -- add the card object to the Player's hand of cards.
@@ -28,24 +35,26 @@ class Player():
     get_cards(): -- returns the list of  cards in the Player's hand.
     list_cards(): -- returns enumerated list of cards.
     filter_cards(): -- filters cards that are legal to play for the hand.
-    get_call(): -- get trump call from player after second round of bidding.
-    get_order(): -- get order to pick up revealed card to be trump in first round of bidding.
-    get_player_card(): -- get input from player to choose a card in hand.
+    get_player_card(): -- get a card to play or discard from the player's agent.
     get_player_status(): -- print player name and each card in hand.
     get_tricks(): -- return the tricks won for the round.
     set_tricks(): -- set the trick count increasing by one.
     is_alone(): -- returns status if Player is going alone this round.
     is_bot(): -- returns status if Player is a bot.
     set_alone(): -- set the alone status for the Player.
-    going_alone(): -- check if the player is going alone without a partner this round.
     reset(): -- reset the counters for the round.
     """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, agent: Agent=None):
         """Initialize player object. Player name assigned via argument name.
         _cards and _team are assigned external of initialization.
+
+        Keyword arguments:
+        name: -- the player's name.
+        agent: -- the agent making the player's decisions, a TerminalAgent if None.
         """
         self._name = name
+        self._agent = agent if agent is not None else TerminalAgent()
         self._cards = []
         self._team = None
         self._tricks = 0
@@ -56,7 +65,7 @@ class Player():
     def __str__(self):
         """Return human-friendly version of player."""
         if not self._is_bot:
-            return f'{Fore.YELLOW}{self._name}{Style.RESET_ALL}'
+            return f'{YELLOW}{self._name}{RESET_ALL}'
         return f'{self._name}'
     
     def __repr__(self):
@@ -67,6 +76,14 @@ class Player():
     def get_name(self) -> str:
         """Return the player's name."""
         return self._name
+
+    def get_agent(self) -> Agent:
+        """Return the agent making the player's decisions."""
+        return self._agent
+
+    def set_agent(self, agent: Agent):
+        """Set the agent making the player's decisions."""
+        self._agent = agent
     
     def get_team(self) -> Team:
         """Return the team object the player is assigned."""
@@ -86,8 +103,8 @@ class Player():
             try:
                 self._cards.remove(card)
             except ValueError as e:
-                print("Card doesn't exist in the player's hand.")
-                print(e)
+                emit(MESSAGE, text="Card doesn't exist in the player's hand.")
+                emit(MESSAGE, text=str(e))
     
     def get_cards(self) -> list[Card]:
         """Returns the list of cards in players hand. Cards are sorted by rank and suit."""
@@ -138,86 +155,46 @@ class Player():
 
         return legal_list
     
-    def get_call(self, previous_revealed: Card) -> str:
-        """Get call from the player. Only acceptable options are 'Hearts', 'Spades', 'Diamonds', or 'Clubs'.
-        Player cannot chose the trump that was already bidded.
-
-        Keyword arguments:
-        previous_revealed: -- Revealed card from the top of deck.
-        """
-        if not previous_revealed:
-            return
-        
-        suit = previous_revealed.get_suit().lower()
-        call = None
-        while call is None:
-            call = input("Enter suit ({}) for trump or pass: -> ".format(', '.join(suit for suit in SUITS)))
-            if call.lower() == 'pass':
-                return call.lower()
-            elif call.lower() != suit:
-                if call.capitalize() in SUITS:
-                    return call.capitalize()
-                else:
-                    call = None
-            else:
-                call = None
-
-    def get_order(self, revealed: Card) -> str:
-        """Get order from the player. Only acceptable options are 'order' or 'pass'.
+    def get_player_card(self, legal_card_list: list[tuple [int, Card]], trump: Trump=None) -> int:
+        """Get the player's agent to choose a card from the list in hand. Returns
+        number assignment (integer) of card to play. A dealer holding too many cards
+        after picking up is asked for a discard instead.
 
-        Keyword arguments:
-        revealed: -- Revealed card from the top of deck.
-        """
-        if not revealed:
-            return
-        
-        order = None
-        while order is None:
-            order = input(f'Order {revealed} or pass?: -> ')
-            print('\n')
-            if (order.lower() == 'order' or order.lower() == 'yes') or order.lower() == 'pass':
-                return order.lower()
-            else:
-                order = None
-
-    def get_player_card(self, legal_card_list: list[tuple [int, Card]]) -> int:
-        """Get player input choosing a card from the list in hand. Returns 
-        number assignment (integer) of card to play.
+        The agent is shown only the player's own hand, at seat 0. Agents that read
+        the rest of the table, like the search bots, are asked by the GameEngine.
 
         Keyword arguments:
         legal_card_list: -- List of cards able to be played this round.
+        trump: -- the trump for the round, None before it is made.
         """
         if not legal_card_list:
             return
-                
-        card = None
-        while card is None:
-            card = input("Enter the number of a card you'd like to choose: -> ")
-            if card.isdigit():
-                if int(card) <= len(legal_card_list) and int(card) > 0:
-                    return int(card)
-                else:
-                    card = None    
-            else:
-                card = None
-
-    def get_player_status(self, cards:list[tuple [int, Card]]=None, trump: Trump=None):
-        """Print the player's name and the current legal cards in their respective hand of cards."""
-        print('\n')
-        print('-' * 40)
-        print(f'\tPLAYER: {self._name} \tTEAM: {self._team.get_name()}')
-        print('-' * 40)
+
+        hands = [0] * PLAYER_COUNT
+        hands[0] = hand_from_cards(self._cards)
+        state = HandState(PLAYER_COUNT - 1, hands, [None])
         if trump:
-            print(f'CARDS IN HAND: \t\tTRUMP: {trump.get_suit()}')
-        else:
-            print(f'CARDS IN HAND: ')
-        if cards:
-            for card in cards:
-                print(f'\t{card[0]}. {card[1]}')
+            state.trump = SUITS.index(trump.get_suit())
+        if len(self._cards) > MAX_CARD_HAND_LIMIT:
+            card = self._agent.discard(state, 0)
         else:
-            for card in self.list_cards():
-                print(f'\t{card[0]}. {card[1]}')
-        print('-' * 40)
+            legal = hand_from_cards([card for _, card in legal_card_list])
+            card = self._agent.play(state, 0, legal)
+
+        for number, legal_card in legal_card_list:
+            if from_card(legal_card) == card:
+                return number
+        raise ValueError(f'{self._name} chose a card that is not legal to play.')
+
+    def get_player_status(self, cards:list[tuple [int, Card]]=None, trump: Trump=None, bidding: bool=False):
+        """Print the player's name and the current legal cards in their respective hand of cards.
+
+        Keyword arguments:
+        cards: -- enumerated list of cards to show, every card in hand if None.
+        trump: -- the current trump for the round, None before it is made.
+        bidding: -- True if the player is about to bid rather than play or discard.
+        """
+        emit(STATUS, player=self, cards=cards or self.list_cards(), trump=trump, bidding=bidding)
 
     def get_tricks(self) -> int:
         """Return current tricks (hands) won this round."""
@@ -242,26 +219,6 @@ class Player():
             return
         self._is_alone = False
 
-    def going_alone(self) -> bool:
-        """Check if player wants to go alone this round for more points.
-        
-        Keyword arguments:
-        player: -- player in question, to set is_alone status.
-        """
-        while True:
-            is_alone = input("Are you going alone?: -> ")
-            match is_alone.lower():
-                case 'yes':
-                    self.set_alone(True)
-                    partner = self._get_partner()
-                    self._set_partner_skipped(partner)
-                    print(f'{self._name} is going alone.')
-                    return True
-                case 'no':
-                    self.set_alone(False)
-                    print(f'{self._name} is not going alone.')
-                    return False
-                
     def get_skipped(self):
         """Returns True if player is skipped this round."""
         return self._is_skipped
@@ -332,7 +289,7 @@ class Player():
 def build_players(names: list[str]) -> list[Player]:
     """Create Player objects based on names list."""
     if not names:
-        print("WARNING: NO NAMES TO CREATE PLAYER OBJECTS. EXITING BUILDER.")
+        emit(MESSAGE, text="WARNING: NO NAMES TO CREATE PLAYER OBJECTS. EXITING BUILDER.")
         return
        
     players = [Player(name) for name in names]
@@ -0,0 +1,213 @@
+"""The profiling module times the phases of the game loop when asked to.
+
+Functions are marked with the timed() decorator and a phase name. While no
+Profiler is active a timed function costs one extra call and a None check;
+while one is active every call is timed with perf_counter_ns and kept, so the
+summary has the count, total and p50/p95/p99 of every phase. Output goes
+through the event sink and is timed by events.ProfilingSink.
+`python -m euchre --profile` runs a game with a Profiler and cProfile and
+writes a JSON summary of the phases and a pstats file.
+
+PhaseStats(): -- timing summary of one phase.
+Profiler(): -- keeps the durations of every timed phase.
+timed(): -- decorator that times a function as a phase.
+timed_steps(): -- decorator that times a generator function as a phase.
+get_profiler(): -- return the active Profiler, None if profiling is off.
+set_profiler(): -- make a Profiler active, None to turn profiling off.
+use_profiler(): -- context manager that makes a Profiler active for a block.
+"""
+from __future__ import annotations
+import math
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Callable, Iterator, NamedTuple
+
+# Version of the JSON summary layout
+SUMMARY_VERSION = 1
+
+
+class PhaseStats(NamedTuple):
+    """Timing summary of one phase, durations in seconds."""
+    name: str
+    count: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class Profiler():
+    """Keeps the duration of every call of every timed phase.
+
+    record(): -- add a duration to a phase.
+    phase(): -- context manager that times a block as a phase.
+    get_stats(): -- return the PhaseStats of every phase.
+    summary(): -- return the stats as a dict ready for JSON.
+    report(): -- return the stats as lines of a table.
+    save(): -- write the summary to a JSON file.
+    """
+
+    def __init__(self):
+        """Initialize the Profiler with no phases."""
+        # phase name: durations in nanoseconds
+        self._samples = {}
+
+    def __repr__(self):
+        """Return the Profiler object."""
+        return f'Profiler(phases={len(self._samples)})'
+
+    # Public methods
+    def record(self, name: str, nanoseconds: int):
+        """Add one duration to a phase.
+
+        Keyword arguments:
+        name: -- name of the phase.
+        nanoseconds: -- how long the call took.
+        """
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = []
+        samples.append(nanoseconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the block as one call of the phase."""
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter_ns() - start)
+
+    def get_stats(self) -> list[PhaseStats]:
+        """Return the PhaseStats of every phase, most total time first."""
+        stats = []
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            stats.append(PhaseStats(
+                name, len(ordered), sum(ordered) / 1e9,
+                _percentile(ordered, 0.50), _percentile(ordered, 0.95), _percentile(ordered, 0.99),
+            ))
+        stats.sort(key=lambda phase: phase.total, reverse=True)
+        return stats
+
+    def summary(self) -> dict:
+        """Return the stats of every phase as a dict ready for JSON."""
+        return {
+            'version': SUMMARY_VERSION,
+            'phases': {
+                phase.name: {
+                    'count': phase.count,
+                    'total_s': phase.total,
+                    'p50_s': phase.p50,
+                    'p95_s': phase.p95,
+                    'p99_s': phase.p99,
+                }
+                for phase in self.get_stats()
+            },
+        }
+
+    def report(self) -> list[str]:
+        """Return the stats of every phase as lines of a table, times in milliseconds."""
+        lines = [f'{"phase":<28}{"count":>8}{"total":>12}{"p50":>10}{"p95":>10}{"p99":>10}']
+        for phase in self.get_stats():
+            lines.append(
+                f'{phase.name:<28}{phase.count:>8}{phase.total * 1e3:>12.3f}'
+                f'{phase.p50 * 1e3:>10.4f}{phase.p95 * 1e3:>10.4f}{phase.p99 * 1e3:>10.4f}'
+            )
+        return lines
+
+    def save(self, path: str):
+        """Write the summary to a JSON file.
+
+        Keyword arguments:
+        path: -- file to write.
+        """
+        import json
+        with open(path, 'w') as file:
+            json.dump(self.summary(), file, indent=2)
+            file.write('\n')
+
+
+_profiler = None
+
+
+def timed(name: str) -> Callable:
+    """Decorator that times every call of the function as the phase name while
+    a Profiler is active.
+
+    Keyword arguments:
+    name: -- name of the phase.
+    """
+    def decorate(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+def timed_steps(name: str) -> Callable:
+    """Decorator that times a generator function, like the engine's steps of a
+    hand, as the phase name while a Profiler is active. A call is timed from its
+    first step until it returns, including the time its Decisions took to answer.
+
+    Keyword arguments:
+    name: -- name of the phase.
+    """
+    def decorate(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return (yield from func(*args, **kwargs))
+            start = perf_counter_ns()
+            try:
+                return (yield from func(*args, **kwargs))
+            finally:
+                profiler.record(name, perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+def get_profiler() -> Profiler|None:
+    """Return the active Profiler, None if profiling is off."""
+    return _profiler
+
+
+def set_profiler(profiler: Profiler|None) -> Profiler|None:
+    """Make the Profiler active, or turn profiling off with None. Returns the
+    Profiler it replaces.
+
+    Keyword arguments:
+    profiler: -- the Profiler timed phases are recorded in.
+    """
+    global _profiler
+    previous = _profiler
+    _profiler = profiler
+    return previous
+
+
+@contextmanager
+def use_profiler(profiler: Profiler) -> Iterator[Profiler]:
+    """Make the Profiler active for the block, then restore the previous one."""
+    previous = set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        set_profiler(previous)
+
+
+def _percentile(ordered: list[int], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted nanosecond samples, in seconds."""
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1] / 1e9
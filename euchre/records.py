@@ -0,0 +1,372 @@
+"""The records module stores played hands in a compact binary file.
+
+Every hand is one fixed-width record of 32 bytes, so a file of records can be
+appended to while games are played and read back at any position without an
+index. A record holds the whole hand: the dealer, the four hands as they were
+dealt, the turned card and the dealer's discard, every bid, the trump, the
+maker and whether they went alone, every card played and the points scored.
+The kitty is the four cards that are in no hand.
+
+Record files start with a 16 byte header:
+
+    magic b'EURC', version (uint16), record size (uint16), 8 reserved bytes
+
+followed by the records. A record is a 256 bit little-endian integer with
+these fields, lowest bits first, and the last 8 bits unused:
+
+    dealer 2, trump 3, maker 3, alone 1, the four dealt hands 24 each,
+    turned card 5, discard 5, bid count 4, bids 3 each (8),
+    cards played 5 each (20), winning team 2, points 3
+
+Missing values (no trump, no discard, unplayed cards) use the all ones value
+of their field. Bids are in bidding order starting left of the dealer, so the
+seat of every bid is known from the dealer. Cards are in playing order; the
+seat of each card follows from the leader and the trick winners.
+
+HandRecord(): -- one played hand.
+record_hand(): -- return the HandRecord of a finished engine hand.
+pack_record(): -- return the bytes of a HandRecord.
+unpack_record(): -- return the HandRecord stored in bytes.
+RecordWriter(): -- appends records to a file, usable as a GameEngine recorder.
+RecordReader(): -- random access to the records of a file through a memory map.
+iter_records(): -- generator over the records of a file, read in blocks.
+"""
+from __future__ import annotations
+from typing import Iterator, NamedTuple
+
+import mmap
+import os
+import struct
+
+from euchre.constants import MAX_CARD_HAND_LIMIT, PLAYER_COUNT
+from euchre.engine import ORDER, HandResult, HandState
+from euchre.masks import CARD_COUNT, FULL_DECK, trick_winner
+
+RECORD_MAGIC = b'EURC'
+RECORD_VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+RECORD_SIZE = 32
+
+# Most bids in a hand: two rounds around the table
+MAX_BIDS = 2 * PLAYER_COUNT
+MAX_PLAYS = PLAYER_COUNT * MAX_CARD_HAND_LIMIT
+
+# Field widths in bits, in the order they are packed
+SEAT_BITS = 2
+SUIT_BITS = 3
+MAKER_BITS = 3
+HAND_BITS = CARD_COUNT
+CARD_BITS = 5
+COUNT_BITS = 4
+BID_BITS = 3
+POINTS_BITS = 3
+
+NO_SUIT = (1 << SUIT_BITS) - 1
+NO_MAKER = (1 << MAKER_BITS) - 1
+NO_CARD = (1 << CARD_BITS) - 1
+NO_TEAM = (1 << SEAT_BITS) - 1
+
+# Bid codes: pass, order, then 2 + the suit index called
+PASS_CODE = 0
+ORDER_CODE = 1
+CALL_CODE = 2
+
+# Records read at a time by iter_records
+READ_BLOCK = 4096
+
+
+class HandRecord(NamedTuple):
+    """One played hand. Seats are numbered 0-3 and seat % 2 is the team.
+
+    dealer: -- seat of the dealer.
+    hands: -- card mask of each seat's hand as dealt.
+    turned: -- the card turned up for bidding.
+    discard: -- the card the dealer discarded after picking up, None if nobody picked up.
+    bids: -- (seat, action) for every bid, where action is 'order', 'pass' or the suit index called.
+    trump: -- suit index of trump, None if every seat passed.
+    maker: -- seat that made trump, None if every seat passed.
+    alone: -- True if the maker went alone.
+    plays: -- card numbers in the order they were played.
+    winner: -- team that scored, None if nobody did.
+    points: -- points the winning team scored.
+    """
+    dealer: int
+    hands: tuple[int, int, int, int]
+    turned: int
+    discard: int|None
+    bids: tuple
+    trump: int|None
+    maker: int|None
+    alone: bool
+    plays: tuple
+    winner: int|None
+    points: int
+
+    def kitty(self) -> int:
+        """Return the card mask of the four cards that were not dealt."""
+        hands = self.hands
+        return FULL_DECK ^ (hands[0] | hands[1] | hands[2] | hands[3])
+
+    def tricks(self) -> list[tuple[int, list[tuple[int, int]], int]]:
+        """Return (leader, [(seat, card), ...], winner) for every trick, like HandState.tricks."""
+        if self.trump is None:
+            return []
+        skipped = (self.maker + 2) % PLAYER_COUNT if self.alone else None
+        seats = PLAYER_COUNT - (1 if self.alone else 0)
+        leader = (self.dealer + 1) % PLAYER_COUNT
+        tricks = []
+        for start in range(0, len(self.plays), seats):
+            cards = self.plays[start:start + seats]
+            order = [(leader + offset) % PLAYER_COUNT for offset in range(PLAYER_COUNT)]
+            order = [seat for seat in order if seat != skipped]
+            trick = list(zip(order, cards))
+            winner = trick[trick_winner(list(cards), self.trump)][0]
+            tricks.append((leader, trick, winner))
+            leader = winner
+        return tricks
+
+
+def record_hand(state: HandState, result: HandResult) -> HandRecord:
+    """Return the HandRecord of a hand the engine has finished.
+
+    Keyword arguments:
+    state: -- the HandState at the end of the hand.
+    result: -- the HandResult of the hand.
+    """
+    plays = tuple(card for _, trick, _ in state.tricks for _, card in trick)
+    return HandRecord(
+        state.dealer, state.dealt, state.turned, state.discard, tuple(state.bids),
+        state.trump, state.maker, state.alone, plays, result.winner, result.points,
+    )
+
+
+def pack_record(record: HandRecord) -> bytes:
+    """Return the RECORD_SIZE bytes of the record."""
+    if len(record.bids) > MAX_BIDS or len(record.plays) > MAX_PLAYS:
+        raise ValueError('Too many bids or plays for one hand.')
+
+    fields = [
+        (record.dealer, SEAT_BITS),
+        (NO_SUIT if record.trump is None else record.trump, SUIT_BITS),
+        (NO_MAKER if record.maker is None else record.maker, MAKER_BITS),
+        (1 if record.alone else 0, 1),
+    ]
+    for hand in record.hands:
+        fields.append((hand, HAND_BITS))
+    fields.append((record.turned, CARD_BITS))
+    fields.append((NO_CARD if record.discard is None else record.discard, CARD_BITS))
+    fields.append((len(record.bids), COUNT_BITS))
+    for index in range(MAX_BIDS):
+        code = PASS_CODE
+        if index < len(record.bids):
+            action = record.bids[index][1]
+            if action == ORDER:
+                code = ORDER_CODE
+            elif action != 'pass':
+                code = CALL_CODE + action
+        fields.append((code, BID_BITS))
+    for index in range(MAX_PLAYS):
+        fields.append((record.plays[index] if index < len(record.plays) else NO_CARD, CARD_BITS))
+    fields.append((NO_TEAM if record.winner is None else record.winner, SEAT_BITS))
+    fields.append((record.points, POINTS_BITS))
+
+    packed = 0
+    shift = 0
+    for value, bits in fields:
+        packed |= value << shift
+        shift += bits
+    return packed.to_bytes(RECORD_SIZE, 'little')
+
+
+def unpack_record(data: bytes, offset: int=0) -> HandRecord:
+    """Return the HandRecord stored in the data at the offset."""
+    packed = int.from_bytes(data[offset:offset + RECORD_SIZE], 'little')
+
+    def take(bits: int) -> int:
+        nonlocal packed
+        value = packed & ((1 << bits) - 1)
+        packed >>= bits
+        return value
+
+    dealer = take(SEAT_BITS)
+    trump = take(SUIT_BITS)
+    maker = take(MAKER_BITS)
+    alone = bool(take(1))
+    hands = tuple(take(HAND_BITS) for _ in range(PLAYER_COUNT))
+    turned = take(CARD_BITS)
+    discard = take(CARD_BITS)
+    bid_count = take(COUNT_BITS)
+
+    bids = []
+    for index in range(MAX_BIDS):
+        code = take(BID_BITS)
+        if index >= bid_count:
+            continue
+        seat = (dealer + 1 + index) % PLAYER_COUNT
+        if code == PASS_CODE:
+            bids.append((seat, 'pass'))
+        elif code == ORDER_CODE:
+            bids.append((seat, ORDER))
+        else:
+            bids.append((seat, code - CALL_CODE))
+
+    plays = []
+    for _ in range(MAX_PLAYS):
+        card = take(CARD_BITS)
+        if card != NO_CARD:
+            plays.append(card)
+    winner = take(SEAT_BITS)
+    points = take(POINTS_BITS)
+
+    return HandRecord(
+        dealer, hands, turned,
+        None if discard == NO_CARD else discard,
+        tuple(bids),
+        None if trump == NO_SUIT else trump,
+        None if maker == NO_MAKER else maker,
+        alone, tuple(plays),
+        None if winner == NO_TEAM else winner,
+        points,
+    )
+
+
+def _check_header(data: bytes, path: str):
+    """Raise ValueError if the data does not start with a record file header."""
+    if len(data) < HEADER.size:
+        raise ValueError(f'{path} is not a record file.')
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != RECORD_MAGIC:
+        raise ValueError(f'{path} is not a record file.')
+    if version != RECORD_VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f'{path} is record version {version}, expected {RECORD_VERSION}.')
+
+
+class RecordWriter():
+    """Appends records to a file, writing the header if the file is new. Can be
+    passed to GameEngine as its recorder to keep every hand that is played.
+
+    write(): -- append a HandRecord.
+    record(): -- append the record of a finished engine hand.
+    get_count(): -- return the number of records written by this writer.
+    close(): -- flush and close the file.
+    """
+
+    def __init__(self, path: str):
+        """Open the record file at the path for appending. Raises ValueError if the
+        file exists and is not a record file of this version.
+        """
+        self._path = path
+        self._count = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, 'rb') as f:
+                _check_header(f.read(HEADER.size), path)
+        self._file = open(path, 'ab')
+        if not exists:
+            self._file.write(HEADER.pack(RECORD_MAGIC, RECORD_VERSION, RECORD_SIZE))
+
+    def __repr__(self):
+        """Return the RecordWriter object."""
+        return f'RecordWriter({self._path!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Public methods
+    def write(self, record: HandRecord):
+        """Append the record to the file."""
+        self._file.write(pack_record(record))
+        self._count += 1
+
+    def record(self, state: HandState, result: HandResult):
+        """Append the record of a hand the engine has finished."""
+        self.write(record_hand(state, result))
+
+    def get_count(self) -> int:
+        """Return the number of records written by this writer."""
+        return self._count
+
+    def close(self):
+        """Flush and close the file."""
+        if not self._file.closed:
+            self._file.close()
+
+
+class RecordReader():
+    """Random access to the records of a file through a read-only memory map.
+
+    get_record(): -- return the record at a position, same as reader[index].
+    close(): -- release the memory map.
+    """
+
+    def __init__(self, path: str):
+        """Memory map the record file at the path. Raises ValueError if it is not a
+        record file of this version.
+        """
+        self._path = path
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _check_header(self._data, path)
+        except ValueError:
+            self._data.close()
+            raise
+        self._count = (len(self._data) - HEADER.size) // RECORD_SIZE
+
+    def __repr__(self):
+        """Return the RecordReader object."""
+        return f'RecordReader({self._path!r})'
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> HandRecord:
+        return self.get_record(index)
+
+    def __iter__(self) -> Iterator[HandRecord]:
+        for index in range(self._count):
+            yield unpack_record(self._data, HEADER.size + index * RECORD_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Public methods
+    def get_record(self, index: int) -> HandRecord:
+        """Return the record at the position, counting from 0. Negative positions
+        count from the end.
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('record index out of range')
+        return unpack_record(self._data, HEADER.size + index * RECORD_SIZE)
+
+    def close(self):
+        """Release the memory map."""
+        self._data.close()
+
+
+def iter_records(path: str, start: int=0) -> Iterator[HandRecord]:
+    """Yield the records of the file in order, reading it in blocks of records.
+    A partly written record at the end of the file is skipped.
+
+    Keyword arguments:
+    path: -- the record file.
+    start: -- position of the first record to yield.
+    """
+    with open(path, 'rb') as f:
+        _check_header(f.read(HEADER.size), path)
+        f.seek(HEADER.size + start * RECORD_SIZE)
+        while True:
+            block = f.read(READ_BLOCK * RECORD_SIZE)
+            whole = len(block) - len(block) % RECORD_SIZE
+            for offset in range(0, whole, RECORD_SIZE):
+                yield unpack_record(block, offset)
+            if whole < READ_BLOCK * RECORD_SIZE:
+                return
@@ -0,0 +1,348 @@
+"""The replay module plays recorded games back through the engine at simulation speed.
+
+A game can be reproduced two ways. From its hand records (records.HandRecord,
+as written by records.RecordWriter), the engine deals each recorded deal and
+a LogAgent answers every decision with the recorded action, so nothing waits,
+prompts, prints or thinks. From its seed, the engine is built again with the
+same seeded random number generator and deterministic agents, and plays the
+same game.
+
+Replays from records are verified as they go: every trick must have the
+recorded seats, cards and winner, and the hand must score the recorded
+winner and points and pack to the same record bytes, or ReplayError names the
+first difference. A replay can stop at any hand and trick, leaving a Replay
+paused at that decision: step it on with the record, or with other agents to
+see what would have happened. Earlier hands are skipped by adding up their
+recorded points rather than playing them.
+
+ReplayError: -- a replay that does not match its record.
+LogAgent(): -- answers every decision of a hand with the recorded actions.
+Replay(): -- a hand paused part way through a replay.
+replay_hand(): -- replay one hand record and return the HandResult.
+replay_game(): -- replay the hand records of a game and return the GameResult.
+fast_forward(): -- replay the records of a game up to a hand and trick.
+seek(): -- play a seeded game up to a hand and trick.
+"""
+from __future__ import annotations
+from typing import Generator, Sequence
+
+from euchre.constants import PLAYER_COUNT, POINTS_TO_WIN
+from euchre.engine import CALL, ORDER, PLAY, Decision, GameEngine, GameResult, HandResult, HandState, decide
+from euchre.masks import card_list
+from euchre.records import HandRecord, pack_record, record_hand
+
+
+class ReplayError(ValueError):
+    """A replayed hand that does not match its record."""
+
+
+class LogAgent():
+    """Answers every decision of one hand with the actions of its HandRecord, in
+    order. Raises ReplayError when the engine asks for a decision the record does
+    not have.
+
+    order(): -- return the recorded first round bid.
+    call(): -- return the recorded second round bid.
+    alone(): -- return whether the maker went alone.
+    discard(): -- return the recorded discard.
+    play(): -- return the next recorded card.
+    """
+
+    def __init__(self, record: HandRecord, bids: int=0, plays: int=0):
+        """Initialize the agent at the start of the record.
+
+        Keyword arguments:
+        record: -- the HandRecord to answer from.
+        bids: -- number of recorded bids already made.
+        plays: -- number of recorded cards already played.
+        """
+        self._record = record
+        self._bids = bids
+        self._plays = plays
+
+    def __repr__(self):
+        """Return the LogAgent object."""
+        return f'LogAgent(bids={self._bids}, plays={self._plays})'
+
+    # Public methods
+    def order(self, state: HandState, seat: int) -> bool:
+        """Return the recorded first round bid of the seat."""
+        return self._bid(seat, ORDER) == 'order'
+
+    def call(self, state: HandState, seat: int) -> int|None:
+        """Return the suit the seat called, None for a pass."""
+        action = self._bid(seat, CALL)
+        return None if action == 'pass' else action
+
+    def alone(self, state: HandState, seat: int) -> bool:
+        """Return True if the maker went alone."""
+        return self._record.alone
+
+    def discard(self, state: HandState, seat: int) -> int:
+        """Return the card the dealer discarded."""
+        if self._record.discard is None:
+            raise ReplayError(f'Seat {seat} discards, but the record has no discard.')
+        return self._record.discard
+
+    def play(self, state: HandState, seat: int, legal: int) -> int:
+        """Return the next recorded card."""
+        if self._plays >= len(self._record.plays):
+            raise ReplayError(f'Seat {seat} plays, but the record has only {len(self._record.plays)} cards.')
+        card = self._record.plays[self._plays]
+        if not legal >> card & 1:
+            raise ReplayError(f'Seat {seat} cannot play the recorded card {card}.')
+        self._plays += 1
+        return card
+
+    # Private methods
+    def _bid(self, seat: int, kind: str) -> object:
+        """Return the next recorded bid, checking the seat making it."""
+        bids = self._record.bids
+        if self._bids >= len(bids):
+            raise ReplayError(f'Seat {seat} bids ({kind}), but the record has only {len(bids)} bids.')
+        recorded_seat, action = bids[self._bids]
+        if recorded_seat != seat:
+            raise ReplayError(f'Bid {self._bids} is by seat {recorded_seat} in the record, not seat {seat}.')
+        self._bids += 1
+        return action
+
+
+class Replay():
+    """A hand paused part way through a replay, at a decision.
+
+    get_decision(): -- return the Decision the replay is paused at.
+    get_state(): -- return the HandState of the hand.
+    get_engine(): -- return the GameEngine playing the hand.
+    get_record(): -- return the HandRecord being replayed, None for a seeded game.
+    step(): -- answer the decision with any answer, leaving the record.
+    advance(): -- follow the record to the lead of a trick.
+    finish(): -- play the rest of the hand and return the HandResult.
+    """
+
+    def __init__(self, engine: GameEngine, steps: Generator, decision: Decision|None,
+                 record: HandRecord=None, log: LogAgent=None, result: HandResult=None):
+        """Initialize the paused replay.
+
+        Keyword arguments:
+        engine: -- the GameEngine playing the hand.
+        steps: -- the engine's hand_steps generator for the hand.
+        decision: -- the Decision the hand is paused at, None once it is over.
+        record: -- the HandRecord being replayed, None for a seeded game.
+        log: -- the LogAgent answering from the record, at the paused decision.
+        result: -- the HandResult, once the hand is over.
+        """
+        self._engine = engine
+        self._steps = steps
+        self._decision = decision
+        self._record = record
+        self._log = log
+        self._result = result
+        self._state = decision.state if decision else None
+        self._verified = 0
+        self._left = False
+
+    def __repr__(self):
+        """Return the Replay object."""
+        decision = self._decision
+        where = f'{decision.kind} by seat {decision.seat}' if decision else 'over'
+        return f'Replay({where})'
+
+    # Public methods
+    def get_decision(self) -> Decision|None:
+        """Return the Decision the replay is paused at, None once the hand is over."""
+        return self._decision
+
+    def get_state(self) -> HandState:
+        """Return the HandState of the hand, as played so far."""
+        return self._state
+
+    def get_engine(self) -> GameEngine:
+        """Return the GameEngine playing the hand."""
+        return self._engine
+
+    def get_record(self) -> HandRecord|None:
+        """Return the HandRecord being replayed, None for a seeded game."""
+        return self._record
+
+    def step(self, answer: object) -> Decision|None:
+        """Answer the paused decision with any answer and return the next decision,
+        None once the hand is over. The hand leaves the record: it is no longer
+        verified and has to be played on with agents.
+        """
+        if self._decision is None:
+            raise ValueError('The hand is over.')
+        self._left = self._record is not None
+        self._send(answer)
+        return self._decision
+
+    def advance(self, trick: int) -> Decision:
+        """Follow the record, or the engine's agents for a seeded game, to the lead
+        of a trick and return the decision there. Verifies every trick on the way.
+
+        Keyword arguments:
+        trick: -- number of the trick, from 0.
+        """
+        while True:
+            decision = self._decision
+            if decision is None:
+                raise ValueError(f'The hand is over before trick {trick}.')
+            if decision.kind == PLAY and not decision.state.trick and len(decision.state.tricks) == trick:
+                return decision
+            self._follow()
+
+    def finish(self, agents: Sequence=None) -> HandResult:
+        """Play the rest of the hand and return the HandResult. Without agents the
+        hand follows the record, or the engine's agents for a seeded game, and is
+        verified against the record; with agents it is played on by them.
+
+        Keyword arguments:
+        agents: -- the agent of every seat, None to follow the record.
+        """
+        while self._decision is not None:
+            if agents is None:
+                self._follow()
+            else:
+                self._left = self._record is not None
+                self._send(decide(agents[self._decision.seat], self._decision))
+        if self._record is not None and not self._left:
+            self._verify_result()
+        return self._result
+
+    # Private methods
+    def _send(self, answer: object):
+        """Send the answer into the hand and keep the next decision, or the result."""
+        try:
+            self._decision = self._steps.send(answer)
+        except StopIteration as stop:
+            self._decision = None
+            self._result = stop.value
+
+    def _follow(self):
+        """Answer the paused decision from the record and verify any finished trick."""
+        decision = self._decision
+        if self._record is None:
+            self._send(decide(self._engine.get_agents()[decision.seat], decision))
+            return
+        if self._left:
+            raise ValueError('The hand has left the record, play it on with agents.')
+        self._send(decide(self._log, decision))
+        self._check_tricks()
+
+    def _check_tricks(self):
+        """Check every trick finished since the last check against the record."""
+        state = self._state
+        recorded = None
+        while self._verified < len(state.tricks):
+            if recorded is None:
+                recorded = self._record.tricks()
+            number = self._verified
+            if number >= len(recorded) or tuple(state.tricks[number][1]) != tuple(recorded[number][1]):
+                raise ReplayError(f'Trick {number} was played as {state.tricks[number][1]}, '
+                                  f'not as recorded.')
+            if state.tricks[number][2] != recorded[number][2]:
+                raise ReplayError(f'Trick {number} was won by seat {state.tricks[number][2]}, '
+                                  f'the record says seat {recorded[number][2]}.')
+            self._verified += 1
+
+    def _verify_result(self):
+        """Raise ReplayError if the replayed hand does not score or pack like the record."""
+        record, result = self._record, self._result
+        if (result.winner, result.points) != (record.winner, record.points):
+            raise ReplayError(f'The hand scored {result.points} points for team {result.winner}, '
+                              f'the record says {record.points} for team {record.winner}.')
+        if pack_record(record_hand(self._state, result)) != pack_record(record):
+            raise ReplayError('The replayed hand does not pack to the recorded bytes.')
+
+
+def replay_hand(record: HandRecord, engine: GameEngine=None) -> HandResult:
+    """Replay one hand record, verifying every trick and the score. Returns the
+    HandResult. Raises ReplayError at the first difference from the record.
+
+    Keyword arguments:
+    record: -- the HandRecord to replay.
+    engine: -- the GameEngine to play it on, for its scores; a new one if None.
+    """
+    return _start(record, engine).finish()
+
+
+def replay_game(records: Sequence[HandRecord], points_to_win: int=POINTS_TO_WIN) -> GameResult:
+    """Replay the hand records of one game in order, verifying every hand.
+    Returns the GameResult. Raises ReplayError at the first difference.
+
+    Keyword arguments:
+    records: -- the HandRecord of every hand of the game.
+    points_to_win: -- points a team needs to win the game.
+    """
+    if not records:
+        raise ValueError('A game needs at least one hand record.')
+    engine = _engine(records[0].dealer, (0, 0), points_to_win)
+    hands = []
+    for number, record in enumerate(records):
+        try:
+            hands.append(replay_hand(record, engine))
+        except ReplayError as e:
+            raise ReplayError(f'Hand {number}: {e}') from None
+    scores = engine.get_scores()
+    winner = 0 if scores[0] >= scores[1] else 1
+    return GameResult(winner, scores, hands)
+
+
+def fast_forward(records: Sequence[HandRecord], hand: int, trick: int=None) -> Replay:
+    """Jump to a hand of a recorded game and replay it up to a trick. The hands
+    before it are not played: the scores are the sum of their recorded points.
+    Returns the Replay paused there.
+
+    Keyword arguments:
+    records: -- the HandRecord of every hand of the game.
+    hand: -- number of the hand to stop in, from 0.
+    trick: -- number of the trick to stop at the lead of, from 0; None to stop
+        at the first bid of the hand.
+    """
+    if not 0 <= hand < len(records):
+        raise ValueError(f'The game has {len(records)} hands, there is no hand {hand}.')
+    scores = [0, 0]
+    for record in records[:hand]:
+        if record.winner is not None:
+            scores[record.winner] += record.points
+    record = records[hand]
+    replay = _start(record, _engine(record.dealer, tuple(scores)))
+    if trick is not None:
+        replay.advance(trick)
+    return replay
+
+
+def seek(engine: GameEngine, hand: int, trick: int=None) -> Replay:
+    """Play a game on the engine with its own agents up to a hand and trick, as
+    when the engine was built again from the game's seed. Returns the Replay
+    paused there.
+
+    Keyword arguments:
+    engine: -- a new GameEngine with the game's seeded rng and deterministic agents.
+    hand: -- number of the hand to stop in, from 0.
+    trick: -- number of the trick to stop at the lead of, from 0; None to stop
+        at the first decision of the hand.
+    """
+    for _ in range(hand):
+        engine.play_hand()
+    steps = engine.hand_steps()
+    replay = Replay(engine, steps, next(steps))
+    if trick is not None:
+        replay.advance(trick)
+    return replay
+
+
+def _engine(dealer: int, scores: tuple[int, int], points_to_win: int=POINTS_TO_WIN) -> GameEngine:
+    """Return a GameEngine for replays. Its agents are never asked, the records answer."""
+    return GameEngine([None] * PLAYER_COUNT, dealer=dealer, points_to_win=points_to_win, scores=scores)
+
+
+def _start(record: HandRecord, engine: GameEngine=None) -> Replay:
+    """Deal the recorded hand on the engine and return the Replay at its first decision."""
+    if engine is None:
+        engine = _engine(record.dealer, (0, 0))
+    if engine.get_dealer() != record.dealer:
+        raise ReplayError(f'The record is dealt by seat {record.dealer}, the engine deals from seat {engine.get_dealer()}.')
+    kitty = [record.turned] + [card for card in card_list(record.kitty()) if card != record.turned]
+    steps = engine.hand_steps((list(record.hands), kitty))
+    return Replay(engine, steps, next(steps), record, LogAgent(record))
+
@@ -3,6 +3,7 @@
 is_euchred(): Checks if the maker team lost the majority tricks this round
 check_alone(): checks if one of the players went alone this round.
 score_round(): Score points for the round.
+round_points(): Return the winning team index and points for the round.
 print_scores(): Print the current scores for each team.
 calculate_team_tricks(): Calculate the tricks for each player.
 score_trick(): Score trick of the highest ranking card.
@@ -25,6 +26,8 @@ from euchre.constants import (
     MARCH_POINTS,
     POINTS_TO_WIN,
 )
+from euchre.events import MESSAGE, SCORE, TRICK_WON, TRICKS, emit
+from euchre.profiling import timed
 def is_euchred(makers: Team, winner: Team) -> bool:
     """Return True if the makers did not make the points this round.
 
@@ -50,6 +53,7 @@ def check_alone(team_list: list[Team]) -> tuple[Team, True]|False:
             
     return False
 
+@timed('score_round')
 def score_round(teams: list[Team], trump: Trump):
     """Score points for the round. The team with the majority of tricks wins points.
     
@@ -68,31 +72,52 @@ def score_round(teams: list[Team], trump: Trump):
     makers = trump.get_makers()
     scores = calculate_team_tricks(teams)
     is_alone = check_alone(teams)
+
+    tricks = [scores[team.get_name()] for team in teams]
+    maker_index = teams.index(makers) if makers in teams else None
+    alone_index = teams.index(is_alone[0]) if is_alone else None
+
+    result = round_points(tricks, maker_index, alone_index)
+    if result:
+        winner, points = result
+        teams[winner].set_score(points)
+
+
+def round_points(tricks: list[int], makers: int|None, alone: int|None) -> tuple[int, int]|None:
+    """Return (team index, points) for the team that won the round, or None if
+    no team took the majority. Works on plain team indexes so headless callers
+    can score a round without Team or Player objects.
+
+    Keyword arguments:
+    tricks: -- tricks won by each team this round, indexed by team.
+    makers: -- index of the team that decided on trump.
+    alone: -- index of the team with a player going alone, None if nobody is.
+    """
     winner = None
     points = 0
 
-    for team in teams:
-        tricks = scores[team.get_name()]
-        if tricks >= MIN_TRICKS and tricks < MAX_TRICKS:
+    for team, team_tricks in enumerate(tricks):
+        if team_tricks >= MIN_TRICKS and team_tricks < MAX_TRICKS:
             winner = team
             # check if the makers team got euchred this round, if so award 2 points
-            if is_euchred(makers,winner):
+            if is_euchred(makers, winner):
                 points = MARCH_POINTS
             else:
                 # give 1 point
                 points = MAJORITY_POINTS
-        elif tricks == MAX_TRICKS:
+        elif team_tricks == MAX_TRICKS:
             winner = team
             # is winning player went alone, give 4 points instead
-            if is_alone:
-                if winner == is_alone[0]:
+            if alone is not None:
+                if winner == alone:
                     points = ALONE_POINTS
             else:
                 # give 2 points
                 points = MARCH_POINTS
 
-    if winner:
-        winner.set_score(points)
+    if winner is None:
+        return None
+    return (winner, points)
     
 
 def print_scores(team_list: list[Team]):
@@ -104,13 +129,7 @@ def print_scores(team_list: list[Team]):
         if not team_list:
             return
         
-        print('\n')
-        print('-' * 40)
-        print('\t\tROUND SCORES: ')
-        print('-' * 40)
-        for team in team_list:
-            print(f'{team}: {team.get_score()}')
-        print('\n')
+        emit(SCORE, scores=[(team, team.get_score()) for team in team_list])
 
 
 def calculate_team_tricks(teams: list[Team]) -> dict[str, int]:
@@ -138,7 +157,7 @@ def score_trick(winner: tuple[Player, Card]):
     winner: -- tuple of the highest ranking card for the round.
     """
     if not winner:
-        print("ERROR - NO TRICK TO SCORE.")
+        emit(MESSAGE, text="ERROR - NO TRICK TO SCORE.")
         return
     # increase the trick count by one for this hand for the player
     player = winner[0]
@@ -156,8 +175,7 @@ def print_trick_winner(winner: tuple[Player, Card]):
     player = winner[0]
     team = player.get_team()
     card = winner[1]
-    print('\n')
-    print(f'{player} won a trick for Team {team.get_name()} with the {card}!')    
+    emit(TRICK_WON, player=player, card=card, team=team)
 
 def print_tricks(players: list[Player], teams: list[Team]):
     """Print update of current tricks scored by each Team.
@@ -169,16 +187,11 @@ def print_tricks(players: list[Player], teams: list[Team]):
     if not players or not teams:
         return
     
-    print('\n')
-    print('-' * 40)
-    print('\t\tTRICK SCORES: ')
-    print('-' * 40)
-    for player in players:
-        print(f'{player.get_name()}: {player.get_tricks()}')
-    print('\n')
-    team_trick_scores = calculate_team_tricks(teams)
-    for team,score in team_trick_scores.items():
-        print(f'Team {team}: {score}')
+    emit(
+        TRICKS,
+        players=[(player.get_name(), player.get_tricks()) for player in players],
+        teams=list(calculate_team_tricks(teams).items()),
+    )
 
 def check_for_winner(team_list: list[Team]) -> Team|False:
     """Check each Team for 10 or more points. Returns Team object if True.
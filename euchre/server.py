@@ -0,0 +1,541 @@
+"""The server module hosts many games of Euchre at once over a line-based TCP protocol.
+
+Each table is an asyncio task driving the GameEngine: whenever the engine needs
+a decision from a seat played by a person, the table sends the decision to
+their connection and waits for the answer without blocking any other table.
+Seats nobody joined are played by bots, and so are the seats of people who
+disconnect or do not answer in time.
+
+Every message is one line of JSON. Clients send:
+
+    {"type": "join", "name": "Ann", "table": "den"}   sit at a table, a new one if table is left out
+    {"type": "start"}                                 start the table, bots fill the empty seats
+    {"type": "answer", "value": ...}                  answer the last decision
+
+and the server sends:
+
+    {"type": "seated", "table": "den", "seat": 0}
+    {"type": "decide", "kind": "play", "seat": 0, "options": [...], "state": {...}}
+    {"type": "action", "kind": "play", "seat": 1, "value": 7}
+    {"type": "hand", "result": {...}}
+    {"type": "game_over", "winner": 0, "scores": [10, 6]}
+    {"type": "error", "message": "..."}
+
+Cards and suits use the numbering of the masks module. A table starts by
+itself once all four seats are taken. Answers are the same as the agent
+methods of GameEngine: true or false to order and go alone, a suit index or
+null to call, a card number to discard and play.
+
+    python -m euchre.server --port 7000
+
+Connection(): -- sends and receives protocol messages.
+StreamConnection(): -- a connection over an asyncio TCP stream.
+LocalConnection(): -- one end of an in-process connection, for tests and local clients.
+local_pair(): -- return the two ends of an in-process connection.
+RemoteAgent(): -- asynchronous agent for a seat played over a connection.
+Table(): -- one game with up to four remote seats.
+GameServer(): -- accepts connections and runs the tables.
+main(): -- command line entry point.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from abc import ABC, abstractmethod
+from random import Random
+
+from euchre.agents import decide_async
+from euchre.bots import BotAgent
+from euchre.constants import PLAYER_COUNT, POINTS_TO_WIN, SUITS
+from euchre.engine import (
+    ALONE,
+    CALL,
+    DISCARD,
+    ORDER,
+    PLAY,
+    Decision,
+    GameEngine,
+    GameResult,
+    HandResult,
+    HandState,
+    decide,
+)
+from euchre.masks import card_list, card_suit
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7000
+# Longest line a client may send
+LINE_LIMIT = 4096
+
+
+class Connection(ABC):
+    """Sends and receives protocol messages, one dictionary per message.
+    A connection missing a method cannot be created.
+
+    send(): -- send a message.
+    receive(): -- return the next message, None once the connection is closed.
+    close(): -- close the connection.
+    """
+
+    @abstractmethod
+    async def send(self, message: dict): ...
+
+    @abstractmethod
+    async def receive(self) -> dict|None: ...
+
+    @abstractmethod
+    async def close(self): ...
+
+
+class StreamConnection(Connection):
+    """A connection over an asyncio TCP stream, one JSON message per line."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    def __repr__(self):
+        """Return the StreamConnection object."""
+        return f'StreamConnection({self._writer.get_extra_info("peername")})'
+
+    async def send(self, message: dict):
+        if self._writer.is_closing():
+            return
+        self._writer.write(json.dumps(message).encode() + b'\n')
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+
+    async def receive(self) -> dict|None:
+        while True:
+            try:
+                line = await self._reader.readline()
+            except (ConnectionError, ValueError):
+                return None
+            if not line:
+                return None
+            try:
+                message = json.loads(line)
+            except ValueError:
+                await self.send({'type': 'error', 'message': 'Messages must be one line of JSON.'})
+                continue
+            if isinstance(message, dict):
+                return message
+            await self.send({'type': 'error', 'message': 'Messages must be JSON objects.'})
+
+    async def close(self):
+        if not self._writer.is_closing():
+            self._writer.close()
+
+
+class LocalConnection(Connection):
+    """One end of an in-process connection. Messages go through JSON like they
+    would over TCP, so clients see exactly what a network client would.
+    """
+
+    def __init__(self, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        self._inbox = inbox
+        self._outbox = outbox
+        self._closed = False
+
+    def __repr__(self):
+        """Return the LocalConnection object."""
+        return 'LocalConnection()'
+
+    async def send(self, message: dict):
+        if not self._closed:
+            await self._outbox.put(json.dumps(message))
+
+    async def receive(self) -> dict|None:
+        if self._closed:
+            return None
+        line = await self._inbox.get()
+        if line is None:
+            self._closed = True
+            return None
+        return json.loads(line)
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            await self._outbox.put(None)
+
+
+def local_pair() -> tuple[LocalConnection, LocalConnection]:
+    """Return the (server end, client end) of a new in-process connection."""
+    to_server = asyncio.Queue()
+    to_client = asyncio.Queue()
+    return LocalConnection(to_server, to_client), LocalConnection(to_client, to_server)
+
+
+def _state_message(state: HandState, seat: int) -> dict:
+    """Return what the seat may see of the hand state."""
+    return {
+        'dealer': state.dealer,
+        'hand': card_list(state.hands[seat]),
+        'turned': state.turned,
+        'trump': state.trump,
+        'maker': state.maker,
+        'alone': state.alone,
+        'skipped': state.skipped,
+        'bids': state.bids,
+        'trick': state.trick,
+        'won': state.won,
+    }
+
+
+def _result_message(result: HandResult) -> dict:
+    """Return the hand result as a message field."""
+    return dict(result._asdict())
+
+
+def _valid_answer(decision: Decision, value) -> bool:
+    """Return True if the value answers the decision."""
+    if decision.kind in (DISCARD, PLAY):
+        return type(value) is int and 0 <= value and decision.options >> value & 1 == 1
+    if decision.kind == CALL:
+        return value is None or (type(value) is int and value in decision.options)
+    return isinstance(value, bool)
+
+
+class RemoteAgent():
+    """Asynchronous agent for a seat played over a connection. Decisions the
+    person does not answer in time, or after they disconnect, are made by a bot.
+
+    decide(): -- send a decision to the connection and return the answer.
+    order(), call(), alone(), discard(), play(): -- the AsyncAgent methods, answered by decide().
+    answer(): -- hand an answer received from the connection to the waiting decision.
+    disconnect(): -- let the bot make every decision from now on.
+    is_connected(): -- return True while the connection is open.
+    """
+
+    def __init__(self, connection: Connection, name: str, timeout: float|None=None):
+        """Initialize the agent.
+
+        Keyword arguments:
+        connection: -- the connection of the person playing the seat.
+        name: -- the name the person joined with.
+        timeout: -- seconds to wait for an answer before the bot decides, None to wait forever.
+        """
+        self._connection = connection
+        self._name = name
+        self._timeout = timeout
+        self._answers = asyncio.Queue()
+        self._connected = True
+        self._fallback = BotAgent()
+
+    def __repr__(self):
+        """Return the RemoteAgent object."""
+        return f'RemoteAgent({self._name!r})'
+
+    # Public methods
+    def get_name(self) -> str:
+        """Return the name the person joined with."""
+        return self._name
+
+    def is_connected(self) -> bool:
+        """Return True while the connection is open."""
+        return self._connected
+
+    def answer(self, value):
+        """Hand an answer received from the connection to the waiting decision."""
+        self._answers.put_nowait((True, value))
+
+    def disconnect(self):
+        """Let the bot make every decision from now on."""
+        self._connected = False
+        self._answers.put_nowait((False, None))
+
+    async def send(self, message: dict):
+        """Send a message to the connection, if it is still open."""
+        if self._connected:
+            await self._connection.send(message)
+
+    async def decide(self, decision: Decision):
+        """Send the decision to the connection and return a valid answer, asking
+        again after an invalid one.
+        """
+        # Answers sent before this decision was asked for are stale
+        while not self._answers.empty():
+            answered, _ = self._answers.get_nowait()
+            if not answered:
+                self._connected = False
+
+        while self._connected:
+            options = decision.options
+            if decision.kind in (DISCARD, PLAY):
+                options = card_list(options)
+            await self._connection.send({
+                'type': 'decide',
+                'kind': decision.kind,
+                'seat': decision.seat,
+                'options': list(options),
+                'state': _state_message(decision.state, decision.seat),
+            })
+            try:
+                answered, value = await asyncio.wait_for(self._answers.get(), self._timeout)
+            except asyncio.TimeoutError:
+                break
+            if not answered:
+                self._connected = False
+                break
+            if _valid_answer(decision, value):
+                return value
+            await self._connection.send({'type': 'error', 'message': f'{value!r} does not answer {decision.kind}.'})
+
+        return decide(self._fallback, decision)
+
+    async def order(self, state: HandState, seat: int) -> bool:
+        return await self.decide(Decision(ORDER, seat, state))
+
+    async def call(self, state: HandState, seat: int) -> int|None:
+        turned_suit = card_suit(state.turned)
+        options = tuple(suit for suit in range(len(SUITS)) if suit != turned_suit)
+        return await self.decide(Decision(CALL, seat, state, options))
+
+    async def alone(self, state: HandState, seat: int) -> bool:
+        return await self.decide(Decision(ALONE, seat, state))
+
+    async def discard(self, state: HandState, seat: int) -> int:
+        return await self.decide(Decision(DISCARD, seat, state, state.hands[seat]))
+
+    async def play(self, state: HandState, seat: int, legal: int) -> int:
+        return await self.decide(Decision(PLAY, seat, state, legal))
+
+
+class Table():
+    """One game with up to four remote seats. The empty seats are played by bots
+    when the table starts.
+
+    sit(): -- seat a remote agent, returning the seat.
+    is_full(): -- return True if every seat is taken.
+    is_started(): -- return True once the game has started.
+    run(): -- play the game, returning the GameResult.
+    record(): -- keep the result of a finished hand, called by the engine.
+    """
+
+    def __init__(self, name: str, rng: Random=None, points_to_win: int=POINTS_TO_WIN):
+        self._name = name
+        self._rng = rng
+        self._points_to_win = points_to_win
+        self._seats = [None] * PLAYER_COUNT
+        self._started = False
+        # results of finished hands not sent to the players yet
+        self._finished = []
+
+    def __repr__(self):
+        """Return the Table object."""
+        return f'Table({self._name!r})'
+
+    # Public methods
+    def get_name(self) -> str:
+        """Return the name of the table."""
+        return self._name
+
+    def is_full(self) -> bool:
+        """Return True if every seat is taken."""
+        return None not in self._seats
+
+    def is_started(self) -> bool:
+        """Return True once the game has started."""
+        return self._started
+
+    def sit(self, agent: RemoteAgent) -> int:
+        """Seat the agent at the first empty seat and return it. Raises ValueError
+        if the table is full or already playing.
+        """
+        if self._started or self.is_full():
+            raise ValueError(f'Table {self._name} is not taking players.')
+        seat = self._seats.index(None)
+        self._seats[seat] = agent
+        return seat
+
+    async def run(self) -> GameResult:
+        """Play the game, filling the empty seats with bots. Returns the GameResult."""
+        self._started = True
+        agents = [agent if agent is not None else BotAgent() for agent in self._seats]
+        remotes = [agent for agent in agents if isinstance(agent, RemoteAgent)]
+        engine = GameEngine(agents, self._rng, points_to_win=self._points_to_win, recorder=self)
+
+        steps = engine.game_steps()
+        try:
+            decision = next(steps)
+            while True:
+                value = await decide_async(agents[decision.seat], decision)
+                action = {'type': 'action', 'kind': decision.kind, 'seat': decision.seat, 'value': value}
+                if decision.kind == DISCARD:
+                    # Only the dealer sees what was discarded
+                    del action['value']
+                for remote in remotes:
+                    await remote.send(action)
+                # Let the other tables run between decisions
+                await asyncio.sleep(0)
+                decision = steps.send(value)
+                await self._send_hands(remotes)
+        except StopIteration as stop:
+            game = stop.value
+        await self._send_hands(remotes)
+
+        for remote in remotes:
+            await remote.send({'type': 'game_over', 'winner': game.winner, 'scores': list(game.scores)})
+        return game
+
+    def record(self, state: HandState, result: HandResult):
+        """Keep the result of a hand the engine has finished, to send to the players."""
+        self._finished.append(result)
+
+    # Private methods
+    async def _send_hands(self, remotes: list[RemoteAgent]):
+        """Send the result of every hand finished since the last call to the players."""
+        for result in self._finished:
+            for remote in remotes:
+                await remote.send({'type': 'hand', 'result': _result_message(result)})
+        self._finished.clear()
+
+
+class GameServer():
+    """Accepts connections and runs every table as its own task.
+
+    handle(): -- serve one connection until it closes.
+    connect_local(): -- return the client end of a new in-process connection.
+    start(): -- listen for TCP connections.
+    get_tables(): -- return the tables that are waiting or playing.
+    wait_closed(): -- wait until every table has finished.
+    """
+
+    def __init__(self, points_to_win: int=POINTS_TO_WIN, timeout: float|None=None, seed: int|None=None):
+        """Initialize the server.
+
+        Keyword arguments:
+        points_to_win: -- points a team needs to win a game.
+        timeout: -- seconds a person has to answer a decision before a bot answers for them.
+        seed: -- seed for the deals of every table, None for random deals.
+        """
+        self._points_to_win = points_to_win
+        self._timeout = timeout
+        self._seed = seed
+        self._tables = {}
+        self._tasks = set()
+        self._names = itertools.count(1)
+        self._server = None
+
+    def __repr__(self):
+        """Return the GameServer object."""
+        return f'GameServer(tables={len(self._tables)})'
+
+    # Public methods
+    def get_tables(self) -> dict[str, Table]:
+        """Return the tables that are waiting or playing by name."""
+        return dict(self._tables)
+
+    async def start(self, host: str=DEFAULT_HOST, port: int=DEFAULT_PORT):
+        """Listen for TCP connections. Returns the asyncio server."""
+        async def on_connect(reader, writer):
+            await self.handle(StreamConnection(reader, writer))
+        self._server = await asyncio.start_server(on_connect, host, port, limit=LINE_LIMIT)
+        return self._server
+
+    def connect_local(self) -> LocalConnection:
+        """Serve a new in-process connection and return the client end."""
+        server_end, client_end = local_pair()
+        self._spawn(self.handle(server_end))
+        return client_end
+
+    async def wait_closed(self):
+        """Wait until every running table and connection has finished."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def handle(self, connection: Connection):
+        """Serve one connection until it closes."""
+        agent = None
+        table = None
+        try:
+            while True:
+                message = await connection.receive()
+                if message is None:
+                    break
+                kind = message.get('type')
+                if kind == 'join' and agent is None:
+                    agent, table = await self._join(connection, message)
+                elif kind == 'start' and table is not None:
+                    self._start_table(table)
+                elif kind == 'answer' and agent is not None:
+                    agent.answer(message.get('value'))
+                else:
+                    await connection.send({'type': 'error', 'message': f'Unexpected message {kind!r}.'})
+        finally:
+            if agent is not None:
+                agent.disconnect()
+                if table is not None and not table.is_started():
+                    self._remove_table(table)
+            await connection.close()
+
+    # Private methods
+    async def _join(self, connection: Connection, message: dict) -> tuple[RemoteAgent|None, Table|None]:
+        """Seat the connection at the table named in the join message."""
+        name = message.get('table') or f'table-{next(self._names)}'
+        table = self._tables.get(name)
+        if table is None:
+            rng = Random(f'{self._seed}:{name}') if self._seed is not None else None
+            table = self._tables[name] = Table(name, rng, self._points_to_win)
+
+        agent = RemoteAgent(connection, str(message.get('name', 'Player')), self._timeout)
+        try:
+            seat = table.sit(agent)
+        except ValueError as e:
+            await connection.send({'type': 'error', 'message': str(e)})
+            return None, None
+        await connection.send({'type': 'seated', 'table': name, 'seat': seat})
+        if table.is_full():
+            self._start_table(table)
+        return agent, table
+
+    def _start_table(self, table: Table):
+        """Start the game at the table unless it is already playing."""
+        if table.is_started():
+            return
+        task = self._spawn(table.run())
+        task.add_done_callback(lambda _: self._remove_table(table))
+
+    def _remove_table(self, table: Table):
+        """Forget the table once it is no longer taking players."""
+        if self._tables.get(table.get_name()) is table:
+            del self._tables[table.get_name()]
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        """Run the coroutine as a task that wait_closed waits for."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+async def serve(host: str=DEFAULT_HOST, port: int=DEFAULT_PORT, **kwargs):
+    """Run a GameServer until it is cancelled."""
+    server = await GameServer(**kwargs).start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str]=None):
+    """Run the server from the command line."""
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m euchre.server', description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=DEFAULT_HOST, help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port to listen on')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='seconds to answer a decision before a bot answers')
+    parser.add_argument('--points', type=int, default=POINTS_TO_WIN, help='points to win a game')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, points_to_win=args.points, timeout=args.timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
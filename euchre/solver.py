@@ -0,0 +1,454 @@
+"""The solver module finds the double-dummy result of a hand: the number of tricks
+a team takes when every hand is known and every seat plays perfectly.
+
+The search is minimax with alpha-beta pruning over the card masks of the masks
+module, narrowed down with null-window probes. Positions at the start of each
+trick are cached in a transposition table keyed on the remaining hands and the
+leader, which starts from the tricks the highest trumps are sure to take; a
+position in the middle of a trick is searched from the cards already played to
+it. Cards that are next to each other in rank among the cards still in play are
+equivalent, so only one of them is searched, and moves are ordered so cheap
+cutoffs come first.
+The legality and trick rules are the same as Player.filter_cards and
+cards.get_highest_rank_card.
+
+Solver(): -- double-dummy solver with a reusable transposition table.
+solve(): -- return the double-dummy tricks for a team with a fresh Solver.
+"""
+from __future__ import annotations
+
+from euchre.constants import PLAYER_COUNT, SUITS
+from euchre.masks import (
+    CARD_COUNT,
+    EFFECTIVE_RANK,
+    EFFECTIVE_SUIT,
+    TRUMP_SUIT_MASK,
+    card_list,
+    legal_mask,
+    trick_winner,
+)
+
+# (card, bit) for the cards of each effective suit from strongest to weakest, for every trump
+SUIT_ORDER = tuple(
+    tuple(
+        tuple(
+            (card, 1 << card) for card in
+            sorted(card_list(TRUMP_SUIT_MASK[trump][suit]), key=lambda card: -EFFECTIVE_RANK[trump][card])
+        )
+        for suit in range(len(SUITS))
+    )
+    for trump in range(len(SUITS))
+)
+
+# HIGHER[trump][card]: the bits of the cards of the card's effective suit that rank
+# above it, nearest first
+HIGHER = tuple(
+    tuple(
+        tuple(bit for other, bit in reversed(SUIT_ORDER[trump][EFFECTIVE_SUIT[trump][card]])
+              if EFFECTIVE_RANK[trump][other] > EFFECTIVE_RANK[trump][card])
+        for card in range(CARD_COUNT)
+    )
+    for trump in range(len(SUITS))
+)
+
+# FOLLOW_RANK[trump][led_suit][card]: the rank of the card in a trick led in the
+# suit, 0 when the card neither follows nor trumps, so it can never take the trick
+FOLLOW_RANK = tuple(
+    tuple(
+        tuple(
+            EFFECTIVE_RANK[trump][card] if EFFECTIVE_SUIT[trump][card] in (led_suit, trump) else 0
+            for card in range(CARD_COUNT)
+        )
+        for led_suit in range(len(SUITS))
+    )
+    for trump in range(len(SUITS))
+)
+
+
+class Solver():
+    """Double-dummy solver for one trump suit. The transposition table is kept
+    between calls, so solving many positions of the same deal reuses work.
+
+    solve(): -- return the tricks a team takes from a position with perfect play.
+    move_values(): -- return the tricks the mover's team takes after each legal card.
+    clear(): -- empty the transposition table.
+    get_nodes(): -- return the number of positions searched.
+    """
+
+    def __init__(self, trump: int, skipped: int|None=None):
+        """Initialize the solver.
+
+        Keyword arguments:
+        trump: -- suit index of trump.
+        skipped: -- seat sitting out because their partner is alone, None if nobody is.
+        """
+        self._trump = trump
+        self._skipped = skipped
+        self._suits = EFFECTIVE_SUIT[trump]
+        self._ranks = EFFECTIVE_RANK[trump]
+        self._suit_order = SUIT_ORDER[trump]
+        self._suit_masks = TRUMP_SUIT_MASK[trump]
+        self._follow_ranks = FOLLOW_RANK[trump]
+        self._higher = HIGHER[trump]
+        self._table = {}
+        # (table key, ordered leads, top trumps) of every (hands..., leader) seen,
+        # they are slow to build and every null-window search visits the position again
+        self._leads = {}
+        self._nodes = 0
+        self._team = 0
+        # seats in playing order for every leader
+        self._orders = []
+        for leader in range(PLAYER_COUNT):
+            order = []
+            for offset in range(PLAYER_COUNT):
+                seat = (leader + offset) % PLAYER_COUNT
+                if seat != skipped:
+                    order.append(seat)
+            self._orders.append(tuple(order))
+
+    def __repr__(self):
+        """Return the Solver object."""
+        return f'Solver(trump={self._trump}, skipped={self._skipped})'
+
+    # Public methods
+    def clear(self):
+        """Empty the transposition table."""
+        self._table.clear()
+        self._leads.clear()
+
+    def get_nodes(self) -> int:
+        """Return the number of positions searched since the solver was made."""
+        return self._nodes
+
+    def solve(self, hands: list[int], leader: int, team: int, trick: list[int]=()) -> int:
+        """Return the number of the remaining tricks, including the one in progress,
+        the team takes with perfect play from every seat.
+
+        Keyword arguments:
+        hands: -- card mask of each seat.
+        leader: -- seat that led the trick in progress.
+        team: -- team index (0 or 1) to count tricks for.
+        trick: -- cards already played to the trick in progress, in order.
+        """
+        self._set_team(team)
+        tricks = hands[leader].bit_count() + (1 if trick else 0)
+        return self._value(list(hands), leader, list(trick), tricks)
+
+    def move_values(self, hands: list[int], leader: int, trick: list[int]=()) -> dict[int, int]:
+        """Return {card: tricks} for every legal card of the seat to play, where tricks
+        is what the mover's team takes of the remaining tricks after playing the card.
+
+        Keyword arguments:
+        hands: -- card mask of each seat.
+        leader: -- seat that led the trick in progress.
+        trick: -- cards already played to the trick in progress, in order.
+        """
+        hands = list(hands)
+        trick = list(trick)
+        order = self._orders[leader]
+        seat = order[len(trick)]
+        self._set_team(seat % 2)
+        tricks = hands[leader].bit_count() + (1 if trick else 0)
+
+        led = trick[0] if trick else None
+        legal = legal_mask(hands[seat], led, self._trump)
+        values = {}
+        for card in self._candidates(hands, trick, legal):
+            hands[seat] ^= 1 << card
+            trick.append(card)
+            if len(trick) == len(order):
+                winner = order[trick_winner(trick, self._trump)]
+                won = 1 if winner % 2 == self._team else 0
+                values[card] = won + self._value(hands, winner, [], tricks - 1)
+            else:
+                values[card] = self._value(hands, leader, trick, tricks)
+            trick.pop()
+            hands[seat] ^= 1 << card
+
+        # Equivalent cards that were not searched score the same as their partner
+        for card in card_list(legal):
+            if card not in values:
+                values[card] = values[self._equivalent(hands, trick, card)]
+        return values
+
+    # Private methods
+    def _set_team(self, team: int):
+        """Count tricks for the team. The table only holds values for one team at a time."""
+        if team != self._team:
+            self._table.clear()
+            self._team = team
+
+    def _value(self, hands: list[int], leader: int, trick: list[int], tricks: int) -> int:
+        """Return the exact value of a position by narrowing it down with null-window
+        searches (MTD(f)). The values are so few that this searches fewer positions
+        than a single full-window search.
+        """
+        lower = 0
+        upper = tricks
+        guess = tricks // 2
+        while lower < upper:
+            beta = guess + 1 if guess == lower else guess
+            if trick:
+                winning = trick_winner(trick, self._trump)
+                guess = self._play(hands, leader, trick, winning, beta - 1, beta)
+            else:
+                guess = self._trick_start(hands, leader, beta - 1, beta)
+            if guess < beta:
+                upper = guess
+            else:
+                lower = guess
+        return lower
+
+    def _trick_start(self, hands: list[int], leader: int, alpha: int, beta: int) -> int:
+        """Search from the start of a trick. Returns the tricks the team takes from here."""
+        remaining = hands[leader].bit_count()
+        if remaining == 0:
+            return 0
+        if remaining == 1:
+            return self._last_trick(hands, leader)
+
+        h0, h1, h2, h3 = hands
+        position = (h0, h1, h2, h3, leader)
+        leads = self._leads.get(position)
+        if leads is None:
+            leads = self._leads[position] = (
+                self._key(hands, leader), self._moves(hands, [], hands[leader], 0), self._top_trumps(hands),
+            )
+        key, moves, (holder, sure) = leads
+        entry = self._table.get(key)
+        if entry is not None:
+            lower, upper = entry
+        elif holder % 2 == self._team:
+            lower, upper = sure, remaining
+        else:
+            lower, upper = 0, remaining - sure
+        if lower >= beta:
+            return lower
+        if upper <= alpha:
+            return upper
+        if lower > alpha:
+            alpha = lower
+        if upper < beta:
+            beta = upper
+        if alpha >= beta:
+            return lower
+
+        value = self._play(hands, leader, [], 0, alpha, beta, moves)
+
+        if value <= alpha:
+            upper = value
+        elif value >= beta:
+            lower = value
+        else:
+            lower = upper = value
+        self._table[key] = (lower, upper)
+        return value
+
+    def _key(self, hands: list[int], leader: int) -> int:
+        """Return the table key of the position at the start of a trick.
+
+        Only the order of the cards still in play matters, not which cards were
+        played before, so the key records which seat holds each live card in rank
+        order, suit by suit. Positions that differ only in the played cards share a key.
+        """
+        h0, h1, h2, h3 = hands
+        key = 4 | leader
+        for suit_order in self._suit_order:
+            for _, bit in suit_order:
+                if h0 & bit:
+                    key = key << 3 | 4
+                elif h1 & bit:
+                    key = key << 3 | 5
+                elif h2 & bit:
+                    key = key << 3 | 6
+                elif h3 & bit:
+                    key = key << 3 | 7
+            key = key << 1
+        return key
+
+    def _top_trumps(self, hands: list[int]) -> tuple[int, int]:
+        """Return (seat, tricks) for the seat holding the highest trumps still in play
+        and how many of them it holds in a row. Each of them takes a trick.
+        """
+        holder = 0
+        sure = 0
+        skipped = self._skipped
+        for _, bit in self._suit_order[self._trump]:
+            for seat in range(PLAYER_COUNT):
+                if hands[seat] & bit and seat != skipped:
+                    break
+            else:
+                continue
+            if sure and seat != holder:
+                break
+            holder = seat
+            sure += 1
+        return holder, sure
+
+    def _last_trick(self, hands: list[int], leader: int) -> int:
+        """Score the last trick, where every seat has one card left."""
+        follow = self._follow_ranks[self._suits[hands[leader].bit_length() - 1]]
+        winner = leader
+        high = 0
+        for seat in self._orders[leader]:
+            rank = follow[hands[seat].bit_length() - 1]
+            if rank > high:
+                high = rank
+                winner = seat
+        return 1 if winner % 2 == self._team else 0
+
+    def _play(self, hands: list[int], leader: int, trick: list[int], winning: int, alpha: int, beta: int,
+              moves: list[int]|None=None) -> int:
+        """Search the move of the next seat in the trick in progress.
+
+        winning is the position in the trick of the card winning it so far. moves
+        are the ordered candidate cards, when the caller has them already.
+        """
+        self._nodes += 1
+        order = self._orders[leader]
+        position = len(trick)
+        seat = order[position]
+        team = self._team
+        maximizing = seat % 2 == team
+
+        hand = hands[seat]
+        if position:
+            led_suit = self._suits[trick[0]]
+            follow = self._follow_ranks[led_suit]
+            legal = hand & self._suit_masks[led_suit] or hand
+            high = follow[trick[winning]]
+        else:
+            legal = hand
+        if moves is None:
+            if not legal & (legal - 1):
+                moves = (legal.bit_length() - 1,)
+            elif hand.bit_count() == 2:
+                # With two cards left ordering them costs more than searching both
+                low = legal & -legal
+                moves = (low.bit_length() - 1, legal.bit_length() - 1)
+            else:
+                moves = self._moves(hands, trick, legal, winning)
+        last = position + 1 == len(order)
+        best = -1 if maximizing else CARD_COUNT
+
+        for card in moves:
+            now_winning = position if position and follow[card] > high else winning
+
+            hands[seat] = hand ^ 1 << card
+            trick.append(card)
+            if last:
+                winner = order[now_winning]
+                won = 1 if winner % 2 == team else 0
+                value = won + self._trick_start(hands, winner, alpha - won, beta - won)
+            else:
+                value = self._play(hands, leader, trick, now_winning, alpha, beta)
+            trick.pop()
+            hands[seat] = hand
+
+            if maximizing:
+                if value > best:
+                    best = value
+                    if best > alpha:
+                        alpha = best
+            else:
+                if value < best:
+                    best = value
+                    if best < beta:
+                        beta = best
+            if alpha >= beta:
+                break
+
+        return best
+
+    def _candidates(self, hands: list[int], trick: list[int], legal: int) -> list[int]:
+        """Return the legal cards with only one card of every run of equivalent cards,
+        the strongest of the run.
+
+        Two cards of a hand are equivalent when no card still in play ranks between
+        them in their effective suit.
+        """
+        live = hands[0] | hands[1] | hands[2] | hands[3]
+        for card in trick:
+            live |= 1 << card
+
+        candidates = []
+        higher = self._higher
+        cards = legal
+        while cards:
+            bit = cards & -cards
+            cards ^= bit
+            card = bit.bit_length() - 1
+            # The card is searched unless the next live card above it is legal too
+            for above in higher[card]:
+                if live & above:
+                    if not legal & above:
+                        candidates.append(card)
+                    break
+            else:
+                candidates.append(card)
+        return candidates
+
+    def _equivalent(self, hands: list[int], trick: list[int], card: int) -> int:
+        """Return the stronger card of the run of equivalent cards the card belongs to."""
+        live = hands[0] | hands[1] | hands[2] | hands[3]
+        for played in trick:
+            live |= 1 << played
+        seat_hand = next(hand for hand in hands if hand >> card & 1)
+
+        run_start = None
+        for other, bit in self._suit_order[self._suits[card]]:
+            if not live & bit:
+                continue
+            if seat_hand & bit:
+                if run_start is None:
+                    run_start = other
+                if other == card:
+                    return run_start
+            else:
+                run_start = None
+        return card
+
+    def _moves(self, hands: list[int], trick: list[int], legal: int, winning: int) -> list[int]:
+        """Return the candidate cards in the order they should be searched.
+
+        Leading, the strongest cards go first. Following, the lowest card that takes
+        the trick goes first, then the lowest cards that do not.
+        """
+        if trick:
+            led_suit = self._suits[trick[0]]
+            follow = self._follow_ranks[led_suit]
+            high = follow[trick[winning]]
+        candidates = self._candidates(hands, trick, legal)
+        if len(candidates) < 2:
+            return candidates
+
+        ranks = self._ranks
+        if not trick:
+            candidates.sort(key=ranks.__getitem__, reverse=True)
+            return candidates
+
+        winners = []
+        losers = []
+        for card in reversed(candidates):
+            if follow[card] > high:
+                winners.append(card)
+            else:
+                losers.append(card)
+        winners.sort(key=ranks.__getitem__)
+        losers.sort(key=ranks.__getitem__)
+        return winners + losers
+
+
+def solve(hands: list[int], trump: int, leader: int, team: int, skipped: int|None=None,
+          trick: list[int]=()) -> int:
+    """Return the tricks the team takes with perfect play, using a fresh Solver.
+
+    Keyword arguments:
+    hands: -- card mask of each seat.
+    trump: -- suit index of trump.
+    leader: -- seat that leads (or led) the trick in progress.
+    team: -- team index (0 or 1) to count tricks for.
+    skipped: -- seat sitting out because their partner is alone, None if nobody is.
+    trick: -- cards already played to the trick in progress, in order.
+    """
+    return Solver(trump, skipped).solve(hands, leader, team, trick)
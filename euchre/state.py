@@ -0,0 +1,137 @@
+"""The state module holds the card play of a hand as an immutable value.
+
+A GameState is a tuple of ints and tuples of ints in the encoding of the masks
+module, so it is cheap to create, compare and hash. Playing a card returns a
+new state and leaves the old one untouched, so a search can keep every
+position it visits, use them as keys of a transposition table and go back to
+any of them without undoing anything. The rules are the same as the engine's.
+
+GameState(): -- the card play of a hand, from trump being made to the last trick.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, NamedTuple
+if TYPE_CHECKING:
+    from euchre.engine import HandState
+
+from euchre.constants import MAX_CARD_HAND_LIMIT, PLAYER_COUNT
+from euchre.masks import card_list, legal_mask, trick_winner
+from euchre.scores import round_points
+
+# ORDERS[skipped][leader]: the seats in playing order, skipped is PLAYER_COUNT if nobody sits out
+ORDERS = tuple(
+    tuple(
+        tuple(
+            (leader + offset) % PLAYER_COUNT for offset in range(PLAYER_COUNT)
+            if (leader + offset) % PLAYER_COUNT != skipped
+        )
+        for leader in range(PLAYER_COUNT)
+    )
+    for skipped in range(PLAYER_COUNT + 1)
+)
+
+_new = tuple.__new__
+
+
+class GameState(NamedTuple):
+    """The card play of a hand. Seats are numbered 0-3 and seat % 2 is the team.
+
+    hands: -- card mask of each seat's hand.
+    trump: -- suit index of trump.
+    leader: -- seat that leads the trick in progress.
+    trick: -- cards played to the trick in progress, in playing order.
+    skipped: -- seat sitting out because their partner is alone, None if nobody is.
+    maker: -- seat that made trump.
+    alone: -- True if the maker is going alone.
+    won: -- tricks won by each team.
+
+    from_hand_state(): -- return the GameState of an engine HandState.
+    to_play(): -- return the seat that plays next.
+    is_over(): -- return True once every trick is played.
+    legal_mask(): -- return the mask of cards the seat to play may play.
+    legal_moves(): -- return the cards the seat to play may play.
+    apply(): -- return the state after the seat to play plays a card.
+    result(): -- return the winning team and points of a finished hand.
+    """
+    hands: tuple[int, ...]
+    trump: int
+    leader: int
+    trick: tuple[int, ...] = ()
+    skipped: int|None = None
+    maker: int = 0
+    alone: bool = False
+    won: tuple[int, int] = (0, 0)
+
+    @classmethod
+    def from_hand_state(cls, state: HandState) -> GameState:
+        """Return the GameState of an engine HandState once trump is made."""
+        if state.trump is None:
+            raise ValueError('The hand has no trump yet.')
+        if state.trick:
+            leader = state.trick[0][0]
+        elif state.tricks:
+            # The winner of the last trick leads
+            leader = state.tricks[-1][2]
+        else:
+            leader = state.leader
+        return cls(
+            tuple(state.hands), state.trump, leader, tuple(card for _, card in state.trick),
+            state.skipped, state.maker, state.alone, tuple(state.won),
+        )
+
+    # Public methods
+    def to_play(self) -> int:
+        """Return the seat that plays next."""
+        return self._order()[len(self.trick)]
+
+    def is_over(self) -> bool:
+        """Return True once every trick is played."""
+        return self.won[0] + self.won[1] == MAX_CARD_HAND_LIMIT
+
+    def legal_mask(self) -> int:
+        """Return the mask of cards the seat to play may play."""
+        led = self.trick[0] if self.trick else None
+        return legal_mask(self.hands[self.to_play()], led, self.trump)
+
+    def legal_moves(self) -> list[int]:
+        """Return the cards the seat to play may play, lowest card number first.
+        Empty once the hand is over.
+        """
+        if self.is_over():
+            return []
+        return card_list(self.legal_mask())
+
+    def apply(self, card: int) -> GameState:
+        """Return the state after the seat to play plays the card. Finishing a
+        trick scores it, and its winner leads the next one. Raises ValueError if the
+        card is not legal.
+        """
+        if self.is_over() or not self.legal_mask() >> card & 1:
+            raise ValueError(f'Card {card!r} cannot be played now.')
+
+        order = self._order()
+        seat = order[len(self.trick)]
+        hands = self.hands
+        hands = hands[:seat] + (hands[seat] ^ 1 << card,) + hands[seat + 1:]
+        trick = self.trick + (card,)
+        # Built with tuple.__new__ rather than _replace, which is several times slower
+        if len(trick) < len(order):
+            return _new(GameState, (hands, self.trump, self.leader, trick, self.skipped, self.maker, self.alone, self.won))
+
+        winner = order[trick_winner(trick, self.trump)]
+        won = (self.won[0] + 1, self.won[1]) if winner % 2 == 0 else (self.won[0], self.won[1] + 1)
+        return _new(GameState, (hands, self.trump, winner, (), self.skipped, self.maker, self.alone, won))
+
+    def result(self) -> tuple[int, int]|None:
+        """Return (team, points) for the team that won the hand, the same as
+        scores.round_points. None if the hand is not over.
+        """
+        if not self.is_over():
+            return None
+        makers = self.maker % 2
+        return round_points(self.won, makers, makers if self.alone else None)
+
+    # Private methods
+    def _order(self) -> tuple[int, ...]:
+        """Return the seats in playing order for the trick in progress."""
+        skipped = PLAYER_COUNT if self.skipped is None else self.skipped
+        return ORDERS[skipped][self.leader]
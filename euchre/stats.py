@@ -0,0 +1,581 @@
+"""Aggregate statistics over a stream of hand records.
+
+Hand records are read one at a time and folded into a HandStats, so a run of
+any size is summarized in constant memory. The pipeline is a chain of
+generators: iter_records() reads the records of a file, summarize_hands()
+turns each record into the HandSummary of what happened, and
+HandStats.add() counts it.
+
+Every aggregate is made of integer counters, exact power sums, fixed-bin
+histograms and a HyperLogLog sketch, all of which merge exactly: workers can
+each summarize part of a run and the merged HandStats is the same whichever
+way the records were split and in whatever order the parts are merged.
+
+The metrics are the make rate by where trump is relative to the turned card,
+the euchre rate by the maker's seat relative to the dealer, the success rate
+of going alone and the points scored for each outcome of a hand, as
+scores.round_points awards them.
+
+RunningStats(): -- count, mean and variance of a stream of integers.
+Histogram(): -- counts of integer values in fixed-width bins.
+DistinctSketch(): -- HyperLogLog estimate of how many distinct keys were seen.
+HandSummary(): -- what happened in one hand, from the makers' side.
+summarize_hand(): -- return the HandSummary of a hand record.
+summarize_hands(): -- generator of the HandSummary of each record.
+HandStats(): -- the aggregate metrics of a set of hands.
+collect(): -- fold a stream of hand records into a HandStats.
+collect_file(): -- return the HandStats of the records of a file.
+collect_files(): -- return the merged HandStats of record files, across worker processes.
+main(): -- print the statistics of record files from the command line.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
+if TYPE_CHECKING:
+    from euchre.records import HandRecord
+
+import math
+from itertools import islice
+
+from euchre.constants import MAX_TRICKS, MIN_TRICKS, PLAYER_COUNT, SUITS, TEAM_COUNT
+from euchre.masks import card_suit
+
+# Where trump is relative to the turned card: its suit, the other suit of its
+# colour, or one of the two suits of the other colour
+TRUMP_RELATIONS = ('turned', 'next', 'cross')
+# Maker seats counted clockwise from the dealer
+SEAT_RELATIONS = ('dealer', 'left', 'partner', 'right')
+# How a hand ends for the makers, as scored by scores.round_points
+OUTCOMES = ('euchred', 'made', 'march', 'alone_march')
+# Most points a hand scores, and most tricks a team takes
+MAX_HAND_POINTS = 4
+
+# Registers of a DistinctSketch: 2 ** 12, for about 1.6% standard error
+SKETCH_PRECISION = 12
+MASK_64 = (1 << 64) - 1
+
+
+class RunningStats():
+    """Count, mean and variance of a stream of integers.
+
+    It keeps the count and the exact sums of the values and their squares
+    rather than Welford's running mean. Welford's update and its parallel merge
+    round differently depending on how the values were split, while integer
+    sums merge exactly and give the same mean and variance however the stream
+    was divided between workers.
+
+    add(): -- add a value.
+    merge(): -- add the values of another RunningStats.
+    get_count(): -- return the number of values.
+    mean(): -- return the mean.
+    variance(): -- return the sample variance.
+    stdev(): -- return the sample standard deviation.
+    """
+    __slots__ = ('count', 'total', 'squares')
+
+    def __init__(self):
+        """Initialize the stats with no values."""
+        self.count = 0
+        self.total = 0
+        self.squares = 0
+
+    def __repr__(self):
+        """Return the RunningStats object."""
+        return f'RunningStats(count={self.count}, mean={self.mean():.4f})'
+
+    def __eq__(self, other):
+        return (isinstance(other, RunningStats) and self.count == other.count
+                and self.total == other.total and self.squares == other.squares)
+
+    # Public methods
+    def add(self, value: int):
+        """Add one integer value."""
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+
+    def merge(self, other: RunningStats):
+        """Add the values of another RunningStats to this one."""
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+
+    def get_count(self) -> int:
+        """Return the number of values added."""
+        return self.count
+
+    def mean(self) -> float:
+        """Return the mean of the values, 0.0 if there are none."""
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    def variance(self) -> float:
+        """Return the sample variance of the values, 0.0 for fewer than two."""
+        count = self.count
+        if count < 2:
+            return 0.0
+        # Exact in integers until the one division
+        return (count * self.squares - self.total * self.total) / (count * (count - 1))
+
+    def stdev(self) -> float:
+        """Return the sample standard deviation of the values."""
+        return math.sqrt(self.variance())
+
+
+class Histogram():
+    """Counts of integer values in fixed-width bins from low up to high, with
+    values outside the range counted as under or over.
+
+    add(): -- count a value.
+    merge(): -- add the counts of another Histogram with the same bins.
+    get_count(): -- return the count of the bin holding a value.
+    get_counts(): -- return the count of every bin.
+    get_total(): -- return the number of values counted.
+    quantile(): -- return the low edge of the bin holding a quantile.
+    """
+    __slots__ = ('low', 'high', 'width', 'counts', 'under', 'over')
+
+    def __init__(self, low: int, high: int, width: int=1):
+        """Initialize the histogram with empty bins.
+
+        Keyword arguments:
+        low: -- lowest value of the first bin.
+        high: -- value the last bin stops before.
+        width: -- width of every bin.
+        """
+        if width < 1 or high <= low or (high - low) % width:
+            raise ValueError(f'Bins of width {width} do not divide {low} to {high}.')
+        self.low = low
+        self.high = high
+        self.width = width
+        self.counts = [0] * ((high - low) // width)
+        self.under = 0
+        self.over = 0
+
+    def __repr__(self):
+        """Return the Histogram object."""
+        return f'Histogram(low={self.low}, high={self.high}, width={self.width}, total={self.get_total()})'
+
+    def __eq__(self, other):
+        return (isinstance(other, Histogram) and self._layout() == other._layout()
+                and self.counts == other.counts and self.under == other.under and self.over == other.over)
+
+    # Public methods
+    def add(self, value: int, count: int=1):
+        """Count a value.
+
+        Keyword arguments:
+        value: -- the value to count.
+        count: -- how many times to count it.
+        """
+        if value < self.low:
+            self.under += count
+        elif value >= self.high:
+            self.over += count
+        else:
+            self.counts[(value - self.low) // self.width] += count
+
+    def merge(self, other: Histogram):
+        """Add the counts of another Histogram. Raises ValueError if its bins differ."""
+        if other._layout() != self._layout():
+            raise ValueError(f'Cannot merge {other!r} into {self!r}: the bins differ.')
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            counts[index] += count
+        self.under += other.under
+        self.over += other.over
+
+    def get_count(self, value: int) -> int:
+        """Return the count of the bin holding the value."""
+        if value < self.low:
+            return self.under
+        if value >= self.high:
+            return self.over
+        return self.counts[(value - self.low) // self.width]
+
+    def get_counts(self) -> dict[int, int]:
+        """Return the count of every bin by the low edge of the bin."""
+        return {self.low + index * self.width: count for index, count in enumerate(self.counts)}
+
+    def get_total(self) -> int:
+        """Return the number of values counted, including those out of range."""
+        return sum(self.counts) + self.under + self.over
+
+    def quantile(self, fraction: float) -> int|None:
+        """Return the low edge of the bin holding the quantile, None if the
+        histogram is empty. Values under the range count as low and those over
+        it as high.
+        """
+        total = self.get_total()
+        if not total:
+            return None
+        rank = max(math.ceil(fraction * total), 1)
+        seen = self.under
+        if seen >= rank:
+            return self.low
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.low + index * self.width
+        return self.high
+
+    # Private methods
+    def _layout(self) -> tuple[int, int, int]:
+        """Return the bins of the histogram as (low, high, width)."""
+        return (self.low, self.high, self.width)
+
+
+class DistinctSketch():
+    """HyperLogLog estimate of the number of distinct integer keys added. Two
+    sketches merge exactly by keeping the larger of each register, so the
+    sketch of a whole run does not depend on how the run was split.
+
+    add(): -- add a key.
+    merge(): -- add the keys of another DistinctSketch.
+    estimate(): -- return the estimated number of distinct keys.
+    """
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int=SKETCH_PRECISION):
+        """Initialize an empty sketch.
+
+        Keyword arguments:
+        precision: -- bits of the hash that choose the register, 4 to 16.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f'Sketch precision must be from 4 to 16, not {precision}.')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __repr__(self):
+        """Return the DistinctSketch object."""
+        return f'DistinctSketch(precision={self.precision}, estimate={self.estimate():.0f})'
+
+    def __eq__(self, other):
+        return isinstance(other, DistinctSketch) and self.registers == other.registers
+
+    # Public methods
+    def add(self, key: int):
+        """Add a non-negative integer key of any size."""
+        hashed = _mix64(key & MASK_64)
+        key >>= 64
+        while key:
+            hashed = _mix64(hashed ^ key & MASK_64)
+            key >>= 64
+        precision = self.precision
+        register = hashed >> (64 - precision)
+        rest = hashed & ((1 << (64 - precision)) - 1)
+        # position of the first one bit in the rest of the hash
+        rank = 64 - precision - rest.bit_length() + 1
+        if rank > self.registers[register]:
+            self.registers[register] = rank
+
+    def merge(self, other: DistinctSketch):
+        """Add the keys of another DistinctSketch. Raises ValueError if its precision differs."""
+        if other.precision != self.precision:
+            raise ValueError(f'Cannot merge {other!r} into {self!r}: the precision differs.')
+        registers = self.registers
+        for index, rank in enumerate(other.registers):
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def estimate(self) -> float:
+        """Return the estimated number of distinct keys added."""
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * size and empty:
+            # Linear counting is closer for small counts
+            return size * math.log(size / empty)
+        return estimate
+
+
+class HandSummary(NamedTuple):
+    """What happened in one hand, from the makers' side.
+
+    deal: -- key of the deal: the four hands and the turned card.
+    relation: -- index in TRUMP_RELATIONS of trump against the turned card, None if passed out.
+    seat: -- index in SEAT_RELATIONS of the maker's seat, None if passed out.
+    alone: -- True if the maker went alone.
+    tricks: -- tricks the makers took.
+    outcome: -- index in OUTCOMES of how the hand ended for the makers.
+    points: -- points scored in the hand, by either team.
+    maker_points: -- points for the makers, negative when the defenders scored.
+    """
+    deal: int
+    relation: int|None
+    seat: int|None
+    alone: bool
+    tricks: int
+    outcome: int|None
+    points: int
+    maker_points: int
+
+
+def summarize_hand(record: HandRecord) -> HandSummary:
+    """Return the HandSummary of a hand record."""
+    hands = record.hands
+    deal = hands[0] | hands[1] << 24 | hands[2] << 48 | hands[3] << 72 | record.turned << 96
+    if record.trump is None:
+        return HandSummary(deal, None, None, False, 0, None, 0, 0)
+
+    turned_suit = card_suit(record.turned)
+    if record.trump == turned_suit:
+        relation = 0
+    elif record.trump == (turned_suit + 2) % len(SUITS):
+        relation = 1
+    else:
+        relation = 2
+    makers = record.maker % TEAM_COUNT
+    tricks = sum(1 for _, _, winner in record.tricks() if winner % TEAM_COUNT == makers)
+    if tricks < MIN_TRICKS:
+        outcome = 0
+    elif tricks < MAX_TRICKS:
+        outcome = 1
+    else:
+        outcome = 3 if record.alone else 2
+    maker_points = record.points if record.winner == makers else -record.points
+    return HandSummary(deal, relation, (record.maker - record.dealer) % PLAYER_COUNT,
+                       record.alone, tricks, outcome, record.points, maker_points)
+
+
+def summarize_hands(records: Iterable[HandRecord]) -> Iterator[HandSummary]:
+    """Yield the HandSummary of each record in the stream."""
+    for record in records:
+        yield summarize_hand(record)
+
+
+class HandStats():
+    """The aggregate metrics of a set of hands. Every field merges exactly.
+
+    add(): -- count the HandSummary of one hand.
+    merge(): -- add the metrics of another HandStats.
+    make_rate(): -- return the share of hands made for a trump relation.
+    euchre_rate(): -- return the share of hands euchred for a maker seat.
+    alone_rate(): -- return the share of alone hands the maker made.
+    distinct_deals(): -- return the estimated number of distinct deals.
+    summary(): -- return a dictionary of the metrics.
+    """
+    FIELDS = (
+        'hands', 'passed', 'called', 'made', 'seat_made', 'seat_euchred',
+        'alone', 'alone_made', 'alone_march', 'outcomes', 'tricks', 'maker_points', 'deals',
+    )
+
+    def __init__(self):
+        """Initialize the metrics with no hands."""
+        # hands with trump made, and deals passed out by every seat
+        self.hands = 0
+        self.passed = 0
+        # trump made, and made by the makers, by TRUMP_RELATIONS
+        self.called = [0] * len(TRUMP_RELATIONS)
+        self.made = [0] * len(TRUMP_RELATIONS)
+        # trump made, and euchred, by SEAT_RELATIONS of the maker
+        self.seat_made = [0] * len(SEAT_RELATIONS)
+        self.seat_euchred = [0] * len(SEAT_RELATIONS)
+        self.alone = 0
+        self.alone_made = 0
+        self.alone_march = 0
+        # points scored for each of the OUTCOMES
+        self.outcomes = [Histogram(0, MAX_HAND_POINTS + 1) for _ in OUTCOMES]
+        self.tricks = Histogram(0, MAX_TRICKS + 1)
+        self.maker_points = RunningStats()
+        self.deals = DistinctSketch()
+
+    def __repr__(self):
+        """Return the HandStats object."""
+        return f'HandStats(hands={self.hands}, passed={self.passed})'
+
+    def __eq__(self, other):
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    # Public methods
+    def add(self, hand: HandSummary):
+        """Count the HandSummary of one hand."""
+        self.deals.add(hand.deal)
+        if hand.relation is None:
+            self.passed += 1
+            return
+        self.hands += 1
+        self.called[hand.relation] += 1
+        self.seat_made[hand.seat] += 1
+        if hand.outcome:
+            self.made[hand.relation] += 1
+        else:
+            self.seat_euchred[hand.seat] += 1
+        if hand.alone:
+            self.alone += 1
+            if hand.outcome:
+                self.alone_made += 1
+            if hand.outcome == 3:
+                self.alone_march += 1
+        self.outcomes[hand.outcome].add(hand.points)
+        self.tricks.add(hand.tricks)
+        self.maker_points.add(hand.maker_points)
+
+    def merge(self, other: HandStats):
+        """Add the metrics of another HandStats to this one."""
+        for field in self.FIELDS:
+            value = getattr(other, field)
+            if isinstance(value, int):
+                setattr(self, field, getattr(self, field) + value)
+            elif isinstance(value, list):
+                mine = getattr(self, field)
+                for index, item in enumerate(value):
+                    if isinstance(item, int):
+                        mine[index] += item
+                    else:
+                        mine[index].merge(item)
+            else:
+                getattr(self, field).merge(value)
+
+    def make_rate(self, relation: int) -> float:
+        """Return the share of hands made when trump had the TRUMP_RELATIONS index to the turned card."""
+        return _rate(self.made[relation], self.called[relation])
+
+    def euchre_rate(self, seat: int) -> float:
+        """Return the share of hands euchred when the maker sat at the SEAT_RELATIONS index from the dealer."""
+        return _rate(self.seat_euchred[seat], self.seat_made[seat])
+
+    def alone_rate(self) -> float:
+        """Return the share of hands played alone that the maker made."""
+        return _rate(self.alone_made, self.alone)
+
+    def distinct_deals(self) -> float:
+        """Return the estimated number of distinct deals, passed out or not."""
+        return self.deals.estimate()
+
+    def summary(self) -> dict:
+        """Return a dictionary of the metrics, ready for JSON."""
+        return {
+            'hands': self.hands,
+            'passed': self.passed,
+            'distinct_deals': round(self.distinct_deals()),
+            'make_rate': {
+                name: {'called': self.called[index], 'rate': self.make_rate(index)}
+                for index, name in enumerate(TRUMP_RELATIONS)
+            },
+            'euchre_rate': {
+                name: {'made': self.seat_made[index], 'rate': self.euchre_rate(index)}
+                for index, name in enumerate(SEAT_RELATIONS)
+            },
+            'alone': {
+                'hands': self.alone,
+                'made': self.alone_made,
+                'march': self.alone_march,
+                'rate': self.alone_rate(),
+            },
+            'points': {
+                name: {str(points): count for points, count in self.outcomes[index].get_counts().items() if count}
+                for index, name in enumerate(OUTCOMES)
+            },
+            'maker_tricks': {str(tricks): count for tricks, count in self.tricks.get_counts().items()},
+            'maker_points': {'mean': self.maker_points.mean(), 'stdev': self.maker_points.stdev()},
+        }
+
+
+def collect(records: Iterable[HandRecord], stats: HandStats=None) -> HandStats:
+    """Fold a stream of hand records into a HandStats and return it.
+
+    Keyword arguments:
+    records: -- any iterable of HandRecord, read once.
+    stats: -- HandStats to add to, a new one if None.
+    """
+    if stats is None:
+        stats = HandStats()
+    add = stats.add
+    for hand in summarize_hands(records):
+        add(hand)
+    return stats
+
+
+def collect_file(path: str, start: int=0, stop: int=None) -> HandStats:
+    """Return the HandStats of the records of a file.
+
+    Keyword arguments:
+    path: -- the record file.
+    start: -- position of the first record to count.
+    stop: -- position of the record to stop before, None for the end of the file.
+    """
+    from euchre.records import iter_records
+    records = iter_records(path, start)
+    if stop is not None:
+        records = islice(records, stop - start)
+    return collect(records)
+
+
+def collect_files(paths: list[str], workers: int=1) -> HandStats:
+    """Return the merged HandStats of the record files, summarized across
+    worker processes. The result is the same for any number of workers.
+
+    Keyword arguments:
+    paths: -- the record files.
+    workers: -- number of worker processes, 1 reads in this process.
+    """
+    from euchre.records import RecordReader, iter_records
+    stats = HandStats()
+    if workers <= 1:
+        for path in paths:
+            collect(iter_records(path), stats)
+        return stats
+
+    from euchre.tournament import run_shards, split_range, worker_pool
+    shards = []
+    for path in paths:
+        with RecordReader(path) as reader:
+            count = len(reader)
+        shards.extend((path, start, stop) for start, stop in split_range(0, count, workers))
+
+    with worker_pool(workers) as pool:
+        for result in run_shards(collect_file, shards, pool):
+            stats.merge(result)
+    return stats
+
+
+def main(argv: list[str]=None):
+    """Print the statistics of record files from the command line."""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog='python -m euchre.stats', description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='hand record files, as written by records.RecordWriter')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--json', action='store_true', help='print the statistics as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        summary = collect_files(args.paths, args.workers).summary()
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f'Hands: {summary["hands"]}  Passed out: {summary["passed"]}  '
+          f'Distinct deals: ~{summary["distinct_deals"]}')
+    for name, entry in summary['make_rate'].items():
+        print(f'Trump {name:<8} called {entry["called"]:>8}  make rate {entry["rate"]:.3f}')
+    for name, entry in summary['euchre_rate'].items():
+        print(f'Maker {name:<8} made {entry["made"]:>10}  euchre rate {entry["rate"]:.3f}')
+    alone = summary['alone']
+    print(f'Alone: {alone["hands"]}  made rate {alone["rate"]:.3f}  marches {alone["march"]}')
+    for name, points in summary['points'].items():
+        counts = '  '.join(f'{value} pts: {count}' for value, count in points.items())
+        print(f'{name:<12} {counts}')
+    maker = summary['maker_points']
+    print(f'Maker points per hand: {maker["mean"]:.3f} (sd {maker["stdev"]:.3f})')
+
+
+def _rate(count: int, total: int) -> float:
+    """Return count / total, 0.0 when there is nothing to divide by."""
+    return count / total if total else 0.0
+
+
+def _mix64(value: int) -> int:
+    """Return the splitmix64 finalizer of a 64 bit value, spreading every input bit over the output."""
+    value = (value ^ value >> 30) * 0xBF58476D1CE4E5B9 & MASK_64
+    value = (value ^ value >> 27) * 0x94D049BB133111EB & MASK_64
+    return value ^ value >> 31
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""The strength module rates five card hands for bidding with a precomputed table.
+
+Every five card hand is rated for every trump suit: the number of trumps and
+bowers it holds, its off-suit aces, the off suits it is void in and an estimate
+of the tricks it takes. Only the suits relative to trump matter, so a hand is
+first relabelled with trump as Spades by canonical.trump_permutation, which
+keeps the colour pairs and so the left bower, and the table holds one record for each of the
+C(24, 5) = 42,504 relabelled hands. Records are two bytes each and the table
+ships as a binary file that is memory mapped on first use, so rating a hand is
+one lookup.
+
+    python -m euchre.strength
+
+rebuilds the table file.
+
+HandStrength(): -- the bidding metrics of a hand for a trump suit.
+rate_hand(): -- work out the metrics of a hand without the table.
+hand_index(): -- return the position of a five card hand among all five card hands.
+trump_relative(): -- relabel a hand so trump is Spades.
+StrengthTable(): -- the metrics of every hand, read from bytes or a memory map.
+build_table(): -- return the bytes of the table file.
+write_table(): -- write the table file.
+load_table(): -- memory map a table file.
+get_table(): -- return the shared table, loading it on first use.
+"""
+from __future__ import annotations
+from typing import NamedTuple
+
+import mmap
+import os
+import struct
+from itertools import combinations
+from math import comb
+
+from euchre.canonical import TRUMP_PERMUTATIONS, permute_hand
+from euchre.constants import MAX_CARD_HAND_LIMIT, SUITS
+from euchre.masks import (
+    CARD_COUNT,
+    JACK,
+    LEFT_SUIT,
+    RANK_ORDER,
+    SUIT_SIZE,
+    TRUMP_SUIT_MASK,
+    card_index,
+)
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'strength.bin')
+TABLE_MAGIC = b'EUST'
+TABLE_VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+RECORD = struct.Struct('<H')
+HAND_COUNT = comb(CARD_COUNT, MAX_CARD_HAND_LIMIT)
+
+# Trump suit of the relabelled hands in the table
+TABLE_TRUMP = 0
+
+
+# Record bit fields: (shift, width)
+TRUMPS_FIELD = (0, 3)
+BOWERS_FIELD = (3, 2)
+ACES_FIELD = (5, 2)
+VOIDS_FIELD = (7, 2)
+TRICKS_FIELD = (9, 6)
+
+# Cards in the trump suit, counting the left bower
+TRUMP_CARDS = SUIT_SIZE + 1
+
+# Tricks are estimated in tenths of a trick
+TRICK_UNITS = 10
+# A trump with no higher trump missing is a trick; each missing higher trump costs this much
+MISSING_TRUMP_COST = 3
+LOW_TRUMP_VALUE = 2
+# Every trump past the second is worth this much more, the long trumps take the last tricks
+LONG_TRUMP_BONUS = 2
+OFF_ACE_VALUE = 7
+GUARDED_KING_VALUE = 4
+SHORT_KING_VALUE = 2
+# Each void off suit is a chance to trump in when the hand has trumps to do it
+VOID_VALUE = 3
+VOID_TRUMPS = 2
+
+# combinations of the card number for every hand size, for hand_index
+_BINOMIALS = tuple(
+    tuple(comb(card, size) for size in range(MAX_CARD_HAND_LIMIT + 1))
+    for card in range(CARD_COUNT)
+)
+
+
+class HandStrength(NamedTuple):
+    """The bidding metrics of a hand for one trump suit.
+
+    trumps: -- number of trumps, counting the left bower.
+    bowers: -- number of bowers.
+    aces: -- number of off-suit aces.
+    voids: -- number of off suits with no cards.
+    tricks: -- estimated number of tricks the hand takes by itself.
+    """
+    trumps: int
+    bowers: int
+    aces: int
+    voids: int
+    tricks: float
+
+
+def rate_hand(hand: int, trump: int) -> HandStrength:
+    """Work out the bidding metrics of a hand without the table.
+
+    Keyword arguments:
+    hand: -- card mask of the hand.
+    trump: -- suit index of trump.
+    """
+    suit_masks = TRUMP_SUIT_MASK[trump]
+    trumps = hand & suit_masks[trump]
+    trump_count = trumps.bit_count()
+    right = 1 << card_index(JACK, trump)
+    left = 1 << card_index(JACK, LEFT_SUIT[trump])
+    bowers = (1 if trumps & right else 0) + (1 if trumps & left else 0)
+
+    tenths = 0
+    missing = 0
+    for card in RANK_ORDER[trump][:TRUMP_CARDS]:
+        if hand >> card & 1:
+            tenths += max(LOW_TRUMP_VALUE, TRICK_UNITS - MISSING_TRUMP_COST * missing)
+        else:
+            missing += 1
+    tenths += LONG_TRUMP_BONUS * max(0, trump_count - 2)
+
+    aces = 0
+    voids = 0
+    for suit in range(len(SUITS)):
+        if suit == trump:
+            continue
+        cards = hand & suit_masks[suit]
+        if not cards:
+            voids += 1
+            continue
+        ace = cards >> card_index(14, suit) & 1
+        king = cards >> card_index(13, suit) & 1
+        aces += ace
+        tenths += OFF_ACE_VALUE * ace
+        if king:
+            tenths += GUARDED_KING_VALUE if ace else SHORT_KING_VALUE if cards.bit_count() <= 2 else 0
+    if trump_count >= VOID_TRUMPS:
+        tenths += VOID_VALUE * voids
+
+    tricks = min(tenths, MAX_CARD_HAND_LIMIT * TRICK_UNITS)
+    return HandStrength(trump_count, bowers, aces, voids, tricks / TRICK_UNITS)
+
+
+def hand_index(hand: int) -> int:
+    """Return the position of a five card hand among all five card hands, 0 to 42,503,
+    by the combinatorial number system.
+    """
+    index = 0
+    size = 1
+    while hand:
+        low = hand & -hand
+        index += _BINOMIALS[low.bit_length() - 1][size]
+        size += 1
+        hand ^= low
+    return index
+
+
+def trump_relative(hand: int, trump: int) -> int:
+    """Return the hand with its suits relabelled so trump is Spades and the left
+    bower suit is Clubs. Every metric of the hand is the same under the new labels.
+    """
+    if trump == TABLE_TRUMP:
+        return hand
+    return permute_hand(hand, TRUMP_PERMUTATIONS[trump])
+
+
+def _pack(strength: HandStrength) -> int:
+    """Return the two byte record of the metrics."""
+    record = 0
+    values = (strength.trumps, strength.bowers, strength.aces, strength.voids,
+              round(strength.tricks * TRICK_UNITS))
+    for (shift, _), value in zip((TRUMPS_FIELD, BOWERS_FIELD, ACES_FIELD, VOIDS_FIELD, TRICKS_FIELD), values):
+        record |= value << shift
+    return record
+
+
+def _field(record: int, field: tuple[int, int]) -> int:
+    """Return a bit field of a record."""
+    shift, width = field
+    return record >> shift & ((1 << width) - 1)
+
+
+class StrengthTable():
+    """The bidding metrics of every five card hand for every trump, backed by the
+    bytes of a table file or a memory map of one.
+
+    lookup(): -- return the HandStrength of a hand.
+    tricks(): -- return the estimated tricks of a hand.
+    get_record(): -- return the packed record of a hand.
+    close(): -- release the memory map.
+    """
+
+    def __init__(self, data: bytes|mmap.mmap):
+        """Initialize the table from the contents of a table file. Raises ValueError
+        if the contents are not a table of this version.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError('Strength table is too short.')
+        magic, version, record_size, count = HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or record_size != RECORD.size:
+            raise ValueError('Not a strength table of this version.')
+        if count != HAND_COUNT or len(data) != HEADER.size + count * record_size:
+            raise ValueError('Strength table has the wrong number of hands.')
+        self._data = data
+
+    def __repr__(self):
+        """Return the StrengthTable object."""
+        return f'StrengthTable(hands={HAND_COUNT})'
+
+    # Public methods
+    def lookup(self, hand: int, trump: int) -> HandStrength:
+        """Return the HandStrength of the hand for the trump. Hands that are not
+        five cards are rated directly.
+
+        Keyword arguments:
+        hand: -- card mask of the hand.
+        trump: -- suit index of trump.
+        """
+        if hand.bit_count() != MAX_CARD_HAND_LIMIT:
+            return rate_hand(hand, trump)
+        record = self._record(hand, trump)
+        return HandStrength(
+            _field(record, TRUMPS_FIELD),
+            _field(record, BOWERS_FIELD),
+            _field(record, ACES_FIELD),
+            _field(record, VOIDS_FIELD),
+            _field(record, TRICKS_FIELD) / TRICK_UNITS,
+        )
+
+    def tricks(self, hand: int, trump: int) -> float:
+        """Return the estimated tricks of the hand for the trump."""
+        if hand.bit_count() != MAX_CARD_HAND_LIMIT:
+            return rate_hand(hand, trump).tricks
+        return _field(self._record(hand, trump), TRICKS_FIELD) / TRICK_UNITS
+
+    def get_record(self, hand: int, trump: int) -> int:
+        """Return the two byte record of the hand for the trump, the same for every
+        hand with the same metrics. Hands that are not five cards are rated directly.
+        """
+        if hand.bit_count() != MAX_CARD_HAND_LIMIT:
+            return _pack(rate_hand(hand, trump))
+        return self._record(hand, trump)
+
+    def close(self):
+        """Release the memory map, if the table is backed by one."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    # Private methods
+    def _record(self, hand: int, trump: int) -> int:
+        """Return the record of a five card hand."""
+        offset = HEADER.size + RECORD.size * hand_index(trump_relative(hand, trump))
+        return RECORD.unpack_from(self._data, offset)[0]
+
+
+def build_table() -> bytes:
+    """Rate every five card hand with Spades as trump and return the table file contents."""
+    records = bytearray(HEADER.size + RECORD.size * HAND_COUNT)
+    HEADER.pack_into(records, 0, TABLE_MAGIC, TABLE_VERSION, RECORD.size, HAND_COUNT)
+    for cards in combinations(range(CARD_COUNT), MAX_CARD_HAND_LIMIT):
+        hand = 0
+        for card in cards:
+            hand |= 1 << card
+        offset = HEADER.size + RECORD.size * hand_index(hand)
+        RECORD.pack_into(records, offset, _pack(rate_hand(hand, TABLE_TRUMP)))
+    return bytes(records)
+
+
+def write_table(path: str=TABLE_PATH):
+    """Build the table and write it to the path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(build_table())
+
+
+def load_table(path: str=TABLE_PATH) -> StrengthTable:
+    """Memory map the table file at the path and return the StrengthTable."""
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return StrengthTable(data)
+    except ValueError:
+        data.close()
+        raise
+
+
+_table = None
+
+def get_table() -> StrengthTable:
+    """Return the table shared by the bots, memory mapping the shipped file on first
+    use. The table is built in memory if the file is missing or out of date.
+    """
+    global _table
+    if _table is None:
+        try:
+            _table = load_table()
+        except (OSError, ValueError):
+            _table = StrengthTable(build_table())
+    return _table
+
+
+if __name__ == "__main__":
+    write_table()
+    print(f'Wrote {HAND_COUNT} hands to {TABLE_PATH}.')
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 from collections import deque
 from random import sample
 
+from euchre.events import TEAMS, emit
+
 # Base Team class
 class Team():
     def __init__(self, player_A: Player, player_B: Player, name: str):
@@ -68,15 +70,13 @@ def build_teams(teams_list: list[Player]) -> list[Team]:
     if not teams_list:
         return
     
-    print('\n')
-    print(f'Assigning teams...')
     teams = []
     team_names = ["Red", "Black"]
 
     for team in zip(team_names, teams_list):
         new_team = Team(team[1][0],team[1][1], team[0])
-        print(new_team)
         teams.append(new_team)
+    emit(TEAMS, teams=teams)
 
     return teams
 
@@ -8,14 +8,12 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from euchre.teams import Team
 
+from euchre.events import GAME_WON, TITLE, emit
+
 # Print the title screen for the game
 def title():
     """Print the title screen for the game."""
-    print('-' * 40)
-    print(f'\t\tEUCHRE')
-    print('-' * 40)
-    print(f'Welcome to the classic card game of Euchre!')
-    print('\n')
+    emit(TITLE)
 
 # Congratulate the winners of the game
 def congrats(team: Team):
@@ -27,6 +25,5 @@ def congrats(team: Team):
     if not team:
         return
     
-    players = team.get_players()
-    print(f'Team {team.get_name()} HAS WON THE GAME! CONGRATULATIONS {players[0]} and {players[1]}!')
+    emit(GAME_WON, team=team)
     
\ No newline at end of file
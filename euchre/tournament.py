@@ -0,0 +1,364 @@
+"""The tournament module plays large numbers of bot-vs-bot games across processes.
+
+Every game gets its own random stream seeded from the tournament seed and the
+game number, so the results for a seed are identical no matter how the games
+are split between workers.
+
+    python -m euchre.tournament --games 10000 --workers 8 --seed 1 bot bot
+
+TournamentStats(): -- mergeable counters for a set of games.
+play_games(): -- play a range of games in this process.
+run_tournament(): -- play games across worker processes and merge the results.
+split_range(): -- split a range of numbers into shards for the workers.
+worker_pool(): -- context manager giving a pool of worker processes, if more than one.
+run_shards(): -- run a function for every shard on the pool and return the results.
+main(): -- command line entry point.
+"""
+from __future__ import annotations
+from typing import Callable, Iterable
+
+import contextlib
+import math
+from random import Random
+
+from euchre.bots import Bot, BotAgent, EVAgent, ISMCTSAgent, PIMCAgent
+from euchre.constants import BOTS, PLAYER_COUNT, TEAM_COUNT
+from euchre.engine import GameEngine
+from euchre.teams import Team, assign_player_teams, seat_teams
+
+
+def _pimc_agent(rng: Random) -> PIMCAgent:
+    """Return a PIMCAgent limited by samples only, so games can be reproduced."""
+    return PIMCAgent(samples=16, time_budget=None, rng=rng)
+
+
+def _ismcts_agent(rng: Random) -> ISMCTSAgent:
+    """Return an ISMCTSAgent limited by iterations only, so games can be reproduced."""
+    return ISMCTSAgent(iterations=200, time_budget=None, rng=rng)
+
+
+# Agents that can take part in a tournament, by name. Each is built from a random
+# number generator that is seeded for the game and seat.
+AGENTS = {
+    'bot': lambda rng: BotAgent(),
+    'ev': lambda rng: EVAgent(),
+    'pimc': _pimc_agent,
+    'ismcts': _ismcts_agent,
+}
+
+# z value for 95% confidence intervals
+Z_95 = 1.959963984540054
+
+
+class TournamentStats():
+    """Counters for a set of games. All counters are integers so merging partial
+    results from workers is exact and independent of the order they arrive in.
+
+    merge(): -- add the counters of another TournamentStats.
+    win_rate(): -- return the share of games won by a team.
+    win_interval(): -- return the 95% Wilson interval of the win rate.
+    points_per_hand(): -- return the average points a team scored per hand.
+    points_interval(): -- return the 95% interval of the average points margin per hand.
+    euchre_rate(): -- return the share of a team's made hands that were euchred.
+    summary(): -- return a dictionary of the results.
+    """
+    FIELDS = (
+        'games', 'hands', 'passed', 'wins', 'points', 'made', 'euchred',
+        'alone', 'alone_made', 'margin_sum', 'margin_squares',
+    )
+
+    def __init__(self):
+        self.games = 0
+        # hands with a trump made, and deals passed out by every seat
+        self.hands = 0
+        self.passed = 0
+        self.wins = [0] * TEAM_COUNT
+        self.points = [0] * TEAM_COUNT
+        # hands the team made trump, and how many of those they were euchred on
+        self.made = [0] * TEAM_COUNT
+        self.euchred = [0] * TEAM_COUNT
+        self.alone = [0] * TEAM_COUNT
+        self.alone_made = [0] * TEAM_COUNT
+        # points of team 0 minus points of team 1 for every hand, for the interval
+        self.margin_sum = 0
+        self.margin_squares = 0
+
+    def __repr__(self):
+        """Return the TournamentStats object."""
+        return f'TournamentStats(games={self.games}, wins={self.wins})'
+
+    def __eq__(self, other):
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    # Public methods
+    def add_game(self, result):
+        """Add the GameResult of one game to the counters."""
+        self.games += 1
+        self.wins[result.winner] += 1
+        for hand in result.hands:
+            if hand.trump is None:
+                self.passed += 1
+                continue
+            self.hands += 1
+            makers = hand.maker % 2
+            self.made[makers] += 1
+            if hand.alone:
+                self.alone[makers] += 1
+            if hand.winner is None:
+                continue
+            self.points[hand.winner] += hand.points
+            margin = hand.points if hand.winner == 0 else -hand.points
+            self.margin_sum += margin
+            self.margin_squares += margin * margin
+            if hand.winner != makers:
+                self.euchred[makers] += 1
+            elif hand.alone:
+                self.alone_made[makers] += 1
+
+    def merge(self, other: TournamentStats):
+        """Add the counters of another TournamentStats to this one."""
+        for field in self.FIELDS:
+            value = getattr(other, field)
+            if isinstance(value, list):
+                mine = getattr(self, field)
+                for team, count in enumerate(value):
+                    mine[team] += count
+            else:
+                setattr(self, field, getattr(self, field) + value)
+
+    def win_rate(self, team: int) -> float:
+        """Return the share of games won by the team."""
+        return _rate(self.wins[team], self.games)
+
+    def win_interval(self, team: int) -> tuple[float, float]:
+        """Return the 95% Wilson score interval of the team's win rate."""
+        return wilson_interval(self.wins[team], self.games)
+
+    def points_per_hand(self, team: int) -> float:
+        """Return the average points the team scored per hand played."""
+        return _rate(self.points[team], self.hands)
+
+    def points_interval(self) -> tuple[float, float]:
+        """Return the 95% interval of the points margin per hand of team 0 over team 1."""
+        if self.hands < 2:
+            return (0.0, 0.0)
+        mean = self.margin_sum / self.hands
+        variance = (self.margin_squares - self.hands * mean * mean) / (self.hands - 1)
+        spread = Z_95 * math.sqrt(max(variance, 0.0) / self.hands)
+        return (mean - spread, mean + spread)
+
+    def euchre_rate(self, team: int) -> float:
+        """Return the share of hands the team made trump and was euchred."""
+        return _rate(self.euchred[team], self.made[team])
+
+    def summary(self, agents: list[str]=None) -> dict:
+        """Return a dictionary of the results for each team.
+
+        Keyword arguments:
+        agents: -- names of the agents playing for each team.
+        """
+        teams = []
+        for team in range(TEAM_COUNT):
+            teams.append({
+                'agent': agents[team] if agents else None,
+                'wins': self.wins[team],
+                'win_rate': self.win_rate(team),
+                'win_interval': self.win_interval(team),
+                'points_per_hand': self.points_per_hand(team),
+                'made': self.made[team],
+                'euchre_rate': self.euchre_rate(team),
+                'alone': self.alone[team],
+                'alone_made': self.alone_made[team],
+            })
+        return {
+            'games': self.games,
+            'hands': self.hands,
+            'passed': self.passed,
+            'margin_interval': self.points_interval(),
+            'teams': teams,
+        }
+
+
+def wilson_interval(successes: int, trials: int) -> tuple[float, float]:
+    """Return the 95% Wilson score interval for a proportion.
+
+    Keyword arguments:
+    successes: -- number of successes.
+    trials: -- number of trials.
+    """
+    if not trials:
+        return (0.0, 1.0)
+    rate = successes / trials
+    z2 = Z_95 * Z_95
+    centre = (rate + z2 / (2 * trials)) / (1 + z2 / trials)
+    spread = Z_95 * math.sqrt(rate * (1 - rate) / trials + z2 / (4 * trials * trials)) / (1 + z2 / trials)
+    return (centre - spread, centre + spread)
+
+
+def game_rng(seed: int, game: int, stream: str='deal') -> Random:
+    """Return a random stream for one game of the tournament. The deals and each
+    seat's agent draw from separate streams, so the same seed deals the same cards
+    whichever agents are playing.
+
+    Keyword arguments:
+    seed: -- the tournament seed.
+    game: -- the number of the game in the tournament.
+    stream: -- name of the stream within the game.
+    """
+    return Random(f'{seed}:{game}:{stream}')
+
+
+def seat_agents(agents: list[str], seed: int=0, game: int=0) -> list:
+    """Seat a Bot for every player with teams.seat_teams and return the agent for each
+    seat. Seats alternate between the teams, so seat % 2 is the team index.
+
+    Keyword arguments:
+    agents: -- the agent name playing for each team.
+    seed: -- the tournament seed, for the agents' random streams.
+    game: -- the number of the game in the tournament.
+    """
+    bots = [Bot(name) for name in BOTS[:PLAYER_COUNT]]
+    team_list = [Team(bots[0], bots[1], "Red"), Team(bots[2], bots[3], "Black")]
+    assign_player_teams(team_list)
+
+    seats = []
+    for seat, bot in enumerate(seat_teams(team_list)):
+        team = team_list.index(bot.get_team())
+        seats.append(AGENTS[agents[team]](game_rng(seed, game, f'seat{seat}')))
+    return seats
+
+
+def play_games(agents: list[str], seed: int, start: int, stop: int) -> TournamentStats:
+    """Play games start to stop of the tournament in this process. Returns the TournamentStats.
+
+    Keyword arguments:
+    agents: -- the agent name playing for each team.
+    seed: -- the tournament seed.
+    start: -- number of the first game to play.
+    stop: -- number of the game to stop before.
+    """
+    stats = TournamentStats()
+    for game in range(start, stop):
+        seats = seat_agents(agents, seed, game)
+        engine = GameEngine(seats, game_rng(seed, game), dealer=game % PLAYER_COUNT)
+        stats.add_game(engine.play_game())
+    return stats
+
+
+def run_tournament(agents: list[str], games: int, seed: int=0, workers: int=1) -> TournamentStats:
+    """Play the games across worker processes and merge the results.
+
+    Keyword arguments:
+    agents: -- the agent name playing for each team.
+    games: -- number of games to play.
+    seed: -- the tournament seed.
+    workers: -- number of worker processes, 1 plays in this process.
+    """
+    for name in agents:
+        if name not in AGENTS:
+            raise ValueError(f'Unknown agent {name!r}. Choose from {", ".join(AGENTS)}.')
+
+    # Several shards per worker keep the workers busy when games vary in length
+    shards = [(agents, seed, start, stop) for start, stop in split_range(0, games, workers * 4)]
+    stats = TournamentStats()
+    with worker_pool(workers) as pool:
+        for result in run_shards(play_games, shards, pool):
+            stats.merge(result)
+    return stats
+
+
+def split_range(start: int, stop: int, parts: int) -> list[tuple[int, int]]:
+    """Split the numbers start to stop into at most parts (start, stop) ranges of
+    nearly equal size, in order. An empty range is one empty shard.
+
+    Keyword arguments:
+    start: -- the first number.
+    stop: -- the number to stop before.
+    parts: -- the most ranges to split into.
+    """
+    count = stop - start
+    parts = min(count, parts) or 1
+    bounds = [start + count * part // parts for part in range(parts + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+@contextlib.contextmanager
+def worker_pool(workers: int):
+    """Context manager giving a pool of worker processes for run_shards(), or
+    None to run the shards in this process when there is only one worker.
+
+    Keyword arguments:
+    workers: -- number of worker processes.
+    """
+    if workers <= 1:
+        yield None
+        return
+    # Imported here so worker processes, which import this module, skip it
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def run_shards(function: Callable, shards: Iterable[tuple], pool=None) -> list:
+    """Call the function with the arguments of every shard and return the results
+    in shard order, on the workers of the pool or in this process without one.
+    The function has to be importable by the workers, a module level function.
+
+    Keyword arguments:
+    function: -- the function to call for every shard.
+    shards: -- the arguments of every call.
+    pool: -- the pool from worker_pool(), None to run in this process.
+    """
+    if pool is None:
+        return [function(*shard) for shard in shards]
+    futures = [pool.submit(function, *shard) for shard in shards]
+    return [future.result() for future in futures]
+
+
+def main(argv: list[str]=None):
+    """Run a tournament from the command line and print the results."""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog='python -m euchre.tournament', description=__doc__.splitlines()[0])
+    parser.add_argument('agents', nargs='*', default=['bot', 'bot'],
+                        help=f'agent for each team, one of {", ".join(AGENTS)} (default: bot bot)')
+    parser.add_argument('--games', type=int, default=1000, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='tournament seed')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    if len(args.agents) != TEAM_COUNT:
+        parser.error(f'expected {TEAM_COUNT} agents, got {len(args.agents)}')
+
+    try:
+        stats = run_tournament(args.agents, args.games, args.seed, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    summary = stats.summary(args.agents)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print('-' * 40)
+    print(f'\t\tTOURNAMENT')
+    print('-' * 40)
+    print(f'Games: {summary["games"]}  Hands: {summary["hands"]}  Passed out: {summary["passed"]}')
+    for team, result in enumerate(summary['teams']):
+        low, high = result['win_interval']
+        print(f'Team {team} ({result["agent"]}): win rate {result["win_rate"]:.3f} [{low:.3f}, {high:.3f}], '
+              f'points/hand {result["points_per_hand"]:.3f}, euchre rate {result["euchre_rate"]:.3f}')
+    low, high = summary['margin_interval']
+    print(f'Points margin per hand (team 0 - team 1): [{low:.3f}, {high:.3f}]')
+
+
+def _rate(count: int, total: int) -> float:
+    """Return count / total, or 0 if there is nothing to count."""
+    if not total:
+        return 0.0
+    return count / total
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""The tracker module keeps track of the card play of a hand as it happens.
+
+A CardTracker is updated once per card played and answers every question
+about the hand so far with a lookup: the mask of cards played, the suits each
+seat has shown out of and the cards left in each suit. Suits are effective
+suits under trump, so the left bower counts as trump, the same as
+Trump.get_left. The game engine keeps one in the HandState of each hand, so
+agents read the round so far without going back over the tricks played.
+
+CardTracker(): -- played cards, known voids and remaining cards of a hand.
+"""
+from __future__ import annotations
+
+from euchre.constants import PLAYER_COUNT, SUITS
+from euchre.masks import EFFECTIVE_SUIT, TRUMP_SUIT_MASK
+
+
+class CardTracker():
+    """Played cards, known voids and remaining cards of one hand, updated card
+    by card. Seats, cards and suits are numbered as in the masks module and
+    the engine's HandState.
+
+    reset(): -- forget the hand and start a new one with a trump suit.
+    start_trick(): -- start a new trick.
+    play(): -- record a card played by a seat.
+    get_trump(): -- return the trump suit index.
+    get_led_suit(): -- return the effective suit led to the trick in progress.
+    get_trick(): -- return the (seat, card) pairs of the trick in progress.
+    get_history(): -- return every card played this hand, in order.
+    get_played(): -- return the mask of cards played.
+    is_played(): -- return True if a card has been played.
+    get_voids(): -- return the mask of suits a seat has shown out of.
+    is_void(): -- return True if a seat has shown out of a suit.
+    remaining(): -- return how many cards of a suit are not played yet.
+    get_remaining(): -- return the mask of cards of a suit not played yet.
+    """
+
+    def __init__(self, trump: int=None):
+        """Initialize the tracker for a hand.
+
+        Keyword arguments:
+        trump: -- suit index of trump, None until trump is made.
+        """
+        self.reset(trump)
+
+    def __repr__(self):
+        """Return the CardTracker object."""
+        return f'CardTracker(trump={self._trump!r}, played={self._played.bit_count()})'
+
+    # Public methods
+    def reset(self, trump: int=None):
+        """Forget every card played and start a new hand.
+
+        Keyword arguments:
+        trump: -- suit index of trump for the new hand.
+        """
+        self._trump = trump
+        self._played = 0
+        # bit per effective suit each seat has shown out of
+        self._voids = [0] * PLAYER_COUNT
+        self._counts = [0] * len(SUITS)
+        if trump is not None:
+            self._counts = [mask.bit_count() for mask in TRUMP_SUIT_MASK[trump]]
+        self._trick = []
+        self._led_suit = None
+        self._history = []
+
+    def start_trick(self):
+        """Start a new trick. The next card played leads it."""
+        self._trick = []
+        self._led_suit = None
+
+    def play(self, seat: int, card: int):
+        """Record the card played by the seat. A card that does not follow the
+        suit led shows the seat is out of that suit.
+
+        Keyword arguments:
+        seat: -- seat number that played the card.
+        card: -- card number played.
+        """
+        bit = 1 << card
+        if self._played & bit:
+            raise ValueError(f'Card {card!r} has already been played.')
+        if self._trump is None:
+            raise ValueError('Cards cannot be played before trump is made.')
+
+        suit = EFFECTIVE_SUIT[self._trump][card]
+        if self._led_suit is None:
+            self._led_suit = suit
+        elif suit != self._led_suit:
+            self._voids[seat] |= 1 << self._led_suit
+        self._played |= bit
+        self._counts[suit] -= 1
+        self._trick.append((seat, card))
+        self._history.append(card)
+
+    def get_trump(self) -> int|None:
+        """Return the suit index of trump."""
+        return self._trump
+
+    def get_led_suit(self) -> int|None:
+        """Return the effective suit led to the trick in progress, None before the lead."""
+        return self._led_suit
+
+    def get_trick(self) -> list[tuple[int, int]]:
+        """Return the (seat, card) pairs of the trick in progress, in playing order."""
+        return self._trick
+
+    def get_history(self) -> list[int]:
+        """Return every card played this hand, in the order they were played."""
+        return self._history
+
+    def get_played(self) -> int:
+        """Return the mask of every card played this hand."""
+        return self._played
+
+    def is_played(self, card: int) -> bool:
+        """Return True if the card has been played this hand."""
+        return bool(self._played >> card & 1)
+
+    def get_voids(self, seat: int) -> int:
+        """Return the mask with a bit per effective suit the seat has shown out of."""
+        return self._voids[seat]
+
+    def is_void(self, seat: int, suit: int) -> bool:
+        """Return True if the seat has shown out of the effective suit."""
+        return bool(self._voids[seat] >> suit & 1)
+
+    def remaining(self, suit: int) -> int:
+        """Return how many cards of the effective suit have not been played,
+        wherever they are: in hands, the kitty or the discard.
+        """
+        return self._counts[suit]
+
+    def get_remaining(self, suit: int) -> int:
+        """Return the mask of cards of the effective suit not played yet."""
+        return TRUMP_SUIT_MASK[self._trump][suit] & ~self._played
@@ -4,6 +4,7 @@ Trump(): -- Base Trump class
 """
 
 from euchre.cards import Card
+from euchre.events import MAKERS, TRUMP, emit
 
 class Trump(Card):
     """Base Trump Class used to keep track of the Trump for the round.
@@ -66,14 +67,11 @@ class Trump(Card):
 
     def print_trump(self):
         """Print the current Trump suit."""
-        print('\n')
-        print('-' * 40)
-        print(f'\tCURRENT TRUMP IS: {self._suit}')
-        print('-' * 40)
+        emit(TRUMP, trump=self)
 
     def print_makers(self):
         """Print the makers for the current Trump."""
-        print(f'Ordered by {self._makers}.')
+        emit(MAKERS, makers=self._makers)
 
     # Private methods
     def _find_left(self, suit):
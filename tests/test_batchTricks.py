@@ -0,0 +1,121 @@
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main, skipUnless
+from euchre.batch import NO_CARD, highest_cards, legal_masks, lowest_cards, np, trick_winners, tricks_from_records
+from euchre.bots import BotAgent
+from euchre.constants import SUITS
+from euchre.engine import GameEngine
+from euchre.masks import card_index, hand_from_cards, highest_card, lowest_card, to_card, trick_winner
+from euchre.players import Player
+from euchre.records import RecordReader, RecordWriter
+from euchre.trumps import Trump
+
+
+def random_rows(rng, count):
+    """Return hands, led cards and trumps for random positions, a quarter of them leading."""
+    hands, leds, trumps = [], [], []
+    for _ in range(count):
+        cards = rng.sample(range(24), 6)
+        hands.append(sum(1 << card for card in cards[:rng.randint(1, 5)]))
+        leds.append(NO_CARD if rng.random() < 0.25 else cards[5])
+        trumps.append(rng.randrange(4))
+    return hands, leds, trumps
+
+
+class TestLegalMasks(TestCase):
+
+    def test_legalMasks_matchesFilterCards(self):
+        hands, leds, trumps = random_rows(Random(1), 1000)
+        expected = []
+        for hand, led, trump in zip(hands, leds, trumps):
+            player = Player("Player1")
+            for card in range(24):
+                if hand >> card & 1:
+                    player.receive_card(to_card(card))
+            if led == NO_CARD:
+                expected.append(hand)
+                continue
+            legal = player.filter_cards(to_card(led), Trump(SUITS[trump]))
+            expected.append(hand_from_cards(legal) or hand)
+
+        self.assertEqual(legal_masks(hands, leds, trumps, use_numpy=False), expected)
+        if np is not None:
+            self.assertEqual(legal_masks(hands, leds, trumps).tolist(), expected)
+
+
+    def test_legalMasks_leftBowerFollowsTrump(self):
+        # Hearts trump: the Jack of Diamonds follows a Hearts lead, not a Diamonds lead
+        jack_diamonds = card_index(11, 1)
+        hand = 1 << jack_diamonds | 1 << card_index(9, 0)
+        leds = [card_index(9, 3), card_index(14, 1)]
+
+        self.assertEqual(legal_masks([hand, hand], leds, [3, 3], use_numpy=False), [1 << jack_diamonds, hand])
+
+
+class TestCardChoice(TestCase):
+
+    def test_highestAndLowestCards_matchMasks(self):
+        rng = Random(2)
+        masks = [sum(1 << card for card in rng.sample(range(24), rng.randint(1, 6))) for _ in range(1000)]
+        trumps = [rng.randrange(4) for _ in masks]
+        highest = [highest_card(mask, trump) for mask, trump in zip(masks, trumps)]
+        lowest = [lowest_card(mask, trump) for mask, trump in zip(masks, trumps)]
+
+        self.assertEqual(highest_cards(masks, trumps, use_numpy=False), highest)
+        self.assertEqual(lowest_cards(masks, trumps, use_numpy=False), lowest)
+        if np is not None:
+            self.assertEqual(highest_cards(masks, trumps).tolist(), highest)
+            self.assertEqual(lowest_cards(masks, trumps).tolist(), lowest)
+
+
+@skipUnless(np is not None, 'NumPy is not installed')
+class TestBatchTricks(TestCase):
+
+    def test_trickWinners_matchesTrickWinner(self):
+        rng = Random(1)
+        cards, trumps, leaders, expected = [], [], [], []
+        for _ in range(2000):
+            row = rng.sample(range(24), 4)
+            trump = rng.randrange(4)
+            leader = rng.randrange(4)
+            order = [(leader + offset) % 4 for offset in range(4)]
+            cards.append(row)
+            trumps.append(trump)
+            leaders.append(leader)
+            expected.append(order[trick_winner([row[seat] for seat in order], trump)])
+
+        winners = trick_winners(np.array(cards), np.array(trumps), np.array(leaders))
+
+        self.assertEqual(winners.tolist(), expected)
+
+
+    def test_trickWinners_leftBowerAndSkippedSeat(self):
+        # Spades trump: seat 2 leads the Ace of Clubs, seat 0 wins with the left bower, seat 3 sits out
+        cards = np.array([[card_index(11, 2), card_index(13, 2), card_index(14, 2), NO_CARD]])
+
+        self.assertEqual(trick_winners(cards, np.array([0]), np.array([2])).tolist(), [0])
+        self.assertEqual(trick_winners(cards, np.array([1]), np.array([2])).tolist(), [2])
+
+
+    def test_trickWinners_wrongShape(self):
+        with self.assertRaises(ValueError):
+            trick_winners(np.zeros((3, 3), dtype=int), np.zeros(3, dtype=int), np.zeros(3, dtype=int))
+
+
+    def test_tricksFromRecords_matchesRecordedWinners(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hands.rec')
+            with RecordWriter(path) as writer:
+                GameEngine([BotAgent() for _ in range(4)], Random(2), recorder=writer).play_game()
+            with RecordReader(path) as reader:
+                records = list(reader)
+
+        expected = [winner for record in records for _, _, winner in record.tricks()]
+        winners = trick_winners(*tricks_from_records(records))
+
+        self.assertEqual(winners.tolist(), expected)
+
+
+if __name__ == '__main__':
+    main()
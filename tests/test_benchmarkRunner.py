@@ -0,0 +1,48 @@
+import os
+import tempfile
+from unittest import TestCase, main
+from benchmarks.cases import CASES
+from benchmarks.runner import Result, compare, load_baseline, measure, run, save_baseline
+from euchre.events import NullSink, use_sink
+
+
+class TestBenchmarkRunner(TestCase):
+    def test_everyCaseRuns(self):
+        with use_sink(NullSink()):
+            for name, case in CASES.items():
+                with self.subTest(name=name):
+                    case()()
+
+    def test_measure(self):
+        result = measure('list', lambda: [0] * 1000, min_time=0.001, repeat=2)
+        self.assertEqual(result.name, 'list')
+        self.assertGreater(result.ops_per_sec, 0)
+        self.assertGreaterEqual(result.peak_bytes, 8000)
+
+    def test_run_unknownName(self):
+        with self.assertRaises(ValueError):
+            run(['no_such_benchmark'])
+
+    def test_baselineRoundTrip(self):
+        results = [Result('a', 1000.0, 10), Result('b', 2.5, 0)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(results, path)
+            self.assertEqual(load_baseline(path), {result.name: result for result in results})
+
+    def test_compare(self):
+        baseline = {'fast': Result('fast', 1000.0, 100), 'lean': Result('lean', 1000.0, 1000)}
+        results = [
+            Result('fast', 850.0, 100),
+            Result('lean', 950.0, 1500),
+            Result('new', 1.0, 10**6),
+        ]
+        regressions = compare(results, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('fast:'))
+        self.assertIn('peak bytes/op', regressions[1])
+        self.assertEqual(compare(results, baseline, threshold=0.6), [])
+
+
+if __name__ == '__main__':
+    main()
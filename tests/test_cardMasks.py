@@ -0,0 +1,97 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.cards import Card, get_highest_rank_card
+from euchre.constants import SUITS, VALUES
+from euchre.masks import (
+    EFFECTIVE_RANK,
+    EFFECTIVE_SUIT,
+    card_index,
+    card_list,
+    from_card,
+    hand_from_cards,
+    highest_card,
+    legal_mask,
+    sort_hand,
+    to_card,
+    trick_winner,
+)
+from euchre.players import Player
+from euchre.trumps import Trump
+
+
+class TestCardMasks(TestCase):
+
+    def setUp(self):
+        self.rng = Random(24)
+        self.deck = [(value, suit) for value in VALUES for suit in SUITS]
+
+    def test_cardIndex_roundTrip(self):
+        for value, suit in self.deck:
+            card = Card(value, suit)
+            self.assertEqual(repr(to_card(from_card(card))), repr(card))
+
+
+    def test_cardList_lowestFirst(self):
+        self.assertEqual(card_list(0b100101), [0, 2, 5])
+
+
+    def test_leftBower_isTrump(self):
+        # Hearts trump, Jack of Diamonds is the left bower
+        left = card_index(11, 1)
+
+        self.assertEqual(EFFECTIVE_SUIT[3][left], 3)
+        self.assertEqual(EFFECTIVE_RANK[3][left], Trump.RANK["Jack_L"])
+        self.assertEqual(highest_card(1 << left | 1 << card_index(14, 3), 3), left)
+
+
+    def test_legalMask_matchesFilterCards(self):
+        for _ in range(500):
+            cards = self.rng.sample(self.deck, 6)
+            player = Player("Player_1")
+            for card in cards[1:]:
+                player.receive_card(Card(*card))
+            led = Card(*cards[0])
+            suit = self.rng.choice(SUITS)
+
+            filtered = player.filter_cards(led, Trump(suit))
+            hand = hand_from_cards(player.get_cards())
+            expected = hand_from_cards(filtered) or hand
+
+            self.assertEqual(legal_mask(hand, from_card(led), SUITS.index(suit)), expected)
+
+
+    def test_trickWinner_matchesHighestRankCard(self):
+        players = [Player(f'Player_{seat}') for seat in range(4)]
+        for _ in range(500):
+            suit = self.rng.choice(SUITS)
+            trick = self.rng.sample(self.deck, 4)
+            cards_played = [(player, Card(*card)) for player, card in zip(players, trick)]
+
+            winner = get_highest_rank_card(cards_played, Trump(suit))
+            cards = [card_index(value, SUITS.index(suit_of)) for value, suit_of in trick]
+
+            self.assertEqual(trick_winner(cards, SUITS.index(suit)), players.index(winner[0]))
+
+
+    def test_sortHand_matchesSortedCardsInHand(self):
+        for _ in range(100):
+            player = Player("Player_1")
+            for card in self.rng.sample(self.deck, 5):
+                player.receive_card(Card(*card))
+
+            expected = [from_card(card) for card in player.sorted_cards_in_hand()]
+
+            self.assertEqual(sort_hand(hand_from_cards(player.get_cards())), expected)
+
+
+    def test_sortHand_trumpFirst(self):
+        # Spades trump: right bower, left bower, then the rest
+        hand = 1 << card_index(9, 1) | 1 << card_index(11, 2) | 1 << card_index(11, 0) | 1 << card_index(14, 0)
+
+        self.assertEqual(sort_hand(hand, 0), [
+            card_index(11, 0), card_index(11, 2), card_index(14, 0), card_index(9, 1)
+        ])
+
+
+if __name__ == '__main__':
+    main()
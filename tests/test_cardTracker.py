@@ -0,0 +1,90 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import GameEngine
+from euchre.masks import EFFECTIVE_SUIT, card_index
+from euchre.tracker import CardTracker
+
+S, D, C, H = range(4)
+
+
+class Recorder():
+    def __init__(self):
+        self.states = []
+
+    def record(self, state, result):
+        self.states.append(state)
+
+
+class TestCardTracker(TestCase):
+    def setUp(self):
+        self.tracker = CardTracker(S)
+
+    def test_remaining_leftBowerCountsAsTrump(self):
+        self.assertEqual(self.tracker.remaining(S), 7)
+        self.assertEqual(self.tracker.remaining(C), 5)
+        self.assertEqual(self.tracker.remaining(H), 6)
+        self.tracker.play(0, card_index(11, C))
+        self.assertEqual(self.tracker.remaining(S), 6)
+        self.assertEqual(self.tracker.remaining(C), 5)
+        self.assertFalse(self.tracker.get_remaining(S) >> card_index(11, C) & 1)
+
+    def test_play_recordsVoids(self):
+        self.tracker.play(0, card_index(14, H))
+        self.tracker.play(1, card_index(9, H))
+        self.tracker.play(2, card_index(9, S))
+        self.tracker.play(3, card_index(10, D))
+        self.assertTrue(self.tracker.is_void(2, H))
+        self.assertTrue(self.tracker.is_void(3, H))
+        self.assertEqual(self.tracker.get_voids(1), 0)
+        self.assertTrue(self.tracker.is_played(card_index(9, S)))
+        self.assertEqual(self.tracker.get_played().bit_count(), 4)
+
+    def test_play_leftBowerDoesNotFollowItsSuit(self):
+        self.tracker.play(0, card_index(14, C))
+        self.tracker.play(1, card_index(11, C))
+        self.assertTrue(self.tracker.is_void(1, C))
+        self.tracker.start_trick()
+        self.tracker.play(1, card_index(9, S))
+        self.tracker.play(2, card_index(13, C))
+        self.assertEqual(self.tracker.get_led_suit(), S)
+        self.assertTrue(self.tracker.is_void(2, S))
+
+    def test_play_sameCardTwice(self):
+        self.tracker.play(0, card_index(9, H))
+        with self.assertRaises(ValueError):
+            self.tracker.play(1, card_index(9, H))
+
+    def test_reset(self):
+        self.tracker.play(0, card_index(9, H))
+        self.tracker.reset(H)
+        self.assertEqual(self.tracker.get_played(), 0)
+        self.assertEqual(self.tracker.get_trick(), [])
+        self.assertEqual(self.tracker.remaining(H), 7)
+
+    def test_handState_engineUpdatesTracker(self):
+        for seed in range(10):
+            recorder = Recorder()
+            GameEngine([BotAgent() for _ in range(4)], Random(seed), recorder=recorder).play_hand()
+            state = recorder.states[0]
+            if state.trump is None:
+                continue
+            tracker = state.tracker
+            voids = [0] * 4
+            for _, trick, _ in state.tricks:
+                led_suit = EFFECTIVE_SUIT[state.trump][trick[0][1]]
+                for seat, card in trick:
+                    if EFFECTIVE_SUIT[state.trump][card] != led_suit:
+                        voids[seat] |= 1 << led_suit
+            played = [card for _, trick, _ in state.tricks for _, card in trick]
+            with self.subTest(seed=seed):
+                self.assertEqual(tracker.get_trump(), state.trump)
+                self.assertEqual(tracker.get_history(), played)
+                self.assertEqual(tracker.get_played(), sum(1 << card for card in played))
+                self.assertEqual(tracker.get_trick(), state.tricks[-1][1])
+                self.assertEqual([tracker.get_voids(seat) for seat in range(4)], voids)
+                self.assertEqual(sum(tracker.remaining(suit) for suit in range(4)), 24 - len(played))
+
+
+if __name__ == '__main__':
+    main()
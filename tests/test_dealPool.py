@@ -0,0 +1,101 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.dealpool import DealPool, PairedStats, play_pairs, pool_deal, run_paired
+from euchre.engine import GameEngine, HandResult
+from euchre.masks import FULL_DECK
+
+
+class Recorder():
+    def __init__(self):
+        self.states = []
+
+    def record(self, state, result):
+        self.states.append(state)
+
+
+class TestDealPool(TestCase):
+
+    def setUp(self):
+        self.pool = DealPool(8)
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.unlink()
+
+    def test_fill_packsEveryDeal(self):
+        self.pool.fill(3, 20)
+        self.assertEqual(self.pool.get_window(), (20, 28))
+        for number in range(20, 28):
+            dealer, hands, kitty = self.pool.get_deal(number)
+            with self.subTest(number=number):
+                self.assertEqual((dealer, hands, kitty), pool_deal(3, number))
+                self.assertEqual(dealer, number % 4)
+                cards = [bin(hand).count('1') for hand in hands]
+                self.assertEqual(cards, [5] * 4)
+                self.assertEqual(hands[0] | hands[1] | hands[2] | hands[3] | sum(1 << card for card in kitty), FULL_DECK)
+
+    def test_getDeal_onlyInWindow(self):
+        self.pool.fill(0, 16, 20)
+        with self.assertRaises(ValueError):
+            self.pool.get_deal(15)
+        with self.assertRaises(ValueError):
+            self.pool.get_deal(24)
+        with self.assertRaises(ValueError):
+            self.pool.fill(0, 0, 9)
+
+    def test_attach_readsTheSameDeals(self):
+        self.pool.fill(5, 0)
+        with DealPool(name=self.pool.get_name()) as attached:
+            self.assertEqual(attached.get_capacity(), 8)
+            self.assertEqual([attached.get_deal(number) for number in range(8)],
+                             [self.pool.get_deal(number) for number in range(8)])
+
+    def test_playPairs_swapsTheAgents(self):
+        self.pool.fill(2, 0)
+        stats = play_pairs(['bot', 'bot'], 2, self.pool.get_name(), 0, 8)
+        # The same deterministic agent on both teams: every deal sums to nothing
+        self.assertEqual(stats.pairs.get_count(), 8)
+        self.assertEqual(stats.pairs.mean(), 0)
+        self.assertEqual(stats.mean(), 0)
+
+    def test_playHand_playsTheGivenDeal(self):
+        self.pool.fill(2, 0)
+        dealer, hands, kitty = self.pool.get_deal(3)
+        recorder = Recorder()
+        engine = GameEngine([BotAgent()] * 4, Random(0), dealer=dealer, recorder=recorder)
+        result = engine.play_hand((hands, kitty))
+        self.assertEqual(result.dealer, dealer)
+        self.assertEqual((recorder.states[0].dealt, recorder.states[0].turned), (tuple(hands), kitty[0]))
+
+
+class TestPairedStats(TestCase):
+
+    def test_addPair_marginsForTheFirstAgent(self):
+        stats = PairedStats()
+        # first agent makes and wins 2 on team 0, then is euchred for 2 on team 1
+        stats.add_pair(HandResult(0, 0, 0, False, (4, 1), 0, 2), HandResult(1, 3, 3, False, (2, 3), 0, 2))
+        self.assertEqual((stats.hands.get_count(), stats.pairs.get_count()), (2, 1))
+        self.assertEqual(stats.mean(), 0)
+        self.assertEqual(stats.made, [2, 0])
+
+    def test_runPaired_sameForAnySplit(self):
+        single = run_paired(['ev', 'bot'], 40, seed=1)
+        windows = run_paired(['ev', 'bot'], 40, seed=1, capacity=7)
+        workers = run_paired(['ev', 'bot'], 40, seed=1, workers=2, capacity=16)
+        self.assertEqual(single, windows)
+        self.assertEqual(single, workers)
+        low, high = single.interval()
+        self.assertLessEqual(low, single.mean())
+        self.assertLessEqual(single.mean(), high)
+        self.assertEqual(single.summary(['ev', 'bot'])['deals'], 40)
+
+    def test_runPaired_rejectsUnknownAgents(self):
+        with self.assertRaises(ValueError):
+            run_paired(['bot', 'nobody'], 4)
+        with self.assertRaises(ValueError):
+            run_paired(['bot'], 4)
+
+
+if __name__ == '__main__':
+    main()
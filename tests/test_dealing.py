@@ -0,0 +1,80 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.dealers import Dealer
+from euchre.dealing import ALTERNATING, THREE_TWO, Deck, deal_positions
+from euchre.events import NullSink, use_sink
+from euchre.masks import FULL_DECK, from_card
+from euchre.players import Player
+from euchre.trumps import Trump
+
+
+class TestDeck(TestCase):
+    def test_dealPositions(self):
+        self.assertEqual(deal_positions(THREE_TWO)[:6], (0, 0, 0, 1, 1, 1))
+        self.assertEqual(deal_positions(THREE_TWO)[12:], (0, 0, 1, 1, 2, 2, 3, 3))
+        self.assertEqual(deal_positions(ALTERNATING)[:5], (0, 0, 0, 1, 1))
+        with self.assertRaises(ValueError):
+            deal_positions(((3, 3, 3, 3), (3, 2, 2, 2)))
+
+    def test_dealMasks(self):
+        deck = Deck(Random(5))
+        for dealer in range(4):
+            deck.shuffle()
+            hands = deck.deal_masks(dealer)
+            self.assertEqual([bin(hand).count('1') for hand in hands], [5] * 4)
+            kitty = 0
+            for card in deck.kitty():
+                kitty |= 1 << card
+            self.assertEqual(hands[0] | hands[1] | hands[2] | hands[3] | kitty, FULL_DECK)
+            # The first card of the deck goes left of the dealer
+            self.assertTrue(hands[(dealer + 1) % 4] >> deck.get_cards()[0] & 1)
+            self.assertEqual(deck.turned(), deck.kitty()[0])
+
+    def test_seededDecksMatch(self):
+        first, second = Deck(Random(9)), Deck(Random(9))
+        for _ in range(3):
+            first.shuffle()
+            second.shuffle()
+            self.assertEqual(first.get_cards(), second.get_cards())
+
+
+class TestDealer(TestCase):
+    def setUp(self):
+        self.players = [Player(f'Player_{seat}') for seat in range(4)]
+
+    def deal(self, dealer: Dealer):
+        for player in self.players:
+            player.reset()
+        with use_sink(NullSink()):
+            return dealer.deal_cards()
+
+    def test_dealsFromTheDeck(self):
+        dealer = Dealer(self.players, Random(2))
+        deck = Deck(Random(2))
+        revealed = self.deal(dealer)
+        deck.shuffle()
+        # Player order starts left of the dealer, who is the first player
+        order = dealer.get_player_order()
+        hands = deck.deal_masks(3)
+        for position, player in enumerate(order):
+            mask = sum(1 << from_card(card) for card in player.get_cards())
+            self.assertEqual(mask, hands[position])
+        self.assertEqual(from_card(revealed), deck.turned())
+
+    def test_cardsReusedAndReset(self):
+        dealer = Dealer(self.players, Random(3))
+        seen = set()
+        trump = Trump('Spades')
+        for _ in range(6):
+            self.deal(dealer)
+            dealt = [card for player in self.players for card in player.get_cards()]
+            self.assertTrue(all(card.get_value() <= 14 for card in dealt))
+            self.assertEqual(len({from_card(card) for card in dealt}), 20)
+            seen.update(id(card) for card in dealt)
+            # Trump rankings a hand leaves on the cards are reset by the next deal
+            for card in dealt:
+                card.update_to_trump(trump)
+        self.assertLessEqual(len(seen), 24)
+
+if __name__ == '__main__':
+    main()
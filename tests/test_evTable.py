@@ -0,0 +1,151 @@
+from random import Random
+from unittest import TestCase, main
+from unittest.mock import patch
+from euchre.bots import BotAgent, EVAgent, EVBot
+from euchre.cards import Card
+from euchre.engine import GameEngine, HandState
+from euchre.evtable import (
+    ALONE_BID,
+    BIDS,
+    ORDER_BID,
+    PASS_BID,
+    BidValues,
+    EVCounts,
+    EVTable,
+    bid_key,
+    build_table,
+    check_table,
+    simulate_bid,
+    simulate_deals,
+)
+from euchre.masks import FULL_DECK, card_index, card_list, hand_from_cards
+from euchre.strength import get_table as get_strength_table
+
+S, D, C, H = range(4)
+
+
+def deal_around(hand, turned, dealer):
+    """Return the HandState of a deal giving seat 0 the hand and the rest of the deck in order."""
+    rest = card_list(FULL_DECK & ~hand & ~(1 << turned))
+    hands = [hand] + [sum(1 << card for card in rest[start:start + 5]) for start in (0, 5, 10)]
+    return HandState(dealer, hands, [turned] + rest[15:])
+
+
+class Recorder():
+    def __init__(self):
+        self.states = []
+
+    def record(self, state, result):
+        self.states.append(state)
+
+
+class TestSimulation(TestCase):
+
+    def test_bidKey(self):
+        hand = sum(1 << card_index(value, suit) for value, suit in ((11, S), (11, C), (14, S), (9, H), (10, D)))
+        turned = card_index(13, S)
+        relation, rank, record = bid_key(hand, turned, seat=2, dealer=3)
+        self.assertEqual(relation, 3)
+        self.assertEqual(rank, 13 - 9)
+        self.assertEqual(record, get_strength_table().get_record(hand, S))
+        # Relabelling the suits with the turned card keeps the key
+        red_hand = sum(1 << card_index(value, suit) for value, suit in ((11, H), (11, D), (14, H), (9, S), (10, C)))
+        self.assertEqual(bid_key(red_hand, card_index(13, H), 2, 3)[2], record)
+
+    def test_simulateBid_forcesTheSeat(self):
+        agents = [BotAgent()] * 4
+        for bid in range(len(BIDS)):
+            recorder = Recorder()
+            with patch('euchre.evtable.GameEngine', lambda *args, **kwargs: GameEngine(*args, recorder=recorder, **kwargs)):
+                points = simulate_bid('deal', 1, 0, bid, agents)
+            state = recorder.states[0]
+            with self.subTest(bid=BIDS[bid]):
+                # seats 2 and 3 bid before seat 0 when seat 1 deals
+                self.assertEqual(state.bids[:2], [(2, 'pass'), (3, 'pass')])
+                self.assertEqual(state.bids[2], (0, 'order' if bid != PASS_BID else 'pass'))
+                if bid != PASS_BID:
+                    self.assertEqual(state.maker, 0)
+                    self.assertEqual(state.alone, bid == ALONE_BID)
+                self.assertIn(points, (-4, -2, -1, 0, 1, 2, 4))
+
+    def test_simulateDeals_mergeIsExact(self):
+        whole = simulate_deals(7, 0, 12)
+        parts = EVCounts()
+        parts.merge(simulate_deals(7, 6, 12))
+        parts.merge(simulate_deals(7, 0, 6))
+        self.assertEqual(parts, whole)
+        self.assertEqual(sum(whole.get_values(key).samples for key in whole.get_keys()), 12 * 4)
+
+
+class TestEVTable(TestCase):
+
+    def test_buildTable_roundTrip(self):
+        counts = EVCounts()
+        counts.add((1, 2, 300), (0, 1, 4))
+        counts.add((1, 2, 300), (-1, 2, -2))
+        counts.add((0, 5, 7), (0, -2, -4))
+        table = EVTable(build_table(counts))
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.get_values((1, 2, 300)), BidValues(-0.5, 1.5, 1.0, 2))
+        self.assertEqual(table.get_values((0, 5, 7)).best(), PASS_BID)
+        self.assertIsNone(table.get_values((3, 0, 0)))
+
+    def test_table_rejectsOtherFiles(self):
+        with self.assertRaises(ValueError):
+            EVTable(b'EUST' + bytes(20))
+        data = bytearray(build_table(EVCounts()))
+        data[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            EVTable(bytes(data))
+
+    def test_best_passesOnTies(self):
+        self.assertEqual(BidValues(0.5, 0.5, 0.5, 40).best(), PASS_BID)
+        self.assertEqual(BidValues(0.1, 0.9, 0.9, 40).best(), ORDER_BID)
+        self.assertEqual(BidValues(0.1, 0.9, 1.2, 40).best(), ALONE_BID)
+
+    def test_checkTable(self):
+        table = EVTable(build_table(simulate_deals(3, 0, 20)))
+        report = check_table(table, 5)
+        self.assertEqual(report['decisions'], 20)
+        self.assertLessEqual(report['table'], report['best'])
+        self.assertLessEqual(report['threshold'], report['best'])
+
+
+class TestEVBots(TestCase):
+
+    def test_evAgent_followsTheTable(self):
+        recorder = Recorder()
+        GameEngine([BotAgent()] * 4, Random(4), recorder=recorder).play_hand()
+        state = recorder.states[0]
+        key = bid_key(state.dealt[1], state.turned, 1, 0)
+        counts = EVCounts()
+        for _ in range(40):
+            counts.add(key, (0, 1, 4))
+        table = EVTable(build_table(counts))
+
+        with patch('euchre.bots.get_ev_table', return_value=table):
+            result = GameEngine([BotAgent(), EVAgent(), BotAgent(), BotAgent()], Random(4)).play_hand()
+        # Seat 1 bids first, left of the dealer
+        self.assertEqual((result.maker, result.alone), (1, True))
+
+    def test_evAgent_fallsBackWithoutTable(self):
+        with patch('euchre.bots.get_ev_table', return_value=None):
+            plain = GameEngine([BotAgent()] * 4, Random(9)).play_game()
+            ev = GameEngine([EVAgent()] * 4, Random(9)).play_game()
+        self.assertEqual(plain, ev)
+
+    def test_evBot_getOrder(self):
+        bot = EVBot("Ewe")
+        hand = [Card(11, "Spades"), Card(11, "Clubs"), Card(14, "Spades"), Card(9, "Hearts"), Card(10, "Diamonds")]
+        state = deal_around(hand_from_cards(hand), card_index(13, S), 3)
+        counts = EVCounts()
+        for _ in range(40):
+            counts.add(bid_key(hand_from_cards(hand), card_index(13, S), 0, 3), (1, -1, -2))
+        with patch('euchre.bots.get_ev_table', return_value=EVTable(build_table(counts))):
+            self.assertFalse(bot.get_agent().order(state, 0))
+        with patch('euchre.bots.get_ev_table', return_value=None):
+            self.assertTrue(bot.get_agent().order(state, 0))
+
+
+if __name__ == '__main__':
+    main()
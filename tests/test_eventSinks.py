@@ -0,0 +1,123 @@
+import io
+from unittest import TestCase, main
+from unittest.mock import patch
+from euchre.bots import Bot
+from euchre.cards import Card
+from euchre.dealers import Dealer
+from euchre.events import (
+    BID,
+    CARD_PLAYED,
+    DEAL,
+    PAUSE,
+    STATUS,
+    TRICKS,
+    BufferedSink,
+    Event,
+    EventSink,
+    NullSink,
+    TerminalSink,
+    emit,
+    get_sink,
+    render,
+    use_sink,
+)
+from euchre.players import Player
+from euchre.scores import print_tricks
+from euchre.teams import Team, assign_player_teams
+
+
+class CollectingSink(EventSink):
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class TestEventSinks(TestCase):
+    def setUp(self):
+        self.players = [Player("Ann"), Bot("Cow"), Player("Bob"), Bot("Dog")]
+        self.teams = [Team(self.players[0], self.players[2], "Red"), Team(self.players[1], self.players[3], "Black")]
+        assign_player_teams(self.teams)
+
+    def test_eventSink_needsEmit(self):
+        class FlushOnly(EventSink):
+            def flush(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            FlushOnly()
+        self.assertIsInstance(CollectingSink(), EventSink)
+
+    def test_render_cardPlayed(self):
+        card = Card(14, "Hearts")
+        event = Event(CARD_PLAYED, {'player': self.players[1], 'card': card, 'trick': ((self.players[1], card),)})
+        self.assertEqual(render(event), [
+            f'Cow played {card}.', '\n', '\n', 'All cards played:', f'\tCow played {card}',
+        ])
+
+    def test_render_bidOnlyAnnouncesBots(self):
+        revealed = Card(9, "Clubs")
+        bot_bid = Event(BID, {'player': self.players[1], 'revealed': revealed, 'call': 'pass', 'first_round': False})
+        human_bid = Event(BID, {'player': self.players[0], 'revealed': revealed, 'call': 'pass', 'first_round': True})
+        self.assertEqual(render(bot_bid), ['Cow has passed in second round.'])
+        self.assertEqual(render(human_bid), [])
+
+    def test_render_statusOfBotsOnlyWhilePlaying(self):
+        bidding = Event(STATUS, {'player': self.players[1], 'cards': [], 'trump': None, 'bidding': True})
+        playing = Event(STATUS, {'player': self.players[1], 'cards': [], 'trump': None, 'bidding': False})
+        self.assertEqual(render(bidding), [])
+        self.assertEqual(render(playing)[-1], 'Cow is thinking...')
+
+    def test_terminalSink_writesLikePrint(self):
+        stream = io.StringIO()
+        with use_sink(TerminalSink(stream=stream)):
+            print_tricks(self.players, self.teams)
+        expected = io.StringIO()
+        for line in ['\n', '-' * 40, '\t\tTRICK SCORES: ', '-' * 40, 'Ann: 0', 'Cow: 0', 'Bob: 0', 'Dog: 0',
+                     '\n', 'Team Red: 0', 'Team Black: 0']:
+            print(line, file=expected)
+        self.assertEqual(stream.getvalue(), expected.getvalue())
+
+    @patch('euchre.events.time.sleep')
+    def test_terminalSink_pacing(self, sleep):
+        with use_sink(TerminalSink(pacing=0, stream=io.StringIO())):
+            emit(PAUSE)
+        sleep.assert_not_called()
+        with use_sink(TerminalSink(pacing=1.5, stream=io.StringIO())):
+            emit(PAUSE)
+        sleep.assert_called_once_with(1.5)
+
+    def test_bufferedSink_writesInBatches(self):
+        stream = io.StringIO()
+        sink = BufferedSink(stream, buffer_size=1 << 20)
+        with use_sink(sink):
+            print_tricks(self.players, self.teams)
+            self.assertEqual(stream.getvalue(), '')
+        self.assertIn('Team Black: 0', stream.getvalue())
+
+    def test_nullSink_dropsEvents(self):
+        sink = NullSink()
+        with patch.object(sink, 'emit') as sink_emit, use_sink(sink):
+            Dealer(self.players).deal_cards()
+        sink_emit.assert_not_called()
+
+    def test_dealEvents(self):
+        sink = CollectingSink()
+        with use_sink(sink):
+            dealer = Dealer(self.players)
+            revealed = dealer.deal_cards()
+            print_tricks(self.players, self.teams)
+        self.assertEqual([event.kind for event in sink.events], [DEAL, TRICKS])
+        self.assertIs(sink.events[0].data['revealed'], revealed)
+        self.assertEqual(sink.events[1].data['teams'], [('Red', 0), ('Black', 0)])
+
+    def test_useSink_restoresPrevious(self):
+        previous = get_sink()
+        with use_sink(NullSink()):
+            self.assertIsNot(get_sink(), previous)
+        self.assertIs(get_sink(), previous)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+from itertools import product
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import GameEngine, HandState, decide
+from euchre.constants import POINTS_TO_WIN
+from euchre.masks import card_index
+from euchre.scores import round_points
+
+
+class PassingAgent(BotAgent):
+    """Never makes trump."""
+    def order(self, state, seat):
+        return False
+
+    def call(self, state, seat):
+        return None
+
+
+class TestGameEngine(TestCase):
+
+    def setUp(self):
+        self.agents = [BotAgent() for _ in range(4)]
+
+    def test_playGame_teamReachesWinningScore(self):
+        engine = GameEngine(self.agents, Random(1))
+        result = engine.play_game()
+
+        self.assertGreaterEqual(result.scores[result.winner], POINTS_TO_WIN)
+        self.assertLess(result.scores[1 - result.winner], POINTS_TO_WIN)
+
+
+    def test_playGame_sameSeedSameGame(self):
+        first = GameEngine(self.agents, Random(7)).play_game()
+        second = GameEngine(self.agents, Random(7)).play_game()
+
+        self.assertEqual(first, second)
+
+
+    def test_playHand_everyTrickPlayed(self):
+        engine = GameEngine(self.agents, Random(3))
+        result = engine.play_hand()
+        while result.trump is None:
+            result = engine.play_hand()
+
+        self.assertEqual(sum(result.tricks), 5)
+
+
+    def test_playHand_allPass_noPointsAndDealerPasses(self):
+        engine = GameEngine([PassingAgent() for _ in range(4)], Random(3))
+        result = engine.play_hand()
+
+        self.assertIsNone(result.trump)
+        self.assertEqual(result.points, 0)
+        self.assertEqual(engine.get_dealer(), 1)
+
+
+    def test_handSteps_playDecisionsOnlyOfferLegalCards(self):
+        engine = GameEngine(self.agents, Random(5))
+        for _ in range(20):
+            steps = engine.hand_steps()
+            try:
+                decision = next(steps)
+                while True:
+                    if decision.kind == 'play':
+                        state = decision.state
+                        self.assertEqual(decision.options, state.legal_cards(decision.seat))
+                    decision = steps.send(decide(self.agents[decision.seat], decision))
+            except StopIteration:
+                pass
+
+
+    def test_handSteps_rejectsAnswersThatAreNotCards(self):
+        for kind, answer in product(('discard', 'play'), (None, '3', -1, 1.0)):
+            # Seed 3 deals a hand ordered up in the first round
+            engine = GameEngine(self.agents, Random(3))
+            steps = engine.hand_steps()
+            decision = next(steps)
+            while decision.kind != kind:
+                decision = steps.send(decide(self.agents[decision.seat], decision))
+            with self.subTest(kind=kind, answer=answer), self.assertRaises(ValueError):
+                steps.send(answer)
+
+
+    def test_legalCards_leftBowerFollowsTrump(self):
+        # Spades are trump, so the Jack of Clubs has to follow a Spade lead
+        jack_clubs = card_index(11, 2)
+        ace_clubs = card_index(14, 2)
+        state = HandState(0, [1 << jack_clubs | 1 << ace_clubs, 0, 0, 0], [card_index(9, 3)])
+        state.trump = 0
+        state.trick = [(3, card_index(9, 0))]
+
+        self.assertEqual(state.legal_cards(0), 1 << jack_clubs)
+
+
+    def test_roundPoints(self):
+        self.assertEqual(round_points([3, 2], 0, None), (0, 1))
+        self.assertEqual(round_points([2, 3], 0, None), (1, 2))
+        self.assertEqual(round_points([5, 0], 0, None), (0, 2))
+        self.assertEqual(round_points([5, 0], 0, 0), (0, 4))
+        self.assertEqual(round_points([0, 5], 0, 0), (1, 0))
+
+
+if __name__ == '__main__':
+    main()
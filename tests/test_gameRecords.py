@@ -0,0 +1,94 @@
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import GameEngine
+from euchre.records import (
+    RECORD_SIZE,
+    HandRecord,
+    RecordReader,
+    RecordWriter,
+    iter_records,
+    pack_record,
+    unpack_record,
+)
+
+
+class TestGameRecords(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'hands.rec')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play(self, games, seed=0):
+        results = []
+        with RecordWriter(self.path) as writer:
+            for game in range(games):
+                engine = GameEngine([BotAgent() for _ in range(4)], Random(seed + game), recorder=writer)
+                results.extend(engine.play_game().hands)
+        return results
+
+
+    def test_packRecord_roundTrip(self):
+        record = HandRecord(
+            dealer=3, hands=(0b111, 0b111000, 0b111000000, 0b111000000000), turned=23, discard=22,
+            bids=((0, 'pass'), (1, 'pass'), (2, 'pass'), (3, 'order')), trump=3, maker=3, alone=True,
+            plays=tuple(range(15)), winner=1, points=4,
+        )
+        data = pack_record(record)
+
+        self.assertEqual(len(data), RECORD_SIZE)
+        self.assertEqual(unpack_record(data), record)
+
+
+    def test_recordWriter_engineHandsReadBack(self):
+        results = self.play(3)
+
+        with RecordReader(self.path) as reader:
+            self.assertEqual(len(reader), len(results))
+            for record, result in zip(reader, results):
+                self.assertEqual((record.dealer, record.trump, record.maker, record.alone),
+                                 (result.dealer, result.trump, result.maker, result.alone))
+                self.assertEqual((record.winner, record.points), (result.winner, result.points))
+                if record.trump is not None:
+                    won = [0, 0]
+                    for _, _, winner in record.tricks():
+                        won[winner % 2] += 1
+                    self.assertEqual(tuple(won), result.tricks)
+
+
+    def test_recordWriter_appendsToExistingFile(self):
+        first = self.play(1)
+        second = self.play(1, seed=5)
+
+        with RecordReader(self.path) as reader:
+            self.assertEqual(len(reader), len(first) + len(second))
+            self.assertEqual(reader[len(first)].dealer, second[0].dealer)
+
+
+    def test_iterRecords_matchesReaderAndSkipsPartialRecord(self):
+        self.play(2)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * (RECORD_SIZE // 2))
+
+        with RecordReader(self.path) as reader:
+            self.assertEqual(list(iter_records(self.path)), list(reader))
+            self.assertEqual(list(iter_records(self.path, start=3)), list(reader)[3:])
+
+
+    def test_recordReader_notARecordFile(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a record file')
+
+        with self.assertRaises(ValueError):
+            RecordReader(self.path)
+        with self.assertRaises(ValueError):
+            RecordWriter(self.path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, main
+from euchre.server import Connection, GameServer, local_pair
+
+
+async def play(connection, table=None, start=True, answer=None):
+    """Join a table and answer every decision until the game is over.
+    Returns (game over message, every message received).
+    """
+    await connection.send({'type': 'join', 'name': 'Ann', 'table': table})
+    if start:
+        await connection.send({'type': 'start'})
+    messages = []
+    while True:
+        message = await connection.receive()
+        if message is None:
+            return None, messages
+        messages.append(message)
+        if message['type'] == 'decide':
+            value = answer(message) if answer else first_option(message)
+            await connection.send({'type': 'answer', 'value': value})
+        elif message['type'] == 'game_over':
+            await connection.close()
+            return message, messages
+
+
+def first_option(message):
+    kind = message['kind']
+    if kind in ('order', 'alone'):
+        return False
+    # Calling the first suit in the second round makes sure every hand is played
+    return message['options'][0]
+
+
+class TestGameServer(IsolatedAsyncioTestCase):
+
+    async def test_manyTables_allFinish(self):
+        server = GameServer(points_to_win=5, seed=1)
+        results = await asyncio.gather(*(play(server.connect_local()) for _ in range(50)))
+
+        for game_over, messages in results:
+            self.assertEqual(game_over['type'], 'game_over')
+            self.assertGreaterEqual(max(game_over['scores']), 5)
+            self.assertEqual(messages[0]['type'], 'seated')
+        await server.wait_closed()
+        self.assertEqual(server.get_tables(), {})
+
+
+    async def test_handResults_addUpToTheScores(self):
+        server = GameServer(points_to_win=5, seed=4)
+        game_over, messages = await play(server.connect_local())
+
+        scores = [0, 0]
+        for message in messages:
+            if message['type'] == 'hand' and message['result']['winner'] is not None:
+                scores[message['result']['winner']] += message['result']['points']
+        self.assertEqual(scores, game_over['scores'])
+        # The last hand is sent before the game is over
+        self.assertEqual(messages[-2]['type'], 'hand')
+        await server.wait_closed()
+
+
+    async def test_fullTable_startsByItself(self):
+        server = GameServer(points_to_win=3, seed=2)
+        results = await asyncio.gather(*(play(server.connect_local(), 'den', start=False) for _ in range(4)))
+
+        seats = sorted(messages[0]['seat'] for _, messages in results)
+        self.assertEqual(seats, [0, 1, 2, 3])
+        self.assertEqual(len({tuple(game_over['scores']) for game_over, _ in results}), 1)
+
+
+    async def test_invalidAnswer_isAskedAgain(self):
+        server = GameServer(points_to_win=1, seed=3)
+        asked = []
+
+        def answer(message):
+            asked.append(message['kind'])
+            if message['kind'] == 'play' and asked.count('play') == 1:
+                return 99
+            return first_option(message)
+
+        game_over, messages = await play(server.connect_local(), answer=answer)
+
+        self.assertIsNotNone(game_over)
+        self.assertIn('error', [message['type'] for message in messages])
+
+
+    async def test_disconnectedSeat_isPlayedByBot(self):
+        server = GameServer(points_to_win=3, seed=4)
+        leaving = server.connect_local()
+        staying = server.connect_local()
+        await leaving.send({'type': 'join', 'name': 'Bo', 'table': 'den'})
+        self.assertEqual((await leaving.receive())['type'], 'seated')
+        await leaving.close()
+        await asyncio.sleep(0)
+
+        game_over, _ = await play(staying, 'den')
+
+        self.assertEqual(game_over['type'], 'game_over')
+
+
+    async def test_tcp_joinAndStart(self):
+        server = GameServer(points_to_win=1, seed=5)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"type": "join", "name": "Ann"}\nnot json\n')
+        await writer.drain()
+
+        seated = await reader.readline()
+        error = await reader.readline()
+
+        self.assertIn(b'"seated"', seated)
+        self.assertIn(b'"error"', error)
+        writer.close()
+        await writer.wait_closed()
+        listener.close()
+        await listener.wait_closed()
+        await server.wait_closed()
+
+
+    async def test_connection_needsEveryMethod(self):
+        class SendOnly(Connection):
+            async def send(self, message):
+                pass
+
+        with self.assertRaises(TypeError):
+            SendOnly()
+        self.assertIsInstance(local_pair()[0], Connection)
+
+
+if __name__ == '__main__':
+    main()
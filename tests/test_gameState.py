@@ -0,0 +1,99 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import PLAY, GameEngine
+from euchre.masks import card_index, card_list
+from euchre.state import GameState
+
+
+def play_hand(seed: int):
+    """Play a hand of bots with the engine, checking a GameState follows every card.
+    Returns (final GameState, HandResult).
+    """
+    engine = GameEngine([BotAgent() for _ in range(4)], Random(seed))
+    agent = BotAgent()
+    steps = engine.hand_steps()
+    game_state = None
+    try:
+        decision = next(steps)
+        while True:
+            answer = agent.play(decision.state, decision.seat, decision.options) if decision.kind == PLAY \
+                else getattr(agent, decision.kind)(decision.state, decision.seat)
+            if decision.kind == PLAY:
+                if game_state is None:
+                    game_state = GameState.from_hand_state(decision.state)
+                assert game_state == GameState.from_hand_state(decision.state)
+                assert game_state.to_play() == decision.seat
+                assert game_state.legal_moves() == card_list(decision.options)
+                game_state = game_state.apply(answer)
+            decision = steps.send(answer)
+    except StopIteration as stop:
+        return game_state, stop.value
+
+
+class TestGameState(TestCase):
+    def setUp(self):
+        S, D, C, H = range(4)
+        # Spades trump, seat 0 leads with the right bower
+        self.state = GameState(
+            hands=(
+                1 << card_index(11, S) | 1 << card_index(9, H),
+                1 << card_index(14, S) | 1 << card_index(10, H),
+                1 << card_index(11, C) | 1 << card_index(9, D),
+                1 << card_index(9, C) | 1 << card_index(14, H),
+            ),
+            trump=S, leader=0, maker=0, won=(2, 1),
+        )
+
+    def test_matchesEngine(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                game_state, result = play_hand(seed)
+                if result.trump is None:
+                    continue
+                self.assertTrue(game_state.is_over())
+                self.assertEqual(game_state.won, result.tricks)
+                self.assertEqual(game_state.result(), (result.winner, result.points))
+
+    def test_leftBowerFollowsTrump(self):
+        state = self.state.apply(card_index(11, 0)).apply(card_index(14, 0))
+        self.assertEqual(state.to_play(), 2)
+        self.assertEqual(state.legal_moves(), [card_index(11, 2)])
+        state = state.apply(card_index(11, 2))
+        # Seat 3 holds no trump, so any card is legal
+        self.assertEqual(state.legal_moves(), card_list(self.state.hands[3]))
+
+    def test_trickScored(self):
+        state = self.state
+        for card in (card_index(11, 0), card_index(14, 0), card_index(11, 2), card_index(9, 2)):
+            state = state.apply(card)
+        self.assertEqual(state.won, (3, 1))
+        self.assertEqual(state.leader, 0)
+        self.assertEqual(state.trick, ())
+
+    def test_applyLeavesStateUnchanged(self):
+        before = hash(self.state)
+        self.state.apply(card_index(9, 3))
+        self.assertEqual(hash(self.state), before)
+        with self.assertRaises(AttributeError):
+            self.state.leader = 1
+
+    def test_transpositionsAreEqual(self):
+        first = self.state.apply(card_index(9, 3))
+        second = GameState(*self.state).apply(card_index(9, 3))
+        self.assertEqual(first, second)
+        self.assertEqual(len({first, second}), 1)
+
+    def test_illegalMove(self):
+        state = self.state.apply(card_index(11, 0))
+        with self.assertRaises(ValueError):
+            state.apply(card_index(10, 3))
+
+    def test_skippedSeat(self):
+        state = self.state._replace(skipped=2)
+        state = state.apply(card_index(11, 0)).apply(card_index(14, 0))
+        self.assertEqual(state.to_play(), 3)
+
+
+if __name__ == '__main__':
+    main()
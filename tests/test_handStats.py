@@ -0,0 +1,157 @@
+import os
+import statistics
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import GameEngine
+from euchre.masks import card_index
+from euchre.records import HandRecord, RecordWriter, record_hand
+from euchre.stats import (
+    OUTCOMES,
+    TRUMP_RELATIONS,
+    DistinctSketch,
+    HandStats,
+    Histogram,
+    RunningStats,
+    collect,
+    collect_files,
+    summarize_hand,
+)
+
+S, D, C, H = range(4)
+
+
+class ListRecorder():
+    def __init__(self):
+        self.records = []
+
+    def record(self, state, result):
+        self.records.append(record_hand(state, result))
+
+
+def play_records(games, seed=0):
+    recorder = ListRecorder()
+    for game in range(games):
+        GameEngine([BotAgent() for _ in range(4)], Random(seed + game), recorder=recorder).play_game()
+    return recorder.records
+
+
+class TestAccumulators(TestCase):
+
+    def test_runningStats_matchesStatistics(self):
+        values = [3, -2, 4, 1, 1, 0, -2, 2]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        self.assertEqual(stats.get_count(), 8)
+        self.assertAlmostEqual(stats.mean(), statistics.mean(values))
+        self.assertAlmostEqual(stats.variance(), statistics.variance(values))
+
+    def test_runningStats_mergeIsExact(self):
+        values = list(range(-50, 150, 3))
+        whole = RunningStats()
+        left, right = RunningStats(), RunningStats()
+        for index, value in enumerate(values):
+            whole.add(value)
+            (left if index % 3 else right).add(value)
+        right.merge(left)
+        self.assertEqual(right, whole)
+        self.assertEqual(right.variance(), whole.variance())
+
+    def test_histogram_binsAndQuantiles(self):
+        histogram = Histogram(0, 10, 2)
+        for value in (-1, 0, 1, 3, 3, 9, 10, 12):
+            histogram.add(value)
+        self.assertEqual(histogram.get_counts(), {0: 2, 2: 2, 4: 0, 6: 0, 8: 1})
+        self.assertEqual((histogram.under, histogram.over), (1, 2))
+        self.assertEqual(histogram.get_total(), 8)
+        self.assertEqual(histogram.quantile(0.5), 2)
+        self.assertEqual(histogram.quantile(1.0), 10)
+        self.assertIsNone(Histogram(0, 4).quantile(0.5))
+
+    def test_histogram_mergeNeedsSameBins(self):
+        with self.assertRaises(ValueError):
+            Histogram(0, 10, 3)
+        with self.assertRaises(ValueError):
+            Histogram(0, 10).merge(Histogram(0, 10, 2))
+
+    def test_distinctSketch_estimateAndMerge(self):
+        whole, left, right = DistinctSketch(), DistinctSketch(), DistinctSketch()
+        for key in range(20000):
+            whole.add(key << 80 | key)
+            (left if key % 2 else right).add(key << 80 | key)
+            # duplicates do not count twice
+            left.add(key << 80 | key)
+        left.merge(right)
+        self.assertEqual(left, whole)
+        self.assertAlmostEqual(whole.estimate() / 20000, 1.0, delta=0.05)
+        small = DistinctSketch()
+        for key in range(100):
+            small.add(key)
+        self.assertAlmostEqual(small.estimate(), 100, delta=5)
+
+
+class TestHandStats(TestCase):
+
+    def test_summarizeHand_aloneSweptByDefendersScoresNothing(self):
+        # Seat 1 goes alone in Spades, seat 0 takes every trick leading trump
+        hands = (
+            sum(1 << card_index(value, suit) for value, suit in ((11, S), (11, C), (14, S), (13, S), (12, S))),
+            sum(1 << card_index(value, H) for value in (9, 10, 12, 13, 14)),
+            sum(1 << card_index(value, D) for value in (9, 10, 12, 13, 14)),
+            sum(1 << card_index(value, C) for value in (10, 12, 13, 14)) | 1 << card_index(10, S),
+        )
+        plays = []
+        for lead, heart, diamond in zip(((11, S), (11, C), (14, S), (13, S), (12, S)), (9, 10, 12, 13, 14), (9, 10, 12, 13, 14)):
+            plays.extend((card_index(*lead), card_index(heart, H), card_index(diamond, D)))
+        record = HandRecord(
+            dealer=3, hands=hands, turned=card_index(9, C), discard=None, bids=((0, 'pass'), (1, 'order')),
+            trump=S, maker=1, alone=True, plays=tuple(plays), winner=0, points=0,
+        )
+        hand = summarize_hand(record)
+        self.assertEqual(TRUMP_RELATIONS[hand.relation], 'next')
+        self.assertEqual(hand.seat, 2)
+        self.assertEqual(hand.tricks, 0)
+        self.assertEqual(OUTCOMES[hand.outcome], 'euchred')
+        self.assertEqual((hand.points, hand.maker_points), (0, 0))
+
+    def test_collect_countsEveryHand(self):
+        records = play_records(5)
+        stats = collect(iter(records))
+        passed = sum(1 for record in records if record.trump is None)
+        self.assertEqual(stats.passed, passed)
+        self.assertEqual(stats.hands, len(records) - passed)
+        self.assertEqual(sum(stats.called), stats.hands)
+        self.assertEqual(sum(stats.seat_made), stats.hands)
+        self.assertEqual(sum(histogram.get_total() for histogram in stats.outcomes), stats.hands)
+        self.assertEqual(stats.tricks.get_total(), stats.hands)
+        for relation in range(len(TRUMP_RELATIONS)):
+            self.assertLessEqual(stats.make_rate(relation), 1.0)
+        self.assertIn('alone', stats.summary())
+
+    def test_merge_sameForAnySplit(self):
+        records = play_records(6, seed=3)
+        whole = collect(records)
+        parts = [collect(records[start::3]) for start in range(3)]
+        merged = HandStats()
+        for part in reversed(parts):
+            merged.merge(part)
+        self.assertEqual(merged, whole)
+        self.assertEqual(merged.summary(), whole.summary())
+
+    def test_collectFiles_sameForAnyWorkerCount(self):
+        with TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f'{index}.rec') for index in range(2)]
+            for index, path in enumerate(paths):
+                with RecordWriter(path) as writer:
+                    for game in range(3):
+                        GameEngine([BotAgent() for _ in range(4)], Random(index * 10 + game), recorder=writer).play_game()
+            single = collect_files(paths)
+            several = collect_files(paths, workers=2)
+        self.assertEqual(single, several)
+        self.assertGreater(single.hands, 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+from itertools import combinations
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import Bot
+from euchre.engine import HandState
+from euchre.masks import card_index
+from euchre.strength import (
+    HAND_COUNT,
+    TABLE_PATH,
+    build_table,
+    get_table,
+    hand_index,
+    load_table,
+    rate_hand,
+    trump_relative,
+)
+
+
+def hand_of(*cards):
+    return sum(1 << card_index(value, suit) for value, suit in cards)
+
+
+class TestStrengthTable(TestCase):
+
+    def test_handIndex_everyHandHasItsOwnIndex(self):
+        indexes = set()
+        for cards in combinations(range(24), 5):
+            indexes.add(hand_index(sum(1 << card for card in cards)))
+
+        self.assertEqual(indexes, set(range(HAND_COUNT)))
+
+
+    def test_trumpRelative_keepsTheMetrics(self):
+        rng = Random(4)
+        for _ in range(500):
+            hand = sum(1 << card for card in rng.sample(range(24), 5))
+            for trump in range(4):
+                self.assertEqual(rate_hand(hand, trump), rate_hand(trump_relative(hand, trump), 0))
+
+
+    def test_lookup_matchesRateHand(self):
+        table = get_table()
+        rng = Random(5)
+        for _ in range(500):
+            hand = sum(1 << card for card in rng.sample(range(24), 5))
+            for trump in range(4):
+                self.assertEqual(table.lookup(hand, trump), rate_hand(hand, trump))
+
+
+    def test_shippedTable_isUpToDate(self):
+        table = load_table(TABLE_PATH)
+        try:
+            self.assertEqual(table._data[:], build_table())
+        finally:
+            table.close()
+
+
+    def test_rateHand_leftBowerCountsAsTrump(self):
+        # Jack of Clubs is the left bower with Spades as trump
+        hand = hand_of((11, 0), (11, 2), (14, 0), (14, 1), (9, 3))
+        strength = rate_hand(hand, 0)
+
+        self.assertEqual(strength.trumps, 3)
+        self.assertEqual(strength.bowers, 2)
+        self.assertEqual(strength.aces, 1)
+        self.assertEqual(strength.voids, 1)
+
+
+class TestBotBidding(TestCase):
+
+    def setUp(self):
+        self.bot = Bot("Cow")
+
+    def deal(self, turned, *cards):
+        """Return a HandState with the cards in seat 0's hand and the turned card on the kitty."""
+        return HandState(3, [hand_of(*cards), 0, 0, 0], [card_index(*turned)])
+
+
+    def test_chooseOrder_strongHandOrders(self):
+        state = self.deal((9, 0), (11, 0), (11, 2), (14, 0), (13, 0), (14, 3))
+
+        self.assertTrue(self.bot.choose_order(state, 0))
+
+
+    def test_chooseOrder_weakHandPasses(self):
+        state = self.deal((14, 0), (9, 0), (10, 1), (12, 2), (9, 3), (10, 3))
+
+        self.assertFalse(self.bot.choose_order(state, 0))
+
+
+    def test_chooseAlone_topTrumpsGoAlone(self):
+        state = self.deal((9, 0), (11, 3), (11, 1), (14, 3), (13, 3), (14, 0))
+        state.trump = 3
+
+        self.assertTrue(self.bot.choose_alone(state, 0))
+
+
+    def test_chooseCall_callsStrongestSuit(self):
+        state = self.deal((12, 0), (11, 3), (11, 1), (14, 3), (9, 0), (10, 0))
+
+        self.assertEqual(self.bot.choose_call(state, 0), 3)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent, ISMCTSAgent, ISMCTSBot
+from euchre.engine import GameEngine, HandState
+from euchre.ismcts import ROLLOUT_POLICIES, BidView, ISMCTSSearch, SearchTree
+from euchre.masks import FULL_DECK, card_index, card_list
+from euchre.pimc import PlayView
+from euchre.state import GameState
+
+S, D, C, H = range(4)
+
+
+def mask(*cards):
+    return sum(1 << card_index(value, suit) for value, suit in cards)
+
+
+def deal_around(hand, turned, seat, dealer):
+    """Return the HandState of a deal giving the seat the hand and the rest of the deck in order."""
+    rest = card_list(FULL_DECK & ~hand & ~(1 << turned))
+    hands = [sum(1 << card for card in rest[start:start + 5]) for start in (0, 5, 10)]
+    hands.insert(seat, hand)
+    return HandState(dealer, hands, [turned] + rest[15:])
+
+
+def opening_view():
+    hand = mask((11, S), (11, C), (14, S), (9, H), (10, D))
+    turned = mask((13, S))
+    return PlayView(
+        seat=1, hand=hand, legal=hand, trump=S, leader=1, trick=(), skipped=None,
+        unseen=FULL_DECK & ~hand & ~turned, sizes=(5, 5, 5, 5),
+        voids=(0, 0, 0, 0), known=(turned, 0, 0, 0), maker=0,
+    )
+
+
+class TestSearchTree(TestCase):
+
+    def test_addAndFind(self):
+        tree = SearchTree()
+        first = tree.add(0, 3, 1)
+        second = tree.add(0, 7, 0)
+        grandchild = tree.add(first, 12, 0)
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(tree.find(0, 3), first)
+        self.assertEqual(tree.find(0, 7), second)
+        self.assertEqual(tree.find(first, 12), grandchild)
+        self.assertEqual(tree.find(0, 12), -1)
+        tree.clear()
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree.find(0, 3), -1)
+
+
+class TestRolloutPolicies(TestCase):
+
+    def test_policiesPlayLegalCards(self):
+        rng = Random(4)
+        hands = tuple(mask(*cards) for cards in (
+            ((9, S), (10, H), (12, C), (13, D), (14, H)),
+            ((10, S), (11, H), (12, D), (9, C), (14, C)),
+            ((11, S), (12, H), (13, C), (9, D), (10, D)),
+            ((12, S), (13, H), (14, D), (10, C), (9, H)),
+        ))
+        for name, policy in ROLLOUT_POLICIES.items():
+            state = GameState(hands, S, 0, (), None, 0, False, (0, 0))
+            while not state.is_over():
+                legal = 0
+                for card in state.legal_moves():
+                    legal |= 1 << card
+                card = policy(state, legal, rng)
+                with self.subTest(policy=name):
+                    self.assertTrue(legal >> card & 1)
+                state = state.apply(card)
+
+    def test_unknownPolicy(self):
+        with self.assertRaises(ValueError):
+            ISMCTSSearch(policy='psychic')
+
+
+class TestISMCTSSearch(TestCase):
+
+    def test_choose_legalCardAndRate(self):
+        search = ISMCTSSearch(iterations=200, time_budget=None, rng=Random(1))
+        view = opening_view()
+        card = search.choose(view)
+        self.assertTrue(view.legal >> card & 1)
+        self.assertEqual(search.get_iterations(), 200)
+        self.assertGreater(search.get_rate(), 0)
+        self.assertGreater(search.get_throughput(), 0)
+
+    def test_choose_sameSeedSameCard(self):
+        cards = [ISMCTSSearch(iterations=100, time_budget=None, rng=Random(5)).choose(opening_view())
+                 for _ in range(2)]
+        self.assertEqual(cards[0], cards[1])
+
+    def test_choose_reusesTreeAcrossTricks(self):
+        search = ISMCTSSearch(iterations=2000, time_budget=None, rng=Random(2))
+        view = opening_view()
+        card = search.choose(view)
+        nodes = len(search.get_tree())
+
+        # Follow the most visited replies, so the next decision is in the tree
+        tree = search.get_tree()
+        node = tree.find(0, card)
+        history = [card]
+        for _ in range(3):
+            children = []
+            child = tree.child[node]
+            while child >= 0:
+                children.append(child)
+                child = tree.sibling[child]
+            node = max(children, key=lambda child: tree.visits[child])
+            history.append(tree.move[node])
+        played = sum(1 << played_card for played_card in history)
+
+        hand = view.hand & ~(1 << card)
+        later = view._replace(
+            hand=hand, legal=hand, trick=(), unseen=view.unseen & ~played,
+            sizes=(4, 4, 4, 4), known=(0, 0, 0, 0), won=(0, 1),
+        )
+        search.choose(later, tuple(history))
+        reused = len(search.get_tree())
+        self.assertGreater(reused, nodes)
+        # An unrelated history starts a new tree
+        search.choose(later, (card_index(9, D),) * 4)
+        self.assertLess(len(search.get_tree()), reused)
+
+    def test_bids_returnOptions(self):
+        search = ISMCTSSearch(iterations=40, time_budget=None, bidder=BotAgent(), rng=Random(3))
+        strong = mask((11, S), (11, C), (14, S), (13, S), (14, H))
+        view = BidView(seat=1, hand=strong, dealer=0, turned=card_index(12, S))
+        self.assertTrue(search.order(view))
+        self.assertIn(search.call(view._replace(first_round=False), (D, C, H)), (D, C, H, None))
+        self.assertIn(search.alone(view._replace(trump=S)), (True, False))
+
+
+class TestISMCTSAgent(TestCase):
+
+    def test_playHand_finishesHands(self):
+        agents = [ISMCTSAgent(iterations=30, time_budget=None, rng=Random(seat)) for seat in range(4)]
+        engine = GameEngine(agents, Random(2))
+        for _ in range(3):
+            result = engine.play_hand()
+            if result.trump is not None:
+                self.assertEqual(sum(result.tricks), 5)
+
+    def test_playHand_sameSeedSamePlay(self):
+        results = []
+        for _ in range(2):
+            agents = [ISMCTSAgent(iterations=30, time_budget=None, rng=Random(seat)) for seat in range(4)]
+            results.append(GameEngine(agents, Random(8)).play_hand())
+
+        self.assertEqual(results[0], results[1])
+
+
+class TestISMCTSBot(TestCase):
+
+    def test_getOrderAndCall(self):
+        bot = ISMCTSBot("Owl", iterations=40, time_budget=None, rng=Random(6))
+        hand = mask((11, S), (11, C), (14, S), (13, S), (14, H))
+        state = deal_around(hand, card_index(12, S), 1, 0)
+        self.assertTrue(bot.get_agent().order(state, 1))
+        self.assertEqual(bot.get_search().get_iterations(), 40)
+        state = deal_around(hand, card_index(12, D), 1, 0)
+        self.assertIn(bot.get_agent().call(state, 1), (S, C, H, None))
+
+    def test_playCard_trumpsToTakeTheTrick(self):
+        owl = ISMCTSBot("Owl", iterations=100, time_budget=None, rng=Random(3))
+        hands = [mask((9, C)), mask((9, D)), mask((12, D)), mask((9, S), (14, C))]
+        state = HandState(3, hands, [card_index(10, S), card_index(11, H), card_index(12, H), card_index(13, C)])
+        state.trump = S
+        state.maker = 0
+        state.tracker.reset(S)
+        for seat, card in ((0, card_index(14, H)), (1, card_index(10, D)), (2, card_index(13, H))):
+            state.tracker.play(seat, card)
+            state.trick.append((seat, card))
+
+        self.assertEqual(owl.get_agent().play(state, 3, hands[3]), card_index(9, S))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import io
+import subprocess
+import sys
+from unittest import TestCase, main
+from unittest.mock import patch
+from euchre.events import MESSAGE, TerminalSink, emit, use_sink
+
+
+def imported_after(statement: str) -> set[str]:
+    """Return the modules a fresh interpreter has imported after running the statement."""
+    code = f'{statement}; import sys; print(" ".join(sys.modules))'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+class TestLazyImports(TestCase):
+    def test_engine_skipsDisplayModules(self):
+        modules = imported_after('import euchre.engine')
+        self.assertNotIn('colorama', modules)
+        self.assertNotIn('euchre.cards', modules)
+
+    def test_tournament_skipsProcessPool(self):
+        modules = imported_after('import euchre.tournament')
+        self.assertNotIn('concurrent.futures', modules)
+        self.assertNotIn('argparse', modules)
+        self.assertNotIn('colorama', modules)
+
+    @patch('euchre.colors._console_ready', False)
+    @patch('colorama.just_fix_windows_console')
+    def test_terminalSink_setsUpConsoleOnce(self, fix_console):
+        for _ in range(2):
+            with use_sink(TerminalSink(stream=io.StringIO())):
+                emit(MESSAGE, text='one')
+                emit(MESSAGE, text='two')
+        fix_console.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    main()
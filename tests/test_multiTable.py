@@ -0,0 +1,55 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import BotAgent, PIMCAgent
+from euchre.engine import GameEngine
+from euchre.multitable import AgentBatch, BatchAgent, BatchBotAgent, TableBatch
+
+
+class CountingBatch():
+    def __init__(self, agent):
+        self.agent = agent
+        self.sizes = []
+
+    def decide_batch(self, decisions):
+        self.sizes.append(len(decisions))
+        return self.agent.decide_batch(decisions)
+
+
+class TestTableBatch(TestCase):
+
+    def test_playGames_sameAsEngine(self):
+        expected = [GameEngine([BotAgent()] * 4, Random(seed)).play_game() for seed in range(40)]
+        for use_numpy in (True, False):
+            agent = BatchBotAgent(use_numpy=use_numpy)
+            results = TableBatch([agent] * 4, [Random(seed) for seed in range(40)]).play_games()
+            with self.subTest(use_numpy=use_numpy):
+                self.assertEqual(results, expected)
+
+    def test_playHands_batchesEveryTable(self):
+        agent = CountingBatch(BatchBotAgent())
+        tables = TableBatch([agent] * 4, [Random(seed) for seed in range(30)], dealer=2)
+        results = tables.play_hands()
+
+        expected = [GameEngine([BotAgent()] * 4, Random(seed), dealer=2).play_hand() for seed in range(30)]
+        self.assertEqual(results, expected)
+        self.assertEqual(max(agent.sizes), 30)
+        self.assertEqual(tables.get_calls(), len(agent.sizes))
+        self.assertEqual([engine.get_dealer() for engine in tables.get_engines()], [3] * 30)
+
+    def test_playHands_groupsDecisionsBySeatAgent(self):
+        bots = CountingBatch(BatchBotAgent())
+        pimc = CountingBatch(AgentBatch(PIMCAgent(samples=4, time_budget=None, rng=Random(1))))
+        tables = TableBatch([pimc, bots, pimc, bots], [Random(seed) for seed in range(6)])
+        results = tables.play_hands()
+
+        self.assertEqual(len(results), 6)
+        self.assertTrue(bots.sizes and pimc.sizes)
+        self.assertIsInstance(pimc, BatchAgent)
+
+    def test_wrongNumberOfAgents(self):
+        with self.assertRaises(ValueError):
+            TableBatch([BatchBotAgent()] * 3, [Random(0)])
+
+
+if __name__ == '__main__':
+    main()
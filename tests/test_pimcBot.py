@@ -0,0 +1,88 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.bots import PIMCAgent, PIMCBot
+from euchre.engine import GameEngine, HandState
+from euchre.masks import FULL_DECK, SUIT_MASK, card_index
+from euchre.pimc import DealSampler, PlayView
+
+
+def trick_state():
+    """Return the HandState of a trick late in a hand with Spades trump: Hearts are led
+    and the last seat holds the Nine of Spades and the Ace of Clubs."""
+    hands = [1 << card_index(9, 2), 1 << card_index(9, 1), 1 << card_index(12, 1), 1 << card_index(9, 0) | 1 << card_index(14, 2)]
+    state = HandState(3, hands, [card_index(10, 0), card_index(11, 3), card_index(12, 3), card_index(13, 2)])
+    state.trump = 0
+    state.maker = 0
+    state.tracker.reset(0)
+    for seat, card in ((0, card_index(14, 3)), (1, card_index(10, 1)), (2, card_index(13, 3))):
+        state.tracker.play(seat, card)
+        state.trick.append((seat, card))
+    return state
+
+
+class TestDealSampler(TestCase):
+
+    def test_sample_respectsSizesVoidsAndKnownCards(self):
+        hand = sum(1 << card_index(value, 0) for value in (9, 10, 12, 13, 14))
+        turned = 1 << card_index(11, 3)
+        view = PlayView(
+            seat=0, hand=hand, legal=hand, trump=0, leader=0, trick=(), skipped=None,
+            unseen=FULL_DECK & ~hand & ~turned, sizes=(5, 5, 5, 5),
+            # Seat 1 is out of Hearts, seat 3 holds the turned Jack of Hearts
+            voids=(0, 1 << 3, 0, 0), known=(0, 0, 0, turned),
+        )
+        sampler = DealSampler(Random(1))
+        sampler.prepare(view)
+
+        for _ in range(50):
+            hands = sampler.sample()
+            self.assertEqual([hand.bit_count() for hand in hands], [5, 5, 5, 5])
+            self.assertEqual(hands[0], hand)
+            self.assertTrue(hands[3] & turned)
+            self.assertFalse(hands[1] & SUIT_MASK[3])
+            self.assertEqual((hands[1] & hands[2]) | (hands[2] & hands[3]) | (hands[1] & hands[3]), 0)
+            self.assertEqual((hands[1] | hands[2] | hands[3]) & ~turned & ~view.unseen, 0)
+
+
+class TestPIMCAgent(TestCase):
+
+    def test_playHand_pimcAgentFinishesHands(self):
+        agents = [PIMCAgent(samples=4, time_budget=None, rng=Random(seat)) for seat in range(4)]
+        engine = GameEngine(agents, Random(2))
+        for _ in range(3):
+            result = engine.play_hand()
+            if result.trump is not None:
+                self.assertEqual(sum(result.tricks), 5)
+
+
+    def test_playHand_sameSeedSamePlay(self):
+        results = []
+        for _ in range(2):
+            agents = [PIMCAgent(samples=4, time_budget=None, rng=Random(seat)) for seat in range(4)]
+            results.append(GameEngine(agents, Random(8)).play_hand())
+
+        self.assertEqual(results[0], results[1])
+
+
+    def test_view_readsTheTracker(self):
+        state = trick_state()
+        view = PIMCAgent(samples=4, time_budget=None)._view(state, 3, state.hands[3])
+
+        # Seat 1 threw a Diamond on the Hearts lead
+        self.assertEqual(view.voids, (0, 1 << 3, 0, 0))
+        self.assertEqual(view.unseen & state.tracker.get_played(), 0)
+        self.assertEqual(view.trick, tuple(card for _, card in state.trick))
+
+
+class TestPIMCBot(TestCase):
+
+    def test_playCard_trumpsToTakeTheTrick(self):
+        pimc = PIMCBot("Pig", samples=8, time_budget=None, rng=Random(3))
+        state = trick_state()
+        card = pimc.get_agent().play(state, 3, state.hands[3])
+
+        self.assertEqual(card, card_index(9, 0))
+
+
+if __name__ == '__main__':
+    main()
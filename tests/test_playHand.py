@@ -0,0 +1,142 @@
+from random import Random
+from unittest import TestCase, main
+from unittest.mock import patch
+from euchre.agents import ScriptedAgent
+from euchre.cards import Card
+from euchre.core import play_cards, play_hand
+from euchre.engine import GameEngine
+from euchre.events import STATUS, EventSink, NullSink, use_sink
+from euchre.masks import from_card, hand_from_cards
+from euchre.players import Player
+from euchre.teams import Team, assign_player_teams
+from euchre.trumps import Trump
+
+
+def scripted(*cards: Card, **answers) -> ScriptedAgent:
+    """Return an agent playing the cards in order."""
+    return ScriptedAgent(play=[from_card(card) for card in cards], **answers)
+
+
+class Recorder():
+    def __init__(self):
+        self.states = []
+
+    def record(self, state, result):
+        self.states.append(state)
+
+
+class StatusSink(EventSink):
+    def __init__(self):
+        self.shown = []
+
+    def emit(self, event):
+        if event.kind == STATUS and not event.data['bidding']:
+            self.shown.append((event.data['player'], [(number, from_card(card)) for number, card in event.data['cards']]))
+
+
+class TestPlayHand(TestCase):
+    def setUp(self):
+        self.p1 = Player("Player_1")
+        self.p2 = Player("Pig")
+        self.p3 = Player("Dog")
+        self.p4 = Player("Cow")
+        self.teams = [Team(self.p1, self.p3, "Player_team"), Team(self.p2, self.p4, "Opponent_team")]
+        assign_player_teams(self.teams)
+        # Seating, Player_1 deals so Pig leads
+        self.players = [self.p1, self.p2, self.p3, self.p4]
+
+        self.p1_hand = [Card(14, "Spades"), Card(9, "Hearts"), Card(14, "Diamonds"), Card(14, "Clubs"), Card(12, "Clubs")]
+        self.p2_hand = [Card(11, "Clubs"), Card(11, "Spades"), Card(9, "Diamonds"), Card(10, "Diamonds"), Card(11, "Diamonds")]
+        self.p3_hand = [Card(12, "Spades"), Card(13, "Hearts"), Card(12, "Diamonds"), Card(9, "Clubs"), Card(13, "Diamonds")]
+        self.p4_hand = [Card(13, "Spades"), Card(14, "Hearts"), Card(10, "Clubs"), Card(13, "Clubs"), Card(10, "Hearts")]
+        # Pig orders up the Nine of Spades and the dealer throws it away again
+        self.nS = Card(9, "Spades")
+        self.kitty = [self.nS, Card(10, "Spades"), Card(11, "Hearts"), Card(12, "Hearts")]
+
+        # Every seat plays its hand in the order above
+        self.p1.set_agent(scripted(*self.p1_hand, discard=[from_card(self.nS)]))
+        self.p2.set_agent(scripted(*self.p2_hand, order=[True], alone=[False]))
+        self.p3.set_agent(scripted(*self.p3_hand))
+        self.p4.set_agent(scripted(*self.p4_hand))
+
+    def play_hand(self):
+        """Play the hand with the scripted agents. Returns the HandResult, the
+        final HandState and the (player, numbered card numbers) of every status shown."""
+        hands = [hand_from_cards(hand) for hand in (self.p1_hand, self.p2_hand, self.p3_hand, self.p4_hand)]
+        recorder = Recorder()
+        engine = GameEngine([player.get_agent() for player in self.players], Random(0), recorder=recorder)
+        sink = StatusSink()
+        with use_sink(sink):
+            result = play_hand(engine, self.players, self.teams, (hands, [from_card(card) for card in self.kitty]))
+        return result, recorder.states[0], sink.shown
+
+    def status_of(self, shown, player, trick):
+        """Return the numbered cards shown to the player to play in a trick. The
+        dealer is shown their cards to discard first."""
+        return [cards for shower, cards in shown if shower is player][trick + (player is self.p1)]
+
+    def test_playHand_tricksFollowTheScript(self):
+        _, state, _ = self.play_hand()
+
+        self.assertEqual(state.tricks[0][1], [
+            (1, from_card(self.p2_hand[0])),
+            (2, from_card(self.p3_hand[0])),
+            (3, from_card(self.p4_hand[0])),
+            (0, from_card(self.p1_hand[0])),
+        ])
+        # Pig wins the first two tricks with the bowers and leads both
+        self.assertEqual([(leader, winner) for leader, _, winner in state.tricks[:2]], [(1, 1), (1, 1)])
+        self.assertEqual(state.hands, [0, 0, 0, 0])
+
+    def test_playHand_showsTheCardsLeftInHand(self):
+        _, _, shown = self.play_hand()
+
+        p1_cards = self.status_of(shown, self.p1, 1)
+        self.assertEqual([number for number, _ in p1_cards], [1, 2, 3, 4])
+        self.assertEqual(sum(1 << card for _, card in p1_cards), hand_from_cards(self.p1_hand[1:]))
+
+    def test_playHand_showsOnlyLegalCards(self):
+        _, _, shown = self.play_hand()
+
+        # Pig leads the Nine of Diamonds in the third trick, Dog has to follow
+        # with a Diamond and keeps the Nine of Clubs
+        cards = self.status_of(shown, self.p3, 2)
+        self.assertEqual([number for number, _ in cards], [1, 2])
+        self.assertEqual(sum(1 << card for _, card in cards), hand_from_cards([self.p3_hand[2], self.p3_hand[4]]))
+
+    def test_playHand_scoresThePlayers(self):
+        result, state, _ = self.play_hand()
+
+        won = [sum(1 for _, _, winner in state.tricks if winner == seat) for seat in range(4)]
+        self.assertEqual([player.get_tricks() for player in self.players], won)
+        self.assertEqual(self.players[result.winner].get_team().get_score(), result.points)
+
+
+@patch('euchre.events._sink', NullSink())
+class TestPlayCards(TestCase):
+    def setUp(self):
+        self.p1 = Player("Player_1", scripted(Card(9, "Hearts")))
+        self.p2 = Player("Pig", scripted(Card(14, "Hearts")))
+        self.p3 = Player("Dog", scripted(Card(13, "Hearts")))
+        self.p4 = Player("Cow", scripted(Card(10, "Hearts")))
+        self.aS = Card(14, "Spades")
+        for player, card in ((self.p1, Card(9, "Hearts")), (self.p1, self.aS), (self.p2, Card(14, "Hearts")),
+                             (self.p3, Card(13, "Hearts")), (self.p4, Card(10, "Hearts"))):
+            player.receive_card(card)
+        self.trump = Trump("Spades")
+
+    def test_playCards_skipsThePartnerOfALonePlayer(self):
+        self.p3.set_skipped(True)
+        cards_played = play_cards([self.p2, self.p3, self.p4, self.p1], self.trump)
+
+        self.assertEqual([player for player, _ in cards_played], [self.p2, self.p4, self.p1])
+        self.assertEqual(self.p1.get_cards(), [self.aS])
+
+    def test_playCards_mustFollowSuit(self):
+        self.p1.set_agent(scripted(self.aS))
+        with self.assertRaises(ValueError):
+            play_cards([self.p2, self.p3, self.p4, self.p1], self.trump)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import asyncio
+import io
+from random import Random
+from unittest import TestCase, main
+from euchre.agents import Agent, AsyncAdapter, AsyncAgent, ScriptedAgent, TerminalAgent, decide_async
+from euchre.bots import Bot, BotAdapter, BotAgent, PIMCBot
+from euchre.cards import Card
+from euchre.engine import CALL, ORDER, PLAY, Decision, GameEngine, HandState
+from euchre.events import BufferedSink, use_sink
+from euchre.masks import card_index, from_card, hand_from_cards
+from euchre.players import Player
+from euchre.trumps import Trump
+
+
+def typed(*lines: str):
+    """Return a read function answering the prompts with the lines in order."""
+    answers = iter(lines)
+    return lambda prompt: next(answers)
+
+
+def hand_state(cards: list[Card], turned: Card) -> HandState:
+    """Return a HandState with the cards in seat 0's hand."""
+    return HandState(3, [hand_from_cards(cards), 0, 0, 0], [from_card(turned)])
+
+
+class TestTerminalAgent(TestCase):
+    def setUp(self):
+        self.cards = [Card(14, "Hearts"), Card(11, "Spades"), Card(9, "Diamonds")]
+        self.state = hand_state(self.cards, Card(10, "Clubs"))
+
+    def test_order_reasksUntilValid(self):
+        stream = io.StringIO()
+        with use_sink(BufferedSink(stream)) as sink:
+            agent = TerminalAgent(typed('maybe', 'YES'))
+            self.assertTrue(agent.order(self.state, 0))
+            self.assertFalse(TerminalAgent(typed('pass')).order(self.state, 0))
+            sink.flush()
+        # A blank break after every answer, through the event sink
+        self.assertEqual(stream.getvalue(), '\n\n' * 3)
+
+    def test_call_rejectsTurnedSuit(self):
+        agent = TerminalAgent(typed('clubs', 'wands', 'hearts'))
+        self.assertEqual(agent.call(self.state, 0), 3)
+        self.assertIsNone(TerminalAgent(typed('Pass')).call(self.state, 0))
+
+    def test_alone(self):
+        self.assertTrue(TerminalAgent(typed('sure', 'yes')).alone(self.state, 0))
+        self.assertFalse(TerminalAgent(typed('no')).alone(self.state, 0))
+
+    def test_play_numbersSortedLegalCards(self):
+        # Sorted as Spades, Diamonds, Clubs, Hearts
+        agent = TerminalAgent(typed('0', '4', 'x', '2'))
+        legal = self.state.hands[0]
+        self.assertEqual(agent.play(self.state, 0, legal), from_card(Card(9, "Diamonds")))
+
+    def test_discard_numbersHand(self):
+        agent = TerminalAgent(typed('1'))
+        self.assertEqual(agent.discard(self.state, 0), from_card(Card(11, "Spades")))
+
+
+class TestScriptedAgent(TestCase):
+    def test_answersInOrder(self):
+        agent = ScriptedAgent(order=[False, True], call=[None, 2], play=[5, 7])
+        self.assertEqual([agent.order(None, 0), agent.order(None, 0)], [False, True])
+        self.assertEqual([agent.call(None, 0), agent.call(None, 0)], [None, 2])
+        self.assertEqual(agent.play(None, 0, 0), 5)
+        self.assertEqual(agent.remaining(PLAY), 1)
+
+    def test_scriptRunsOut(self):
+        agent = ScriptedAgent(alone=[True])
+        agent.alone(None, 0)
+        with self.assertRaises(LookupError):
+            agent.alone(None, 0)
+
+    def test_protocols(self):
+        self.assertIsInstance(ScriptedAgent(), Agent)
+        self.assertIsInstance(TerminalAgent(), Agent)
+        self.assertIsInstance(BotAgent(), Agent)
+        self.assertIsInstance(AsyncAdapter(BotAgent()), AsyncAgent)
+
+    def test_engineGame(self):
+        # Every seat passes both rounds, so every hand is passed out
+        agents = [ScriptedAgent(order=[False], call=[None]) for _ in range(4)]
+        engine = GameEngine(agents, Random(3))
+        result = engine.play_hand()
+        self.assertIsNone(result.trump)
+        self.assertTrue(all(agent.remaining(ORDER) == 0 for agent in agents))
+
+
+class TestDecideAsync(TestCase):
+    def test_syncAndAsyncAgents(self):
+        state = HandState(0, [0b111, 0, 0, 0], [card_index(10, 0)])
+        decision = Decision(CALL, 0, state, (1, 2, 3))
+        for agent in (ScriptedAgent(call=[2]), AsyncAdapter(ScriptedAgent(call=[2]))):
+            self.assertEqual(asyncio.run(decide_async(agent, decision)), 2)
+
+        play = Decision(PLAY, 0, state, 0b010)
+        self.assertEqual(asyncio.run(decide_async(ScriptedAgent(play=[1]), play)), 1)
+
+
+class TestPlayerAgent(TestCase):
+    def test_getPlayerCard_discardsWithFullHand(self):
+        cards = [Card(value, "Hearts") for value in range(9, 15)]
+        player = Player("Dealer", ScriptedAgent(discard=[from_card(cards[0])]))
+        for card in cards:
+            player.receive_card(card)
+        card_list = player.list_cards()
+        # Hearts are sorted highest first, so the Nine is last
+        self.assertEqual(player.get_player_card(card_list, Trump("Hearts")), 6)
+
+    def test_bot_decidesThroughItsAgent(self):
+        bot = Bot("Dealer")
+        self.assertIsInstance(bot.get_agent(), BotAdapter)
+        for card in (Card(14, "Spades"), Card(11, "Clubs"), Card(9, "Hearts"), Card(13, "Diamonds"), Card(12, "Spades")):
+            bot.receive_card(card)
+        bot.receive_card(Card(9, "Spades"))
+        card_list = bot.list_cards()
+        # Spades are trump after the pickup, so the Nine of Hearts is the lowest card
+        discard = card_list[bot.get_player_card(card_list, Trump("Spades")) - 1][1]
+        self.assertEqual(from_card(discard), card_index(9, 3))
+
+    def test_getPlayerCard_searchBotNeedsTheEngine(self):
+        bot = PIMCBot("Owl", samples=4, time_budget=None, rng=Random(1))
+        bot.receive_card(Card(14, "Hearts"))
+        with self.assertRaises(ValueError):
+            bot.get_player_card(bot.list_cards(), Trump("Spades"))
+
+    def test_getPlayerCard_illegalCard(self):
+        player = Player("Player", ScriptedAgent(play=[from_card(Card(9, "Spades"))]))
+        player.receive_card(Card(14, "Hearts"))
+        with self.assertRaises(ValueError):
+            player.get_player_card(player.list_cards())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,30 @@
 from unittest.mock import patch
 from unittest import TestCase, main, skipIf
+from euchre.agents import ScriptedAgent
 from euchre.cards import Card
+from euchre.core import play_cards
+from euchre.masks import from_card
 from euchre.players import Player
 from euchre.teams import Team, assign_player_teams
 from euchre.trumps import Trump
-from euchre.__main__ import play_cards
 
 # Set to False if you want to run all tests with skipIf decorator
 skip_passing = True
 skip_failing = False
 
-# TODO Actually implement tests for bots, right now they are actual human players
 
-# These tests take a long time to process on the commandline
-# since they rely on input from the terminal
+def scripted(*cards: Card) -> ScriptedAgent:
+    """Return an agent playing the cards in order."""
+    return ScriptedAgent(play=[from_card(card) for card in cards])
+
+
+# The players answer through scripted agents instead of terminal input
 class TestPlayerLoopMechanics(TestCase):
     def setUp(self):
+        delay = patch('euchre.core.delay')
+        delay.start()
+        self.addCleanup(delay.stop)
+
         self.p1 = Player("Player_1")
         
         self.pcAS = Card(14, "Spades")
@@ -59,10 +68,15 @@ class TestPlayerLoopMechanics(TestCase):
         self.players = [self.p2, self.p3, self.p4, self.p1]
         self.trump = Trump("Spades")
 
+        # Cards played in the first trick, then the second
+        self.p1.set_agent(scripted(self.pcAS, self.pc9H))
+        self.p2.set_agent(scripted(self.jC, self.jS))
+        self.p3.set_agent(scripted(self.qS, self.kH))
+        self.p4.set_agent(scripted(self.kS, self.aH))
+
 
     @skipIf(skip_passing, "Test is working, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_loop_playersPlayCardFromHand(self, input):
+    def test_loop_playersPlayCardFromHand(self):
         cards_played = play_cards(self.players, self.trump)
 
         self.assertEqual(cards_played, [
@@ -74,8 +88,7 @@ class TestPlayerLoopMechanics(TestCase):
 
 
     @skipIf(skip_passing, "Test is working, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_cardsInHandAfterPlaying(self, input):
+    def test_cardsInHandAfterPlaying(self):
         cards_played = play_cards(self.players, self.trump)
         
         # Cards in players hand
@@ -90,8 +103,7 @@ class TestPlayerLoopMechanics(TestCase):
 
     
     @skipIf(skip_passing, "Test is working, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_listCardsAfterPlaying(self, input):
+    def test_listCardsAfterPlaying(self):
         cards_played = play_cards(self.players, self.trump)
         
         # Cards in players hand
@@ -111,8 +123,7 @@ class TestPlayerLoopMechanics(TestCase):
 
 
     @skipIf(skip_passing, "Test is working, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1','1','1','1','1'])
-    def test_playerCardsPlayed_TwoHands(self, input):
+    def test_playerCardsPlayed_TwoHands(self):
         cards_played_r1 = play_cards(self.players, self.trump)
         cards_played_r2 = play_cards(self.players, self.trump)
         
@@ -129,8 +140,7 @@ class TestPlayerLoopMechanics(TestCase):
 
 
     @skipIf(skip_failing, "Test is failing, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1','1','1','1','1'])
-    def test_LeaderCardsPlayed_TwoHands(self, input):
+    def test_LeaderCardsPlayed_TwoHands(self):
         cards_played_r1 = play_cards(self.players, self.trump)
         cards_played_r2 = play_cards(self.players, self.trump)
         
@@ -147,8 +157,7 @@ class TestPlayerLoopMechanics(TestCase):
 
 
     @skipIf(skip_failing, "Test is failing, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1','1','1','1','1'])
-    def test_LeaderCardsPlayed_TwoHands_listCards(self, input):
+    def test_LeaderCardsPlayed_TwoHands_listCards(self):
         cards_played_r1 = play_cards(self.players, self.trump)
         cards_played_r2 = play_cards(self.players, self.trump)
         
@@ -189,8 +198,7 @@ class TestPlayerLoopMechanics(TestCase):
 
 
     @skipIf(skip_passing, "Test is passing, skipping for now.")
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_BotPlayer_CardsInHand_afterPlayingCard(self, input):
+    def test_BotPlayer_CardsInHand_afterPlayingCard(self):
         cards_played = play_cards(self.players, self.trump)
         
         # self.p2 = Player("Pig")
@@ -203,8 +211,7 @@ class TestPlayerLoopMechanics(TestCase):
         self.assertEqual(cards, expected)
 
 
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_BotPlayer_listCards_afterPlayingCard(self, input):
+    def test_BotPlayer_listCards_afterPlayingCard(self):
         cards_played = play_cards(self.players, self.trump)
         
         # self.p2 = Player("Pig")
@@ -217,8 +224,7 @@ class TestPlayerLoopMechanics(TestCase):
         self.assertEqual(cards, expected)
 
 
-    @patch('builtins.input', side_effect=['2','1','1','1'])
-    def test_BotPlayer_filterCards_afterPlayingCard(self, input):
+    def test_BotPlayer_filterCards_afterPlayingCard(self):
         cards_played = play_cards(self.players, self.trump)
         
         # self.p2 = Player("Pig")
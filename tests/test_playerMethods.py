@@ -1,6 +1,7 @@
-from unittest.mock import patch
 from unittest import TestCase, main
+from euchre.agents import ScriptedAgent
 from euchre.cards import Card
+from euchre.masks import from_card
 from euchre.players import Player
 from euchre.trumps import Trump
 
@@ -147,15 +148,15 @@ class TestPlayerMethods(TestCase):
 
         self.assertEqual(p1.filter_cards(c1, trump), [pc1, pc3])
 
-    @patch('builtins.input', return_value='1')
-    def test_getPlayerCard(self, input):
-        p1 = Player("Player_1")
+    def test_getPlayerCard(self):
         pc1 = Card(10, "Diamonds")
         pc2 = Card(11, "Diamonds")
         pc3 = Card(12, "Hearts")
         pc4 = Card(13, "Spades")
         pc5 = Card(9, "Clubs")
 
+        p1 = Player("Player_1", ScriptedAgent(play=[from_card(pc4)]))
+
         p1.receive_card(pc1)
         p1.receive_card(pc2)
         p1.receive_card(pc3)
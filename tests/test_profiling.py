@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import tempfile
+from random import Random
+from unittest import TestCase, main
+from unittest.mock import patch
+from euchre.__main__ import parse_args
+from euchre.bots import BotAgent
+from euchre.engine import GameEngine
+from euchre.events import MESSAGE, PAUSE, ProfilingSink, TerminalSink, emit, use_sink
+from euchre.profiling import Profiler, get_profiler, timed, timed_steps, use_profiler
+
+
+@timed('double')
+def double(number):
+    return number * 2
+
+
+class TestProfiling(TestCase):
+    def test_timed_recordsOnlyWhenActive(self):
+        profiler = Profiler()
+        self.assertEqual(double(2), 4)
+        self.assertEqual(profiler.get_stats(), [])
+        with use_profiler(profiler):
+            self.assertIs(get_profiler(), profiler)
+            double(3)
+            double(4)
+        self.assertIsNone(get_profiler())
+        double(5)
+        stats = profiler.get_stats()
+        self.assertEqual([(phase.name, phase.count) for phase in stats], [('double', 2)])
+
+    def test_timed_recordsWhenRaising(self):
+        @timed('fails')
+        def fails():
+            raise ValueError
+        profiler = Profiler()
+        with use_profiler(profiler), self.assertRaises(ValueError):
+            fails()
+        self.assertEqual(profiler.get_stats()[0].count, 1)
+
+    def test_timedSteps_timesTheWholeGenerator(self):
+        @timed_steps('steps')
+        def steps():
+            answer = yield 1
+            return answer * 2
+        profiler = Profiler()
+        with use_profiler(profiler):
+            generator = steps()
+            self.assertEqual(next(generator), 1)
+            self.assertEqual(profiler.get_stats(), [])
+            with self.assertRaises(StopIteration) as stop:
+                generator.send(3)
+        self.assertEqual(stop.exception.value, 6)
+        self.assertEqual(profiler.get_stats()[0].count, 1)
+
+    def test_engineHand_recordsThePhases(self):
+        profiler = Profiler()
+        with use_profiler(profiler):
+            # The first hand of seed 1 is played out
+            result = GameEngine([BotAgent() for _ in range(4)], Random(1)).play_hand()
+        self.assertIsNotNone(result.trump)
+        counts = {phase.name: phase.count for phase in profiler.get_stats()}
+        self.assertEqual(counts['bidding_round'], 1)
+        self.assertEqual(counts['play_cards'], 5)
+        self.assertEqual(counts['get_highest_rank_card'], 5)
+        self.assertEqual(counts['score_round'], 1)
+
+    def test_percentiles(self):
+        profiler = Profiler()
+        for nanoseconds in range(1, 101):
+            profiler.record('phase', nanoseconds * 1000)
+        phase = profiler.get_stats()[0]
+        self.assertEqual(phase.count, 100)
+        self.assertAlmostEqual(phase.total, 5050e-6)
+        self.assertAlmostEqual(phase.p50, 50e-6)
+        self.assertAlmostEqual(phase.p95, 95e-6)
+        self.assertAlmostEqual(phase.p99, 99e-6)
+
+    def test_save(self):
+        profiler = Profiler()
+        profiler.record('slow', 2000)
+        profiler.record('fast', 10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            profiler.save(path)
+            with open(path) as file:
+                summary = json.load(file)
+        self.assertEqual(summary, profiler.summary())
+        self.assertEqual(list(summary['phases']), ['slow', 'fast'])
+        self.assertEqual(summary['phases']['slow']['count'], 1)
+        self.assertEqual(len(profiler.report()), 3)
+
+    @patch('euchre.events.time.sleep')
+    def test_profilingSink(self, sleep):
+        profiler = Profiler()
+        stream = io.StringIO()
+        with use_sink(ProfilingSink(TerminalSink(pacing=1, stream=stream), profiler)):
+            emit(MESSAGE, text='hello')
+            emit(PAUSE)
+        self.assertEqual(stream.getvalue(), 'hello\n')
+        self.assertEqual({phase.name: phase.count for phase in profiler.get_stats()}, {'output': 1, 'pause': 1})
+
+    def test_parseArgs(self):
+        self.assertIsNone(parse_args([]).profile)
+        self.assertEqual(parse_args(['--profile']).profile, 'euchre-profile')
+        self.assertEqual(parse_args(['--profile', 'run1']).profile, 'run1')
+
+
+if __name__ == '__main__':
+    main()
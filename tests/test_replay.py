@@ -0,0 +1,131 @@
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from euchre.bots import BotAgent
+from euchre.engine import PLAY, GameEngine, decide
+from euchre.masks import card_index
+from euchre.records import HandRecord, RecordReader, RecordWriter, record_hand
+from euchre.replay import ReplayError, fast_forward, replay_game, replay_hand, seek
+
+S, D, C, H = range(4)
+
+
+class ListRecorder():
+    def __init__(self):
+        self.records = []
+
+    def record(self, state, result):
+        self.records.append(record_hand(state, result))
+
+
+def play_game(seed):
+    recorder = ListRecorder()
+    result = GameEngine([BotAgent() for _ in range(4)], Random(seed), recorder=recorder).play_game()
+    return result, recorder
+
+
+def live_state(seed, hand, trick):
+    """Return the live HandState of a seeded game at the lead of a trick."""
+    engine = GameEngine([BotAgent() for _ in range(4)], Random(seed))
+    for _ in range(hand):
+        engine.play_hand()
+    scores = engine.get_scores()
+    steps = engine.hand_steps()
+    decision = next(steps)
+    while not (decision.kind == PLAY and not decision.state.trick and len(decision.state.tricks) == trick):
+        decision = steps.send(decide(engine.get_agents()[decision.seat], decision))
+    return decision.state, scores
+
+
+def swept_alone_record():
+    # Seat 1 goes alone in Spades, seat 0 takes every trick leading trump
+    hands = (
+        sum(1 << card_index(value, suit) for value, suit in ((11, S), (11, C), (14, S), (13, S), (12, S))),
+        sum(1 << card_index(value, H) for value in (9, 10, 12, 13, 14)),
+        sum(1 << card_index(value, D) for value in (9, 10, 12, 13, 14)),
+        sum(1 << card_index(value, C) for value in (10, 12, 13, 14)) | 1 << card_index(10, S),
+    )
+    plays = []
+    for lead, heart, diamond in zip(((11, S), (11, C), (14, S), (13, S), (12, S)), (9, 10, 12, 13, 14), (9, 10, 12, 13, 14)):
+        plays.extend((card_index(*lead), card_index(heart, H), card_index(diamond, D)))
+    return HandRecord(
+        dealer=3, hands=hands, turned=card_index(9, C), discard=None,
+        bids=((0, 'pass'), (1, 'pass'), (2, 'pass'), (3, 'pass'), (0, 'pass'), (1, S)),
+        trump=S, maker=1, alone=True, plays=tuple(plays), winner=0, points=0,
+    )
+
+
+class TestReplay(TestCase):
+
+    def test_replayGame_matchesRecordedGames(self):
+        for seed in range(8):
+            result, recorder = play_game(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(replay_game(recorder.records), result)
+
+    def test_replayGame_fromRecordFile(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.rec')
+            with RecordWriter(path) as writer:
+                result = GameEngine([BotAgent() for _ in range(4)], Random(11), recorder=writer).play_game()
+            with RecordReader(path) as reader:
+                self.assertEqual(replay_game(list(reader)), result)
+
+    def test_replayHand_aloneSweptByDefendersScoresNothing(self):
+        result = replay_hand(swept_alone_record())
+        self.assertEqual((result.maker, result.alone, result.tricks), (1, True, (5, 0)))
+        self.assertEqual((result.winner, result.points), (0, 0))
+
+    def test_replayHand_rejectsTamperedRecords(self):
+        _, recorder = play_game(2)
+        record = next(record for record in recorder.records if record.trump is not None)
+        plays = list(record.plays)
+        plays[-1], plays[-2] = plays[-2], plays[-1]
+        tampered = (
+            record._replace(points=record.points + 1),
+            record._replace(plays=tuple(plays)),
+            record._replace(bids=record.bids[1:]),
+            record._replace(dealer=(record.dealer + 1) % 4),
+        )
+        for bad in tampered:
+            with self.subTest(record=bad), self.assertRaises(ReplayError):
+                replay_hand(bad)
+
+    def test_fastForward_matchesLiveGame(self):
+        result, recorder = play_game(5)
+        hand = next(index for index, record in enumerate(recorder.records) if index > 1 and record.trump is not None)
+        for trick in range(5):
+            replay = fast_forward(recorder.records, hand, trick)
+            state, scores = live_state(5, hand, trick)
+            with self.subTest(trick=trick):
+                self.assertEqual(replay.get_engine().get_scores(), scores)
+                self.assertEqual(replay.get_state().tricks, state.tricks)
+                self.assertEqual(replay.get_state().hands, state.hands)
+                self.assertEqual(replay.get_decision().seat, state.tricks[-1][2] if trick else (state.dealer + 1) % 4)
+                self.assertEqual(replay.finish(), result.hands[hand])
+
+    def test_fastForward_playOnWithOtherAgents(self):
+        _, recorder = play_game(6)
+        hand = next(index for index, record in enumerate(recorder.records) if record.trump is not None)
+        replay = fast_forward(recorder.records, hand, 2)
+        legal = replay.get_decision().options
+        replay.step((legal & -legal).bit_length() - 1)
+        with self.assertRaises(ValueError):
+            replay.finish()
+        result = replay.finish([BotAgent() for _ in range(4)])
+        self.assertEqual(sum(result.tricks), 5)
+        with self.assertRaises(ValueError):
+            fast_forward(recorder.records, len(recorder.records))
+
+    def test_seek_sameAsFastForward(self):
+        _, recorder = play_game(7)
+        replay = seek(GameEngine([BotAgent() for _ in range(4)], Random(7)), 3, 1)
+        recorded = fast_forward(recorder.records, 3, 1)
+        self.assertEqual(replay.get_state().tricks, recorded.get_state().tricks)
+        self.assertEqual(replay.get_engine().get_scores(), recorded.get_engine().get_scores())
+        self.assertEqual(replay.finish(), recorded.finish())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import unittest
-from euchre.__main__ import get_highest_rank_card
+from euchre.cards import get_highest_rank_card
 from euchre.cards import Card
 from euchre.players import Player
 from euchre.trumps import Trump
@@ -0,0 +1,86 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.canonical import (
+    PERMUTATIONS,
+    canonical_deal,
+    canonical_hand,
+    invert,
+    permute_card,
+    permute_hand,
+    trump_permutation,
+)
+from euchre.masks import LEFT_SUIT
+from euchre.solver import solve
+
+
+def random_deal(rng):
+    cards = list(range(24))
+    rng.shuffle(cards)
+    return [sum(1 << card for card in cards[seat * 5:seat * 5 + 5]) for seat in range(4)]
+
+
+class TestSuitCanonical(TestCase):
+
+    def test_permutations_keepColourPairs(self):
+        self.assertEqual(len(set(PERMUTATIONS)), 8)
+        for permutation in PERMUTATIONS:
+            for suit in range(4):
+                self.assertEqual(LEFT_SUIT[permutation[suit]], permutation[LEFT_SUIT[suit]])
+
+
+    def test_permuteHand_invertRoundTrip(self):
+        hand = sum(1 << card for card in (0, 5, 7, 15, 23))
+        for permutation in PERMUTATIONS:
+            permuted = permute_hand(hand, permutation)
+            self.assertEqual(permuted.bit_count(), 5)
+            self.assertEqual(permute_hand(permuted, invert(permutation)), hand)
+
+
+    def test_permuteCard_matchesPermuteHand(self):
+        for permutation in PERMUTATIONS:
+            for card in range(24):
+                self.assertEqual(permute_hand(1 << card, permutation), 1 << permute_card(card, permutation))
+
+
+    def test_canonicalHand_sameForEveryRenaming(self):
+        rng = Random(2)
+        for _ in range(100):
+            hand = sum(1 << card for card in rng.sample(range(24), 5))
+            canonical, permutation = canonical_hand(hand)
+            self.assertEqual(permute_hand(hand, permutation), canonical)
+            for other in PERMUTATIONS:
+                self.assertEqual(canonical_hand(permute_hand(hand, other))[0], canonical)
+
+
+    def test_canonicalDeal_trumpBecomesSpades(self):
+        rng = Random(3)
+        for trump in range(4):
+            hands, canonical_trump, permutation = canonical_deal(random_deal(rng), trump)
+            self.assertEqual(canonical_trump, 0)
+            self.assertEqual(permutation[trump], 0)
+        self.assertEqual(trump_permutation(3)[3], 0)
+        self.assertEqual(trump_permutation(3)[LEFT_SUIT[3]], LEFT_SUIT[0])
+
+
+    def test_canonicalDeal_sameDoubleDummyResult(self):
+        rng = Random(4)
+        for _ in range(10):
+            hands = random_deal(rng)
+            trump = rng.randrange(4)
+            canonical, canonical_trump, _ = canonical_deal(hands, trump)
+            self.assertEqual(solve(hands, trump, 1, 0), solve(list(canonical), canonical_trump, 1, 0))
+
+
+    def test_canonicalDeal_renamingsShareTheForm(self):
+        hands = random_deal(Random(5))
+        trump = 2
+        forms = set()
+        for permutation in PERMUTATIONS:
+            renamed = [permute_hand(hand, permutation) for hand in hands]
+            forms.add(canonical_deal(renamed, permutation[trump])[:2])
+
+        self.assertEqual(len(forms), 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+from unittest import TestCase, main
+from euchre.tournament import TournamentStats, run_shards, run_tournament, split_range, wilson_interval
+
+
+class TestTournament(TestCase):
+
+    def test_runTournament_sameResultsForAnyWorkerCount(self):
+        single = run_tournament(['bot', 'bot'], 12, seed=5, workers=1)
+        several = run_tournament(['bot', 'bot'], 12, seed=5, workers=3)
+
+        self.assertEqual(single, several)
+        self.assertEqual(single.games, 12)
+
+
+    def test_runTournament_seedChangesResults(self):
+        first = run_tournament(['bot', 'bot'], 12, seed=1)
+        second = run_tournament(['bot', 'bot'], 12, seed=2)
+
+        self.assertNotEqual(first, second)
+
+
+    def test_merge_addsCounters(self):
+        first = run_tournament(['bot', 'bot'], 6, seed=9)
+        merged = TournamentStats()
+        merged.merge(first)
+        merged.merge(first)
+
+        self.assertEqual(merged.games, 12)
+        self.assertEqual(merged.wins, [count * 2 for count in first.wins])
+
+
+    def test_splitRange_coversEveryNumberOnce(self):
+        self.assertEqual(split_range(10, 17, 3), [(10, 12), (12, 14), (14, 17)])
+        self.assertEqual(split_range(0, 2, 8), [(0, 1), (1, 2)])
+        self.assertEqual(split_range(5, 5, 4), [(5, 5)])
+        self.assertEqual(run_shards(pow, [(2, 3), (3, 2)]), [8, 9])
+
+
+    def test_runTournament_unknownAgent(self):
+        with self.assertRaises(ValueError):
+            run_tournament(['bot', 'nobody'], 1)
+
+
+    def test_wilsonInterval_containsRate(self):
+        low, high = wilson_interval(30, 100)
+
+        self.assertLess(low, 0.3)
+        self.assertGreater(high, 0.3)
+
+
+if __name__ == '__main__':
+    main()
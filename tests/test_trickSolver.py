@@ -0,0 +1,93 @@
+from random import Random
+from unittest import TestCase, main
+from euchre.masks import card_index, card_list, legal_mask, trick_winner
+from euchre.solver import Solver, solve
+
+
+def minimax(hands, trump, leader, team, skipped=None, trick=()):
+    """Plain minimax over every legal card, to check the solver against."""
+    order = [(leader + offset) % 4 for offset in range(4) if (leader + offset) % 4 != skipped]
+    if not trick and not hands[leader]:
+        return 0
+    seat = order[len(trick)]
+    led = trick[0] if trick else None
+    values = []
+    for card in card_list(legal_mask(hands[seat], led, trump)):
+        after = list(hands)
+        after[seat] ^= 1 << card
+        played = list(trick) + [card]
+        if len(played) == len(order):
+            winner = order[trick_winner(played, trump)]
+            values.append((winner % 2 == team) + minimax(after, trump, winner, team, skipped))
+        else:
+            values.append(minimax(after, trump, leader, team, skipped, played))
+    return max(values) if seat % 2 == team else min(values)
+
+
+def deal(rng, size, skipped=None):
+    deck = list(range(24))
+    rng.shuffle(deck)
+    hands = [sum(1 << card for card in deck[seat * size:seat * size + size]) for seat in range(4)]
+    if skipped is not None:
+        hands[skipped] = 0
+    return hands
+
+
+class TestTrickSolver(TestCase):
+
+    def setUp(self):
+        self.rng = Random(4)
+
+    def test_solve_matchesMinimax(self):
+        for _ in range(60):
+            hands = deal(self.rng, 3)
+            trump = self.rng.randrange(4)
+            leader = self.rng.randrange(4)
+            team = self.rng.randrange(2)
+
+            self.assertEqual(solve(hands, trump, leader, team), minimax(hands, trump, leader, team))
+
+
+    def test_solve_loneHandMatchesMinimax(self):
+        for _ in range(40):
+            hands = deal(self.rng, 4, skipped=3)
+            trump = self.rng.randrange(4)
+
+            self.assertEqual(solve(hands, trump, 0, 1, skipped=3), minimax(hands, trump, 0, 1, skipped=3))
+
+
+    def test_solve_bothTeamsAddUp(self):
+        for _ in range(20):
+            hands = deal(self.rng, 5)
+            solver = Solver(self.rng.randrange(4))
+
+            self.assertEqual(solver.solve(hands, 1, 0) + solver.solve(hands, 1, 1), 5)
+
+
+    def test_solve_topTrumpsTakeEveryTrick(self):
+        # Spades trump, seat 0 holds both bowers and the three top spades
+        hands = [
+            sum(1 << card_index(value, 0) for value in (11, 14, 13, 12)) | 1 << card_index(11, 2),
+            sum(1 << card_index(value, 1) for value in (9, 10, 11, 12, 13)),
+            sum(1 << card_index(value, 3) for value in (9, 10, 11, 12, 13)),
+            sum(1 << card_index(value, 2) for value in (9, 10, 12, 13, 14)),
+        ]
+
+        self.assertEqual(solve(hands, 0, 0, 0), 5)
+
+
+    def test_moveValues_matchSolveAfterEachCard(self):
+        for _ in range(10):
+            hands = deal(self.rng, 5)
+            trump = self.rng.randrange(4)
+            values = Solver(trump).move_values(hands, 2)
+
+            self.assertEqual(sorted(values), card_list(hands[2]))
+            for card, value in values.items():
+                after = list(hands)
+                after[2] ^= 1 << card
+                self.assertEqual(value, solve(after, trump, 2, 0, trick=[card]))
+
+
+if __name__ == '__main__':
+    main()